@@ -0,0 +1,6 @@
+"""
+Benchmarks for the RedVox SDK.
+
+Benchmarks are not part of the distributed package and are not collected by the unit tests.  Each ``bench_*`` module
+can be run directly from the root of the repository, i.e.: ``python -m benchmarks.bench_session_model``
+"""
@@ -0,0 +1,133 @@
+"""
+Benchmark aligning the audio of many stations to one time grid against a loop over the stations.
+
+Synthetic stations of audio with a random clock offset and a 10 second gap each are saved to disk.  The loop reads
+each station's timestamps and microphone data, interpolates them to the grid and stacks the rows, as user code would.
+redvox.common.alignment.align_channel is run serially and in parallel into memory, and into a memory-mapped .npy file.
+Each run is done in a fresh worker process and reports its wall time and the largest resident memory it reached.
+The default problem is one hour of 100 stations of 800 Hz audio.
+
+Usage: python -m benchmarks.bench_aligned_export [--hours H] [--stations N] [--audio-hz R] [--workers W]
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pyarrow as pa
+
+from redvox import settings
+from redvox.common.alignment import align_channel
+from redvox.common.sensor_data import SensorData, SensorType
+from redvox.common.station import Station
+
+from benchmarks.measure import peak_bytes_since, rss_bytes, run_in_fresh_process
+
+
+def _stations(num_stations: int, hours: float, audio_hz: float, base_dir: str) -> List[Station]:
+    rng = np.random.default_rng(0)
+    interval = 1e6 / audio_hz
+    num_samples = int(hours * 3600 * audio_hz)
+    stations = []
+    for i in range(num_stations):
+        station_dir = os.path.join(base_dir, f"{i:010d}")
+        timestamps = 1.6e15 + rng.uniform(0, interval) + np.arange(num_samples) * interval
+        # remove 10 seconds of samples from a random place to make a gap
+        gap_start = rng.integers(0, max(num_samples - int(10 * audio_hz), 1))
+        keep = np.ones(num_samples, dtype=bool)
+        keep[gap_start : gap_start + int(10 * audio_hz)] = False
+        table = pa.Table.from_pydict(
+            {
+                "timestamps": timestamps[keep],
+                "unaltered_timestamps": timestamps[keep],
+                "microphone": rng.standard_normal(num_samples)[keep],
+            }
+        )
+        station = Station(f"{i:010d}", start_timestamp=1.6e15, base_dir=station_dir, save_data=True)
+        station.append_sensor(
+            SensorData(
+                "audio",
+                table,
+                SensorType.AUDIO,
+                audio_hz,
+                1 / audio_hz,
+                0.0,
+                True,
+                save_data=True,
+                base_dir=os.path.join(station_dir, "AUDIO"),
+            )
+        )
+        station.update_first_and_last_data_timestamps()
+        stations.append(station)
+    return stations
+
+
+def _loop(stations: List[Station], audio_hz: float, out_path: Optional[str], workers: int) -> Tuple[float, int]:
+    """
+    :return: seconds and bytes of resident memory used to interpolate each station in a loop and stack the rows
+    """
+    baseline = rss_bytes()
+    start = time.perf_counter()
+    first = min(s.first_data_timestamp() for s in stations)
+    last = max(s.last_data_timestamp() for s in stations)
+    grid = np.arange(first, last + 1, 1e6 / audio_hz)
+    rows = []
+    for station in stations:
+        audio = station.audio_sensor()
+        rows.append(np.interp(grid, audio.data_timestamps(), audio.get_microphone_data(), left=np.nan, right=np.nan))
+    np.vstack(rows)
+    return time.perf_counter() - start, peak_bytes_since(baseline)
+
+
+def _align(stations: List[Station], audio_hz: float, out_path: Optional[str], workers: int) -> Tuple[float, int]:
+    """
+    :return: seconds and bytes of resident memory used by align_channel
+    """
+    baseline = rss_bytes()
+    start = time.perf_counter()
+    if workers > 1:
+        settings.set_parallelism_enabled(True)
+        with multiprocessing.Pool(workers) as pool:
+            align_channel(stations, SensorType.AUDIO, "microphone", audio_hz, out_path=out_path, pool=pool)
+    else:
+        settings.set_parallelism_enabled(False)
+        align_channel(stations, SensorType.AUDIO, "microphone", audio_hz, out_path=out_path)
+    return time.perf_counter() - start, peak_bytes_since(baseline)
+
+
+def _measure(fn, stations: List[Station], audio_hz: float, out_path: Optional[str], workers: int) -> Tuple[float, int]:
+    """
+    :return: the result of fn, run in a fresh process that can start its own pool of workers
+    """
+    return run_in_fresh_process(fn, stations, audio_hz, out_path, workers)
+
+
+def main(argv: List[str]):
+    parser = argparse.ArgumentParser("bench_aligned_export", description="Compare aligning stations to a loop")
+    parser.add_argument("--hours", type=float, default=1.0, help="Hours of data per station, default 1")
+    parser.add_argument("--stations", type=int, default=100, help="Number of stations, default 100")
+    parser.add_argument("--audio-hz", type=float, default=800.0, help="Audio sample rate, default 800")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Parallel workers, default all cpus")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        start = time.perf_counter()
+        stations = _stations(args.stations, args.hours, args.audio_hz, tmp_dir)
+        print(f"{args.stations} stations of {args.hours} hours written in {time.perf_counter() - start:.1f}s")
+        out_path = os.path.join(tmp_dir, "aligned.npy")
+        for name, fn, path, workers in (
+            ("loop", _loop, None, 1),
+            ("serial", _align, None, 1),
+            ("parallel", _align, None, args.workers),
+            ("parallel npy", _align, out_path, args.workers),
+        ):
+            seconds, used_bytes = _measure(fn, stations, args.audio_hz, path, workers)
+            print(f"{name:>12}: {seconds:8.1f}s  {used_bytes / 1e6:9.1f} MB peak memory")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
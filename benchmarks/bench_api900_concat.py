@@ -0,0 +1,74 @@
+"""
+Benchmark gap detection and concatenation of redvox.api900.concat over a day of API 900 data from one station.
+
+The day is built from the recorded 1637680001 test packets (51.2 s at 80 Hz), shifted so that they are continuous,
+with a number of randomly placed time gaps.
+
+Usage: python -m benchmarks.bench_api900_concat [num_packets] [num_gaps]
+"""
+import glob
+import os
+import random
+import sys
+import time
+from typing import List
+
+import numpy as np
+
+import redvox.api900.concat as concat
+import redvox.api900.lib.api900_pb2 as api900_pb2
+import redvox.api900.reader as reader
+from redvox.tests import TEST_DATA_DIR
+
+PACKET_LEN_US: int = 51_200_000
+
+
+def _day(num_packets: int, num_gaps: int, seed: int = 0) -> List[api900_pb2.RedvoxPacket]:
+    templates: List[api900_pb2.RedvoxPacket] = list(
+        map(reader.read_file, sorted(glob.glob(os.path.join(TEST_DATA_DIR, "1637680001_*.rdvxz"))))
+    )
+    start_us: int = templates[0].evenly_sampled_channels[0].first_sample_timestamp_epoch_microseconds_utc
+    gaps = set(random.Random(seed).sample(range(1, num_packets), num_gaps))
+    packets: List[api900_pb2.RedvoxPacket] = []
+    gap_us: int = 0
+    for i in range(num_packets):
+        template = templates[i % len(templates)]
+        packet = api900_pb2.RedvoxPacket()
+        packet.CopyFrom(template)
+        gap_us += 60_000_000 if i in gaps else 0
+        offset_us: int = (start_us + i * PACKET_LEN_US + gap_us
+                          - template.evenly_sampled_channels[0].first_sample_timestamp_epoch_microseconds_utc)
+        for channel in packet.evenly_sampled_channels:
+            channel.first_sample_timestamp_epoch_microseconds_utc += offset_us
+        for channel in packet.unevenly_sampled_channels:
+            channel.timestamps_microseconds_utc[:] = np.array(channel.timestamps_microseconds_utc, np.int64) + offset_us
+        packet.app_file_start_timestamp_machine += offset_us
+        packets.append(packet)
+    return packets
+
+
+def main(num_packets: int = 1688, num_gaps: int = 10):
+    packets = _day(num_packets, num_gaps)
+    print(f"{num_packets} packets ({num_packets * PACKET_LEN_US / 3.6e9:.1f} hours) with {num_gaps} gaps")
+
+    start = time.perf_counter()
+    wrapped = list(map(reader.wrap, packets))
+    print(f"wrap:                          {time.perf_counter() - start:7.3f}s")
+
+    start = time.perf_counter()
+    gaps = concat._identify_gaps(wrapped, 5)
+    print(f"_identify_gaps:                {time.perf_counter() - start:7.3f}s ({len(gaps)} gaps)")
+
+    start = time.perf_counter()
+    changes = concat._identify_sensor_changes(wrapped)
+    print(f"_identify_sensor_changes:      {time.perf_counter() - start:7.3f}s ({len(changes)} changes)")
+
+    start = time.perf_counter()
+    segments = concat.concat_wrapped_redvox_packets(wrapped)
+    elapsed = time.perf_counter() - start
+    print(f"concat_wrapped_redvox_packets: {elapsed:7.3f}s ({len(segments)} segments, {num_packets / elapsed:.0f} "
+          f"packets/s)")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,76 @@
+"""
+Benchmark the throughput of the API 900 reader over a synthetic unstructured directory of .rdvxz files.
+
+Each synthetic device is a copy of the recorded 1637680001 test packets with its own redvox id and file timestamps.
+The directory is read serially, then with process pools of increasing size, and then as a stream of devices.
+
+Usage: python -m benchmarks.bench_api900_reader [num_devices] [packets_per_device] [max_in_flight_packets]
+"""
+import glob
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from typing import List
+
+import redvox.api900.reader as reader
+import redvox.settings as settings
+from redvox.tests import TEST_DATA_DIR
+
+
+def _write_tree(directory: str, num_devices: int, packets_per_device: int) -> int:
+    templates: List[reader.WrappedRedvoxPacket] = list(
+        map(reader.read_rdvxz_file, sorted(glob.glob(os.path.join(TEST_DATA_DIR, "1637680001_*.rdvxz"))))
+    )
+    num_bytes: int = 0
+    for device in range(num_devices):
+        redvox_id: str = f"{1_000_000_000 + device}"
+        for i in range(packets_per_device):
+            packet = templates[i % len(templates)].clone()
+            packet.set_redvox_id(redvox_id)
+            packet.set_uuid(f"{device}")
+            packet.set_app_file_start_timestamp_machine(1_600_000_000_000_000 + i * 51_200_000)
+            packet.write_rdvxz(directory)
+            num_bytes += os.path.getsize(os.path.join(directory, packet.default_filename()))
+    return num_bytes
+
+
+def _report(name: str, num_files: int, elapsed: float):
+    print(f"{name:>32}: {elapsed:7.2f}s {num_files / elapsed:9.1f} files/s")
+
+
+def main(num_devices: int = 100, packets_per_device: int = 50, max_in_flight_packets: int = 1024):
+    num_files: int = num_devices * packets_per_device
+    with tempfile.TemporaryDirectory() as directory:
+        num_bytes = _write_tree(directory, num_devices, packets_per_device)
+        print(f"{num_devices} devices x {packets_per_device} packets, {num_bytes / 1e6:.1f} MB")
+
+        start = time.perf_counter()
+        reader.read_rdvxz_file_range(directory, concat_continuous_segments=False)
+        _report("serial read_rdvxz_file_range", num_files, time.perf_counter() - start)
+
+        settings.set_parallelism_enabled(True)
+        for num_workers in sorted({1, 2, multiprocessing.cpu_count()}):
+            with multiprocessing.Pool(num_workers) as pool:
+                start = time.perf_counter()
+                reader.read_rdvxz_file_range(
+                    directory, concat_continuous_segments=False, pool=pool, max_in_flight_packets=max_in_flight_packets
+                )
+                _report(f"{num_workers} process read_rdvxz_file_range", num_files, time.perf_counter() - start)
+
+        with multiprocessing.Pool() as pool:
+            start = time.perf_counter()
+            first_s = None
+            for _ in reader.iter_rdvxz_file_range(
+                directory, concat_continuous_segments=False, pool=pool, max_in_flight_packets=max_in_flight_packets
+            ):
+                if first_s is None:
+                    first_s = time.perf_counter() - start
+            _report("iter_rdvxz_file_range", num_files, time.perf_counter() - start)
+            print(f"{'first device after':>32}: {first_s:7.2f}s")
+        settings.set_parallelism_enabled(False)
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
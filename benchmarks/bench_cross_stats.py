@@ -0,0 +1,76 @@
+"""
+Benchmark the batched cross correlation of redvox.common.cross_stats against looping xcorr_main.
+
+Every station records the same noise with a different delay and its own additive noise.  All stations are aligned
+against the first station, and the pairwise correlation of the first max_pairs stations is computed serially and with
+a process pool.  The full size problem (100 stations x 10 minutes at 8 kHz) needs about 2 GB for the single precision
+signals.
+
+Usage: python -m benchmarks.bench_cross_stats [num_stations] [duration_s] [sample_rate_hz] [max_pairs]
+"""
+import multiprocessing
+import sys
+import time
+
+import numpy as np
+
+import redvox.common.cross_stats as cs
+import redvox.settings as settings
+
+
+def _signals(num_stations: int, num_samples: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    max_delay: int = num_samples // 100
+    source: np.ndarray = rng.standard_normal(num_samples + max_delay, dtype=np.float32)
+    sigs: np.ndarray = np.empty((num_stations, num_samples), dtype=np.float32)
+    for i, delay in enumerate(rng.integers(0, max_delay, num_stations)):
+        sigs[i] = source[delay : delay + num_samples]
+        sigs[i] += 0.5 * rng.standard_normal(num_samples, dtype=np.float32)
+    return sigs
+
+
+def main(num_stations: int = 100, duration_s: float = 600.0, sample_rate_hz: float = 8000.0, max_pairs: int = 10):
+    sigs = _signals(num_stations, int(duration_s * sample_rate_hz))
+    print(f"{num_stations} stations x {duration_s}s at {sample_rate_hz}Hz, {sigs.nbytes / 1e6:.0f} MB")
+
+    start = time.perf_counter()
+    looped = [cs.xcorr_main(sig, sigs[0], sample_rate_hz) for sig in sigs]
+    loop_s = time.perf_counter() - start
+    print(f"looping xcorr_main:  {loop_s:8.2f}s")
+
+    start = time.perf_counter()
+    batch = cs.xcorr_main_batch(sigs, sigs[0], sample_rate_hz)
+    batch_s = time.perf_counter() - start
+    print(f"xcorr_main_batch:    {batch_s:8.2f}s ({loop_s / batch_s:.1f}x)")
+    print(
+        f"offsets equal: {np.array_equal([r[1] for r in looped], batch[1])}, "
+        f"max xcorr difference: {np.abs(np.array([r[0] for r in looped]) - batch[0]).max():.2e}"
+    )
+
+    pair_sigs = sigs[:max_pairs]
+    start = time.perf_counter()
+    for sig in pair_sigs:
+        for sig_ref in pair_sigs:
+            cs.xcorr_main(sig, sig_ref, sample_rate_hz)
+    loop_s = time.perf_counter() - start
+    print(f"{len(pair_sigs)}x{len(pair_sigs)} pairs, looping xcorr_main: {loop_s:8.2f}s")
+
+    start = time.perf_counter()
+    cs.xcorr_pairs(pair_sigs, sample_rate_hz)
+    pairs_s = time.perf_counter() - start
+    print(f"{len(pair_sigs)}x{len(pair_sigs)} pairs, xcorr_pairs:         {pairs_s:8.2f}s ({loop_s / pairs_s:.1f}x)")
+
+    settings.set_parallelism_enabled(True)
+    with multiprocessing.Pool() as pool:
+        start = time.perf_counter()
+        cs.xcorr_pairs(pair_sigs, sample_rate_hz, pool)
+        pool_s = time.perf_counter() - start
+    settings.set_parallelism_enabled(False)
+    print(
+        f"{len(pair_sigs)}x{len(pair_sigs)} pairs, xcorr_pairs with {multiprocessing.cpu_count()} processes: "
+        f"{pool_s:8.2f}s ({loop_s / pool_s:.1f}x)"
+    )
+
+
+if __name__ == "__main__":
+    main(*(arg_type(arg) for arg_type, arg in zip((int, float, float, int), sys.argv[1:])))
@@ -0,0 +1,45 @@
+"""
+Benchmark the download throughput of redvox.cloud.data_client against a local HTTP stand-in for S3.
+
+The stand-in serves thousands of small .rdvxm files with a fixed latency per request.
+
+Usage: python -m benchmarks.bench_download [num_files] [latency_ms]
+"""
+import sys
+import tempfile
+import time
+
+import lz4.frame
+
+import redvox.cloud.data_client as data_client
+from redvox.tests.cloud.http_stand_in import HttpStandIn
+
+from benchmarks import synthetic
+
+
+def main(num_files: int = 2000, latency_ms: float = 20.0):
+    config = synthetic.SyntheticStationConfig("1000000001", num_packets=1)
+    content = lz4.frame.compress(synthetic.synthetic_packet(config, 0).SerializeToString())
+    paths = [
+        f"/rdvxdata/2021/01/01/00/{1_000_000_000 + i}_1609459200000000.rdvxm?X-Amz-Algorithm=AWS4-HMAC-SHA256"
+        for i in range(num_files)
+    ]
+    print(f"{num_files} files of {len(content)} bytes, {latency_ms}ms latency per request")
+    with HttpStandIn(latency_s=latency_ms / 1000.0) as server:
+        for path in paths:
+            server.files[path] = content
+        urls = [server.url(path) for path in paths]
+        for workers in (1, 4, 16, 64):
+            with tempfile.TemporaryDirectory() as out_dir:
+                start = time.perf_counter()
+                results = data_client.download_files(urls, out_dir, 0, workers, max_connections_per_host=workers)
+                elapsed = time.perf_counter() - start
+            total_bytes = sum(r.resp_len for r in results)
+            print(
+                f"{workers:3} workers: {elapsed:7.3f}s {num_files / elapsed:8.1f} files/s "
+                f"{total_bytes / elapsed / 1e6:7.2f} MB/s"
+            )
+
+
+if __name__ == "__main__":
+    main(*(arg_type(arg) for arg_type, arg in zip((int, float), sys.argv[1:])))
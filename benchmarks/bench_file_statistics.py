@@ -0,0 +1,75 @@
+"""
+Benchmark extracting StationStat information from a synthetic unstructured directory of API M files.
+
+Compares the list of StationStat objects built from wrapped packets with the table filled straight from the
+protobufs, serially, with a process pool over index shards, and from a parquet cache.  The packets are 51.2 s of 80 Hz
+audio with 1 Hz location and 5 synch exchanges, about 17 kB each.
+
+Usage: python -m benchmarks.bench_file_statistics [num_stations] [packets_per_station]
+"""
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+import redvox.settings as settings
+from redvox.common import file_statistics as fs
+from redvox.common.io import index_unstructured
+
+from benchmarks import synthetic
+
+
+def _report(name: str, num_files: int, elapsed: float):
+    print(f"{name:>36}: {elapsed:8.2f}s {num_files / elapsed:9.0f} files/s")
+
+
+def main(num_stations: int = 1000, packets_per_station: int = 100):
+    num_files: int = num_stations * packets_per_station
+    configs = synthetic.fleet_configs(
+        num_stations,
+        num_packets=packets_per_station,
+        audio_sample_rate_hz=80.0,
+        packet_duration_s=51.2,
+        pressure_sample_rate_hz=0.0,
+        health_sample_rate_hz=0.0,
+    )
+    with tempfile.TemporaryDirectory() as base_dir:
+        synthetic.write_fleet(configs, base_dir, structured=False)
+        start = time.perf_counter()
+        index = index_unstructured(base_dir)
+        print(f"{num_stations} stations x {packets_per_station} packets, indexed in {time.perf_counter() - start:.2f}s")
+
+        settings.set_parallelism_enabled(False)
+        start = time.perf_counter()
+        fs.extract_stats_serial(index)
+        _report("extract_stats_serial", num_files, time.perf_counter() - start)
+
+        start = time.perf_counter()
+        table = fs.extract_stats_table(index)
+        _report("extract_stats_table (serial)", num_files, time.perf_counter() - start)
+
+        settings.set_parallelism_enabled(True)
+        with multiprocessing.Pool() as pool:
+            start = time.perf_counter()
+            fs.extract_stats_table(index, pool)
+            _report(f"extract_stats_table ({multiprocessing.cpu_count()} processes)", num_files,
+                    time.perf_counter() - start)
+        settings.set_parallelism_enabled(False)
+
+        cache_path = os.path.join(base_dir, "stats.parquet")
+        start = time.perf_counter()
+        fs.extract_stats_table(index, cache_path=cache_path)
+        _report("extract_stats_table (write cache)", num_files, time.perf_counter() - start)
+        start = time.perf_counter()
+        fs.extract_stats_table(index, cache_path=cache_path)
+        _report("extract_stats_table (cached)", num_files, time.perf_counter() - start)
+        print(f"cache size: {os.path.getsize(cache_path) / 1e6:.1f} MB, table size: {table.nbytes / 1e6:.1f} MB")
+
+        start = time.perf_counter()
+        fs.stats_from_table(table)
+        _report("stats_from_table", num_files, time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
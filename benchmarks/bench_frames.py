@@ -0,0 +1,122 @@
+"""
+Benchmark iterating over the sensors of a long multi-station window in frames against loading whole sensor tables.
+
+Synthetic stations with audio, barometer and accelerometer sensors are saved to disk, then read in a fresh worker
+process either frame by frame with redvox.common.frames.iter_frames or one whole table at a time with pyarrow_table().
+Each reports its wall time and the largest resident memory the worker reached above its memory before reading.
+The default problem is 24 hours of 20 stations with 800 Hz audio, about 40 GB of data before compression.
+
+Usage: python -m benchmarks.bench_frames [--hours H] [--stations N] [--frame-s S] [--audio-hz R]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from typing import List, Tuple
+
+import numpy as np
+import pyarrow as pa
+
+from redvox.common.frames import iter_frames
+from redvox.common.sensor_data import SensorData, SensorType
+from redvox.common.station import Station
+
+from benchmarks.measure import peak_bytes_since, rss_bytes, run_in_fresh_process
+
+
+def _sensor(
+    sensor_type: SensorType, channels: List[str], hours: float, sample_rate_hz: float, base_dir: str, seed: int
+) -> SensorData:
+    """
+    :return: a sensor of hours of evenly sampled random data saved to base_dir
+    """
+    rng = np.random.default_rng(seed)
+    num_samples = int(hours * 3600 * sample_rate_hz)
+    timestamps = 1.6e15 + np.arange(num_samples) * (1e6 / sample_rate_hz)
+    table = pa.Table.from_pydict(
+        {
+            "timestamps": timestamps,
+            "unaltered_timestamps": timestamps,
+            **{c: rng.standard_normal(num_samples).astype(np.float32).astype(np.float64) for c in channels},
+        }
+    )
+    return SensorData(
+        sensor_type.name.lower(),
+        table,
+        sensor_type,
+        sample_rate_hz,
+        1 / sample_rate_hz,
+        0.0,
+        True,
+        save_data=True,
+        base_dir=os.path.join(base_dir, sensor_type.name),
+    )
+
+
+def _stations(num_stations: int, hours: float, audio_hz: float, base_dir: str) -> List[Station]:
+    stations = []
+    for i in range(num_stations):
+        station_dir = os.path.join(base_dir, f"{i:010d}")
+        station = Station(f"{i:010d}", start_timestamp=1.6e15, base_dir=station_dir, save_data=True)
+        station.append_sensor(_sensor(SensorType.AUDIO, ["microphone"], hours, audio_hz, station_dir, i))
+        station.append_sensor(_sensor(SensorType.PRESSURE, ["pressure"], hours, 30.0, station_dir, i))
+        station.append_sensor(
+            _sensor(SensorType.ACCELEROMETER, [f"accelerometer_{a}" for a in "xyz"], hours, 100.0, station_dir, i)
+        )
+        station.update_first_and_last_data_timestamps()
+        stations.append(station)
+    return stations
+
+
+def _read_frames(stations: List[Station], frame_s: float) -> Tuple[float, int, int]:
+    """
+    :return: seconds, bytes of resident memory used and number of rows read by iterating over every frame
+    """
+    baseline = rss_bytes()
+    start = time.perf_counter()
+    rows = 0
+    for frame in iter_frames(stations, frame_s):
+        rows += sum(t.num_rows for sensors in frame.data.values() for t in sensors.values())
+    return time.perf_counter() - start, peak_bytes_since(baseline), rows
+
+
+def _read_tables(stations: List[Station], frame_s: float) -> Tuple[float, int, int]:
+    """
+    :return: seconds, bytes of resident memory used and number of rows read by loading each whole table
+    """
+    baseline = rss_bytes()
+    start = time.perf_counter()
+    rows = 0
+    for station in stations:
+        for sensor in station.data():
+            rows += sensor.pyarrow_table().num_rows
+    return time.perf_counter() - start, peak_bytes_since(baseline), rows
+
+
+def _measure(fn, stations: List[Station], frame_s: float) -> Tuple[float, int, int]:
+    """
+    :return: the result of fn, run in a fresh worker process
+    """
+    return run_in_fresh_process(fn, stations, frame_s)
+
+
+def main(argv: List[str]):
+    parser = argparse.ArgumentParser("bench_frames", description="Compare frame iteration to loading whole tables")
+    parser.add_argument("--hours", type=float, default=24.0, help="Hours of data per station, default 24")
+    parser.add_argument("--stations", type=int, default=20, help="Number of stations, default 20")
+    parser.add_argument("--frame-s", type=float, default=10.0, help="Duration of each frame in seconds, default 10")
+    parser.add_argument("--audio-hz", type=float, default=800.0, help="Audio sample rate, default 800")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        start = time.perf_counter()
+        stations = _stations(args.stations, args.hours, args.audio_hz, tmp_dir)
+        print(f"{args.stations} stations of {args.hours} hours written in {time.perf_counter() - start:.1f}s")
+        for name, fn in (("frames", _read_frames), ("whole tables", _read_tables)):
+            seconds, used_bytes, rows = _measure(fn, stations, args.frame_s)
+            print(f"{name:>12}: {seconds:8.1f}s  {used_bytes / 1e6:9.1f} MB peak memory  {rows} rows")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,62 @@
+"""
+Benchmark the memory and parquet size of audio with explicit timestamps against implicit timing.
+
+The audio is hours of 48 kHz samples in 4096 sample packets with a few gaps.  Each representation reports the bytes of
+its in-memory table, the size of its parquet file and the time to create the timestamps when they are requested.
+
+Usage: python -m benchmarks.bench_implicit_timing [hours] [sample_rate_hz]
+"""
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from redvox.common import gap_and_pad_utils as gpu
+from redvox.common.sensor_data import SensorData, SensorType
+
+
+def _audio_table(num_packets: int, sample_rate_hz: float, samples_per_packet: int = 4096) -> pa.Table:
+    rng = np.random.default_rng(0)
+    interval = 1e6 / sample_rate_hz
+    packets = [
+        (
+            1.6e15 + i * samples_per_packet * interval,
+            pa.Table.from_pydict({"microphone": rng.standard_normal(samples_per_packet)}),
+        )
+        for i in range(num_packets)
+        if i % 1000 != 999
+    ]
+    return gpu.fill_audio_gaps(packets, interval).create_timestamps()
+
+
+def _measure(sensor: SensorData, name: str, tmp_dir: str):
+    stored = sensor._stored_table()
+    path = os.path.join(tmp_dir, f"{name}.parquet")
+    pq.write_table(stored, path)
+    start = time.perf_counter()
+    sensor.data_timestamps()
+    timestamps_s = time.perf_counter() - start
+    print(
+        f"{name:>9}: {stored.nbytes / 1e6:9.1f} MB in memory  {os.path.getsize(path) / 1e6:9.1f} MB parquet  "
+        f"{timestamps_s:7.3f}s to get timestamps"
+    )
+
+
+def main(hours: float = 1.0, sample_rate_hz: float = 48000.0):
+    table = _audio_table(int(hours * 3600 * sample_rate_hz / 4096), sample_rate_hz)
+    print(f"{table.num_rows} samples")
+    sensor = SensorData("audio", table, SensorType.AUDIO, sample_rate_hz, 1 / sample_rate_hz, 0.0, True)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        _measure(sensor, "explicit", tmp_dir)
+        start = time.perf_counter()
+        sensor.set_implicit_timing(True)
+        print(f"converted in {time.perf_counter() - start:.3f}s, {len(sensor.timing_segments().starts)} runs")
+        _measure(sensor, "implicit", tmp_dir)
+
+
+if __name__ == "__main__":
+    main(*[float(a) for a in sys.argv[1:3]])
@@ -0,0 +1,91 @@
+"""
+Benchmark the array based location analysis of redvox.api900.location_analyzer over a synthetic fleet of stations.
+
+Every station reports gps points scattered around a surveyed point, and a few of those points are blacklisted.  The
+fleet is validated against the blacklist one station at a time and all at once, then compared with the survey.
+
+Usage: python -m benchmarks.bench_location_analyzer [num_stations] [points_per_station]
+"""
+import sys
+import time
+from typing import List
+
+import numpy as np
+
+import redvox.api900.location_analyzer as la
+
+SURVEY = {"lat": 19.72833, "lon": -156.0592, "alt": 11.9, "bar": 101.61, "sea_bar": 101.92}
+BLACKLIST = [{"lat": 19.735, "lon": -156.035, "alt": 26}, {"lat": 19.7284, "lon": -156.0590, "alt": 15}]
+POLYGON = [
+    {"lat": 19.727, "lon": -156.061},
+    {"lat": 19.727, "lon": -156.057},
+    {"lat": 19.730, "lon": -156.057},
+    {"lat": 19.7285, "lon": -156.059},
+    {"lat": 19.730, "lon": -156.061},
+    {"lat": 19.727, "lon": -156.061},
+]
+
+
+def _fleet(num_stations: int, points_per_station: int, seed: int = 0) -> List[la.GPSDataHolder]:
+    rng = np.random.default_rng(seed)
+    fleet: List[la.GPSDataHolder] = []
+    for i in range(num_stations):
+        gps_data = [
+            SURVEY["lat"] + rng.normal(0, 0.001, points_per_station),
+            SURVEY["lon"] + rng.normal(0, 0.001, points_per_station),
+            SURVEY["alt"] + rng.normal(0, 20, points_per_station),
+            np.abs(rng.normal(10, 5, points_per_station)),
+        ]
+        gps_dh = la.GPSDataHolder(f"{1_000_000_000 + i}", "iOS" if i % 2 else "Android", gps_data, 80.0)
+        gps_dh.set_barometer(101.6 + rng.normal(0, 0.05, points_per_station))
+        fleet.append(gps_dh)
+    return fleet
+
+
+def _report(name: str, num_points: int, elapsed: float):
+    print(f"{name:>30}: {elapsed:8.4f}s {num_points / elapsed:12.0f} points/s")
+
+
+def main(num_stations: int = 1000, points_per_station: int = 500):
+    num_points: int = num_stations * points_per_station
+    analyzer = la.LocationAnalyzer(None, SURVEY, BLACKLIST)
+    analyzer.all_gps_data = _fleet(num_stations, points_per_station)
+    print(f"{num_stations} stations x {points_per_station} points")
+
+    start = time.perf_counter()
+    looped = [la.validate(gps_dh, validation_points=BLACKLIST) for gps_dh in analyzer.all_gps_data]
+    _report("validate per station", num_points, time.perf_counter() - start)
+
+    start = time.perf_counter()
+    analyzer.validate_all()
+    _report("validate_all", num_points, time.perf_counter() - start)
+    same_sizes: bool = [v.get_size() for v in looped if v.get_size()[0]] == [
+        v.get_size() for v in analyzer.valid_gps_data
+    ]
+    print(f"{'same valid points':>30}: {same_sizes}")
+
+    start = time.perf_counter()
+    analyzer.compare_with_real_location()
+    _report("compare_with_real_location", num_points, time.perf_counter() - start)
+
+    start = time.perf_counter()
+    analyzer.get_barometric_heights(SURVEY["sea_bar"])
+    _report("get_barometric_heights", num_stations, time.perf_counter() - start)
+
+    gps_array = np.concatenate([gps_dh.get_gps_array() for gps_dh in analyzer.all_gps_data], axis=1)
+    num_looped: int = min(num_points, 10_000)
+    start = time.perf_counter()
+    looped_inside = [
+        la.validate_point_in_polygon({"lat": lat, "lon": lon}, POLYGON)
+        for lat, lon in zip(gps_array[0, :num_looped], gps_array[1, :num_looped])
+    ]
+    _report(f"{num_looped} validate_point_in_polygon", num_looped, time.perf_counter() - start)
+
+    start = time.perf_counter()
+    inside = la.validate_points_in_polygon(gps_array[0], gps_array[1], POLYGON)
+    _report("validate_points_in_polygon", num_points, time.perf_counter() - start)
+    print(f"{'same points inside':>30}: {inside[:num_looped].tolist() == looped_inside}")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,102 @@
+"""
+Check the memory model of redvox.common.memory_planner against the memory actually used to read synthetic stations.
+
+Every station of each scenario is planned with the given budget, then every chunk of files the plan makes is read in a
+fresh worker process.  The worker reports the largest resident memory it reached above its resident memory before
+reading, which is printed next to the planner's estimate for the chunk.
+
+Usage: python -m benchmarks.bench_memory_planner [--scenario NAME ...] [--budget-mb MB]
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+from typing import Dict, List, Tuple
+
+from redvox.common import io
+from redvox.common.memory_planner import plan_workload
+from redvox.common.station import Station
+
+from benchmarks import synthetic
+from benchmarks.measure import peak_bytes_since, rss_bytes, run_in_fresh_process
+from benchmarks.bench_pipeline import SCENARIOS
+
+
+def _read_chunk(index: io.Index) -> int:
+    """
+    :param index: files of a single station to read
+    :return: bytes of resident memory used to read the files and load them into a Station
+    """
+    # the SDK imports these when it first needs them; their memory isn't part of the estimate
+    import pandas  # noqa: F401
+    import pyarrow.dataset  # noqa: F401
+    import pyarrow.parquet  # noqa: F401
+    import scipy.optimize  # noqa: F401
+
+    baseline = rss_bytes()
+    Station.create_from_indexes([index])
+    return peak_bytes_since(baseline)
+
+
+def _measure(index: io.Index) -> int:
+    """
+    :param index: files of a single station to read
+    :return: bytes of resident memory used to read the files, measured in a fresh worker process
+    """
+    return run_in_fresh_process(_read_chunk, index)
+
+
+def run_scenario(name: str, budget_bytes: float) -> List[Tuple[str, int, float, int]]:
+    """
+    :param name: name of the scenario in bench_pipeline.SCENARIOS
+    :param budget_bytes: memory budget of the plan
+    :return: station id, number of files, estimated bytes and measured bytes of every chunk
+    """
+    scenario = SCENARIOS[name]
+    rows = []
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        configs = synthetic.fleet_configs(scenario.num_stations, **scenario.station_kwargs)
+        synthetic.write_fleet(configs, tmp_dir, scenario.structured)
+        index = io.index_structured(tmp_dir) if scenario.structured else io.index_unstructured(tmp_dir)
+        indexes = [index.get_index_for_station_id(s) for s in sorted(index.summarize().station_ids())]
+        plan = plan_workload(indexes, budget_bytes, multiprocessing.cpu_count())
+        print(
+            f"{name}: {plan.num_workers} workers, {plan.chunk_limit_bytes / 1e6:.1f} MB per worker, "
+            f"estimated peak {plan.estimated_peak_bytes() / 1e6:.1f} MB"
+        )
+        for station_index in indexes:
+            for chunk in plan.split_index(station_index):
+                rows.append(
+                    (
+                        chunk.entries[0].station_id,
+                        len(chunk.entries),
+                        plan.estimate_index_bytes(chunk),
+                        _measure(chunk),
+                    )
+                )
+        os.chdir(cwd)
+    return rows
+
+
+def main(argv: List[str]):
+    parser = argparse.ArgumentParser("bench_memory_planner", description="Compare estimated and measured memory use")
+    parser.add_argument("--scenario", nargs="+", choices=sorted(SCENARIOS), help="Scenarios to run, default all")
+    parser.add_argument("--budget-mb", type=float, default=512.0, help="Memory budget of the plan, default 512")
+    args = parser.parse_args(argv)
+
+    results: Dict[str, List[Tuple[str, int, float, int]]] = {
+        name: run_scenario(name, args.budget_mb * 1e6) for name in args.scenario or SCENARIOS
+    }
+    for name, rows in results.items():
+        print(name)
+        for station_id, num_files, estimated, measured in rows:
+            print(
+                f"{station_id:>12}: {num_files:4d} files  estimated {estimated / 1e6:8.1f} MB  "
+                f"measured {measured / 1e6:8.1f} MB  ({measured / max(estimated, 1):5.2f}x)"
+            )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,64 @@
+"""
+Benchmark reading the metadata view of API M packets against fully parsing them.
+
+For 800 Hz and 48 kHz audio packets with a 30 Hz barometer, a 100 Hz accelerometer, 1 Hz location and station health,
+times decompressing and parsing the whole packet, decompressing and skimming only, and decompressing, skimming and
+parsing the metadata view.
+
+Usage: python -m benchmarks.bench_packet_metadata [num_reads]
+"""
+import sys
+import time
+
+import lz4.frame
+
+import redvox.api1000.common.packet_metadata as pm
+import redvox.api1000.proto.redvox_api_m_pb2 as api_m
+
+from benchmarks import synthetic
+
+
+def _read_full(data: bytes) -> api_m.RedvoxPacketM:
+    proto = api_m.RedvoxPacketM()
+    proto.ParseFromString(lz4.frame.decompress(data))
+    return proto
+
+
+def _time(fn, data: bytes, num_reads: int) -> float:
+    """
+    :return: mean time of fn(data) in milliseconds
+    """
+    start = time.perf_counter()
+    for _ in range(num_reads):
+        fn(data)
+    return (time.perf_counter() - start) * 1000.0 / num_reads
+
+
+def main(num_reads: int = 200):
+    # 2^15 audio samples per 800 Hz packet and 2^18 per 48 kHz packet
+    for sample_rate_hz, num_samples in ((800.0, 2**15), (48000.0, 2**18)):
+        config = synthetic.SyntheticStationConfig(
+            "1000000001",
+            audio_sample_rate_hz=sample_rate_hz,
+            packet_duration_s=num_samples / sample_rate_hz,
+            accelerometer_sample_rate_hz=100.0,
+        )
+        packet = synthetic.synthetic_packet(config, 0)
+        data: bytes = lz4.frame.compress(packet.SerializeToString())
+        metadata_size: int = len(pm.skim_packet_bytes(lz4.frame.decompress(data)))
+        print(
+            f"{sample_rate_hz:.0f} Hz, {config.packet_duration_s:.2f} s: {len(data) / 1e3:.0f} kB compressed, "
+            f"{packet.ByteSize() / 1e3:.0f} kB serialized, {metadata_size / 1e3:.1f} kB metadata view"
+        )
+        full = _time(_read_full, data, num_reads)
+        skim = _time(lambda d: pm.skim_packet_bytes(lz4.frame.decompress(d)), data, num_reads)
+        view = _time(pm.read_metadata_compressed, data, num_reads)
+        decompress = _time(lz4.frame.decompress, data, num_reads)
+        print(f"{'decompress only':>24}: {decompress:8.3f} ms")
+        print(f"{'full parse':>24}: {full:8.3f} ms")
+        print(f"{'skim':>24}: {skim:8.3f} ms")
+        print(f"{'metadata view':>24}: {view:8.3f} ms ({full / view:.1f}x)")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,295 @@
+"""
+Benchmark the full ingest pipeline on reproducible synthetic data.
+
+Each scenario writes a fleet of synthetic stations to a temporary directory, then runs every stage of the pipeline on
+it: indexing, SessionModel creation, ApiReader, Station loading, DataWindow creation and DataWindow
+serialization and deserialization.  Every stage reports its wall time, the peak resident memory of the process and its
+children while the stage ran, and the bytes the process read while the stage ran.
+
+Results are printed and can be written as JSON, which can be compared against the results of another commit:
+
+    python -m benchmarks.bench_pipeline --output before.json
+    (check out another commit)
+    python -m benchmarks.bench_pipeline --output after.json
+    python -m benchmarks.bench_pipeline --compare before.json after.json
+
+Usage: python -m benchmarks.bench_pipeline [--scenario NAME ...] [--output PATH] [--parallel] [--compare OLD NEW]
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, field, asdict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import psutil
+
+import redvox
+import redvox.settings as settings
+from redvox.common import io, data_window_io as dw_io
+from redvox.common.api_reader import ApiReader
+from redvox.common.data_window import DataWindow, DataWindowConfig
+from redvox.common.session_model import SessionModel
+from redvox.common.station import Station
+
+from benchmarks import synthetic
+
+
+@dataclass
+class Scenario:
+    """
+    A fleet of synthetic stations to run the pipeline on
+
+    Properties:
+        num_stations: int, number of stations in the fleet
+
+        structured: bool, if True, write the data using the api1000 structured directory layout
+
+        station_kwargs: dict, SyntheticStationConfig parameters shared by all stations
+    """
+
+    num_stations: int
+    structured: bool = True
+    station_kwargs: Dict[str, Any] = field(default_factory=dict)
+
+
+SCENARIOS: Dict[str, Scenario] = {
+    "baseline": Scenario(4, station_kwargs={"num_packets": 10}),
+    "unstructured": Scenario(4, False, {"num_packets": 10}),
+    "many_stations": Scenario(32, station_kwargs={"num_packets": 5}),
+    "long_duration": Scenario(2, station_kwargs={"num_packets": 60}),
+    "high_rate": Scenario(
+        2, station_kwargs={"num_packets": 10, "audio_sample_rate_hz": 48000.0, "packet_duration_s": 2**18 / 48000.0}
+    ),
+    "all_sensors": Scenario(
+        4,
+        station_kwargs={
+            "num_packets": 10,
+            "accelerometer_sample_rate_hz": 100.0,
+            "gyroscope_sample_rate_hz": 100.0,
+            "magnetometer_sample_rate_hz": 50.0,
+            "ml_windows_per_packet": 40,
+        },
+    ),
+    "gaps": Scenario(4, station_kwargs={"num_packets": 20, "missing_packets": (3, 4, 11, 17)}),
+}
+
+
+@dataclass
+class StageResult:
+    """
+    Measurements of a single pipeline stage
+
+    Properties:
+        wall_s: float, wall time of the stage in seconds
+
+        peak_rss_mb: float, peak resident memory of the process and its children during the stage, in megabytes
+
+        read_mb: optional float, megabytes read by the process during the stage, None if the platform can't tell
+    """
+
+    wall_s: float
+    peak_rss_mb: float
+    read_mb: Optional[float]
+
+
+class _PeakRss:
+    """
+    samples the resident memory of this process and its children in a background thread
+    """
+
+    def __init__(self, interval_s: float = 0.005):
+        self._interval_s = interval_s
+        self._process = psutil.Process()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self.peak: int = 0
+
+    def _sample(self):
+        rss = self._process.memory_info().rss
+        for child in self._process.children(recursive=True):
+            try:
+                rss += child.memory_info().rss
+            except psutil.Error:
+                pass
+        self.peak = max(self.peak, rss)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._sample()
+            self._stop.wait(self._interval_s)
+
+    def __enter__(self) -> "_PeakRss":
+        self._sample()
+        self._thread.start()
+        return self
+
+    def __exit__(self, *args):
+        self._stop.set()
+        self._thread.join()
+        self._sample()
+
+
+def _bytes_read() -> Optional[int]:
+    """
+    :return: bytes read by this process so far, or None if the platform doesn't report it
+    """
+    try:
+        counters = psutil.Process().io_counters()
+    except (AttributeError, psutil.Error):
+        return None
+    return getattr(counters, "read_chars", counters.read_bytes)
+
+
+def _run_stage(fn: Callable[[], Any]) -> Tuple[Any, StageResult]:
+    """
+    :param fn: the stage to run
+    :return: the result of fn and the measurements of the stage
+    """
+    read_start = _bytes_read()
+    with _PeakRss() as rss:
+        start = time.perf_counter()
+        result = fn()
+        wall_s = time.perf_counter() - start
+    read_end = _bytes_read()
+    read_mb = None if read_start is None or read_end is None else (read_end - read_start) / 1e6
+    return result, StageResult(wall_s, rss.peak / 1e6, read_mb)
+
+
+def _dir_size(base_dir: str) -> int:
+    """
+    :param base_dir: directory to measure
+    :return: total size of the files in base_dir and its subdirectories in bytes
+    """
+    return sum(os.path.getsize(os.path.join(d, f)) for d, _, files in os.walk(base_dir) for f in files)
+
+
+def run_scenario(scenario: Scenario) -> Dict[str, Any]:
+    """
+    :param scenario: the fleet to run the pipeline on
+    :return: the size of the data and the measurements of every stage, as a dictionary
+    """
+    stages: Dict[str, StageResult] = {}
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        data_dir = os.path.join(tmp_dir, "data")
+        out_dir = os.path.join(tmp_dir, "out")
+        configs = synthetic.fleet_configs(scenario.num_stations, **scenario.station_kwargs)
+        files, stages["write"] = _run_stage(lambda: synthetic.write_fleet(configs, data_dir, scenario.structured))
+        index_fn = io.index_structured if scenario.structured else io.index_unstructured
+        _, stages["index"] = _run_stage(lambda: index_fn(data_dir))
+        _, stages["session_model"] = _run_stage(
+            lambda: SessionModel.create_all_from_dir(data_dir, structured_dir=scenario.structured)
+        )
+        reader, stages["api_reader"] = _run_stage(lambda: ApiReader(data_dir, scenario.structured))
+        _, stages["station"] = _run_stage(lambda: [Station.create_from_indexes([i]) for i in reader.files_index])
+        try:
+            data_window, stages["data_window"] = _run_stage(
+                lambda: DataWindow(config=DataWindowConfig(data_dir, scenario.structured), output_dir=out_dir)
+            )
+            path, stages["serialize"] = _run_stage(
+                lambda: dw_io.serialize_data_window(data_window, out_dir, "bench.pkl.lz4")
+            )
+            _, stages["deserialize"] = _run_stage(lambda: dw_io.deserialize_data_window(str(path)))
+        finally:
+            # the DataWindow changes the working directory to its output directory
+            os.chdir(cwd)
+        return {
+            "scenario": asdict(scenario),
+            "num_files": len(files),
+            "data_mb": _dir_size(data_dir) / 1e6,
+            "stages": {name: asdict(result) for name, result in stages.items()},
+        }
+
+
+def _git_commit() -> Optional[str]:
+    """
+    :return: the commit of the working tree or None if it isn't a git repository
+    """
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, check=True, text=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_results(results: Dict[str, Any]):
+    """
+    print the measurements of every scenario
+
+    :param results: results of run_scenario keyed by scenario name
+    """
+    for name, result in results.items():
+        print(f"{name}: {result['num_files']} files, {result['data_mb']:.1f} MB")
+        for stage, measured in result["stages"].items():
+            read = "n/a" if measured["read_mb"] is None else f"{measured['read_mb']:.1f} MB"
+            print(
+                f"{stage:>16}: {measured['wall_s']:8.3f} s {measured['peak_rss_mb']:8.1f} MB peak rss  {read} read"
+            )
+
+
+def compare(old_path: str, new_path: str):
+    """
+    print the ratio new / old of the wall time and peak memory of every stage in both results files
+
+    :param old_path: results written by an earlier run
+    :param new_path: results written by a later run
+    """
+    with open(old_path) as old_file, open(new_path) as new_file:
+        old, new = json.load(old_file), json.load(new_file)
+    print(f"{old.get('commit')} -> {new.get('commit')}")
+    for name, result in new["scenarios"].items():
+        if name not in old["scenarios"]:
+            continue
+        print(name)
+        old_stages = old["scenarios"][name]["stages"]
+        for stage, measured in result["stages"].items():
+            if stage not in old_stages:
+                continue
+            was = old_stages[stage]
+            print(
+                f"{stage:>16}: wall {was['wall_s']:8.3f} -> {measured['wall_s']:8.3f} s "
+                f"({measured['wall_s'] / max(was['wall_s'], 1e-9):5.2f}x)  "
+                f"rss {was['peak_rss_mb']:8.1f} -> {measured['peak_rss_mb']:8.1f} MB"
+            )
+
+
+def main(argv: List[str]):
+    parser = argparse.ArgumentParser("bench_pipeline", description="Benchmark the ingest pipeline on synthetic data")
+    parser.add_argument("--scenario", nargs="+", choices=sorted(SCENARIOS), help="Scenarios to run, default all")
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    parser.add_argument("--parallel", action="store_true", help="Enable parallelism in the SDK")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="Compare two JSON results files")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    settings.set_parallelism_enabled(args.parallel)
+    results = {name: run_scenario(SCENARIOS[name]) for name in args.scenario or SCENARIOS}
+    print_results(results)
+    if args.output:
+        with open(args.output, "w") as out_file:
+            json.dump(
+                {
+                    "commit": _git_commit(),
+                    "redvox_version": redvox.VERSION,
+                    "python": platform.python_version(),
+                    "platform": platform.platform(),
+                    "parallel": args.parallel,
+                    "scenarios": results,
+                },
+                out_file,
+                indent=2,
+            )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
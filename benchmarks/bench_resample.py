@@ -0,0 +1,111 @@
+"""
+Benchmark resampling a long audio sensor saved to disk with SensorData.resample against scipy.signal.resample.
+
+A sensor of random 48 kHz audio is written to disk one hour at a time.  SensorData.resample decimates it with a
+polyphase filter one chunk at a time, into memory and to disk.  The naive approach reads the whole microphone channel
+and resamples it with the FFT of scipy.signal.resample.  Each run is done in a fresh process and reports its wall time
+and the largest resident memory it reached; a run that fails, such as by running out of memory, is reported as failed.
+The default problem is one day of audio, 4.1 billion samples; the naive approach needs several times its 33 GB.
+
+Usage: python -m benchmarks.bench_resample [--hours H] [--audio-hz R] [--new-hz R] [--skip-naive]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from typing import Iterator, List, Optional, Tuple
+
+import numpy as np
+import pyarrow as pa
+
+from redvox.common.io import write_parquet_tables
+from redvox.common.sensor_data import SensorData, SensorType
+
+from benchmarks.measure import peak_bytes_since, rss_bytes, run_in_fresh_process
+
+
+def _hours_of_audio(hours: float, audio_hz: float) -> Iterator[pa.Table]:
+    rng = np.random.default_rng(0)
+    samples_per_hour = int(3600 * audio_hz)
+    num_samples = int(hours * 3600 * audio_hz)
+    for start in range(0, num_samples, samples_per_hour):
+        timestamps = 1.6e15 + np.arange(start, min(start + samples_per_hour, num_samples)) * (1e6 / audio_hz)
+        yield pa.Table.from_pydict(
+            {
+                "timestamps": timestamps,
+                "unaltered_timestamps": timestamps,
+                "microphone": rng.standard_normal(timestamps.size),
+            }
+        )
+
+
+def _audio_sensor(hours: float, audio_hz: float, base_dir: str) -> SensorData:
+    """
+    :return: a sensor of hours of audio saved to base_dir, written without holding all of it in memory
+    """
+    sensor = SensorData(
+        "audio", None, SensorType.AUDIO, audio_hz, 1 / audio_hz, 0.0, True, save_data=True, base_dir=base_dir
+    )
+    sensor.set_file_name("AUDIO_1600000000000000")
+    sensor.fs_writer().create_dir()
+    write_parquet_tables(_hours_of_audio(hours, audio_hz), sensor.full_path(), sensor.fs_writer().write_profile)
+    return sensor
+
+
+def _chunked(sensor: SensorData, new_hz: float, out_dir: Optional[str]) -> Tuple[float, int, int]:
+    """
+    :return: seconds, bytes of resident memory used and number of samples made by SensorData.resample
+    """
+    baseline = rss_bytes()
+    start = time.perf_counter()
+    result = sensor.resample(new_hz, out_dir)
+    return time.perf_counter() - start, peak_bytes_since(baseline), result.num_samples()
+
+
+def _naive(sensor: SensorData, new_hz: float, out_dir: Optional[str]) -> Tuple[float, int, int]:
+    """
+    :return: seconds, bytes of resident memory used and number of samples made by scipy.signal.resample
+    """
+    from scipy import signal
+
+    baseline = rss_bytes()
+    start = time.perf_counter()
+    microphone = sensor.get_data_channel("microphone")
+    result = signal.resample(microphone, int(np.ceil(microphone.size * new_hz / sensor.sample_rate_hz())))
+    return time.perf_counter() - start, peak_bytes_since(baseline), result.size
+
+
+def _measure(fn, sensor: SensorData, new_hz: float, out_dir: Optional[str]) -> Optional[Tuple[float, int, int]]:
+    """
+    :return: the result of fn, run in a fresh process, or None if the process failed
+    """
+    return run_in_fresh_process(fn, sensor, new_hz, out_dir)
+
+
+def main(argv: List[str]):
+    parser = argparse.ArgumentParser("bench_resample", description="Compare chunked resampling to scipy resample")
+    parser.add_argument("--hours", type=float, default=24.0, help="Hours of audio, default 24")
+    parser.add_argument("--audio-hz", type=float, default=48000.0, help="Audio sample rate, default 48000")
+    parser.add_argument("--new-hz", type=float, default=800.0, help="Sample rate to resample to, default 800")
+    parser.add_argument("--skip-naive", action="store_true", help="Don't run scipy.signal.resample")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        start = time.perf_counter()
+        sensor = _audio_sensor(args.hours, args.audio_hz, os.path.join(tmp_dir, "audio"))
+        print(f"{args.hours} hours of {args.audio_hz} Hz audio written in {time.perf_counter() - start:.1f}s")
+        runs = [("chunked", _chunked, None), ("chunked disk", _chunked, os.path.join(tmp_dir, "resampled"))]
+        if not args.skip_naive:
+            runs.append(("scipy", _naive, None))
+        for name, fn, out_dir in runs:
+            result = _measure(fn, sensor, args.new_hz, out_dir)
+            if result is None:
+                print(f"{name:>12}: failed")
+            else:
+                seconds, used_bytes, samples = result
+                print(f"{name:>12}: {seconds:8.1f}s  {used_bytes / 1e6:9.1f} MB peak memory  {samples} samples")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,63 @@
+"""
+Benchmark reading the samples of a 3-axis sensor through pandas against SensorData.samples().
+
+The sensor holds hours of 800 Hz accelerometer data.  The full size problem (24 hours) needs about 3 GB for the table
+and as much again for the samples.  Each method is timed on its first call and on repeated calls, as done by analysis
+loops that read the samples of every window.
+
+Usage: python -m benchmarks.bench_sensor_samples [hours] [sample_rate_hz] [repeats]
+"""
+import sys
+import time
+
+import numpy as np
+import pyarrow as pa
+
+from redvox.common.sensor_data import SensorData, SensorType
+
+
+def _sensor(num_samples: int, sample_rate_hz: float) -> SensorData:
+    rng = np.random.default_rng(0)
+    timestamps = np.arange(num_samples, dtype=np.float64) * (1e6 / sample_rate_hz)
+    table = pa.Table.from_pydict(
+        {
+            "timestamps": timestamps,
+            "unaltered_timestamps": timestamps,
+            "accelerometer_x": rng.standard_normal(num_samples),
+            "accelerometer_y": rng.standard_normal(num_samples),
+            "accelerometer_z": rng.standard_normal(num_samples) + 9.8,
+        }
+    )
+    return SensorData(
+        "accelerometer", table, SensorType.ACCELEROMETER, sample_rate_hz, 1 / sample_rate_hz, 0.0, True
+    )
+
+
+def _time(fn, repeats: int):
+    start = time.perf_counter()
+    result = fn()
+    first_s = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return result, first_s, (time.perf_counter() - start) / max(repeats, 1)
+
+
+def main(hours: float = 24.0, sample_rate_hz: float = 800.0, repeats: int = 5):
+    num_samples = int(hours * 3600 * sample_rate_hz)
+    sensor = _sensor(num_samples, sample_rate_hz)
+    print(f"{num_samples} samples x 3 channels, {sensor.pyarrow_table().nbytes / 1e6:.0f} MB table")
+
+    pandas_result, first_s, repeat_s = _time(lambda: sensor.data_df().iloc[:, 2:].T.to_numpy(), repeats)
+    print(f"pandas:             first {first_s:8.3f}s  repeated {repeat_s:8.3f}s")
+    samples_result, first_s, repeat_s = _time(sensor.samples, repeats)
+    print(f"samples():          first {first_s:8.3f}s  repeated {repeat_s:8.3f}s")
+    _, first_s, repeat_s = _time(
+        lambda: [sensor.get_data_channel(f"accelerometer_{axis}") for axis in "xyz"], repeats
+    )
+    print(f"per-axis getters:   first {first_s:8.3f}s  repeated {repeat_s:8.3f}s")
+    assert np.array_equal(pandas_result, samples_result)
+
+
+if __name__ == "__main__":
+    main(*[float(a) for a in sys.argv[1:3]], *[int(a) for a in sys.argv[3:4]])
@@ -0,0 +1,46 @@
+"""
+Benchmark building SessionModels for a fleet of synthetic stations.
+
+Compares SessionModel.read_all_from_dir (serial, one station at a time) against SessionModel.create_all_from_dir
+run serially and with a pool of workers.
+
+Usage: python -m benchmarks.bench_session_model [num_stations] [num_packets]
+"""
+import multiprocessing
+import sys
+import tempfile
+import time
+
+import redvox.settings as settings
+from redvox.common.session_model import SessionModel
+
+from benchmarks import synthetic
+
+
+def _time(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main(num_stations: int = 100, num_packets: int = 10):
+    with tempfile.TemporaryDirectory() as base_dir:
+        synthetic.write_fleet(synthetic.fleet_configs(num_stations, num_packets=num_packets), base_dir)
+        print(f"{num_stations} stations x {num_packets} packets")
+
+        settings.set_parallelism_enabled(False)
+        print(f"read_all_from_dir (serial): {_time(lambda: SessionModel.read_all_from_dir(base_dir)):.3f}s")
+        print(f"create_all_from_dir (serial): {_time(lambda: SessionModel.create_all_from_dir(base_dir)):.3f}s")
+
+        settings.set_parallelism_enabled(True)
+        workers = 1
+        while workers <= multiprocessing.cpu_count():
+            with multiprocessing.Pool(workers) as pool:
+                elapsed = _time(lambda: SessionModel.create_all_from_dir(base_dir, pool=pool))
+            print(f"create_all_from_dir ({workers} workers): {elapsed:.3f}s")
+            workers *= 2
+        settings.set_parallelism_enabled(False)
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
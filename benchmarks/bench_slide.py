@@ -0,0 +1,99 @@
+"""
+Benchmark moving a DataWindow forward with DataWindow.slide against creating a new DataWindow at every step.
+
+A fleet of synthetic stations is written to disk.  A DataWindow of the first hour is created and moved forward one
+minute at a time, 60 times.  DataWindow.slide reads only the files the window hasn't read and appends their data to the
+stations; the rebuild creates a new DataWindow of the same window from all of its files.  The total and mean wall time
+of both are reported, along with the largest difference in the number of audio samples of a station between the two.
+
+Usage: python -m benchmarks.bench_slide [--stations N] [--window-min M] [--step-s S] [--slides K] [--parallel]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import timedelta
+from typing import Any, Callable, Dict, List, Tuple
+
+import numpy as np
+
+import redvox.settings as settings
+from redvox.common import date_time_utils as dtu
+from redvox.common.data_window import DataWindow, DataWindowConfig, DEFAULT_START_BUFFER_TD, DEFAULT_END_BUFFER_TD
+
+from benchmarks import synthetic
+
+
+def _timed(fn: Callable[[], Any]) -> Tuple[Any, float]:
+    """
+    :return: the result of fn and the seconds it took
+    """
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def _window(data_dir: str, start: dtu.datetime, end: dtu.datetime) -> DataWindow:
+    return DataWindow(config=DataWindowConfig(data_dir, start_datetime=start, end_datetime=end))
+
+
+def _audio_samples(window: DataWindow) -> Dict[str, int]:
+    """
+    :return: the number of audio samples of every station in the window, keyed by station id
+    """
+    return {s.id(): s.audio_sensor().num_samples() for s in window.stations()}
+
+
+def main(argv: List[str]):
+    parser = argparse.ArgumentParser("bench_slide", description="Compare sliding a DataWindow to rebuilding it")
+    parser.add_argument("--stations", type=int, default=4, help="Number of stations, default 4")
+    parser.add_argument("--window-min", type=float, default=60.0, help="Minutes in the window, default 60")
+    parser.add_argument("--step-s", type=float, default=60.0, help="Seconds the window moves each step, default 60")
+    parser.add_argument("--slides", type=int, default=60, help="Number of steps, default 60")
+    parser.add_argument("--parallel", action="store_true", help="Enable parallelism in the SDK")
+    args = parser.parse_args(argv)
+
+    settings.set_parallelism_enabled(args.parallel)
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        data_dir = os.path.join(tmp_dir, "data")
+        # the data covers the buffers before the first window and after the last one
+        duration_s = (
+            DEFAULT_START_BUFFER_TD.total_seconds()
+            + args.window_min * 60
+            + args.slides * args.step_s
+            + DEFAULT_END_BUFFER_TD.total_seconds()
+        )
+        configs = synthetic.fleet_configs(args.stations, num_packets=int(np.ceil(duration_s / 40.96)) + 1)
+        files, write_s = _timed(lambda: synthetic.write_fleet(configs, data_dir))
+        print(f"{len(files)} files of {args.stations} stations written in {write_s:.1f}s")
+
+        start = dtu.datetime_from_epoch_microseconds_utc(synthetic.BASE_TIMESTAMP_MICROS) + DEFAULT_START_BUFFER_TD
+        end = start + timedelta(minutes=args.window_min)
+        step = timedelta(seconds=args.step_s)
+        slide_total = rebuild_total = 0.0
+        max_difference = 0
+        try:
+            window, first_s = _timed(lambda: _window(data_dir, start, end))
+            print(f"first window created in {first_s:.2f}s")
+            for i in range(1, args.slides + 1):
+                _, slide_s = _timed(lambda: window.slide(start + i * step, end + i * step))
+                rebuilt, rebuild_s = _timed(lambda: _window(data_dir, start + i * step, end + i * step))
+                slide_total += slide_s
+                rebuild_total += rebuild_s
+                slid, expected = _audio_samples(window), _audio_samples(rebuilt)
+                max_difference = max(
+                    [max_difference] + [abs(slid.get(k, 0) - expected.get(k, 0)) for k in {*slid, *expected}]
+                )
+        finally:
+            # the DataWindow changes the working directory to its output directory
+            os.chdir(cwd)
+        print(f"{'slide':>8}: {slide_total:8.2f}s total  {slide_total / args.slides:6.3f}s per step")
+        print(f"{'rebuild':>8}: {rebuild_total:8.2f}s total  {rebuild_total / args.slides:6.3f}s per step")
+        print(f"speedup: {rebuild_total / max(slide_total, 1e-9):.1f}x")
+        print(f"largest difference in audio samples of a station: {max_difference}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,77 @@
+"""
+Benchmark the memory, parquet size and load time of sensor samples stored with each StoragePrecision.
+
+The sensors are hours of 48 kHz audio holding 16 bit counts and of 800 Hz accelerometer data, a quarter hour by
+default, each with a gap of missing samples.  Each precision reports the bytes of the stored table, the size of its
+parquet file, the time to load the sensor from the parquet file and the time to read its samples as float64.
+
+Usage: python -m benchmarks.bench_storage_precision [hours]
+"""
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pyarrow as pa
+
+from redvox.common.sensor_data import SensorData, SensorType, StoragePrecision
+
+
+def _table(num_samples: int, sample_rate_hz: float, channels: dict) -> pa.Table:
+    timestamps = 1.6e15 + np.arange(num_samples, dtype=np.float64) * (1e6 / sample_rate_hz)
+    gap = slice(num_samples // 2, num_samples // 2 + num_samples // 100)
+    for values in channels.values():
+        values[gap] = np.nan
+    return pa.Table.from_pydict({"timestamps": timestamps, "unaltered_timestamps": timestamps, **channels})
+
+
+def _sensors(hours: float):
+    rng = np.random.default_rng(0)
+    num_audio = int(hours * 3600 * 48000)
+    num_accel = int(hours * 3600 * 800)
+    audio = _table(num_audio, 48000.0, {"microphone": rng.integers(-32768, 32768, num_audio).astype(np.float64)})
+    accel = _table(num_accel, 800.0, {f"accelerometer_{axis}": rng.standard_normal(num_accel) for axis in "xyz"})
+    return [
+        ("audio", audio, SensorType.AUDIO, 48000.0),
+        ("accelerometer", accel, SensorType.ACCELEROMETER, 800.0),
+    ]
+
+
+def _measure(name: str, table: pa.Table, sensor_type: SensorType, sample_rate_hz: float, tmp_dir: str):
+    for precision in StoragePrecision:
+        sensor = SensorData(name, sensor_type=sensor_type, save_data=True, base_dir=tmp_dir)
+        sensor.set_storage_precision(precision)
+        sensor.write_pyarrow_table(table)
+        stored_bytes = sensor._stored_table().nbytes
+        disk_bytes = sum(os.path.getsize(os.path.join(sensor.save_dir(), f)) for f in os.listdir(sensor.save_dir()))
+        start = time.perf_counter()
+        loaded = SensorData.from_dir(
+            name,
+            sensor.save_dir(),
+            sensor_type,
+            sample_rate_hz,
+            1 / sample_rate_hz,
+            0.0,
+            True,
+            storage_precision=precision,
+        )
+        load_s = time.perf_counter() - start
+        start = time.perf_counter()
+        samples = loaded.samples()
+        samples_s = time.perf_counter() - start
+        assert samples.dtype == np.float64
+        print(
+            f"{name:>13} {precision.name:>7}: {stored_bytes / 1e6:9.1f} MB in memory  {disk_bytes / 1e6:9.1f} MB "
+            f"parquet  {load_s:7.3f}s to load  {samples_s:7.3f}s to read samples"
+        )
+
+
+def main(hours: float = 0.25):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for name, table, sensor_type, sample_rate_hz in _sensors(hours):
+            _measure(name, table, sensor_type, sample_rate_hz, os.path.join(tmp_dir, name))
+
+
+if __name__ == "__main__":
+    main(*[float(a) for a in sys.argv[1:2]])
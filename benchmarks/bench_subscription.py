@@ -0,0 +1,75 @@
+"""
+Benchmark the subscription decode pipeline against a local websocket stand-in that replays packets from many stations
+as fast as possible.
+
+Usage: python -m benchmarks.bench_subscription [num_messages] [num_stations]
+"""
+import json
+import sys
+import threading
+import time
+
+import lz4.frame
+
+import redvox.cloud.subscription as subscription
+from redvox.cloud.client import CloudClient
+from redvox.cloud.config import RedVoxConfig
+from redvox.tests.cloud.websocket_stand_in import WebSocketStandIn
+
+from benchmarks import synthetic
+
+
+def _pub_msg_bytes(file_path: str, body: bytes) -> bytes:
+    header: bytes = json.dumps({"file_path": file_path}).encode()
+    return b"\xc0\xff\xee" + len(header).to_bytes(2, "little") + header + body
+
+
+def main(num_messages: int = 5000, num_stations: int = 1000):
+    configs = synthetic.fleet_configs(num_stations, num_packets=1)
+    protos = [synthetic.synthetic_packet(config, 0) for config in configs]
+    packets = [lz4.frame.compress(proto.SerializeToString()) for proto in protos]
+    messages = [
+        _pub_msg_bytes(synthetic.packet_file_name(protos[i % num_stations]), packets[i % num_stations])
+        for i in range(num_messages)
+    ]
+    print(f"{num_messages} messages from {num_stations} stations, {len(packets[0])} bytes each")
+
+    start = time.perf_counter()
+    for message in messages:
+        subscription.decode_pub_msg(subscription.PubMsg.parse(message))
+    elapsed = time.perf_counter() - start
+    print(f"decode on one thread: {num_messages / elapsed:9.1f} msgs/s")
+
+    client = CloudClient(RedVoxConfig.from_auth_token("token", "http", "127.0.0.1", 1))
+    try:
+        for policy in subscription.OverflowPolicy:
+            for workers in (1, 2, 4, 8):
+                with WebSocketStandIn(messages) as server:
+                    pipeline = subscription.SubscriptionPipeline(1000, policy, workers)
+                    threading.Thread(
+                        target=subscription.subscribe_bytes_queue,
+                        args=(server.url(), pipeline.queue, client, None, None, pipeline.stop_event),
+                        daemon=True,
+                    ).start()
+                    start = time.perf_counter()
+                    delivered = 0
+                    while delivered + pipeline.metrics().dropped + pipeline.metrics().decode_errors < num_messages:
+                        try:
+                            pipeline.get(timeout=1.0)
+                            delivered += 1
+                        except subscription.Empty:
+                            break
+                    elapsed = time.perf_counter() - start
+                    metrics = pipeline.metrics()
+                    pipeline.close()
+                print(
+                    f"{policy.value:>11} {workers} workers: {delivered / elapsed:9.1f} msgs/s "
+                    f"dropped={metrics.dropped:5} mean latency={metrics.mean_latency_s() * 1000:8.2f}ms "
+                    f"max latency={metrics.max_latency_s * 1000:8.2f}ms max queue={metrics.max_queue_size}"
+                )
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,130 @@
+"""
+Benchmark the parquet size, correction time and windowing time of sensor timestamps stored with each TimestampFormat.
+
+The sensors are 48 kHz audio and 800 Hz accelerometer data with jittered timestamps, a quarter hour by default, saved
+to disk.  Each format reports the bytes of the timestamp columns in the parquet file, the time to correct the
+timestamps with an offset model and the mean time to read a one minute window of the sensor with time_range_table.
+The float64 timestamps are also written with the BYTE_STREAM_SPLIT encoding of parquet for comparison; the SDK
+doesn't write that encoding.  The largest difference between the float and integer corrected timestamps is reported.
+
+Usage: python -m benchmarks.bench_timestamps [--hours H] [--windows N]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from typing import List
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from redvox.common.offset_model import OffsetModel
+from redvox.common.sensor_data import SensorData, SensorType, TimestampFormat, TIMESTAMP_COLUMNS
+
+
+def _table(num_samples: int, sample_rate_hz: float, jitter_us: float, channels: dict) -> pa.Table:
+    rng = np.random.default_rng(1)
+    timestamps = 1.6e15 + np.arange(num_samples, dtype=np.float64) * (1e6 / sample_rate_hz)
+    if jitter_us > 0:
+        timestamps += rng.uniform(0, jitter_us, num_samples)
+    return pa.Table.from_pydict({"timestamps": timestamps, "unaltered_timestamps": timestamps, **channels})
+
+
+def _sensors(hours: float):
+    rng = np.random.default_rng(0)
+    num_audio = int(hours * 3600 * 48000)
+    num_accel = int(hours * 3600 * 800)
+    audio = _table(num_audio, 48000.0, 0.0, {"microphone": rng.integers(-32768, 32768, num_audio).astype(float)})
+    accel = _table(num_accel, 800.0, 50.0, {f"accelerometer_{axis}": rng.standard_normal(num_accel) for axis in "xyz"})
+    return [
+        ("audio", audio, SensorType.AUDIO, 48000.0),
+        ("accelerometer", accel, SensorType.ACCELEROMETER, 800.0),
+    ]
+
+
+def _timestamp_bytes(path: str) -> int:
+    """
+    :return: the compressed bytes of the timestamp columns of a parquet file
+    """
+    metadata = pq.ParquetFile(path).metadata
+    names = metadata.schema.names
+    return sum(
+        metadata.row_group(g).column(names.index(c)).total_compressed_size
+        for g in range(metadata.num_row_groups)
+        for c in TIMESTAMP_COLUMNS
+    )
+
+
+def _model() -> OffsetModel:
+    """
+    :return: an offset model with a drift of 1 microsecond per second
+    """
+    model = OffsetModel.empty_model()
+    model.start_time = 1.6e15
+    model.slope = 1e-6
+    model.intercept = 123456.789
+    return model
+
+
+def _measure(name: str, table: pa.Table, sensor_type: SensorType, sample_rate_hz: float, tmp_dir: str, windows: int):
+    path = os.path.join(tmp_dir, "byte_stream_split.parquet")
+    pq.write_table(
+        table,
+        path,
+        compression="zstd",
+        compression_level=1,
+        use_dictionary=False,
+        use_byte_stream_split=TIMESTAMP_COLUMNS,
+    )
+    print(f"{name:>13} {'FLOAT64 BYTE_STREAM_SPLIT':>25}: {_timestamp_bytes(path) / 1e6:8.1f} MB of timestamps")
+    first, last = table["timestamps"][0].as_py(), table["timestamps"][-1].as_py()
+    starts = np.linspace(first, max(first, last - 60e6), windows)
+    corrected = {}
+    for timestamp_format in TimestampFormat:
+        sensor = SensorData(
+            name,
+            sensor_type=sensor_type,
+            sample_rate_hz=sample_rate_hz,
+            sample_interval_s=1 / sample_rate_hz,
+            sample_interval_std_s=0.0,
+            is_sample_rate_fixed=sensor_type == SensorType.AUDIO,
+            use_offset_model_for_correction=True,
+            save_data=True,
+            base_dir=os.path.join(tmp_dir, timestamp_format.name),
+        )
+        sensor.set_timestamp_format(timestamp_format)
+        sensor.write_pyarrow_table(table)
+        timestamp_bytes = _timestamp_bytes(sensor.full_path())
+        start = time.perf_counter()
+        sensor.update_data_timestamps(_model())
+        correct_s = time.perf_counter() - start
+        corrected[timestamp_format] = sensor.data_timestamps()
+        start = time.perf_counter()
+        for window_start in starts:
+            sensor.time_range_table(window_start, window_start + 60e6)
+        window_s = (time.perf_counter() - start) / windows
+        print(
+            f"{name:>13} {timestamp_format.name:>25}: {timestamp_bytes / 1e6:8.1f} MB of timestamps  "
+            f"{correct_s:7.3f}s to correct  {window_s:7.4f}s per one minute window"
+        )
+    difference = np.max(np.abs(corrected[TimestampFormat.FLOAT64_MICROS] - corrected[TimestampFormat.INT64_NANOS]))
+    print(f"{name:>13} largest difference of the corrected timestamps: {difference:.3f} microseconds")
+
+
+def main(argv: List[str]):
+    parser = argparse.ArgumentParser("bench_timestamps", description="Compare the formats of sensor timestamps")
+    parser.add_argument("--hours", type=float, default=0.25, help="Hours of data per sensor, default 0.25")
+    parser.add_argument("--windows", type=int, default=10, help="Number of one minute windows read, default 10")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for name, table, sensor_type, sample_rate_hz in _sensors(args.hours):
+            sensor_dir = os.path.join(tmp_dir, name)
+            os.makedirs(sensor_dir)
+            _measure(name, table, sensor_type, sample_rate_hz, sensor_dir, args.windows)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
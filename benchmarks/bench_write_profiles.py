@@ -0,0 +1,75 @@
+"""
+Benchmark the parquet write profiles of redvox.common.io on sensor tables.
+
+Each table is written with every profile.  The matrix reports the time to write the file, the time to read all of it,
+the size of the file and how well a query of a short time range is pruned: the fraction of row groups whose timestamp
+statistics overlap the range and the time to read the range with a filter.
+
+Usage: python -m benchmarks.bench_write_profiles [hours] [query_s]
+"""
+import os
+import sys
+import tempfile
+import time
+from typing import List, Tuple
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from redvox.common.io import ParquetWriteProfile, write_parquet
+
+
+def _tables(hours: float) -> List[Tuple[str, pa.Table]]:
+    rng = np.random.default_rng(0)
+    tables = []
+    for name, sample_rate_hz, channels in (("audio", 8000.0, ["microphone"]), ("accelerometer", 800.0, list("xyz"))):
+        num_samples = int(hours * 3600 * sample_rate_hz)
+        timestamps = 1.6e15 + np.arange(num_samples) * (1e6 / sample_rate_hz)
+        columns = {"timestamps": timestamps, "unaltered_timestamps": timestamps}
+        columns.update({c: np.round(rng.standard_normal(num_samples), 4) for c in channels})
+        tables.append((name, pa.Table.from_pydict(columns)))
+    return tables
+
+
+def _pruned_fraction(path: str, start: float, end: float) -> float:
+    """
+    :return: fraction of row groups whose timestamp statistics overlap [start, end), or 1 without statistics
+    """
+    metadata = pq.ParquetFile(path).metadata
+    column = metadata.schema.names.index("timestamps")
+    overlapping = 0
+    for i in range(metadata.num_row_groups):
+        stats = metadata.row_group(i).column(column).statistics
+        if stats is None or not stats.has_min_max or (stats.min < end and stats.max >= start):
+            overlapping += 1
+    return overlapping / max(metadata.num_row_groups, 1)
+
+
+def main(hours: float = 6.0, query_s: float = 60.0):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for name, table in _tables(hours):
+            start = table["timestamps"][table.num_rows // 2].as_py()
+            end = start + query_s * 1e6
+            print(f"{name}: {table.num_rows} rows, {table.nbytes / 1e6:.1f} MB in memory")
+            for profile in ParquetWriteProfile:
+                path = os.path.join(tmp_dir, f"{name}_{profile.name}.parquet")
+                write_start = time.perf_counter()
+                write_parquet(table, path, profile)
+                write_s = time.perf_counter() - write_start
+                read_start = time.perf_counter()
+                pq.read_table(path)
+                read_s = time.perf_counter() - read_start
+                query_start = time.perf_counter()
+                ds.dataset(path).to_table(filter=(ds.field("timestamps") >= start) & (ds.field("timestamps") < end))
+                query_read_s = time.perf_counter() - query_start
+                print(
+                    f"{profile.name:>13}: write {write_s:7.3f}s  read {read_s:7.3f}s  "
+                    f"{os.path.getsize(path) / 1e6:8.1f} MB  row groups read {_pruned_fraction(path, start, end):6.1%}"
+                    f"  range read {query_read_s:7.3f}s"
+                )
+
+
+if __name__ == "__main__":
+    main(*[float(a) for a in sys.argv[1:3]])
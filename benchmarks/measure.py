@@ -0,0 +1,44 @@
+"""
+This module measures the memory benchmarks use, running each measurement in a fresh process so earlier runs don't
+raise its peak resident memory.
+"""
+import multiprocessing
+from typing import Any, Callable, Optional
+
+import psutil
+
+from redvox.common.tracing import max_rss_bytes
+
+
+def rss_bytes() -> int:
+    """
+    :return: the current resident memory of this process in bytes
+    """
+    return psutil.Process().memory_info().rss
+
+
+def peak_bytes_since(baseline: int) -> int:
+    """
+    :param baseline: resident memory of this process in bytes before the work being measured
+    :return: bytes of resident memory the process reached above baseline
+    """
+    return max_rss_bytes() - baseline
+
+
+def _run(queue: multiprocessing.Queue, fn: Callable, *args):
+    queue.put(fn(*args))
+
+
+def run_in_fresh_process(fn: Callable, *args) -> Optional[Any]:
+    """
+    run fn in a new process, which may start its own pool of workers
+
+    :param fn: the function to run; it and its arguments must be picklable
+    :param args: the arguments of fn
+    :return: the result of fn, or None if the process failed
+    """
+    queue = multiprocessing.Queue()
+    process = multiprocessing.Process(target=_run, args=(queue, fn, *args))
+    process.start()
+    process.join()
+    return queue.get() if process.exitcode == 0 else None
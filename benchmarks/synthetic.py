@@ -0,0 +1,423 @@
+"""
+This module generates deterministic synthetic RedVox API M data for benchmarking.
+"""
+import os
+from dataclasses import dataclass
+from typing import Iterator, List, Tuple
+
+import lz4.frame
+import numpy as np
+
+import redvox.api1000.proto.redvox_api_m_pb2 as api_m
+import redvox.api1000.wrapped_redvox_packet.ml as ml
+
+
+BASE_TIMESTAMP_MICROS: float = 1_609_459_200_000_000.0  # 2021-01-01 00:00:00 UTC
+_UNIT = api_m.RedvoxPacketM.Unit
+
+
+@dataclass
+class SyntheticStationConfig:
+    """
+    Describes the data produced by a single synthetic station.
+
+    Properties:
+        station_id: str, the 10 digit id of the station
+
+        audio_sample_rate_hz: float, sample rate of the audio sensor.  Default 800
+
+        packet_duration_s: float, duration of each packet in seconds.  Default 40.96
+
+        num_packets: int, number of consecutive packets to generate.  Default 10
+
+        start_timestamp: float, timestamp of the first audio sample in microseconds since epoch UTC
+
+        pressure_sample_rate_hz: float, sample rate of the barometer, 0 disables the sensor.  Default 30
+
+        accelerometer_sample_rate_hz: float, sample rate of the accelerometer, 0 disables the sensor.  Default 0
+
+        gyroscope_sample_rate_hz: float, sample rate of the gyroscope, 0 disables the sensor.  Default 0
+
+        magnetometer_sample_rate_hz: float, sample rate of the magnetometer, 0 disables the sensor.  Default 0
+
+        location_sample_rate_hz: float, sample rate of the location sensor, 0 disables the sensor.  Default 1
+
+        health_sample_rate_hz: float, sample rate of the station health metrics, 0 disables them.  Default 1
+
+        num_synch_exchanges: int, number of timesync exchanges per packet.  Default 5
+
+        ml_windows_per_packet: int, number of ML inference windows in each packet's event stream, 0 disables the
+        stream.  Default 0
+
+        missing_packets: tuple of int, indices of packets that are not generated, leaving gaps in the data.
+        Default empty tuple
+
+        seed: int, seed for the random values in the packets.  Default 0
+    """
+
+    station_id: str
+    audio_sample_rate_hz: float = 800.0
+    packet_duration_s: float = 40.96
+    num_packets: int = 10
+    start_timestamp: float = BASE_TIMESTAMP_MICROS
+    pressure_sample_rate_hz: float = 30.0
+    accelerometer_sample_rate_hz: float = 0.0
+    gyroscope_sample_rate_hz: float = 0.0
+    magnetometer_sample_rate_hz: float = 0.0
+    location_sample_rate_hz: float = 1.0
+    health_sample_rate_hz: float = 1.0
+    num_synch_exchanges: int = 5
+    ml_windows_per_packet: int = 0
+    missing_packets: Tuple[int, ...] = ()
+    seed: int = 0
+
+    def packet_duration_micros(self) -> float:
+        """
+        :return: duration of a packet in microseconds
+        """
+        return self.packet_duration_s * 1e6
+
+    def samples_per_packet(self) -> int:
+        """
+        :return: number of audio samples in a packet
+        """
+        return int(round(self.audio_sample_rate_hz * self.packet_duration_s))
+
+
+def _set_sample_payload(payload, values: np.ndarray, unit: int):
+    """
+    fill a protobuf SamplePayload with values and their summary statistics
+
+    :param payload: SamplePayload or DoubleSamplePayload to fill
+    :param values: values to add
+    :param unit: unit of the values
+    """
+    payload.unit = unit
+    payload.values.extend(values)
+    _set_stats(payload.value_statistics, values)
+
+
+def _set_stats(stats, values: np.ndarray):
+    """
+    fill a protobuf SummaryStatistics from values
+
+    :param stats: SummaryStatistics to fill
+    :param values: values to summarize
+    """
+    stats.count = len(values)
+    if len(values) > 0:
+        stats.mean = float(np.mean(values))
+        stats.standard_deviation = float(np.std(values))
+        stats.min = float(np.min(values))
+        stats.max = float(np.max(values))
+        stats.range = stats.max - stats.min
+
+
+def _set_timing_payload(payload, timestamps: np.ndarray):
+    """
+    fill a protobuf TimingPayload with timestamps, their summary statistics and sample rate statistics
+
+    :param payload: TimingPayload to fill
+    :param timestamps: timestamps in microseconds since epoch UTC
+    """
+    payload.unit = _UNIT.MICROSECONDS_SINCE_UNIX_EPOCH
+    payload.timestamps.extend(timestamps)
+    _set_stats(payload.timestamp_statistics, timestamps)
+    if len(timestamps) > 1:
+        rates = 1e6 / np.diff(timestamps)
+        payload.mean_sample_rate = float(np.mean(rates))
+        payload.stdev_sample_rate = float(np.std(rates))
+    else:
+        payload.mean_sample_rate = np.nan
+        payload.stdev_sample_rate = np.nan
+
+
+def _sensor_timestamps(start: float, end: float, rate_hz: float, rng: np.random.Generator) -> np.ndarray:
+    """
+    :param start: start of the packet in microseconds since epoch UTC
+    :param end: end of the packet in microseconds since epoch UTC
+    :param rate_hz: nominal sample rate of the sensor
+    :param rng: random generator used to jitter the timestamps
+    :return: slightly jittered timestamps at the nominal rate between start (inclusive) and end (exclusive)
+    """
+    interval = 1e6 / rate_hz
+    timestamps = np.arange(start, end, interval)
+    return np.floor(timestamps + rng.uniform(0, 0.05 * interval, len(timestamps)))
+
+
+def _add_xyz_sensor(
+    sensor,
+    description: str,
+    start: float,
+    end: float,
+    rate_hz: float,
+    means: Tuple[float, float, float],
+    unit: int,
+    rng: np.random.Generator,
+):
+    """
+    fill a protobuf Xyz sensor with noisy samples around the means
+
+    :param sensor: Xyz sensor to fill
+    :param description: description of the sensor
+    :param start: start of the packet in microseconds since epoch UTC
+    :param end: end of the packet in microseconds since epoch UTC
+    :param rate_hz: nominal sample rate of the sensor
+    :param means: mean of the x, y and z samples
+    :param unit: unit of the samples
+    :param rng: random generator used for the samples
+    """
+    sensor.sensor_description = description
+    timestamps = _sensor_timestamps(start, end, rate_hz, rng)
+    _set_timing_payload(sensor.timestamps, timestamps)
+    for samples, mean in zip((sensor.x_samples, sensor.y_samples, sensor.z_samples), means):
+        _set_sample_payload(samples, mean + rng.normal(0, 0.05, len(timestamps)).astype(np.float32), unit)
+
+
+def _add_ml_event_stream(
+    packet: api_m.RedvoxPacketM, config: "SyntheticStationConfig", start: float, end: float, rng: np.random.Generator
+):
+    """
+    add an ML inference event stream with three scored classes per window to the packet
+
+    :param packet: packet to add the stream to
+    :param config: description of the station
+    :param start: start of the packet in microseconds since epoch UTC
+    :param end: end of the packet in microseconds since epoch UTC
+    :param rng: random generator used for the scores
+    """
+    stream = packet.event_streams.add()
+    stream.name = ml.ML_EVENT_STREAM_NAME
+    stream.metadata[ml.ML_METADATA_MODEL_VERSION_KEY] = "0.0.0"
+    stream.metadata[ml.ML_METADATA_INPUT_SAMPLES_PER_HOP_KEY] = "4000"
+    stream.metadata[ml.ML_METADATA_INPUT_SAMPLE_RATE_KEY] = "8000"
+    stream.metadata[ml.ML_METADATA_INPUT_SAMPLES_PER_WINDOW_KEY] = "8000"
+    timestamps = np.floor(np.linspace(start, end, config.ml_windows_per_packet, endpoint=False))
+    _set_timing_payload(stream.timestamps, timestamps)
+    for _ in timestamps:
+        event = stream.events.add()
+        event.description = "synthetic model"
+        scores = rng.dirichlet(np.ones(3))
+        for i, (name, score) in enumerate(zip(("silence", "speech", "explosion"), scores)):
+            event.string_payload[f"{ml.ML_CLASS_PREFIX}{i}"] = name
+            event.numeric_payload[f"{ml.ML_SCORE_PREFIX}{i}"] = float(score)
+
+
+def synthetic_packet(config: SyntheticStationConfig, packet_index: int) -> api_m.RedvoxPacketM:
+    """
+    Creates a single deterministic packet.  The same config and index always produce the same packet.
+
+    :param config: description of the station
+    :param packet_index: position of the packet in the station's data stream
+    :return: a RedvoxPacketM
+    """
+    rng = np.random.default_rng([config.seed, int(config.station_id), packet_index])
+    start = config.start_timestamp + packet_index * config.packet_duration_micros()
+    end = start + config.packet_duration_micros()
+
+    packet = api_m.RedvoxPacketM()
+    packet.api = 1000.0
+    packet.sub_api = 12.0
+
+    info = packet.station_information
+    info.id = config.station_id
+    info.uuid = f"{int(config.station_id) * 7 % 10_000_000_000:010d}"
+    info.description = "synthetic"
+    info.auth_id = "synthetic@redvox.io"
+    info.make = "RedVox"
+    info.model = "synthetic"
+    info.os = api_m.RedvoxPacketM.StationInformation.OsType.LINUX
+    info.app_version = "0.0.0"
+
+    timing = packet.timing_information
+    timing.unit = _UNIT.MICROSECONDS_SINCE_UNIX_EPOCH
+    timing.packet_start_mach_timestamp = start
+    timing.packet_start_os_timestamp = start
+    timing.packet_end_mach_timestamp = end
+    timing.packet_end_os_timestamp = end
+    timing.server_acquisition_arrival_timestamp = end + 250_000.0
+    timing.app_start_mach_timestamp = config.start_timestamp - 1_000_000.0
+    offset = 3_000.0 + 100.0 * (int(config.station_id) % 10)
+    if config.num_synch_exchanges > 0:
+        for a1 in np.linspace(start, end, config.num_synch_exchanges, endpoint=False) + 1_000.0:
+            latency = float(rng.uniform(500, 3_000))
+            exchange = timing.synch_exchanges.add()
+            exchange.unit = _UNIT.MICROSECONDS_SINCE_UNIX_EPOCH
+            exchange.a1 = a1
+            exchange.b1 = a1 - offset + latency
+            exchange.b2 = exchange.b1 + 20.0
+            exchange.a2 = exchange.b2 + offset + latency
+            exchange.a3 = exchange.a2 + 50.0
+            exchange.b3 = exchange.a3 - offset + latency
+        timing.best_latency = 500.0
+        timing.best_offset = offset
+
+    sensors = packet.sensors
+    audio = sensors.audio
+    audio.sensor_description = "synthetic microphone"
+    audio.first_sample_timestamp = start
+    audio.sample_rate = config.audio_sample_rate_hz
+    audio.bits_of_precision = 16.0
+    audio.encoding = "counts"
+    _set_sample_payload(
+        audio.samples,
+        np.round(rng.normal(0, 1_000, config.samples_per_packet())),
+        _UNIT.LSB_PLUS_MINUS_COUNTS,
+    )
+
+    if config.pressure_sample_rate_hz > 0:
+        pressure = sensors.pressure
+        pressure.sensor_description = "synthetic barometer"
+        timestamps = _sensor_timestamps(start, end, config.pressure_sample_rate_hz, rng)
+        _set_timing_payload(pressure.timestamps, timestamps)
+        _set_sample_payload(
+            pressure.samples,
+            101.325 + rng.normal(0, 0.01, len(timestamps)).astype(np.float32),
+            _UNIT.KILOPASCAL,
+        )
+
+    if config.accelerometer_sample_rate_hz > 0:
+        _add_xyz_sensor(
+            sensors.accelerometer,
+            "synthetic accelerometer",
+            start,
+            end,
+            config.accelerometer_sample_rate_hz,
+            (0.0, 0.0, 9.81),
+            _UNIT.METERS_PER_SECOND_SQUARED,
+            rng,
+        )
+
+    if config.gyroscope_sample_rate_hz > 0:
+        _add_xyz_sensor(
+            sensors.gyroscope,
+            "synthetic gyroscope",
+            start,
+            end,
+            config.gyroscope_sample_rate_hz,
+            (0.0, 0.0, 0.0),
+            _UNIT.RADIANS_PER_SECOND,
+            rng,
+        )
+
+    if config.magnetometer_sample_rate_hz > 0:
+        _add_xyz_sensor(
+            sensors.magnetometer,
+            "synthetic magnetometer",
+            start,
+            end,
+            config.magnetometer_sample_rate_hz,
+            (20.0, -5.0, 40.0),
+            _UNIT.MICROTESLA,
+            rng,
+        )
+
+    if config.location_sample_rate_hz > 0:
+        location = sensors.location
+        location.sensor_description = "synthetic location"
+        timestamps = _sensor_timestamps(start, end, config.location_sample_rate_hz, rng)
+        _set_timing_payload(location.timestamps, timestamps)
+        # gps timestamps jitter; a constant gps offset can't be fit by the gps offset model
+        _set_timing_payload(location.timestamps_gps, timestamps + offset + rng.normal(0, 50.0, len(timestamps)))
+        num_locs = len(timestamps)
+        lat = 21.3 + 0.001 * (int(config.station_id) % 100)
+        _set_sample_payload(location.latitude_samples, lat + rng.normal(0, 1e-5, num_locs), _UNIT.DECIMAL_DEGREES)
+        _set_sample_payload(location.longitude_samples, -157.8 + rng.normal(0, 1e-5, num_locs), _UNIT.DECIMAL_DEGREES)
+        _set_sample_payload(location.altitude_samples, 100.0 + rng.normal(0, 1, num_locs), _UNIT.METERS)
+        _set_sample_payload(location.speed_samples, np.abs(rng.normal(0, 0.1, num_locs)), _UNIT.METERS_PER_SECOND)
+        _set_sample_payload(location.bearing_samples, rng.uniform(0, 360, num_locs), _UNIT.DECIMAL_DEGREES)
+        _set_sample_payload(location.horizontal_accuracy_samples, rng.uniform(3, 10, num_locs), _UNIT.METERS)
+        _set_sample_payload(location.vertical_accuracy_samples, rng.uniform(3, 10, num_locs), _UNIT.METERS)
+        _set_sample_payload(location.speed_accuracy_samples, rng.uniform(0, 1, num_locs), _UNIT.METERS_PER_SECOND)
+        _set_sample_payload(location.bearing_accuracy_samples, rng.uniform(0, 5, num_locs), _UNIT.DECIMAL_DEGREES)
+        location.location_providers.extend([api_m.RedvoxPacketM.Sensors.Location.LocationProvider.GPS] * num_locs)
+        location.location_permissions_granted = True
+        location.location_services_requested = True
+        location.location_services_enabled = True
+
+    if config.health_sample_rate_hz > 0:
+        metrics = info.station_metrics
+        timestamps = _sensor_timestamps(start, end, config.health_sample_rate_hz, rng)
+        num_metrics = len(timestamps)
+        _set_timing_payload(metrics.timestamps, timestamps)
+        _set_sample_payload(metrics.battery, np.full(num_metrics, 90.0), _UNIT.PERCENTAGE)
+        _set_sample_payload(metrics.battery_current, rng.uniform(0, 500, num_metrics), _UNIT.MICROAMPERES)
+        _set_sample_payload(metrics.temperature, 30.0 + rng.normal(0, 0.1, num_metrics), _UNIT.DEGREES_CELSIUS)
+        _set_sample_payload(metrics.network_strength, rng.uniform(-90, -40, num_metrics), _UNIT.DECIBEL)
+        _set_sample_payload(metrics.available_ram, np.full(num_metrics, 2e9), _UNIT.BYTE)
+        _set_sample_payload(metrics.available_disk, np.full(num_metrics, 3e10), _UNIT.BYTE)
+        _set_sample_payload(metrics.cpu_utilization, rng.uniform(0, 100, num_metrics), _UNIT.PERCENTAGE)
+        _set_sample_payload(metrics.screen_brightness, np.zeros(num_metrics), _UNIT.PERCENTAGE)
+        metrics_enums = api_m.RedvoxPacketM.StationInformation.StationMetrics
+        metrics.network_type.extend([metrics_enums.NetworkType.WIFI] * num_metrics)
+        metrics.cell_service_state.extend([metrics_enums.CellServiceState.NOMINAL] * num_metrics)
+        metrics.power_state.extend([metrics_enums.PowerState.CHARGING] * num_metrics)
+        metrics.wifi_wake_lock.extend([metrics_enums.WifiWakeLock.NONE] * num_metrics)
+        metrics.screen_state.extend([metrics_enums.ScreenState.OFF] * num_metrics)
+
+    if config.ml_windows_per_packet > 0:
+        _add_ml_event_stream(packet, config, start, end, rng)
+
+    return packet
+
+
+def synthetic_packets(config: SyntheticStationConfig) -> Iterator[api_m.RedvoxPacketM]:
+    """
+    :param config: description of the station
+    :return: iterator over all the packets of the station in time order, skipping the missing packets
+    """
+    for i in range(config.num_packets):
+        if i not in config.missing_packets:
+            yield synthetic_packet(config, i)
+
+
+def packet_file_name(packet: api_m.RedvoxPacketM) -> str:
+    """
+    :param packet: packet to name
+    :return: the standard RedVox file name of the packet, [id]_[start timestamp].rdvxm
+    """
+    return f"{packet.station_information.id}_{int(packet.timing_information.packet_start_mach_timestamp)}.rdvxm"
+
+
+def write_packet(packet: api_m.RedvoxPacketM, base_dir: str, structured: bool = True) -> str:
+    """
+    compress and write a packet to disk
+
+    :param packet: packet to write
+    :param base_dir: the directory to write to.  Structured data is written into an api1000 subdirectory
+    :param structured: if True, write using the api1000 structured directory layout.  Default True
+    :return: the path to the written file
+    """
+    if structured:
+        dt = np.datetime64(int(packet.timing_information.packet_start_mach_timestamp), "us").astype(object)
+        out_dir = os.path.join(
+            base_dir, "api1000", f"{dt.year:04}", f"{dt.month:02}", f"{dt.day:02}", f"{dt.hour:02}"
+        )
+    else:
+        out_dir = base_dir
+    os.makedirs(out_dir, exist_ok=True)
+    path = os.path.join(out_dir, packet_file_name(packet))
+    with open(path, "wb") as f_p:
+        f_p.write(lz4.frame.compress(packet.SerializeToString()))
+    return path
+
+
+def write_fleet(configs: List[SyntheticStationConfig], base_dir: str, structured: bool = True) -> List[str]:
+    """
+    write the data of many synthetic stations to disk
+
+    :param configs: descriptions of each station
+    :param base_dir: the directory to write to
+    :param structured: if True, write using the api1000 structured directory layout.  Default True
+    :return: paths to all written files
+    """
+    return [write_packet(p, base_dir, structured) for c in configs for p in synthetic_packets(c)]
+
+
+def fleet_configs(num_stations: int, **kwargs) -> List[SyntheticStationConfig]:
+    """
+    :param num_stations: number of stations to describe
+    :param kwargs: any other SyntheticStationConfig parameters shared by all stations
+    :return: configs for num_stations stations with consecutive ids starting at 1000000001
+    """
+    return [SyntheticStationConfig(f"{1_000_000_001 + i}", **kwargs) for i in range(num_stations)]
@@ -0,0 +1,246 @@
+"""
+This module provides a metadata view of serialized API M packets.
+
+The view is a RedvoxPacketM decoded from a trimmed copy of the serialized packet.  The trimmed copy is made by walking
+the protobuf wire format and skipping the sample payloads of every sensor except location, which are the bulk of a
+packet.  Station information, station metrics, timing information, location and event streams are kept as-is.
+
+For each dropped payload, the statistics of that payload are updated so that the view still has:
+
+* the number of samples in value_statistics.count of SamplePayloads and DoubleSamplePayloads
+* the number of timestamps in timestamp_statistics.count of TimingPayloads
+* the first and last timestamps in timestamp_statistics.min and timestamp_statistics.max of TimingPayloads
+"""
+
+import struct
+from typing import Dict, NamedTuple, Optional, Tuple, Union
+
+import lz4.frame
+
+from redvox.api1000.errors import ApiMPacketMetadataError
+from redvox.api1000.proto.redvox_api_m_pb2 import RedvoxPacketM
+
+# protobuf wire types
+_VARINT: int = 0
+_I64: int = 1
+_LEN: int = 2
+_I32: int = 5
+
+_DOUBLE: struct.Struct = struct.Struct("<d")
+
+
+class _DroppedField(NamedTuple):
+    """
+    A repeated field that is skipped by the metadata view.
+
+    Properties:
+        item_size: int, size in bytes of each item of a packed numeric field, or 0 if each item is length delimited
+
+        stats_field: Optional[int], number of the SummaryStatistics field to record the item count in, or None
+
+        first_last: bool, if True, the first and last items are recorded as the min and max of the statistics
+    """
+
+    item_size: int
+    stats_field: Optional[int] = None
+    first_last: bool = False
+
+
+# A spec maps field numbers of a message to either the spec of a sub-message to skim or a field to drop.
+# Fields not in the spec are copied as they are.
+_Spec = Dict[int, Union["_Spec", _DroppedField]]
+
+_SAMPLE_PAYLOAD: _Spec = {2: _DroppedField(4, 3)}
+_TIMING_PAYLOAD: _Spec = {2: _DroppedField(8, 3, True)}
+_XYZ: _Spec = {2: _TIMING_PAYLOAD, 3: _SAMPLE_PAYLOAD, 4: _SAMPLE_PAYLOAD, 5: _SAMPLE_PAYLOAD}
+_SINGLE: _Spec = {2: _TIMING_PAYLOAD, 3: _SAMPLE_PAYLOAD}
+_AUDIO: _Spec = {7: _SAMPLE_PAYLOAD}
+_COMPRESSED_AUDIO: _Spec = {5: _DroppedField(0)}
+_IMAGE: _Spec = {2: _TIMING_PAYLOAD, 3: _DroppedField(0)}
+_SENSORS: _Spec = {
+    1: _XYZ,  # accelerometer
+    2: _SINGLE,  # ambient_temperature
+    3: _AUDIO,
+    4: _COMPRESSED_AUDIO,
+    5: _XYZ,  # gravity
+    6: _XYZ,  # gyroscope
+    7: _IMAGE,
+    8: _SINGLE,  # light
+    9: _XYZ,  # linear_acceleration
+    11: _XYZ,  # magnetometer
+    12: _XYZ,  # orientation
+    13: _SINGLE,  # pressure
+    14: _SINGLE,  # proximity
+    15: _SINGLE,  # relative_humidity
+    16: _XYZ,  # rotation_vector
+    17: _XYZ,  # velocity
+}
+_PACKET: _Spec = {5: _SENSORS}
+
+
+def _read_varint(buf: bytes, pos: int) -> Tuple[int, int]:
+    """
+    :param buf: serialized protobuf bytes
+    :param pos: position of the varint in buf
+    :return: the value of the varint and the position after it
+    """
+    result: int = 0
+    shift: int = 0
+    while True:
+        if pos >= len(buf):
+            raise ApiMPacketMetadataError("Truncated varint")
+        b: int = buf[pos]
+        pos += 1
+        result |= (b & 0x7F) << shift
+        if not b & 0x80:
+            return result, pos
+        shift += 7
+        if shift >= 64:
+            raise ApiMPacketMetadataError("Varint is too long")
+
+
+def _encode_varint(value: int) -> bytes:
+    """
+    :param value: non-negative value to encode
+    :return: the value encoded as a varint
+    """
+    out = bytearray()
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+
+def _len_field(field_number: int, value: bytes) -> bytes:
+    """
+    :param field_number: number of the field
+    :param value: serialized value of the field
+    :return: the length delimited field
+    """
+    return _encode_varint(field_number << 3 | _LEN) + _encode_varint(len(value)) + value
+
+
+def _double_field(field_number: int, value: float) -> bytes:
+    """
+    :param field_number: number of the field
+    :param value: value of the field
+    :return: the double field
+    """
+    return _encode_varint(field_number << 3 | _I64) + _DOUBLE.pack(value)
+
+
+def _skim_message(buf: bytes, start: int, end: int, spec: _Spec) -> bytearray:
+    """
+    :param buf: serialized protobuf bytes
+    :param start: position of the first field of the message in buf
+    :param end: position after the last field of the message in buf
+    :param spec: the fields of the message to skim or drop
+    :return: the message without its dropped fields
+    """
+    out = bytearray()
+    # field number -> [item count, position of first item, position of last item]
+    dropped: Dict[int, list] = {}
+    pos: int = start
+    while pos < end:
+        field_start: int = pos
+        tag, pos = _read_varint(buf, pos)
+        field_number: int = tag >> 3
+        wire_type: int = tag & 0x7
+        value_start: int = pos
+        if wire_type == _VARINT:
+            _, pos = _read_varint(buf, pos)
+        elif wire_type == _I64:
+            pos += 8
+        elif wire_type == _I32:
+            pos += 4
+        elif wire_type == _LEN:
+            length, value_start = _read_varint(buf, pos)
+            pos = value_start + length
+        else:
+            raise ApiMPacketMetadataError(f"Unsupported wire type {wire_type} for field {field_number}")
+        if pos > end:
+            raise ApiMPacketMetadataError(f"Field {field_number} runs past the end of its message")
+
+        rule = spec.get(field_number)
+        if rule is None:
+            out += buf[field_start:pos]
+        elif isinstance(rule, dict):
+            if wire_type != _LEN:
+                raise ApiMPacketMetadataError(f"Expected message for field {field_number}, got wire type {wire_type}")
+            out += _len_field(field_number, _skim_message(buf, value_start, pos, rule))
+        else:
+            record = dropped.setdefault(field_number, [0, value_start, value_start])
+            if wire_type == _LEN and rule.item_size > 0:
+                # packed numeric values
+                num_items: int = (pos - value_start) // rule.item_size
+                if num_items > 0:
+                    if record[0] == 0:
+                        record[1] = value_start
+                    record[2] = pos - rule.item_size
+                    record[0] += num_items
+            else:
+                # a single item, either length delimited or an unpacked numeric value
+                if record[0] == 0:
+                    record[1] = value_start
+                record[2] = value_start
+                record[0] += 1
+
+    for field_number, (count, first, last) in dropped.items():
+        rule = spec[field_number]
+        if rule.stats_field is None:
+            continue
+        stats: bytes = _double_field(1, float(count))
+        if rule.first_last and rule.item_size == _DOUBLE.size and count > 0:
+            stats += _double_field(4, _DOUBLE.unpack_from(buf, first)[0])
+            stats += _double_field(5, _DOUBLE.unpack_from(buf, last)[0])
+        # a repeated sub-message field is merged into the earlier one by the parser, overwriting these values
+        out += _len_field(rule.stats_field, stats)
+    return out
+
+
+def skim_packet_bytes(serialized: bytes) -> bytes:
+    """
+    Removes the sample payloads of a serialized RedvoxPacketM.  See the module documentation for what is kept.
+
+    :param serialized: uncompressed serialized RedvoxPacketM
+    :return: the serialized metadata view of the packet
+    """
+    return bytes(_skim_message(serialized, 0, len(serialized), _PACKET))
+
+
+def read_metadata_buffer(serialized: bytes) -> RedvoxPacketM:
+    """
+    :param serialized: uncompressed serialized RedvoxPacketM
+    :return: the metadata view of the packet
+    """
+    proto: RedvoxPacketM = RedvoxPacketM()
+    proto.ParseFromString(skim_packet_bytes(serialized))
+    return proto
+
+
+def read_metadata_compressed(data: bytes) -> RedvoxPacketM:
+    """
+    :param data: lz4 compressed serialized RedvoxPacketM, the contents of a .rdvxm file
+    :return: the metadata view of the packet
+    """
+    return read_metadata_buffer(lz4.frame.decompress(data))
+
+
+def read_metadata_path(rdvxm_path: str) -> RedvoxPacketM:
+    """
+    :param rdvxm_path: path to a .rdvxm file
+    :return: the metadata view of the packet in the file
+    """
+    with lz4.frame.open(rdvxm_path, "rb") as serialized_in:
+        return read_metadata_buffer(serialized_in.read())
+
+
+def get_num_samples(payload: Union[RedvoxPacketM.SamplePayload, RedvoxPacketM.DoubleSamplePayload]) -> int:
+    """
+    :param payload: a sample payload of a full packet or of a metadata view
+    :return: the number of samples in the payload
+    """
+    if len(payload.values) > 0:
+        return len(payload.values)
+    return int(payload.value_statistics.count)
@@ -100,3 +100,12 @@ class ApiMOtherError(ApiMError):
 
     def __init__(self, message: str):
         super().__init__(f"ApiMOtherError: {message}")
+
+
+class ApiMPacketMetadataError(ApiMError):
+    """
+    An error while skimming the metadata of a serialized packet.
+    """
+
+    def __init__(self, message: str):
+        super().__init__(f"ApiMPacketMetadataError: {message}")
@@ -8,6 +8,7 @@ import typing
 import numpy as _np
 
 import redvox.common.date_time_utils as _date_time_utils
+import redvox.api900.constants as _constants
 import redvox.api900.exceptions as _exceptions
 import redvox.api900.sensors.evenly_sampled_sensor as evenly_sampled_sensor
 import redvox.api900.sensors.unevenly_sampled_sensor as unevenly_sampled_sensor
@@ -101,6 +102,87 @@ def _packet_len_s(wrapped_redvox_packet) -> float:
     return len(microphone_sensor.payload_values()) / microphone_sensor.sample_rate_hz()
 
 
+# The sensor presence checks that make up each packet's sensor presence bitmask
+_SENSOR_PRESENCE_FNS: typing.List[str] = ["has_microphone_sensor",
+                                          "has_barometer_sensor",
+                                          "has_time_synchronization_sensor",
+                                          "has_accelerometer_sensor",
+                                          "has_gyroscope_sensor",
+                                          "has_infrared_sensor",
+                                          "has_light_sensor",
+                                          "has_image_sensor",
+                                          "has_location_sensor",
+                                          "has_magnetometer_sensor"]
+
+
+def _sensor_presence(wrapped_redvox_packet) -> int:
+    """
+    Returns a bitmask of the sensors present in a packet.
+    :param wrapped_redvox_packet: The packet to check.
+    :return: A bitmask where bit i is set if the sensor checked by _SENSOR_PRESENCE_FNS[i] is present.
+    """
+    presence: int = 0
+    for i, presence_fn in enumerate(_SENSOR_PRESENCE_FNS):
+        if getattr(wrapped_redvox_packet, presence_fn)():
+            presence |= 1 << i
+    return presence
+
+
+def _continuity_columns(wrapped_redvox_packets) -> typing.Tuple[_np.ndarray, _np.ndarray, _np.ndarray, _np.ndarray]:
+    """
+    Extracts the values used to find discontinuities from each packet in a single pass.
+    :param wrapped_redvox_packets: Packets to extract values from.
+    :return: Arrays of the sensor presence bitmasks, first microphone sample timestamps in microseconds, packet lengths
+             in seconds, and mach time zeros (None when not present) of each packet.
+    """
+    num_packets: int = len(wrapped_redvox_packets)
+    presence: _np.ndarray = _np.empty(num_packets, dtype=_np.int64)
+    first_sample_timestamps: _np.ndarray = _np.empty(num_packets, dtype=_np.float64)
+    packet_lens_s: _np.ndarray = _np.empty(num_packets, dtype=_np.float64)
+    mach_time_zeros: _np.ndarray = _np.empty(num_packets, dtype=object)
+
+    for i, wrapped_redvox_packet in enumerate(wrapped_redvox_packets):
+        microphone_sensor = wrapped_redvox_packet.microphone_sensor()
+        presence[i] = _sensor_presence(wrapped_redvox_packet)
+        first_sample_timestamps[i] = microphone_sensor.first_sample_timestamp_epoch_microseconds_utc()
+        packet_lens_s[i] = len(microphone_sensor.payload_values()) / microphone_sensor.sample_rate_hz()
+        mach_time_zeros[i] = wrapped_redvox_packet.mach_time_zero()
+
+    return presence, first_sample_timestamps, packet_lens_s, mach_time_zeros
+
+
+def _changed(values: _np.ndarray) -> _np.ndarray:
+    """
+    :param values: Values to compare.
+    :return: The indices of the values that differ from the previous value.
+    """
+    return _np.flatnonzero(values[1:] != values[:-1]) + 1
+
+
+def _identify_time_gaps(first_sample_timestamps: _np.ndarray,
+                        packet_lens_s: _np.ndarray,
+                        allowed_timing_error_s: float) -> _np.ndarray:
+    """
+    Identifies packets that start more than the expected packet length plus the allowed error after the previous packet.
+    The expected packet length is the length of the first packet, and of the packet after each time gap after that.
+    :param first_sample_timestamps: The first sample timestamps of each packet in microseconds.
+    :param packet_lens_s: The length of each packet in seconds.
+    :param allowed_timing_error_s: The amount of timing error in seconds.
+    :return: The indices of the packets that follow a time gap.
+    """
+    deltas_s: _np.ndarray = _date_time_utils.microseconds_to_seconds(_np.diff(first_sample_timestamps))
+    time_gaps: typing.List[int] = []
+    # Only the packets after a time gap change the expected length, so search for each gap in turn
+    start: int = 0
+    while start < len(deltas_s):
+        late: _np.ndarray = _np.flatnonzero(deltas_s[start:] > packet_lens_s[start] + allowed_timing_error_s)
+        if len(late) == 0:
+            break
+        start += int(late[0]) + 1
+        time_gaps.append(start)
+    return _np.array(time_gaps, dtype=_np.int64)
+
+
 def _identify_gaps(wrapped_redvox_packets,
                    allowed_timing_error_s: float) -> typing.List[int]:
     """
@@ -113,57 +195,12 @@ def _identify_gaps(wrapped_redvox_packets,
     if len(wrapped_redvox_packets) <= 1:
         return []
 
-    gaps = set()
-
-    truth_len = _packet_len_s(wrapped_redvox_packets[0])
-    for i in range(1, len(wrapped_redvox_packets)):
-        prev_packet = wrapped_redvox_packets[i - 1]
-        next_packet = wrapped_redvox_packets[i]
-
-        # Sensor discontinuity
-        prev_sensors = [prev_packet.has_microphone_sensor(),
-                        prev_packet.has_barometer_sensor(),
-                        prev_packet.has_time_synchronization_sensor(),
-                        prev_packet.has_accelerometer_sensor(),
-                        prev_packet.has_gyroscope_sensor(),
-                        prev_packet.has_infrared_sensor(),
-                        prev_packet.has_light_sensor(),
-                        prev_packet.has_image_sensor(),
-                        prev_packet.has_location_sensor(),
-                        prev_packet.has_magnetometer_sensor()]
-
-        next_sensors = [next_packet.has_microphone_sensor(),
-                        next_packet.has_barometer_sensor(),
-                        next_packet.has_time_synchronization_sensor(),
-                        next_packet.has_accelerometer_sensor(),
-                        next_packet.has_gyroscope_sensor(),
-                        next_packet.has_infrared_sensor(),
-                        next_packet.has_light_sensor(),
-                        next_packet.has_image_sensor(),
-                        next_packet.has_location_sensor(),
-                        next_packet.has_magnetometer_sensor()]
-
-        # pylint: disable=C0200
-        for j in range(len(prev_sensors)):
-            if prev_sensors[j] != next_sensors[j]:
-                gaps.add(i)
-
-        # Time based gaps
-        prev_timestamp = prev_packet.microphone_sensor().first_sample_timestamp_epoch_microseconds_utc()
-        next_timestamp = next_packet.microphone_sensor().first_sample_timestamp_epoch_microseconds_utc()
-        # print(next_timestamp - prev_timestamp)
-        if _date_time_utils.microseconds_to_seconds(next_timestamp - prev_timestamp) > (
-                truth_len + allowed_timing_error_s):
-            gaps.add(i)
-            print("time gap")
-            truth_len = _packet_len_s(wrapped_redvox_packets[i])
-        prev_mach_time_zero = prev_packet.mach_time_zero()
-        next_mach_time_zero = next_packet.mach_time_zero()
-        if next_mach_time_zero != prev_mach_time_zero:
-            gaps.add(i)
-            print("mach time zero gap")
-
-    return sorted(list(gaps))
+    presence, first_sample_timestamps, packet_lens_s, mach_time_zeros = _continuity_columns(wrapped_redvox_packets)
+
+    gaps: _np.ndarray = _np.union1d(_changed(presence), _changed(mach_time_zeros))
+    gaps = _np.union1d(gaps, _identify_time_gaps(first_sample_timestamps, packet_lens_s, allowed_timing_error_s))
+
+    return gaps.tolist()
 
 
 def _identify_sensor_changes(wrapped_redvox_packets: typing.List) -> typing.List[int]:
@@ -175,17 +212,8 @@ def _identify_sensor_changes(wrapped_redvox_packets: typing.List) -> typing.List
     if len(wrapped_redvox_packets) <= 1:
         return []
 
-    sensor_changes: typing.List[int] = []
-    truth_hash = _partial_hash_packet(wrapped_redvox_packets[0])
-    for i in range(1, len(wrapped_redvox_packets)):
-        next_packet = wrapped_redvox_packets[i]
-
-        candidate_hash = _partial_hash_packet(next_packet)
-        if truth_hash != candidate_hash:
-            sensor_changes.append(i)
-            truth_hash = candidate_hash
-
-    return sensor_changes
+    hashes: _np.ndarray = _np.array(list(map(_partial_hash_packet, wrapped_redvox_packets)), dtype=_np.int64)
+    return _changed(hashes).tolist()
 
 
 def _concat_numpy(sensors: RedvoxSensors,
@@ -212,6 +240,24 @@ def _concat_lists(sensors: RedvoxSensors,
     return list(itertools.chain(*metadata_list))
 
 
+# pylint: disable=W0212
+def _concat_interleaved(sensors: RedvoxSensors, pl_type: _constants.PayloadType) -> bool:
+    """
+    Concatenates the interleaved payloads of multi-channel sensors into the first sensor with a single concatenation,
+    rather than deinterleaving, concatenating, and then interleaving each channel again.
+    :param sensors: Unevenly sampled sensors to concatenate the payloads of.
+    :param pl_type: The payload type to store the concatenated payload as.
+    :return: True if the payloads were concatenated, or False if the sensors do not share the same channel types.
+    """
+    channels = [sensor._unevenly_sampled_channel for sensor in sensors]
+    channel_types: typing.List[int] = channels[0].channel_types
+    if any(channel.channel_types != channel_types for channel in channels[1:]):
+        return False
+
+    channels[0].set_payload(_np.concatenate([channel.payload for channel in channels]), pl_type)
+    return True
+
+
 def _concat_continuous_data(wrapped_redvox_packets: list):
     """
     Given a set of continuous wrapped redvox packets, concatenate the packets together by concatting the timestamps,
@@ -239,13 +285,14 @@ def _concat_continuous_data(wrapped_redvox_packets: list):
     if first_packet.has_location_sensor():
         # sensors = list(map(WrappedRedvoxPacket.location_sensor, wrapped_redvox_packets))
         sensors = [packet.location_sensor() for packet in wrapped_redvox_packets]
-        sensors[0].set_payload_values(
-            _concat_numpy(sensors, _location_sensor.LocationSensor.payload_values_latitude),
-            _concat_numpy(sensors, _location_sensor.LocationSensor.payload_values_longitude),
-            _concat_numpy(sensors, _location_sensor.LocationSensor.payload_values_altitude),
-            _concat_numpy(sensors, _location_sensor.LocationSensor.payload_values_speed),
-            _concat_numpy(sensors, _location_sensor.LocationSensor.payload_values_accuracy)
-        ) \
+        if not _concat_interleaved(sensors, _constants.PayloadType.FLOAT64_PAYLOAD):
+            sensors[0].set_payload_values(
+                _concat_numpy(sensors, _location_sensor.LocationSensor.payload_values_latitude),
+                _concat_numpy(sensors, _location_sensor.LocationSensor.payload_values_longitude),
+                _concat_numpy(sensors, _location_sensor.LocationSensor.payload_values_altitude),
+                _concat_numpy(sensors, _location_sensor.LocationSensor.payload_values_speed),
+                _concat_numpy(sensors, _location_sensor.LocationSensor.payload_values_accuracy))
+        sensors[0] \
             .set_timestamps_microseconds_utc(
                 _concat_numpy(sensors, _location_sensor.LocationSensor.timestamps_microseconds_utc)) \
             .set_metadata(_concat_lists(sensors, _location_sensor.LocationSensor.metadata))
@@ -261,11 +308,12 @@ def _concat_continuous_data(wrapped_redvox_packets: list):
     if first_packet.has_magnetometer_sensor():
         # sensors = list(map(WrappedRedvoxPacket.magnetometer_sensor, wrapped_redvox_packets))
         sensors = [packet.magnetometer_sensor() for packet in wrapped_redvox_packets]
-        sensors[0].set_payload_values(
-            _concat_numpy(sensors, _magnetometer_sensor.MagnetometerSensor.payload_values_x),
-            _concat_numpy(sensors, _magnetometer_sensor.MagnetometerSensor.payload_values_y),
-            _concat_numpy(sensors, _magnetometer_sensor.MagnetometerSensor.payload_values_z)
-        ) \
+        if not _concat_interleaved(sensors, _constants.PayloadType.FLOAT64_PAYLOAD):
+            sensors[0].set_payload_values(
+                _concat_numpy(sensors, _magnetometer_sensor.MagnetometerSensor.payload_values_x),
+                _concat_numpy(sensors, _magnetometer_sensor.MagnetometerSensor.payload_values_y),
+                _concat_numpy(sensors, _magnetometer_sensor.MagnetometerSensor.payload_values_z))
+        sensors[0] \
             .set_timestamps_microseconds_utc(
                 _concat_numpy(sensors, _magnetometer_sensor.MagnetometerSensor.timestamps_microseconds_utc)) \
             .set_metadata(_concat_lists(sensors, _magnetometer_sensor.MagnetometerSensor.metadata))
@@ -273,11 +321,12 @@ def _concat_continuous_data(wrapped_redvox_packets: list):
     if first_packet.has_accelerometer_sensor():
         # sensors = list(map(WrappedRedvoxPacket.accelerometer_sensor, wrapped_redvox_packets))
         sensors = [packet.accelerometer_sensor() for packet in wrapped_redvox_packets]
-        sensors[0].set_payload_values(
-            _concat_numpy(sensors, _accelerometer_sensor.AccelerometerSensor.payload_values_x),
-            _concat_numpy(sensors, _accelerometer_sensor.AccelerometerSensor.payload_values_y),
-            _concat_numpy(sensors, _accelerometer_sensor.AccelerometerSensor.payload_values_z)
-        ) \
+        if not _concat_interleaved(sensors, _constants.PayloadType.FLOAT64_PAYLOAD):
+            sensors[0].set_payload_values(
+                _concat_numpy(sensors, _accelerometer_sensor.AccelerometerSensor.payload_values_x),
+                _concat_numpy(sensors, _accelerometer_sensor.AccelerometerSensor.payload_values_y),
+                _concat_numpy(sensors, _accelerometer_sensor.AccelerometerSensor.payload_values_z))
+        sensors[0] \
             .set_timestamps_microseconds_utc(
                 _concat_numpy(sensors, _accelerometer_sensor.AccelerometerSensor.timestamps_microseconds_utc)) \
             .set_metadata(_concat_lists(sensors, _accelerometer_sensor.AccelerometerSensor.metadata))
@@ -285,11 +334,12 @@ def _concat_continuous_data(wrapped_redvox_packets: list):
     if first_packet.has_gyroscope_sensor():
         # sensors = list(map(WrappedRedvoxPacket.gyroscope_sensor, wrapped_redvox_packets))
         sensors = [packet.gyroscope_sensor() for packet in wrapped_redvox_packets]
-        sensors[0].set_payload_values(
-            _concat_numpy(sensors, _gyroscope_sensor.GyroscopeSensor.payload_values_x),
-            _concat_numpy(sensors, _gyroscope_sensor.GyroscopeSensor.payload_values_y),
-            _concat_numpy(sensors, _gyroscope_sensor.GyroscopeSensor.payload_values_z)
-        ) \
+        if not _concat_interleaved(sensors, _constants.PayloadType.FLOAT64_PAYLOAD):
+            sensors[0].set_payload_values(
+                _concat_numpy(sensors, _gyroscope_sensor.GyroscopeSensor.payload_values_x),
+                _concat_numpy(sensors, _gyroscope_sensor.GyroscopeSensor.payload_values_y),
+                _concat_numpy(sensors, _gyroscope_sensor.GyroscopeSensor.payload_values_z))
+        sensors[0] \
             .set_timestamps_microseconds_utc(
                 _concat_numpy(sensors, _gyroscope_sensor.GyroscopeSensor.timestamps_microseconds_utc)) \
             .set_metadata(_concat_lists(sensors, _gyroscope_sensor.GyroscopeSensor.metadata))
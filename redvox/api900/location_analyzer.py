@@ -18,7 +18,7 @@ Haversine equation constants from site: https://movable-type.co.uk/scripts/gis-f
 """
 import pandas as pd
 import numpy as np
-from typing import List, Dict, Optional, Tuple
+from typing import List, Dict, Optional, Tuple, Union
 from fastkml import kml, styles
 from fastkml.geometry import Point
 from redvox.api900 import reader
@@ -71,7 +71,8 @@ class DataHolder:
 
     Properties:
         * id: a string identifier for the data
-        * _data: private data storage; all values must be floats
+        * _data: private data storage; a numpy array of floats
+        * _added: private list of floats added one at a time, moved into _data when the data is read
         * best_value: the value that best represents the data set
     """
 
@@ -82,56 +83,73 @@ class DataHolder:
         :param name: a string identifier for the data
         """
         self.id = name
-        self._data = []
+        self._data = np.array([], dtype=float)
+        self._added: List[float] = []
         self.best_value = None
 
     def add(self, new_data: float):
         """
-        adds one element to the data
+        adds one element to the data.  Use set_data to add many elements at once.
         :param new_data: float value to add
         """
-        self._data.append(new_data)
-        self.replace_zeroes_with_epsilon()
+        self._added.append(EPSILON if new_data == 0.0 else new_data)
 
-    def set_data(self, new_data: List[float]):
+    def set_data(self, new_data: Union[List[float], np.ndarray]):
         """
         overwrites the stored data with the new_data
-        :param new_data: the new list of floats to overwrite the existing data with
+        :param new_data: the new list or array of floats to overwrite the existing data with
         """
-        self._data = new_data
+        self._data = np.asarray(new_data, dtype=float)
+        self._added = []
         self.replace_zeroes_with_epsilon()
 
+    def _merge_added(self):
+        """
+        moves the elements added one at a time into the data array
+        """
+        if self._added:
+            self._data = np.concatenate([self._data, np.asarray(self._added, dtype=float)])
+            self._added = []
+
     def replace_zeroes_with_epsilon(self):
         """
         replaces all 0 values in the data with extremely tiny values
         """
-        for index in range(len(self._data)):
-            if self._data[index] == 0.0:
-                self._data[index] = EPSILON
+        self._merge_added()
+        self._data = np.where(self._data == 0.0, EPSILON, self._data)
 
     def get_mean(self) -> float:
         """
         :return: the mean of the data
         """
+        self._merge_added()
         return np.mean(self._data)
 
     def get_std(self) -> float:
         """
         :return: the standard deviation of the data
         """
+        self._merge_added()
         return np.std(self._data)
 
     def get_data(self) -> List[float]:
         """
         :return: the data
         """
+        return self.get_data_array().tolist()
+
+    def get_data_array(self) -> np.ndarray:
+        """
+        :return: the data as a numpy array
+        """
+        self._merge_added()
         return self._data
 
     def get_len_data(self) -> int:
         """
         :return: the length of the data array
         """
-        return len(self._data)
+        return len(self._data) + len(self._added)
 
 
 class GPSDataHolder:
@@ -256,6 +274,12 @@ class GPSDataHolder:
         """
         return self.gps_df.iloc[0].size, self.barometer.get_len_data()
 
+    def get_gps_array(self) -> np.ndarray:
+        """
+        :return: the gps data as an array with one row each for latitude, longitude, altitude and accuracy
+        """
+        return self.gps_df.to_numpy(dtype=float).reshape(len(GPS_DATA_INDICES), -1)
+
 
 class LocationAnalyzer:
     """
@@ -397,12 +421,10 @@ class LocationAnalyzer:
         :param sea_pressure: the local sea pressure in kPa, default AVG_SEA_LEVEL_PRESSURE_KPA
         :return: a dataframe with the barometric heights in meters and station id as the index
         """
-        bar_heights = {}
-        data_dict = self.all_stations_mean_df["mean bar"].T.to_dict()
-        for index in data_dict.keys():
-            bar_heights[index] = compute_barometric_height(data_dict[index], sea_pressure)
-        barometric_heights = pd.DataFrame(bar_heights, index=["bar height"], columns=self.all_stations_mean_df.index)
-        return barometric_heights.T
+        bar_heights = compute_barometric_height_array(
+            self.all_stations_mean_df["mean bar"].to_numpy(dtype=float), sea_pressure
+        )
+        return pd.DataFrame({"bar height": bar_heights}, index=self.all_stations_mean_df.index)
 
     def validate_all(
         self,
@@ -418,12 +440,10 @@ class LocationAnalyzer:
         """
         # validation always assumes nothing is valid when it starts, so empty out the valid_gps_data
         self.valid_gps_data = []
-        for station in self.all_gps_data:
-            # if self._real_location is not None:
-            #     validated_gps = self.validator(station, self._real_location)
-            # else:
-            #     validated_gps = validate_data(station)
-            validated_gps = validate(station, validation_ranges, "blacklist", self.invalid_points)
+        # validate the points of all stations at once
+        for validated_gps in validate_all_stations(
+            self.all_gps_data, validation_ranges, "blacklist", self.invalid_points
+        ):
             if validated_gps.get_size()[0] != 0:
                 self.valid_gps_data.append(validated_gps)
 
@@ -513,6 +533,7 @@ def load_position_data(w_p: List[reader.WrappedRedvoxPacket]) -> GPSDataHolder:
     :param w_p: list of wrapped packets to read
     :return: all gps data from the packets in a GPSDataHolder
     """
+    # arrays of each packet's data, which are concatenated once all packets are read
     gps_data = [[], [], [], []]
     packet = None
     packet_name = None
@@ -522,24 +543,22 @@ def load_position_data(w_p: List[reader.WrappedRedvoxPacket]) -> GPSDataHolder:
             packet_name = packet.default_filename()
             if packet.has_barometer_sensor():
                 bar_chan = packet.barometer_sensor()  # load barometer data
-                bar_data.extend(bar_chan.payload_values())
+                bar_data.append(bar_chan.payload_values())
             else:
                 # add defaults
-                bar_data.extend([0.0])
+                bar_data.append([0.0])
                 print("WARNING: {} Barometer empty, using default values!".format(packet_name))
             if packet.has_location_sensor():
                 # load each channel's data into the container
                 loc_chan = packet.location_sensor()
-                gps_data[0].extend(loc_chan.payload_values_latitude())
-                gps_data[1].extend(loc_chan.payload_values_longitude())
-                gps_data[2].extend(loc_chan.payload_values_altitude())
-                gps_data[3].extend(loc_chan.payload_values_accuracy())
+                gps_data[0].append(loc_chan.payload_values_latitude())
+                gps_data[1].append(loc_chan.payload_values_longitude())
+                gps_data[2].append(loc_chan.payload_values_altitude())
+                gps_data[3].append(loc_chan.payload_values_accuracy())
             else:
                 # add defaults
-                gps_data[0].extend([0.0])
-                gps_data[1].extend([0.0])
-                gps_data[2].extend([0.0])
-                gps_data[3].extend([0.0])
+                for channel_data in gps_data:
+                    channel_data.append([0.0])
                 print("WARNING: {} Location empty, using default values!".format(packet_name))
     except Exception as eror:
         if packet is not None:
@@ -550,8 +569,9 @@ def load_position_data(w_p: List[reader.WrappedRedvoxPacket]) -> GPSDataHolder:
 
     # load data into data holder
     redvox_id = w_p[0].redvox_id()
-    gps_dfh = GPSDataHolder(str(redvox_id), w_p[0].device_os(), gps_data, w_p[0].microphone_sensor().sample_rate_hz())
-    gps_dfh.set_barometer(bar_data)
+    gps_array = np.array([np.concatenate(channel_data).astype(float) for channel_data in gps_data])
+    gps_dfh = GPSDataHolder(str(redvox_id), w_p[0].device_os(), gps_array, w_p[0].microphone_sensor().sample_rate_hz())
+    gps_dfh.set_barometer(np.concatenate(bar_data).astype(float))
 
     return gps_dfh
 
@@ -618,15 +638,55 @@ def compute_barometric_height_array(
     # due to log function, we can't let sea_pressure or barometric_pressure be 0
     if sea_pressure == 0.0:
         sea_pressure = EPSILON
-    for index in range(len(barometric_pressure)):
-        if barometric_pressure[index] == 0.0:
-            barometric_pressure[index] = EPSILON
+    barometric_pressure = np.asarray(barometric_pressure, dtype=float)
+    barometric_pressure = np.where(barometric_pressure == 0.0, EPSILON, barometric_pressure)
     barometric_height = np.log(sea_pressure / barometric_pressure) / (
         (molar_air_mass * gravity) / (standard_temp * gas_constant)
     )
     return barometric_height
 
 
+def _haversine_m(point: Dict[str, float], latitudes: np.ndarray, longitudes: np.ndarray) -> np.ndarray:
+    """
+    compute horizontal distance from many gps coordinates to the chosen point using haversine formula
+    :param point: dict with location to compute distance to
+    :param latitudes: array of latitudes in degrees
+    :param longitudes: array of longitudes in degrees, same length as latitudes
+    :return: array of horizontal distances in meters
+    """
+    dlon = longitudes - point["lon"]
+    dlat = latitudes - point["lat"]
+    haver = np.sin(dlat * DEG_TO_RAD / 2.0) ** 2.0 + (
+        np.cos(point["lat"] * DEG_TO_RAD) * np.cos(latitudes * DEG_TO_RAD) * np.sin(dlon * DEG_TO_RAD / 2.0) ** 2.0
+    )
+    c = 2.0 * np.arcsin(np.minimum(1.0, np.sqrt(haver)))
+    return EARTH_RADIUS_M * c
+
+
+def get_component_dist_to_points(
+    point: Dict[str, float],
+    latitudes: np.ndarray,
+    longitudes: np.ndarray,
+    altitudes: np.ndarray,
+    bar_heights: Union[float, np.ndarray],
+) -> (np.ndarray, np.ndarray, np.ndarray):
+    """
+    compute distance from many gps data points to the chosen point using haversine formula
+    :param point: dict with location to compute distance to
+    :param latitudes: array of latitudes in degrees
+    :param longitudes: array of longitudes in degrees
+    :param altitudes: array of altitudes in meters
+    :param bar_heights: the barometric height of each point in meters, or one height for all points
+    :return: arrays of the distance in meters of the horizontal and vertical gps components and barometer readings
+    """
+    h_dist = _haversine_m(point, latitudes, longitudes)
+    # vertical distance
+    v_dist = np.abs(altitudes - point["alt"])
+    # vertical distance using barometer
+    v_bar_dist = np.abs(bar_heights - point["alt"])
+    return h_dist, v_dist, v_bar_dist
+
+
 def get_component_dist_to_point(point: Dict[str, float], gps_data: pd.Series, bar_mean: float) -> (float, float, float):
     """
     compute distance from the gps data point to the chosen point using haversine formula
@@ -635,21 +695,13 @@ def get_component_dist_to_point(point: Dict[str, float], gps_data: pd.Series, ba
     :param bar_mean: the mean barometer reading
     :return: the distance in meters of the horizontal and vertical gps components and barometer readings
     """
-    # horizontal distance, use haversine formula
-    dlon = gps_data["longitude"] - point["lon"]
-    dlat = gps_data["latitude"] - point["lat"]
-    haver = np.sin(dlat * DEG_TO_RAD / 2.0) ** 2.0 + (
-        np.cos(point["lat"] * DEG_TO_RAD)
-        * np.cos(gps_data["latitude"] * DEG_TO_RAD)
-        * np.sin(dlon * DEG_TO_RAD / 2.0) ** 2.0
+    return get_component_dist_to_points(
+        point,
+        gps_data["latitude"],
+        gps_data["longitude"],
+        gps_data["altitude"],
+        compute_barometric_height(bar_mean),
     )
-    c = 2.0 * np.arcsin(np.min([1.0, np.sqrt(haver)]))
-    h_dist = EARTH_RADIUS_M * c
-    # vertical distance
-    v_dist = np.abs(gps_data["altitude"] - point["alt"])
-    # vertical distance using barometer
-    v_bar_dist = np.abs(compute_barometric_height(bar_mean) - point["alt"])
-    return h_dist, v_dist, v_bar_dist
 
 
 def get_gps_dist_to_location(
@@ -662,26 +714,72 @@ def get_gps_dist_to_location(
     :param bar_alt: height as measured by a barometer, default None
     :return: array of all distances in meters from gps point to chosen point
     """
+    gps_array = gps_dataholder.get_gps_array()
     # compute distance from the gps data points to the location
     # if given a barometer altitude value, use that instead of the gps altitude
     if bar_alt is not None:
         station_alt = bar_alt
     else:
-        station_alt = gps_dataholder.gps_df.loc["altitude"].to_numpy()
-    # user haversine formula
-    dlon = gps_dataholder.gps_df.loc["longitude"].to_numpy() - point["lon"]
-    dlat = gps_dataholder.gps_df.loc["latitude"].to_numpy() - point["lat"]
-    haver = np.sin(dlat * DEG_TO_RAD / 2.0) ** 2.0 + (
-        np.cos(point["lat"] * DEG_TO_RAD)
-        * np.cos(gps_dataholder.gps_df.loc["latitude"].to_numpy() * DEG_TO_RAD)
-        * np.sin(dlon * DEG_TO_RAD / 2.0) ** 2.0
-    )
-    c = 2 * np.arcsin(np.minimum([1.0], np.sqrt(haver)))
-    h_dist = EARTH_RADIUS_M * c
+        station_alt = gps_array[2]
+    h_dist = _haversine_m(point, gps_array[0], gps_array[1])
     dist_array = h_dist**2 + (point["alt"] - station_alt) ** 2
     return np.sqrt(dist_array)
 
 
+def validate_blacklist_points(
+    latitudes: np.ndarray,
+    longitudes: np.ndarray,
+    altitudes: np.ndarray,
+    bar_heights: Union[float, np.ndarray],
+    point: Dict[str, float],
+    inclusion_ranges: Tuple[float, float, float] = (
+        DEFAULT_INCLUSION_HORIZONTAL_M,
+        DEFAULT_INCLUSION_VERTICAL_M,
+        DEFAULT_INCLUSION_VERTICAL_BAR_M,
+    ),
+) -> np.ndarray:
+    """
+    :param latitudes: array of latitudes to compare
+    :param longitudes: array of longitudes to compare
+    :param altitudes: array of altitudes to compare
+    :param bar_heights: the barometric height of each point in meters, or one height for all points
+    :param point: the point that is blacklisted
+    :param inclusion_ranges: distance from blacklisted point to be considered close enough
+    :return: boolean array, True where the point is not in blacklisted point's vicinity
+    """
+    # calculate distance from gps data to invalid point
+    h_dist, v_dist, v_bar_dist = get_component_dist_to_points(point, latitudes, longitudes, altitudes, bar_heights)
+    # if outside horizontal and vertical distance, we're far enough away from the invalid point
+    return (h_dist > inclusion_ranges[0]) & ((v_dist > inclusion_ranges[1]) | (v_bar_dist > inclusion_ranges[2]))
+
+
+def validate_near_points(
+    latitudes: np.ndarray,
+    longitudes: np.ndarray,
+    altitudes: np.ndarray,
+    bar_heights: Union[float, np.ndarray],
+    point: Dict[str, float],
+    inclusion_ranges: Tuple[float, float, float] = (
+        DEFAULT_INCLUSION_HORIZONTAL_M,
+        DEFAULT_INCLUSION_VERTICAL_M,
+        DEFAULT_INCLUSION_VERTICAL_BAR_M,
+    ),
+) -> np.ndarray:
+    """
+    :param latitudes: array of latitudes to compare
+    :param longitudes: array of longitudes to compare
+    :param altitudes: array of altitudes to compare
+    :param bar_heights: the barometric height of each point in meters, or one height for all points
+    :param point: the chosen point to compare against
+    :param inclusion_ranges: distance from chosen point to be considered close enough
+    :return: boolean array, True where the point is within the chosen point's vicinity
+    """
+    # calculate distance from gps data to point
+    h_dist, v_dist, v_bar_dist = get_component_dist_to_points(point, latitudes, longitudes, altitudes, bar_heights)
+    # if within horizontal distance and vertical distance, we're close enough to the point
+    return (h_dist <= inclusion_ranges[0]) & ((v_dist <= inclusion_ranges[1]) | (v_bar_dist <= inclusion_ranges[2]))
+
+
 def validate_blacklist(
     gps_data: pd.Series,
     point: Dict[str, float],
@@ -699,10 +797,16 @@ def validate_blacklist(
     :param inclusion_ranges: distance from blacklisted point to be considered close enough
     :return: True if point is not in blacklisted point's vicinity
     """
-    # calculate distance from gps data to invalid point
-    h_dist, v_dist, v_bar_dist = get_component_dist_to_point(point, gps_data, bar_mean)
-    # if outside horizontal and vertical distance, we're far enough away from the invalid point
-    return h_dist > inclusion_ranges[0] and (v_dist > inclusion_ranges[1] or v_bar_dist > inclusion_ranges[2])
+    return bool(
+        validate_blacklist_points(
+            gps_data["latitude"],
+            gps_data["longitude"],
+            gps_data["altitude"],
+            compute_barometric_height(bar_mean),
+            point,
+            inclusion_ranges,
+        )
+    )
 
 
 def validate_near_point(
@@ -722,10 +826,16 @@ def validate_near_point(
     :param inclusion_ranges: distance from chosen point to be considered close enough
     :return: True if point is within the chosen point's vicinity
     """
-    # calculate distance from gps data to point
-    h_dist, v_dist, v_bar_dist = get_component_dist_to_point(point, gps_data, bar_mean)
-    # if within horizontal distance and vertical distance, we're close enough to the point
-    return h_dist <= inclusion_ranges[0] and (v_dist <= inclusion_ranges[1] or v_bar_dist <= inclusion_ranges[2])
+    return bool(
+        validate_near_points(
+            gps_data["latitude"],
+            gps_data["longitude"],
+            gps_data["altitude"],
+            compute_barometric_height(bar_mean),
+            point,
+            inclusion_ranges,
+        )
+    )
 
 
 def point_on_line_side(line_points: Tuple[Dict[str, float], Dict[str, float]], point: Dict[str, float]) -> float:
@@ -742,6 +852,34 @@ def point_on_line_side(line_points: Tuple[Dict[str, float], Dict[str, float]], p
     ) * (line_points[1]["lat"] - line_points[0]["lat"])
 
 
+def validate_points_in_polygon(
+    latitudes: np.ndarray, longitudes: np.ndarray, edges: List[Dict[str, float]]
+) -> np.ndarray:
+    """
+    Use winding number algorithm to determine which points are in a polygon (or on the edge)
+
+    if winding number is 0, point is outside polygon.  loops over the edges of the polygon, with all points tested
+    against an edge at once
+
+    algorithm from: http://geomalgorithms.com/a03-_inclusion.html
+    :param latitudes: array of latitudes of the points to compare
+    :param longitudes: array of longitudes of the points to compare
+    :param edges: list of coordinates of the edges of the polygon, with the last edge equal to the first
+    :return: boolean array, True where the point is in the polygon
+    """
+    points = {"lat": np.asarray(latitudes, dtype=float), "lon": np.asarray(longitudes, dtype=float)}
+    wn = np.zeros(points["lat"].shape, dtype=int)  # winding numbers
+    for index in range(len(edges) - 1):
+        side = point_on_line_side((edges[index], edges[index + 1]), points)
+        if edges[index]["lat"] <= edges[index + 1]["lat"]:
+            # upward crossings; edges with equal latitudes are never crossed
+            wn += (edges[index]["lat"] <= points["lat"]) & (edges[index + 1]["lat"] > points["lat"]) & (side >= 0)
+        else:
+            # downward crossings
+            wn -= (edges[index]["lat"] > points["lat"]) & (edges[index + 1]["lat"] <= points["lat"]) & (side <= 0)
+    return wn != 0
+
+
 def validate_point_in_polygon(point: Dict[str, float], edges: List[Dict[str, float]]) -> bool:
     """
     Use winding number algorithm to determine if a point is in a polygon (or on the edge)
@@ -753,16 +891,32 @@ def validate_point_in_polygon(point: Dict[str, float], edges: List[Dict[str, flo
     :param edges: list of coordinates of the edges of the polygon, with the last edge equal to the first
     :return: True if point is in the polygon
     """
-    wn = 0  # winding number
-    for index in range(len(edges) - 1):
-        if edges[index]["lat"] <= point["lat"]:
-            if edges[index + 1]["lat"] > point["lat"]:
-                if point_on_line_side((edges[index], edges[index + 1]), point) >= 0:
-                    wn += 1
-        elif edges[index + 1]["lat"] <= point["lat"]:
-            if point_on_line_side((edges[index], edges[index + 1]), point) <= 0:
-                wn -= 1
-    return wn != 0
+    return bool(validate_points_in_polygon(point["lat"], point["lon"], edges))
+
+
+def _validation_mask(
+    gps_array: np.ndarray,
+    bar_heights: Union[float, np.ndarray],
+    inclusion_ranges: Tuple[float, float, float],
+    validation_type: Optional[str],
+    validation_points: List[Dict[str, float]],
+) -> np.ndarray:
+    """
+    :param gps_array: gps data with one row each for latitude, longitude, altitude and accuracy
+    :param bar_heights: the barometric height of each point in meters, or one height for all points
+    :param inclusion_ranges: ranges to include a data point with a validation point
+    :param validation_type: the kind of validation to perform
+    :param validation_points: the points to validate against
+    :return: boolean array, True where the gps data point is valid against every validation point
+    """
+    if validation_type == "solution" or validation_type == "mean":
+        validate_fn = validate_near_points
+    else:
+        validate_fn = validate_blacklist_points
+    valid = np.ones(gps_array.shape[1], dtype=bool)
+    for point in validation_points:
+        valid &= validate_fn(gps_array[0], gps_array[1], gps_array[2], bar_heights, point, inclusion_ranges)
+    return valid
 
 
 def validate(
@@ -787,51 +941,80 @@ def validate(
     """
     # perform validation.  returns all valid data
     # check if we even have points to compare against
-    if len(validation_points) < 1:
+    if not validation_points:
         return data_to_test  # no points to check, everything is good
-    need_to_test_gps = data_to_test.clone()
-    while True:  # keep going until the data doesn't change
-        # remove any points in the data that are not close to the points
-        validated_gps_data = [[], [], [], []]
-        for gps_point in data_to_test.gps_df.columns:
-            # extract data to test
-            gps_data = data_to_test.gps_df[gps_point]
-            point_valid = True  # assume point is valid
-            for point in validation_points:
-                if validation_type == "solution" or validation_type == "mean":
-                    point_valid = validate_near_point(
-                        gps_data, point, data_to_test.barometer.get_mean(), inclusion_ranges
-                    )
-                    if not point_valid:  # if point_valid ever becomes false, we can stop processing
-                        break
-                else:
-                    point_valid = validate_blacklist(
-                        gps_data, point, data_to_test.barometer.get_mean(), inclusion_ranges
-                    )
-                    if not point_valid:  # if point_valid ever becomes false, we can stop processing
-                        break
-            if point_valid:  # add only valid points
-                validated_gps_data[0].append(gps_data["latitude"])
-                validated_gps_data[1].append(gps_data["longitude"])
-                validated_gps_data[2].append(gps_data["altitude"])
-                validated_gps_data[3].append(gps_data["accuracy"])
-        # create the object to return.
+    gps_array = data_to_test.get_gps_array()
+    # remove any points in the data that are not close to the points
+    valid = _validation_mask(
+        gps_array,
+        compute_barometric_height(data_to_test.barometer.get_mean()),
+        inclusion_ranges,
+        validation_type,
+        validation_points,
+    )
+    # create the object to return.
+    validated_gps = GPSDataHolder(
+        data_to_test.id,
+        data_to_test.os_type,
+        gps_array[:, valid],
+        data_to_test.mic_samp_rate_hz,
+        data_to_test.barometer,
+    )
+    # print message if user allows it
+    if debug:
+        print("{} data validated".format(validated_gps.id))
+    return validated_gps
+
+
+def validate_all_stations(
+    all_data_to_test: List[GPSDataHolder],
+    inclusion_ranges: Tuple[float, float, float] = (
+        DEFAULT_INCLUSION_HORIZONTAL_M,
+        DEFAULT_INCLUSION_VERTICAL_M,
+        DEFAULT_INCLUSION_VERTICAL_BAR_M,
+    ),
+    validation_type: str = None,
+    validation_points: List[Dict[str, float]] = None,
+    debug: bool = False,
+) -> List[GPSDataHolder]:
+    """
+    perform the same validation as validate on every station, with the points of all stations checked at once
+    :param all_data_to_test: gps data of each station to validate
+    :param inclusion_ranges: ranges to include a data point with a validation point
+    :param validation_type: the kind of validation to perform, default None
+    :param validation_points: the points to validate against, default None
+    :param debug: if True, output debugging information, default False
+    :return: all valid gps data of each station, in the same order as all_data_to_test
+    """
+    if len(all_data_to_test) < 1:
+        return []
+    if not validation_points:
+        return list(all_data_to_test)  # no points to check, everything is good
+    gps_arrays = [data_to_test.get_gps_array() for data_to_test in all_data_to_test]
+    sizes = [gps_array.shape[1] for gps_array in gps_arrays]
+    # every point is compared using the barometric height of its own station
+    bar_heights = np.repeat(
+        compute_barometric_height_array([data_to_test.barometer.get_mean() for data_to_test in all_data_to_test]),
+        sizes,
+    )
+    valid = _validation_mask(
+        np.concatenate(gps_arrays, axis=1), bar_heights, inclusion_ranges, validation_type, validation_points
+    )
+    validated = []
+    for data_to_test, gps_array, station_valid in zip(
+        all_data_to_test, gps_arrays, np.split(valid, np.cumsum(sizes)[:-1])
+    ):
         validated_gps = GPSDataHolder(
             data_to_test.id,
             data_to_test.os_type,
-            validated_gps_data,
+            gps_array[:, station_valid],
             data_to_test.mic_samp_rate_hz,
             data_to_test.barometer,
         )
-        if validated_gps.get_size() == need_to_test_gps.get_size():
-            # print message if user allows it
-            if debug:
-                print("{} data validated".format(validated_gps.id))
-            # if data does not change, we are done validating
-            return validated_gps
-        else:
-            # use the new data to update the old data
-            need_to_test_gps = validated_gps.clone()
+        if debug:
+            print("{} data validated".format(validated_gps.id))
+        validated.append(validated_gps)
+    return validated
 
 
 def compute_distance_all(point: Dict[str, float], all_gps_data: List[GPSDataHolder]) -> pd.DataFrame:
@@ -860,17 +1043,18 @@ def compute_distance(point: dict, gps_data: GPSDataHolder) -> dict:
 
     # find the closest barometer altitude to location
     # bar_alt_tmp = (((SEA_PRESSURE / np.array(gps_data.barometer.data)) ** 0.190263096) - 1) * (SOL_TEMP / 0.0065)
+    bar_data = gps_data.barometer.get_data_array()
     if "sea bar" in point.keys() and point["sea_bar"] is not None:
-        bar_alt_tmp = compute_barometric_height_array(np.array(gps_data.barometer.get_data()), point["sea_bar"])
+        bar_alt_tmp = compute_barometric_height_array(bar_data, point["sea_bar"])
     else:
-        bar_alt_tmp = compute_barometric_height_array(np.array(gps_data.barometer.get_data()))
+        bar_alt_tmp = compute_barometric_height_array(bar_data)
     # simplified barometric equation:
     # P(h) = 101.325 * e ** (-0.00012h) -> P(h) / 101.325 = 1 / (e ** 0.00012h)
     # e ** 0.00012h = 101.325 / P(h) -> 0.00012h = ln(101.325) - ln(P))
     # SEA_PRESSURE = 101.325
     # h = ln(SEA_PRESSURE/P(h)) / 0.00012
     min_index = np.argmin(np.abs(bar_alt_tmp - point["alt"]))
-    gps_data.barometer.best_value = gps_data.barometer.get_data()[min_index]
+    gps_data.barometer.best_value = bar_data[min_index]
     bar_alt = bar_alt_tmp[min_index]
     # for all gps coords, find closest to solution
     dist_array = get_gps_dist_to_location(point, gps_data)
@@ -885,19 +1069,20 @@ def compute_distance(point: dict, gps_data: GPSDataHolder) -> dict:
 
     # finding the std of the distances is basically finding the std of accuracy
     acc_std = np.std(dist_array)
-    lat_std = np.std(np.abs(point["lat"] - gps_data.gps_df.loc["latitude"].to_numpy()))
-    lon_std = np.std(np.abs(point["lon"] - gps_data.gps_df.loc["longitude"].to_numpy()))
-    alt_std = np.std(np.abs(point["alt"] - gps_data.gps_df.loc["altitude"].to_numpy()))
+    gps_array = gps_data.get_gps_array()
+    lat_std = np.std(np.abs(point["lat"] - gps_array[0]))
+    lon_std = np.std(np.abs(point["lon"] - gps_array[1]))
+    alt_std = np.std(np.abs(point["alt"] - gps_array[2]))
     bar_std = gps_data.barometer.get_std()
 
     # put data into dictionary to store in data frames later
     stations_data[idd] = [
         gps_data.os_type,
         gps_data.mic_samp_rate_hz,
-        gps_data.gps_df.loc["accuracy", min_index],
-        gps_data.gps_df.loc["latitude", min_index],
-        gps_data.gps_df.loc["longitude", min_index],
-        gps_data.gps_df.loc["altitude", min_index],
+        gps_array[3, min_index],
+        gps_array[0, min_index],
+        gps_array[1, min_index],
+        gps_array[2, min_index],
         gps_data.barometer.best_value,
         dist_array[min_index],
         gps_loc["acc"],
@@ -4,15 +4,20 @@ This module provides functions and classes for working with RedVox API 900 data.
 """
 
 import collections
+import contextlib
 import glob
+import itertools
+import multiprocessing
 import os
 import os.path
 import typing
+from multiprocessing.pool import AsyncResult, Pool
 
 import redvox.api900.lib.api900_pb2 as api900_pb2
 import redvox.api900.concat as concat
 import redvox.common.date_time_utils as date_time_utils
 import redvox.api900.reader_utils as reader_utils
+import redvox.settings as settings
 
 # For backwards compatibility, we want to expose as much as we can from this file since everything used to live in this
 # file. This will allow old code that referenced everything through this module to still function. Someday "soon" we
@@ -297,39 +302,88 @@ def _id_uuid(wrapped_redvox_packet: WrappedRedvoxPacket) -> str:
                       wrapped_redvox_packet.uuid())
 
 
-# pylint: disable=R0913
-def read_rdvxz_file_range(directory: str,
-                          start_timestamp_utc_s: typing.Optional[int] = None,
-                          end_timestamp_utc_s: typing.Optional[int] = None,
-                          redvox_ids: typing.Optional[typing.List[str]] = None,
-                          structured_layout: bool = False,
-                          concat_continuous_segments: bool = True) -> typing.Dict[
-                              str, typing.List[WrappedRedvoxPacket]]:
+# The maximum number of packets that are read, or waiting to be consumed, at any time by the parallel readers
+DEFAULT_MAX_IN_FLIGHT_PACKETS: int = 1024
+# The number of files read by a worker process per task
+_READ_CHUNK_SIZE: int = 16
+
+
+def _read_rdvxz_files(paths: typing.List[str]) -> typing.List[WrappedRedvoxPacket]:
     """
-    Reads a range of .rdvxz files from a given directory.
+    Reads a chunk of .rdvxz files. This is the unit of work sent to worker processes.
+    :param paths: The paths of the files.
+    :return: A list of WrappedRedvoxPackets in the same order as the paths.
+    """
+    return list(map(read_rdvxz_file, paths))
 
-    Given start and end timestamps which represent UNIX time (the number of seconds from the epoch) UTC and an
-    optional set of redvox ids, this function reads .rdvxz within the given time range with the given redvox ids. If
-    not redvox ids are provided, all valid .rdvxz files within the given time range will be included.
 
-    We also support a standardized structured layout. The structured layout organizes .rdvxz files by api, year, month,
-    and day. The structured layout is as follows. api900/YYYY/MM/DD/*.rdvxz where YYYY is the year, MM is the month,
-    and DD is the day. When using the structured layout option, be sure that the root directory path is api900.
-    :param directory: The root directory of the data. If structured_layout is False, then this directory will contain
-                      various unorganized .rdvxz files. If structured_layout is True, then this directory must be the
-                      root api900 directory of the structured files.
+def _read_paths(paths: typing.List[str],
+                pool: typing.Optional[Pool],
+                max_in_flight_packets: int = DEFAULT_MAX_IN_FLIGHT_PACKETS) -> typing.Iterator[WrappedRedvoxPacket]:
+    """
+    Reads .rdvxz files, in parallel when a pool is provided, yielding the packets in the same order as the paths.
+    At most max_in_flight_packets packets are being read or are waiting to be yielded at any time.
+    :param paths: The paths of the files to read.
+    :param pool: An optional pool of worker processes. When None, the files are read serially.
+    :param max_in_flight_packets: The maximum number of packets read ahead of the consumer.
+    :return: An iterator of WrappedRedvoxPackets.
+    """
+    if pool is None or len(paths) <= 1:
+        yield from map(read_rdvxz_file, paths)
+        return
+
+    chunk_size: int = max(1, min(_READ_CHUNK_SIZE, max_in_flight_packets))
+    max_in_flight_chunks: int = max(1, max_in_flight_packets // chunk_size)
+    chunks: typing.Iterator[typing.List[str]] = (paths[i:i + chunk_size] for i in range(0, len(paths), chunk_size))
+    in_flight: typing.Deque[AsyncResult] = collections.deque()
+    for chunk in itertools.islice(chunks, max_in_flight_chunks):
+        in_flight.append(pool.apply_async(_read_rdvxz_files, (chunk,)))
+
+    while len(in_flight) > 0:
+        packets: typing.List[WrappedRedvoxPacket] = in_flight.popleft().get()
+        chunk = next(chunks, None)
+        if chunk is not None:
+            in_flight.append(pool.apply_async(_read_rdvxz_files, (chunk,)))
+        yield from packets
+
+
+@contextlib.contextmanager
+def _reader_pool(pool: typing.Optional[Pool], num_paths: int) -> typing.Iterator[typing.Optional[Pool]]:
+    """
+    Provides the pool used to read files. Files are only read in parallel when parallelism is enabled in
+    redvox.settings and there is more than one file to read.
+    :param pool: An optional pool. If a pool is provided, the user is responsible for closing the pool. If the pool
+                 is not provided, one is created and then closed when the files have been read.
+    :param num_paths: The number of files that will be read.
+    :return: The pool to read files with, or None to read files serially.
+    """
+    if not settings.is_parallelism_enabled() or num_paths <= 1:
+        yield None
+    elif pool is not None:
+        yield pool
+    else:
+        _pool: Pool = multiprocessing.Pool()
+        try:
+            yield _pool
+        finally:
+            _pool.terminate()
+
+
+def _get_range_paths(directory: str,
+                     start_timestamp_utc_s: typing.Optional[int],
+                     end_timestamp_utc_s: typing.Optional[int],
+                     redvox_ids: typing.List[str],
+                     structured_layout: bool) -> typing.List[str]:
+    """
+    Finds the .rdvxz files in a time range with the given redvox ids, see read_rdvxz_file_range.
+    :param directory: The root directory of the data.
     :param start_timestamp_utc_s: The start timestamp as seconds since the epoch UTC.
     :param end_timestamp_utc_s: The end timestamp as seconds since the epoch UTC.
-    :param redvox_ids: An optional list of redvox_ids to filter against (default=[]).
-    :param structured_layout: An optional value to define if this is loading structured data (default=False).
-    :param concat_continuous_segments: An optional value to define if this function should concatenate rdvxz files into
-                                       a multiple continuous rdvxz files seperated at gaps.
-    :return: A dictionary where each key is a single redvox id and each value is a list of ordered WrappedRedvoxPackets.
+    :param redvox_ids: The redvox ids to filter against. All ids are included when empty.
+    :param structured_layout: Whether or not the directory is the root of a structured api900 layout.
+    :return: The paths of the files, grouped by redvox id and ordered by file timestamp.
     """
-
     # Remove trailing directory separators
-    if redvox_ids is None:
-        redvox_ids = []
     while directory.endswith("/") or directory.endswith("\\"):
         directory = directory[:-1]
 
@@ -353,28 +407,125 @@ def read_rdvxz_file_range(directory: str,
             filter(lambda path: _is_path_in_set(path, start_timestamp_utc_s, end_timestamp_utc_s, set(redvox_ids)),
                    all_paths))
 
-    # Convert to WrappedRedvoxPackets
-    wrapped_redvox_packets = map(read_rdvxz_file, paths)
+    # Valid file names have fixed width ids and timestamps, so the file name orders files by id and then time
+    return sorted(paths, key=os.path.basename)
 
-    # Group by redvox_id
-    grouped = _group_by(_id_uuid, wrapped_redvox_packets)
 
-    # Sort
-    for packets in grouped.values():
-        packets.sort(key=WrappedRedvoxPacket.app_file_start_timestamp_machine)
+# pylint: disable=R0913
+def iter_rdvxz_file_range(directory: str,
+                          start_timestamp_utc_s: typing.Optional[int] = None,
+                          end_timestamp_utc_s: typing.Optional[int] = None,
+                          redvox_ids: typing.Optional[typing.List[str]] = None,
+                          structured_layout: bool = False,
+                          concat_continuous_segments: bool = True,
+                          pool: typing.Optional[Pool] = None,
+                          max_in_flight_packets: int = DEFAULT_MAX_IN_FLIGHT_PACKETS) -> typing.Iterator[
+                              typing.Tuple[str, typing.List[WrappedRedvoxPacket]]]:
+    """
+    Reads a range of .rdvxz files from a given directory one device at a time, see read_rdvxz_file_range.
 
-    # If not concatenating, return what we have
-    if not concat_continuous_segments:
-        return grouped
+    Devices are read in order of the redvox id in their file names. The packets of a device are yielded as soon as all
+    of that device's files have been read, while the files of the following devices continue to be read in the
+    background. Only the packets of one device and at most max_in_flight_packets read ahead packets are held in memory
+    by this function.
 
-    # Otherwise, concatenate and return
-    for id_uuid in grouped:
-        grouped[id_uuid] = concat.concat_wrapped_redvox_packets(grouped[id_uuid])
+    When parallelism is enabled in redvox.settings, files are read and decoded by a pool of worker processes.
+    :param directory: The root directory of the data. If structured_layout is False, then this directory will contain
+                      various unorganized .rdvxz files. If structured_layout is True, then this directory must be the
+                      root api900 directory of the structured files.
+    :param start_timestamp_utc_s: The start timestamp as seconds since the epoch UTC.
+    :param end_timestamp_utc_s: The end timestamp as seconds since the epoch UTC.
+    :param redvox_ids: An optional list of redvox_ids to filter against (default=[]).
+    :param structured_layout: An optional value to define if this is loading structured data (default=False).
+    :param concat_continuous_segments: An optional value to define if this function should concatenate rdvxz files into
+                                       a multiple continuous rdvxz files seperated at gaps.
+    :param pool: An optional pool. If a pool is provided, the user is responsible for closing the pool. If the pool is
+                 not provided and parallelism is enabled, one is created and closed once all files have been read.
+    :param max_in_flight_packets: The maximum number of packets read ahead of the consumer (default=1024).
+    :return: An iterator of (redvox_id:uuid, list of ordered WrappedRedvoxPackets) tuples.
+    """
+    if max_in_flight_packets < 1:
+        raise ValueError(f"max_in_flight_packets must be at least 1, but was {max_in_flight_packets}")
 
-    # Finally, sort by device id
-    grouped_and_sorted: typing.Dict[str, typing.List[WrappedRedvoxPacket]] = _sort_dict_by_key(grouped)
+    paths: typing.List[str] = _get_range_paths(directory,
+                                               start_timestamp_utc_s,
+                                               end_timestamp_utc_s,
+                                               [] if redvox_ids is None else redvox_ids,
+                                               structured_layout)
+
+    with _reader_pool(pool, len(paths)) as _pool:
+        path_packets = zip(paths, _read_paths(paths, _pool, max_in_flight_packets))
+        for _, device_path_packets in itertools.groupby(path_packets, key=lambda path_packet: _extract_redvox_id(
+                path_packet[0])):
+            # Group by redvox_id:uuid
+            grouped = _group_by(_id_uuid, map(lambda path_packet: path_packet[1], device_path_packets))
+
+            for id_uuid in sorted(grouped.keys()):
+                packets: typing.List[WrappedRedvoxPacket] = grouped[id_uuid]
+                packets.sort(key=WrappedRedvoxPacket.app_file_start_timestamp_machine)
+
+                if concat_continuous_segments:
+                    packets = concat.concat_wrapped_redvox_packets(packets)
+
+                yield id_uuid, packets
+
+
+# pylint: disable=R0913
+def read_rdvxz_file_range(directory: str,
+                          start_timestamp_utc_s: typing.Optional[int] = None,
+                          end_timestamp_utc_s: typing.Optional[int] = None,
+                          redvox_ids: typing.Optional[typing.List[str]] = None,
+                          structured_layout: bool = False,
+                          concat_continuous_segments: bool = True,
+                          pool: typing.Optional[Pool] = None,
+                          max_in_flight_packets: int = DEFAULT_MAX_IN_FLIGHT_PACKETS) -> typing.Dict[
+                              str, typing.List[WrappedRedvoxPacket]]:
+    """
+    Reads a range of .rdvxz files from a given directory.
 
-    return grouped_and_sorted
+    Given start and end timestamps which represent UNIX time (the number of seconds from the epoch) UTC and an
+    optional set of redvox ids, this function reads .rdvxz within the given time range with the given redvox ids. If
+    not redvox ids are provided, all valid .rdvxz files within the given time range will be included.
+
+    We also support a standardized structured layout. The structured layout organizes .rdvxz files by api, year, month,
+    and day. The structured layout is as follows. api900/YYYY/MM/DD/*.rdvxz where YYYY is the year, MM is the month,
+    and DD is the day. When using the structured layout option, be sure that the root directory path is api900.
+
+    When parallelism is enabled in redvox.settings, files are read and decoded by a pool of worker processes. Use
+    iter_rdvxz_file_range to process each device as soon as its files are read.
+    :param directory: The root directory of the data. If structured_layout is False, then this directory will contain
+                      various unorganized .rdvxz files. If structured_layout is True, then this directory must be the
+                      root api900 directory of the structured files.
+    :param start_timestamp_utc_s: The start timestamp as seconds since the epoch UTC.
+    :param end_timestamp_utc_s: The end timestamp as seconds since the epoch UTC.
+    :param redvox_ids: An optional list of redvox_ids to filter against (default=[]).
+    :param structured_layout: An optional value to define if this is loading structured data (default=False).
+    :param concat_continuous_segments: An optional value to define if this function should concatenate rdvxz files into
+                                       a multiple continuous rdvxz files seperated at gaps.
+    :param pool: An optional pool. If a pool is provided, the user is responsible for closing the pool. If the pool is
+                 not provided and parallelism is enabled, one is created and closed once all files have been read.
+    :param max_in_flight_packets: The maximum number of packets read ahead of the consumer (default=1024).
+    :return: A dictionary where each key is a single redvox id and each value is a list of ordered WrappedRedvoxPackets.
+    """
+    grouped: typing.Dict[str, typing.List[WrappedRedvoxPacket]] = {}
+    for id_uuid, packets in iter_rdvxz_file_range(directory,
+                                                  start_timestamp_utc_s,
+                                                  end_timestamp_utc_s,
+                                                  redvox_ids,
+                                                  structured_layout,
+                                                  concat_continuous_segments,
+                                                  pool,
+                                                  max_in_flight_packets):
+        if id_uuid not in grouped:
+            grouped[id_uuid] = packets
+            continue
+
+        # Files named with a different redvox id than the one in their packets
+        packets = sorted(grouped[id_uuid] + packets, key=WrappedRedvoxPacket.app_file_start_timestamp_machine)
+        grouped[id_uuid] = concat.concat_wrapped_redvox_packets(packets) if concat_continuous_segments else packets
+
+    # Finally, sort by device id
+    return _sort_dict_by_key(grouped)
 
 
 def read_rdvxz_buffer(buf: bytes) -> WrappedRedvoxPacket:
@@ -405,11 +556,19 @@ def read_json_string(json: str) -> WrappedRedvoxPacket:
     return wrap(reader_utils.from_json(json))
 
 
-def read_directory(directory_path: str) -> typing.Dict[str, typing.List[WrappedRedvoxPacket]]:
+def read_directory(directory_path: str,
+                   pool: typing.Optional[Pool] = None,
+                   max_in_flight_packets: int = DEFAULT_MAX_IN_FLIGHT_PACKETS) -> typing.Dict[
+                       str, typing.List[WrappedRedvoxPacket]]:
     """
     Reads .rdvxz files from a directory and returns a dictionary from redvox_id -> a list of sorted wrapped redvox
     packets that belong to that device.
+
+    When parallelism is enabled in redvox.settings, files are read and decoded by a pool of worker processes.
     :param directory_path: The path to the directory containing .rdvxz files.
+    :param pool: An optional pool. If a pool is provided, the user is responsible for closing the pool. If the pool is
+                 not provided and parallelism is enabled, one is created and closed once all files have been read.
+    :param max_in_flight_packets: The maximum number of packets read ahead of the consumer (default=1024).
     :return: A dictionary representing a mapping from redvox_id to its packets.
     """
 
@@ -418,11 +577,10 @@ def read_directory(directory_path: str) -> typing.Dict[str, typing.List[WrappedR
         directory_path = directory_path + "/"
 
     file_paths = sorted(glob.glob(directory_path + "*.rdvxz"))
-    protobuf_packets = map(read_file, file_paths)
-    wrapped_packets = list(map(wrap, protobuf_packets))
     grouped = collections.defaultdict(list)
 
-    for wrapped_packet in wrapped_packets:
-        grouped[wrapped_packet.redvox_id()].append(wrapped_packet)
+    with _reader_pool(pool, len(file_paths)) as _pool:
+        for wrapped_packet in _read_paths(file_paths, _pool, max_in_flight_packets):
+            grouped[wrapped_packet.redvox_id()].append(wrapped_packet)
 
     return grouped
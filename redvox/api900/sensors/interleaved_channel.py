@@ -13,6 +13,34 @@ import redvox.api900.migrations as migrations
 import redvox.api900.reader_utils as reader_utils
 import redvox.api900.stat_utils as stat_utils
 
+# The dtype each payload type is stored as and the dtype it is read back from the protobuf channel as
+_STORED_DTYPES: typing.Dict[constants.PayloadType, typing.Tuple[numpy.dtype, numpy.dtype]] = {
+    constants.PayloadType.INT32_PAYLOAD: (numpy.dtype(numpy.int32), numpy.dtype(numpy.int64)),
+    constants.PayloadType.INT64_PAYLOAD: (numpy.dtype(numpy.int64), numpy.dtype(numpy.int64)),
+    constants.PayloadType.FLOAT32_PAYLOAD: (numpy.dtype(numpy.float32), numpy.dtype(numpy.float64)),
+    constants.PayloadType.FLOAT64_PAYLOAD: (numpy.dtype(numpy.float64), numpy.dtype(numpy.float64)),
+}
+
+
+def _stored_payload(payload_values: numpy.ndarray, pl_type: constants.PayloadType) -> typing.Optional[numpy.ndarray]:
+    """
+    Returns the payload values as they are read back from a protobuf channel after being set, without reading them.
+    :param payload_values: The payload values that were set.
+    :param pl_type: The payload type the values were set as.
+    :return: The payload as extracted from the protobuf channel, or None if it must be read back from the channel.
+    """
+    if pl_type not in _STORED_DTYPES:
+        return None
+    stored_dtype, read_dtype = _STORED_DTYPES[pl_type]
+    # Integer payloads only accept integer values, and floating point payloads accept either
+    if payload_values.dtype.kind not in ("iu" if stored_dtype.kind == "i" else "fiu"):
+        return None
+    payload: numpy.ndarray = payload_values.astype(stored_dtype).astype(read_dtype, copy=False)
+    # Integer values out of range of the payload type are not stored as given
+    if stored_dtype.kind == "i" and not numpy.array_equal(payload, payload_values):
+        return None
+    return payload
+
 
 # pylint: disable=R0902
 class InterleavedChannel:
@@ -196,7 +224,9 @@ class InterleavedChannel:
         if len(payload_values) < 1:
             self.payload = payload_values
         else:
-            self.payload = reader_utils.extract_payload(self.protobuf_channel)
+            self.payload = _stored_payload(payload_values, pl_type)
+            if self.payload is None:
+                self.payload = reader_utils.extract_payload(self.protobuf_channel)
 
             # calculate the means, std devs, and medians
             if should_compute_stats:
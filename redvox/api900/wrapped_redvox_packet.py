@@ -38,6 +38,31 @@ def read_buffer(buf: bytes, is_compressed: bool = True) -> api900_pb2.RedvoxPack
     return redvox_packet
 
 
+def _channel_state(channel: typing.Union[EvenlySampledChannel, UnevenlySampledChannel]) -> typing.Dict[str, typing.Any]:
+    """
+    :param channel: The channel to pickle.
+    :return: The attributes of the channel without its protobuf channel.
+    """
+    state: typing.Dict[str, typing.Any] = channel.__dict__.copy()
+    del state["protobuf_channel"]
+    return state
+
+
+def _restore_channel(channel_class: typing.Type,
+                     state: typing.Dict[str, typing.Any],
+                     protobuf_channel: typing.Any) -> typing.Union[EvenlySampledChannel, UnevenlySampledChannel]:
+    """
+    :param channel_class: EvenlySampledChannel or UnevenlySampledChannel.
+    :param state: The pickled attributes of the channel.
+    :param protobuf_channel: The protobuf channel of the restored packet.
+    :return: The channel with its attributes restored, without extracting the values from the protobuf again.
+    """
+    channel = channel_class.__new__(channel_class)
+    channel.__dict__.update(state)
+    channel.protobuf_channel = protobuf_channel
+    return channel
+
+
 # pylint: disable=R0904
 class WrappedRedvoxPacket:
     """
@@ -80,13 +105,43 @@ class WrappedRedvoxPacket:
             """Holds a mapping of channel type to channel for O(1) access."""
 
             # Initialize channel cache
-            for evenly_sampled_channel in self._evenly_sampled_channels_field:
-                for channel_type in evenly_sampled_channel.channel_types:
-                    self._channel_cache[channel_type] = evenly_sampled_channel
+            self._build_channel_cache()
 
-            for unevenly_sampled_channel in self._unevenly_sampled_channels_field:
-                for channel_type in unevenly_sampled_channel.channel_types:
-                    self._channel_cache[channel_type] = unevenly_sampled_channel
+    def __getstate__(self) -> typing.Dict[str, typing.Any]:
+        """
+        Pickles the protobuf packet as bytes along with the values already extracted by each channel, so that packets
+        read by worker processes do not need to be wrapped again.
+        :return: The state of this packet.
+        """
+        state: typing.Dict[str, typing.Any] = self.__dict__.copy()
+        state["_redvox_packet"] = self._redvox_packet.SerializeToString()
+        state["_evenly_sampled_channels_field"] = list(map(_channel_state, self._evenly_sampled_channels_field))
+        state["_unevenly_sampled_channels_field"] = list(map(_channel_state, self._unevenly_sampled_channels_field))
+        del state["_channel_cache"]
+        return state
+
+    def __setstate__(self, state: typing.Dict[str, typing.Any]):
+        """
+        Restores a pickled packet, pointing each channel at its protobuf channel in the restored packet.
+        :param state: The state of the packet.
+        """
+        redvox_packet: api900_pb2.RedvoxPacket = api900_pb2.RedvoxPacket()
+        redvox_packet.ParseFromString(state["_redvox_packet"])
+        self.__dict__.update(state)
+        self._redvox_packet = redvox_packet
+        if len(state["_evenly_sampled_channels_field"]) != len(redvox_packet.evenly_sampled_channels) or \
+                len(state["_unevenly_sampled_channels_field"]) != len(redvox_packet.unevenly_sampled_channels):
+            self._refresh_channels()
+            return
+        self._evenly_sampled_channels_field = [
+            _restore_channel(EvenlySampledChannel, channel_state, channel)
+            for channel_state, channel in zip(state["_evenly_sampled_channels_field"],
+                                              redvox_packet.evenly_sampled_channels)]
+        self._unevenly_sampled_channels_field = [
+            _restore_channel(UnevenlySampledChannel, channel_state, channel)
+            for channel_state, channel in zip(state["_unevenly_sampled_channels_field"],
+                                              redvox_packet.unevenly_sampled_channels)]
+        self._build_channel_cache()
 
     def redvox_packet(self) -> api900_pb2.RedvoxPacket:
         """
@@ -119,6 +174,12 @@ class WrappedRedvoxPacket:
         self._unevenly_sampled_channels_field = list(map(UnevenlySampledChannel,
                                                          reader_utils.repeated_to_array(
                                                              self._redvox_packet.unevenly_sampled_channels)))
+        self._build_channel_cache()
+
+    def _build_channel_cache(self):
+        """
+        rebuilds the channel cache from the channel lists
+        """
         self._channel_cache = {}
         for evenly_sampled_channel in self._evenly_sampled_channels_field:
             for channel_type in evenly_sampled_channel.channel_types:
@@ -6,24 +6,16 @@ import argparse
 import logging
 import os.path
 import sys
-from typing import Dict, List, Optional, Any, Callable
+from typing import Dict, List, Optional, Any, Callable, TYPE_CHECKING
 
-from redvox.api1000.wrapped_redvox_packet.sensors.image import Image, ImageCodec
-from redvox.api1000.wrapped_redvox_packet.wrapped_packet import WrappedRedvoxPacketM
-from redvox.cloud.data_api import DataRangeReqType
-
-import redvox.cloud.client as cloud_client
-from redvox.cloud.config import RedVoxConfig
-import redvox.cloud.data_api as data_api
-import redvox.cli.conversions as conversions
-import redvox.cli.data_req as data_req
-import redvox.common.io as io
-from redvox.common.gui import cloud_data_retrieval
+# Every command imports only the modules it uses, inside its handler, so that short commands start quickly
+if TYPE_CHECKING:
+    from redvox.cloud.config import RedVoxConfig
+    import redvox.cloud.data_api as data_api
 
 # pylint: disable=C0103
 log = logging.getLogger(__name__)
 
-
 def map_or_default(val: Any, apply: Callable[[Any], Any], default: Any) -> Any:
     if val is None:
         return default
@@ -102,6 +94,8 @@ def rdvxz_to_rdvxm(args) -> None:
     if not check_out_dir(args.out_dir):
         determine_exit(False)
 
+    import redvox.cli.conversions as conversions
+
     determine_exit(conversions.rdvxz_to_rdvxm(args.rdvxz_paths, args.out_dir))
 
 
@@ -116,6 +110,8 @@ def rdvxm_to_rdvxz(args) -> None:
     if not check_out_dir(args.out_dir):
         determine_exit(False)
 
+    import redvox.cli.conversions as conversions
+
     determine_exit(conversions.rdvxm_to_rdvxz(args.rdvxm_paths, args.out_dir))
 
 
@@ -130,6 +126,8 @@ def rdvxz_to_json_args(args) -> None:
     if not check_out_dir(args.out_dir):
         determine_exit(False)
 
+    import redvox.cli.conversions as conversions
+
     determine_exit(conversions.rdvxz_to_json(args.rdvxz_paths, args.out_dir))
 
 
@@ -144,6 +142,8 @@ def rdvxm_to_json_args(args) -> None:
     if not check_out_dir(args.out_dir):
         determine_exit(False)
 
+    import redvox.cli.conversions as conversions
+
     determine_exit(conversions.rdvxm_to_json(args.rdvxm_paths, args.out_dir))
 
 
@@ -158,6 +158,8 @@ def json_to_rdvxz_args(args) -> None:
     if not check_out_dir(args.out_dir):
         determine_exit(False)
 
+    import redvox.cli.conversions as conversions
+
     determine_exit(conversions.json_to_rdvxz(args.json_paths, args.out_dir))
 
 
@@ -172,6 +174,8 @@ def json_to_rdvxm_args(args) -> None:
     if not check_out_dir(args.out_dir):
         determine_exit(False)
 
+    import redvox.cli.conversions as conversions
+
     determine_exit(conversions.json_to_rdvxm(args.json_paths, args.out_dir))
 
 
@@ -183,6 +187,8 @@ def rdvxz_print_stdout_args(args) -> None:
     if not check_files(args.rdvxz_paths, ".rdvxz"):
         determine_exit(False)
 
+    import redvox.cli.conversions as conversions
+
     determine_exit(conversions.rdvxz_print_stdout(args.rdvxz_paths))
 
 
@@ -194,6 +200,8 @@ def rdvxm_print_stdout_args(args) -> None:
     if not check_files(args.rdvxm_paths, ".rdvxm"):
         determine_exit(False)
 
+    import redvox.cli.conversions as conversions
+
     determine_exit(conversions.rdvxm_print_stdout(args.rdvxm_paths))
 
 
@@ -205,41 +213,66 @@ def validate_rdvxm_args(args) -> None:
     if not check_files(args.rdvxm_paths, ".rdvxm"):
         determine_exit(False)
 
+    import redvox.cli.conversions as conversions
+
     determine_exit(conversions.validate_rdvxm(args.rdvxm_paths))
 
 
-def data_req_args(args) -> None:
+def cloud_config_args(args) -> "RedVoxConfig":
     """
-    Wrapper function that calls the data_req.
+    Rebuilds the RedVox config from potentially optional passed in args.  Arguments that weren't passed in are taken
+    from the RedVox cloud configuration found in the environment or the home directory, which is only loaded here so
+    that other commands don't read it.  Exits if the email or password can't be found.
     :param args: Args from argparse.
+    :return: The RedVoxConfig to use.
     """
-    if not check_out_dir(args.out_dir):
-        determine_exit(False)
+    from redvox.cloud.config import RedVoxConfig
 
-    api_type: DataRangeReqType = DataRangeReqType[args.api_type]
+    found_config: Optional[RedVoxConfig] = RedVoxConfig.find()
+
+    def _arg(value: Any, apply: Callable[[RedVoxConfig], Any], default: Any) -> Any:
+        return value if value is not None else map_or_default(found_config, apply, default)
 
-    # Rebuild RedVox config from potentially optional passed in args
-    if args.email is None:
+    email: Optional[str] = _arg(args.email, lambda config: config.username, None)
+    password: Optional[str] = _arg(args.password, lambda config: config.password, None)
+
+    if email is None:
         log.error(
             f"The argument 'email' is required, but was not found in the environment or provided."
         )
         determine_exit(False)
 
-    if args.password is None:
+    if password is None:
         log.error(
             f"The argument 'password' is required, but was not found in the environment or provided."
         )
         determine_exit(False)
 
-    redvox_config: RedVoxConfig = RedVoxConfig(
-        args.email,
-        args.password,
-        args.protocol,
-        args.host,
-        args.port,
-        args.secret_token,
+    return RedVoxConfig(
+        email,
+        password,
+        _arg(args.protocol, lambda config: config.protocol, "https"),
+        _arg(args.host, lambda config: config.host, "redvox.io"),
+        _arg(args.port, lambda config: config.port, 8080),
+        _arg(args.secret_token, lambda config: config.secret_token, None),
     )
 
+
+def data_req_args(args) -> None:
+    """
+    Wrapper function that calls the data_req.
+    :param args: Args from argparse.
+    """
+    if not check_out_dir(args.out_dir):
+        determine_exit(False)
+
+    import redvox.cli.data_req as data_req
+    from redvox.cloud.data_api import DataRangeReqType
+
+    api_type: DataRangeReqType = DataRangeReqType[args.api_type]
+
+    redvox_config: "RedVoxConfig" = cloud_config_args(args)
+
     determine_exit(
         data_req.make_data_req(
             args.out_dir,
@@ -256,7 +289,7 @@ def data_req_args(args) -> None:
 
 
 def data_req_report(
-    redvox_config: RedVoxConfig,
+    redvox_config: "RedVoxConfig",
     report_id: str,
     out_dir: str,
     retries: int,
@@ -267,8 +300,10 @@ def data_req_report(
     :param out_dir: The output directory to play the report distribution.
     :param retries: Number of times to attempt to retry the download on failed attempts.
     """
+    import redvox.cloud.client as cloud_client
+
     client = cloud_client.CloudClient(redvox_config)
-    resp: Optional[data_api.ReportDataResp] = client.request_report_data(report_id)
+    resp: Optional["data_api.ReportDataResp"] = client.request_report_data(report_id)
     client.close()
 
     if resp:
@@ -287,27 +322,7 @@ def data_req_report_args(args) -> None:
     if not check_out_dir(args.out_dir):
         determine_exit(False)
 
-    # Rebuild RedVox config from potentially optional passed in args
-    if args.email is None:
-        log.error(
-            f"The argument 'email' is required, but was not found in the environment or provided."
-        )
-        determine_exit(False)
-
-    if args.password is None:
-        log.error(
-            f"The argument 'password' is required, but was not found in the environment or provided."
-        )
-        determine_exit(False)
-
-    redvox_config: RedVoxConfig = RedVoxConfig(
-        args.email,
-        args.password,
-        args.protocol,
-        args.host,
-        args.port,
-        args.secret_token,
-    )
+    redvox_config: "RedVoxConfig" = cloud_config_args(args)
 
     determine_exit(
         data_req_report(
@@ -319,6 +334,16 @@ def data_req_report_args(args) -> None:
     )
 
 
+def cloud_download_args(args) -> None:
+    """
+    Opens the cloud data retrieval GUI.
+    :param args: Args from argparse.
+    """
+    from redvox.common.gui import cloud_data_retrieval
+
+    cloud_data_retrieval.run_gui()
+
+
 def gallery(rdvxm_paths: List[str]) -> bool:
     """
     Displays a gallery of images from the combined images collected from the given paths.
@@ -328,6 +353,9 @@ def gallery(rdvxm_paths: List[str]) -> bool:
     # Create a new image sensor to hold images from all packets
     try:
         from redvox.api1000.gui.image_viewer import start_gui
+        from redvox.api1000.wrapped_redvox_packet.sensors.image import Image, ImageCodec
+        from redvox.api1000.wrapped_redvox_packet.wrapped_packet import WrappedRedvoxPacketM
+
         image: Image = Image.new()
         # noinspection PyTypeChecker
         image.set_image_codec(ImageCodec.JPG)
@@ -366,6 +394,8 @@ def gallery_args(args) -> None:
 def sort_unstructured(
     input_dir: str, out_dir: Optional[str] = None, copy: bool = True
 ) -> bool:
+    import redvox.common.io as io
+
     out_dir = out_dir if out_dir is not None else "."
     io.sort_unstructured_redvox_data(input_dir, out_dir, copy=copy)
     return True
@@ -385,8 +415,6 @@ def main():
     """
     Entry point into the CLI.
     """
-    redvox_config: Optional[RedVoxConfig] = RedVoxConfig.find()
-
     parser: argparse.ArgumentParser = argparse.ArgumentParser(
         "redvox-cli",
         description="Command line tools for viewing, converting,"
@@ -402,7 +430,7 @@ def main():
 
     # Cloud data retrieval
     cloud_download_parser = sub_parser.add_parser("cloud-download")
-    cloud_download_parser.set_defaults(func=lambda _: cloud_data_retrieval.run_gui())
+    cloud_download_parser.set_defaults(func=cloud_download_args)
 
     # Gallery
     gallery_parser = sub_parser.add_parser("gallery")
@@ -564,12 +592,12 @@ def main():
     data_req_parser.add_argument(
         "--email",
         help="redvox.io account email",
-        default=map_or_default(redvox_config, lambda config: config.username, None),
+        default=None,
     )
     data_req_parser.add_argument(
         "--password",
         help="redvox.io account password",
-        default=map_or_default(redvox_config, lambda config: config.password, None),
+        default=None,
     )
     data_req_parser.add_argument(
         "--out-dir",
@@ -593,25 +621,25 @@ def main():
     data_req_parser.add_argument(
         "--host",
         help="Data server host",
-        default=map_or_default(redvox_config, lambda config: config.host, "redvox.io"),
+        default=None,
     )
     data_req_parser.add_argument(
         "--port",
         type=int,
         help="Data server port",
-        default=map_or_default(redvox_config, lambda config: config.port, 8080),
+        default=None,
     )
     data_req_parser.add_argument(
         "--protocol",
         help="One of either http or https",
         choices=["https", "http"],
-        default=map_or_default(redvox_config, lambda config: config.protocol, "https"),
+        default=None,
     )
     data_req_parser.add_argument(
         "--secret-token",
         help="A shared secret token provided by RedVox required for accessing the data "
         "request service",
-        default=map_or_default(redvox_config, lambda config: config.secret_token, None),
+        default=None,
     )
     data_req_parser.add_argument(
         "--api-type",
@@ -652,12 +680,12 @@ def main():
     data_req_report_parser.add_argument(
         "--email",
         help="redvox.io account email",
-        default=map_or_default(redvox_config, lambda config: config.username, None),
+        default=None,
     )
     data_req_report_parser.add_argument(
         "--password",
         help="redvox.io account password",
-        default=map_or_default(redvox_config, lambda config: config.password, None),
+        default=None,
     )
     data_req_report_parser.add_argument(
         "--retries",
@@ -670,25 +698,25 @@ def main():
     data_req_report_parser.add_argument(
         "--host",
         help="Data server host",
-        default=map_or_default(redvox_config, lambda config: config.host, "redvox.io"),
+        default=None,
     )
     data_req_report_parser.add_argument(
         "--port",
         type=int,
         help="Data server port",
-        default=map_or_default(redvox_config, lambda config: config.port, 8080),
+        default=None,
     )
     data_req_report_parser.add_argument(
         "--protocol",
         help="One of either http or https (default https)",
         choices=["https", "http"],
-        default=map_or_default(redvox_config, lambda config: config.protocol, "https"),
+        default=None,
     )
     data_req_report_parser.add_argument(
         "--secret-token",
         help="A shared secret token provided by RedVox required for accessing the data "
         "request service",
-        default=map_or_default(redvox_config, lambda config: config.secret_token, None),
+        default=None,
     )
     data_req_report_parser.add_argument(
         "report_id",
@@ -4,18 +4,18 @@ This module contains functions for performing RedVox data conversions and displa
 
 import logging
 import os.path
-from typing import List, Optional
-
-import redvox.api900.reader as reader
-import redvox.api900.reader_utils as reader_utils
-import redvox.common.api_conversions as api_conversions
-import redvox.api900.lib.api900_pb2 as api_900
-import redvox.api1000.proto.redvox_api_m_pb2 as api_1000
+from typing import List, Optional, TYPE_CHECKING
 
 import lz4.frame
 
 from redvox.api1000.wrapped_redvox_packet.wrapped_packet import WrappedRedvoxPacketM
 
+# API 900 modules and API conversions are imported by the functions that use them, so that working with API M files
+# doesn't pay for loading them
+if TYPE_CHECKING:
+    import redvox.api900.lib.api900_pb2 as api_900
+    import redvox.api1000.proto.redvox_api_m_pb2 as api_1000
+
 # pylint: disable=C0103
 log = logging.getLogger(__name__)
 
@@ -49,6 +49,9 @@ def rdvxz_to_json(paths: List[str], out_dir: Optional[str] = None) -> bool:
     :param out_dir: An optional output directory (will use input directory by default)
     :return: True if this succeeds, False otherwise
     """
+    import redvox.api900.reader as reader
+    import redvox.api900.reader_utils as reader_utils
+
     for path in paths:
         pb_packet = reader.read_file(path)
 
@@ -92,6 +95,8 @@ def json_to_rdvxz(paths: List[str], out_dir: Optional[str] = None) -> bool:
     :param out_dir: An optional output directory (will use input directory by default)
     :return: True if this succeeds, False otherwise
     """
+    import redvox.api900.reader_utils as reader_utils
+
     for path in paths:
         with open(path, "r") as fin:
             json: str = fin.read()
@@ -132,6 +137,9 @@ def rdvxz_to_rdvxm(paths: List[str], out_dir: Optional[str] = None) -> bool:
     :param out_dir: Optional output directory of converted files (default "./")
     :return: True if completed successfully
     """
+    import redvox.api900.reader as reader
+    import redvox.common.api_conversions as api_conversions
+
     out_dir = out_dir if out_dir is not None else "."
     for path in paths:
         packet_900: api_900.RedvoxPacket = reader.read_file(path, True)
@@ -155,6 +163,9 @@ def rdvxm_to_rdvxz(paths: List[str], out_dir: Optional[str] = None) -> bool:
     :param out_dir: Optional output directory of converted files (default "./")
     :return: True if completed successfully
     """
+    import redvox.api900.reader as reader
+    import redvox.common.api_conversions as api_conversions
+
     out_dir = out_dir if out_dir is not None else "."
     for path in paths:
         wrapped_packet_1000: WrappedRedvoxPacketM = (
@@ -174,6 +185,8 @@ def rdvxz_print_stdout(paths: List[str]) -> bool:
     :param paths: Paths to .rdvxz files to print.
     :return: True if this succeeds, False otherwise.
     """
+    import redvox.api900.reader as reader
+
     for path in paths:
         print(reader.read_file(path))
 
@@ -49,6 +49,8 @@ def make_data_req(
         log.info("No signed urls returned")
         return False
 
-    data_client.download_files(data_resp.signed_urls, out_dir, retries)
+    data_client.download_files(
+        data_resp.signed_urls, out_dir, retries, progress_callback=data_client.print_progress
+    )
 
     return True
@@ -6,14 +6,18 @@ an up-to-date authentication token for making authenticated API requests.
 """
 
 import contextlib
+import itertools
 import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from multiprocessing import Queue
-from typing import List, Optional, Tuple, TYPE_CHECKING, Iterator
-
-import requests
+from typing import Callable, Deque, List, Optional, Tuple, TYPE_CHECKING, Iterator, TypeVar
 
 import redvox.cloud.api as api
 import redvox.cloud.auth_api as auth_api
+from redvox.cloud.data_client import create_session
+from redvox.cloud.data_io import backoff_s, DEFAULT_BACKOFF_S, DEFAULT_MAX_BACKOFF_S
 from redvox.cloud.config import RedVoxConfig
 import redvox.cloud.errors as cloud_errors
 import redvox.common.constants as constants
@@ -28,6 +32,13 @@ import redvox.cloud.session_model_api as session_model_api
 if TYPE_CHECKING:
     from redvox.cloud.query_timing_correction import CorrectedQuery
 
+# pylint: disable=C0103
+ChunkT = TypeVar("ChunkT")
+RespT = TypeVar("RespT")
+
+DEFAULT_MAX_CONCURRENT_REQUESTS: int = 8  # Number of chunked requests in flight at the same time
+DEFAULT_CHUNK_RETRIES: int = 2  # Number of times a chunk is retried after its connection fails
+
 
 def chunk_time_range(
     start_ts: int, end_ts: int, max_chunk: int
@@ -70,12 +81,18 @@ class CloudClient:
         redvox_config: Optional[RedVoxConfig] = RedVoxConfig.find(),
         refresh_token_interval: float = 600.0,
         timeout: Optional[float] = 10.0,
+        max_concurrent_requests: int = DEFAULT_MAX_CONCURRENT_REQUESTS,
+        chunk_retries: int = DEFAULT_CHUNK_RETRIES,
+        retry_backoff_s: float = DEFAULT_BACKOFF_S,
     ):
         """
         Instantiates this client.
         :param redvox_config: The Redvox endpoint configuration.
         :param refresh_token_interval: An optional interval in seconds that the auth token should be refreshed.
         :param timeout: An optional timeout
+        :param max_concurrent_requests: The maximum number of chunked requests in flight at the same time.
+        :param chunk_retries: The number of times a chunk of a chunked request is retried after its connection fails.
+        :param retry_backoff_s: The wait time before the first retry of a chunk in seconds, doubled for each retry.
         """
 
         if redvox_config is None:
@@ -91,13 +108,22 @@ class CloudClient:
         if timeout is not None and (timeout <= 0):
             raise cloud_errors.CloudApiError("timeout must be strictly > 0")
 
+        if max_concurrent_requests <= 0:
+            raise cloud_errors.CloudApiError("max_concurrent_requests must be strictly > 0")
+
+        if chunk_retries < 0:
+            raise cloud_errors.CloudApiError("chunk_retries must be >= 0")
+
         self.redvox_config: RedVoxConfig = redvox_config
         self.refresh_token_interval: float = refresh_token_interval
         self.timeout: Optional[float] = timeout
+        self.max_concurrent_requests: int = max_concurrent_requests
+        self.chunk_retries: int = chunk_retries
+        self.retry_backoff_s: float = retry_backoff_s
 
-        self.__session = (
-            requests.Session()
-        )  # This must be initialized before the auth req!
+        # This must be initialized before the auth req!
+        # The connection pool is shared by the threads making chunked requests.
+        self.__session = create_session(max_concurrent_requests)
 
         self.__refresh_timer = None
         self.__authenticate()
@@ -165,6 +191,62 @@ class CloudClient:
         except:
             pass
 
+    def _request_chunk(
+        self, req_fn: Callable[[ChunkT], Optional[RespT]], chunk: ChunkT
+    ) -> Optional[RespT]:
+        """
+        Makes the request for a single chunk, retrying with backoff when the connection fails.  Error responses
+        from the server aren't retried.
+        :param req_fn: Function that makes the request for a chunk and returns None on error.
+        :param chunk: The chunk to request.
+        :return: The response, or None if the server returns an error.
+        """
+        attempt: int = 0
+        while True:
+            try:
+                return req_fn(chunk)
+            except cloud_errors.ApiConnectionError as ex:
+                if attempt >= self.chunk_retries:
+                    raise ex
+            time.sleep(backoff_s(attempt, self.retry_backoff_s, DEFAULT_MAX_BACKOFF_S))
+            attempt += 1
+
+    def _request_chunks(
+        self, req_fn: Callable[[ChunkT], Optional[RespT]], chunks: List[ChunkT]
+    ) -> Iterator[Optional[RespT]]:
+        """
+        Makes the requests for all chunks concurrently over this client's session.
+
+        At most max_concurrent_requests requests are in flight at once, and responses are yielded in chunk order.
+        A new chunk is only requested once the oldest response has been taken, so no more than
+        max_concurrent_requests responses are ever buffered.
+        :param req_fn: Function that makes the request for a chunk and returns None on error.
+        :param chunks: The chunks to request.
+        :return: An iterator over the response of each chunk, or None for chunks the server returned an error for.
+        """
+        num_workers: int = min(self.max_concurrent_requests, len(chunks))
+        if num_workers <= 1:
+            for chunk in chunks:
+                yield self._request_chunk(req_fn, chunk)
+            return
+
+        remaining: Iterator[ChunkT] = iter(chunks)
+        with ThreadPoolExecutor(max_workers=num_workers) as executor:
+            pending: Deque[Future] = deque(
+                executor.submit(self._request_chunk, req_fn, chunk)
+                for chunk in itertools.islice(remaining, num_workers)
+            )
+            try:
+                while len(pending) > 0:
+                    resp: Optional[RespT] = pending.popleft().result()
+                    for chunk in itertools.islice(remaining, 1):
+                        pending.append(executor.submit(self._request_chunk, req_fn, chunk))
+                    yield resp
+            finally:
+                # Stop requests that have not started when a chunk raises or the caller stops iterating
+                for future in pending:
+                    future.cancel()
+
     def health_check(self) -> bool:
         """
         An API call that returns True if the API Cloud server is up and running or False otherwise.
@@ -279,25 +361,27 @@ class CloudClient:
         )
         metadata_resp: metadata_api.MetadataResp = metadata_api.MetadataResp([])
 
-        for start_ts, end_ts in time_chunks:
+        def _make_req(
+            time_chunk: Tuple[int, int]
+        ) -> Optional[metadata_api.MetadataResp]:
             metadata_req: metadata_api.MetadataReq = metadata_api.MetadataReq(
                 self.auth_token,
-                start_ts,
-                end_ts,
+                time_chunk[0],
+                time_chunk[1],
                 station_ids,
                 metadata_to_include,
                 self.redvox_config.secret_token,
             )
 
-            chunked_resp: Optional[
-                metadata_api.MetadataResp
-            ] = metadata_api.request_metadata(
+            return metadata_api.request_metadata(
                 self.redvox_config,
                 metadata_req,
                 session=self.__session,
                 timeout=self.timeout,
             )
 
+        chunked_resp: Optional[metadata_api.MetadataResp]
+        for chunked_resp in self._request_chunks(_make_req, time_chunks):
             if chunked_resp:
                 metadata_resp.metadata.extend(chunked_resp.metadata)
 
@@ -364,26 +448,26 @@ class CloudClient:
             start_ts_s, end_ts_s, chunk_by_seconds
         )
 
-        for start_ts, end_ts in time_chunks:
+        def _make_req(
+            time_chunk: Tuple[int, int]
+        ) -> Optional[metadata_api.MetadataRespM]:
             metadata_req: metadata_api.MetadataReq = metadata_api.MetadataReq(
                 self.auth_token,
-                start_ts,
-                end_ts,
+                time_chunk[0],
+                time_chunk[1],
                 station_ids,
                 metadata_to_include,
                 self.redvox_config.secret_token,
             )
 
-            chunked_resp: Optional[
-                metadata_api.MetadataRespM
-            ] = metadata_api.request_metadata_m(
+            return metadata_api.request_metadata_m(
                 self.redvox_config,
                 metadata_req,
                 session=self.__session,
                 timeout=self.timeout,
             )
 
-            yield chunked_resp
+        yield from self._request_chunks(_make_req, time_chunks)
 
     def request_geo_metadata_stream(
         self,
@@ -429,26 +513,26 @@ class CloudClient:
             start_ts_s, end_ts_s, chunk_by_seconds
         )
 
-        for start_ts, end_ts in time_chunks:
+        def _make_req(
+            time_chunk: Tuple[int, int]
+        ) -> Optional[metadata_api.GeoMetadataResp]:
             geo_metadata_req: metadata_api.GeoMetadataReq = metadata_api.GeoMetadataReq(
                 self.auth_token,
-                start_ts,
-                end_ts,
+                time_chunk[0],
+                time_chunk[1],
                 bounding_box,
                 bounding_circle,
                 metadata_to_include,
             )
 
-            chunked_resp: Optional[
-                metadata_api.GeoMetadataResp
-            ] = metadata_api.request_geo_metadata(
+            return metadata_api.request_geo_metadata(
                 self.redvox_config,
                 geo_metadata_req,
                 session=self.__session,
                 timeout=self.timeout,
             )
 
-            yield chunked_resp
+        yield from self._request_chunks(_make_req, time_chunks)
 
     def request_timing_metadata(
         self,
@@ -481,23 +565,25 @@ class CloudClient:
             metadata_api.TimingMetaResponse([])
         )
 
-        for start_ts, end_ts in time_chunks:
+        def _make_req(
+            time_chunk: Tuple[int, int]
+        ) -> Optional[metadata_api.TimingMetaResponse]:
             timing_req: metadata_api.TimingMetaRequest = metadata_api.TimingMetaRequest(
                 self.auth_token,
-                start_ts,
-                end_ts,
+                time_chunk[0],
+                time_chunk[1],
                 station_ids,
                 self.redvox_config.secret_token,
             )
-            chunked_resp: metadata_api.TimingMetaResponse = (
-                metadata_api.request_timing_metadata(
-                    self.redvox_config,
-                    timing_req,
-                    session=self.__session,
-                    timeout=self.timeout,
-                )
+            return metadata_api.request_timing_metadata(
+                self.redvox_config,
+                timing_req,
+                session=self.__session,
+                timeout=self.timeout,
             )
 
+        chunked_resp: Optional[metadata_api.TimingMetaResponse]
+        for chunked_resp in self._request_chunks(_make_req, time_chunks):
             if chunked_resp:
                 metadata_resp.items.extend(chunked_resp.items)
 
@@ -527,33 +613,60 @@ class CloudClient:
         start_ts_s: int,
         end_ts_s: int,
         station_ids: List[str],
+        chunk_by_seconds: Optional[int] = None,
     ) -> Optional[metadata_api.StationStatusResp]:
         """
         Requests station timing information from the cloud services.
         :param start_ts_s: The start of the request data window.
         :param end_ts_s: The end of the request data window.
         :param station_ids: A list of station IDs.
-        :return: A StationStatsResp.
+        :param chunk_by_seconds: Optionally split up longer requests into chunks of chunk_by_seconds size.  The
+                                 statuses and data availabilities of each chunk are concatenated in chunk order, so
+                                 data availabilities are split at chunk boundaries.  Default None (a single request)
+        :return: A StationStatsResp or None on error.
         """
         if end_ts_s <= start_ts_s:
             raise cloud_errors.CloudApiError("start_ts_s must be < end_ts_s")
 
-        station_status_req: metadata_api.StationStatusReq = (
-            metadata_api.StationStatusReq(
-                self.redvox_config.secret_token,
-                self.auth_token,
-                start_ts_s,
-                end_ts_s,
-                station_ids,
+        if chunk_by_seconds is not None and chunk_by_seconds <= 0:
+            raise cloud_errors.CloudApiError("chunk_by_seconds must be > 0")
+
+        def _make_req(
+            time_chunk: Tuple[int, int]
+        ) -> Optional[metadata_api.StationStatusResp]:
+            station_status_req: metadata_api.StationStatusReq = (
+                metadata_api.StationStatusReq(
+                    self.redvox_config.secret_token,
+                    self.auth_token,
+                    time_chunk[0],
+                    time_chunk[1],
+                    station_ids,
+                )
             )
-        )
 
-        return metadata_api.request_station_statuses(
-            self.redvox_config,
-            station_status_req,
-            session=self.__session,
-            timeout=self.timeout,
+            return metadata_api.request_station_statuses(
+                self.redvox_config,
+                station_status_req,
+                session=self.__session,
+                timeout=self.timeout,
+            )
+
+        time_chunks: List[Tuple[int, int]] = (
+            [(start_ts_s, end_ts_s)]
+            if chunk_by_seconds is None
+            else chunk_time_range(start_ts_s, end_ts_s, chunk_by_seconds)
+        )
+        status_resp: metadata_api.StationStatusResp = metadata_api.StationStatusResp(
+            [], []
         )
+        chunked_resp: Optional[metadata_api.StationStatusResp]
+        for chunked_resp in self._request_chunks(_make_req, time_chunks):
+            if chunked_resp is None:
+                return None
+            status_resp.station_statuses.extend(chunked_resp.station_statuses)
+            status_resp.data_availabilities.extend(chunked_resp.data_availabilities)
+
+        return status_resp
 
     def request_data_range(
         self,
@@ -572,6 +685,9 @@ class CloudClient:
         :param req_type: The type of data to request.
         :param correct_query_timing: If set to true, timing correction will be applied to each station before the data is
                                     correct_timing queried.
+        :param out_queue: Optional queue for the message of each timing corrected query.  If None, the messages are
+                          printed.  The corrected queries run concurrently, but their messages are reported in query
+                          order as their responses are merged.
         :return: A response containing a list of signed URLs for the RedVox packets.
         """
 
@@ -621,10 +737,23 @@ class CloudClient:
                 print("No timing corrections returned, running original query.")
                 return _make_req(start_ts_s, end_ts_s, station_ids)
 
-            # Make a request for each corrected query, aggregating the results of each request
+            def _make_corrected_req(
+                _corrected_query: "CorrectedQuery",
+            ) -> data_api.DataRangeResp:
+                return _make_req(
+                    round(_corrected_query.corrected_start_ts),
+                    round(_corrected_query.corrected_end_ts),
+                    [_corrected_query.station_id],
+                )
+
+            # Make a request for each corrected query concurrently, aggregating the results in query order
             resp: data_api.DataRangeResp = data_api.DataRangeResp([])
             corrected_query: "CorrectedQuery"
-            for corrected_query in corrected_queries:
+            corrected_resp: data_api.DataRangeResp
+            for corrected_query, corrected_resp in zip(
+                corrected_queries, self._request_chunks(_make_corrected_req, corrected_queries)
+            ):
+                # Report from this thread so the messages stay in query order
                 correction_msg: str = (
                     f"Running timing corrected query for {corrected_query.station_id} "
                     f"start offset={corrected_query.start_offset()} "
@@ -636,13 +765,7 @@ class CloudClient:
                 else:
                     out_queue.put(correction_msg, block=False)
 
-                resp.append(
-                    _make_req(
-                        round(corrected_query.corrected_start_ts),
-                        round(corrected_query.corrected_end_ts),
-                        [corrected_query.station_id],
-                    )
-                )
+                resp.append(corrected_resp)
             return resp
         else:
             # No timing correction requested, go ahead just make the original uncorrected request
@@ -653,13 +776,16 @@ class CloudClient:
         start_ts_s: int,
         end_ts_s: int,
         station_ids: List[str],
+        chunk_by_seconds: Optional[int] = None,
     ) -> Optional[station_stats_api.StationStatsResp]:
         """
         Request signed URLs for RedVox packets.
         :param start_ts_s: The start epoch of the window.
         :param end_ts_s:  The end epoch of the window.
         :param station_ids: A list of station ids.
-        :return: A response containing a list of signed URLs for the RedVox packets.
+        :param chunk_by_seconds: Optionally split up longer requests into chunks of chunk_by_seconds size.  The stats
+                                 of each chunk are concatenated in chunk order.  Default None (a single request)
+        :return: A response containing a list of signed URLs for the RedVox packets or None if any request fails.
         """
         if end_ts_s <= start_ts_s:
             raise cloud_errors.CloudApiError("start_ts_s must be < end_ts_s")
@@ -667,19 +793,41 @@ class CloudClient:
         if len(station_ids) == 0:
             raise cloud_errors.CloudApiError("At least one station_id must be provided")
 
-        station_stats_req: station_stats_api.StationStatReq = (
-            station_stats_api.StationStatReq(
-                self.auth_token,
-                start_ts_s,
-                end_ts_s,
-                station_ids,
-                self.redvox_config.secret_token,
+        if chunk_by_seconds is not None and chunk_by_seconds <= 0:
+            raise cloud_errors.CloudApiError("chunk_by_seconds must be > 0")
+
+        def _make_req(
+            time_chunk: Tuple[int, int]
+        ) -> Optional[station_stats_api.StationStatsResp]:
+            station_stats_req: station_stats_api.StationStatReq = (
+                station_stats_api.StationStatReq(
+                    self.auth_token,
+                    time_chunk[0],
+                    time_chunk[1],
+                    station_ids,
+                    self.redvox_config.secret_token,
+                )
+            )
+
+            return station_stats_api.request_station_stats(
+                self.redvox_config, station_stats_req, self.__session, self.timeout
             )
-        )
 
-        return station_stats_api.request_station_stats(
-            self.redvox_config, station_stats_req, self.__session, self.timeout
+        time_chunks: List[Tuple[int, int]] = (
+            [(start_ts_s, end_ts_s)]
+            if chunk_by_seconds is None
+            else chunk_time_range(start_ts_s, end_ts_s, chunk_by_seconds)
+        )
+        stats_resp: station_stats_api.StationStatsResp = (
+            station_stats_api.StationStatsResp([])
         )
+        chunked_resp: Optional[station_stats_api.StationStatsResp]
+        for chunked_resp in self._request_chunks(_make_req, time_chunks):
+            if chunked_resp is None:
+                return None
+            stats_resp.station_stats.extend(chunked_resp.station_stats)
+
+        return stats_resp
 
     def request_session_model(
         self, session_key: str
@@ -748,6 +896,8 @@ def cloud_client(
     redvox_config: Optional[RedVoxConfig] = RedVoxConfig.find(),
     refresh_token_interval: float = 600.0,
     timeout: float = 10.0,
+    max_concurrent_requests: int = DEFAULT_MAX_CONCURRENT_REQUESTS,
+    chunk_retries: int = DEFAULT_CHUNK_RETRIES,
 ):
     """
     Function that can be used within a "with" block to automatically handle the closing of open resources.
@@ -759,6 +909,8 @@ def cloud_client(
     :param redvox_config: The Redvox endpoint configuration.
     :param refresh_token_interval: An optional token refresh interval
     :param timeout: An optional timeout.
+    :param max_concurrent_requests: The maximum number of chunked requests in flight at the same time.
+    :param chunk_retries: The number of times a chunk of a chunked request is retried after its connection fails.
     :return: A CloudClient.
     """
     if redvox_config is None:
@@ -766,7 +918,13 @@ def cloud_client(
             "A RedVoxConfig was not found in the environment and one wasn't provided"
         )
 
-    client: CloudClient = CloudClient(redvox_config, refresh_token_interval, timeout)
+    client: CloudClient = CloudClient(
+        redvox_config,
+        refresh_token_interval,
+        timeout,
+        max_concurrent_requests,
+        chunk_retries,
+    )
     try:
         yield client
     finally:
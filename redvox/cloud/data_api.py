@@ -81,13 +81,31 @@ class DataRangeResp:
 
     signed_urls: List[str]
 
-    def download_fs(self, out_dir: str, retries: int = 3, out_queue: Optional[Queue] = None) -> None:
+    def download_fs(
+        self,
+        out_dir: str,
+        retries: int = 3,
+        out_queue: Optional[Queue] = None,
+        progress_callback: Optional[data_client.ProgressCallback] = None,
+        max_workers: int = data_client.DEFAULT_MAX_WORKERS,
+    ) -> None:
         """
         Download the referenced packets to the provided output directory.
         :param out_dir: Output directory to store the downloaded files.
         :param retries: Number of times to retry downloading the file on failure.
+        :param out_queue: Optional queue to send progress messages to.
+        :param progress_callback: Optional function called with the progress after each file is downloaded.  If
+                                  neither progress_callback nor out_queue are provided, the progress is printed.
+        :param max_workers: Number of files to download at the same time.
         """
-        data_client.download_files(self.signed_urls, out_dir, retries, out_queue=out_queue)
+        data_client.download_files(
+            self.signed_urls,
+            out_dir,
+            retries,
+            max_workers,
+            out_queue=out_queue,
+            progress_callback=progress_callback,
+        )
 
     def append(self, other: "DataRangeResp") -> "DataRangeResp":
         """
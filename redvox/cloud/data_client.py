@@ -1,17 +1,29 @@
 """
-This module provides a custom work-stealing thread pool for downloading API M data in parallel.
+This module provides a thread pool for downloading API M data in parallel.
+
+Downloads are network and disk bound, so all workers share a single requests.Session whose connection pool limits
+the number of simultaneous connections made to each host.
 """
 
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
+import logging
 import time
-from typing import List, Optional
-from multiprocessing import cpu_count, Manager, Process, Queue
-import queue
+import warnings
+from typing import Callable, List, Optional
+from multiprocessing import Queue
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from redvox.cloud.data_io import download_file
 
+# pylint: disable=C0103
+log = logging.getLogger(__name__)
+
+DEFAULT_MAX_WORKERS: int = 16  # Number of threads downloading at the same time
+DEFAULT_MAX_CONNECTIONS_PER_HOST: int = 16  # Number of simultaneous connections made to a single host
+
 
 @dataclass
 class DownloadResult:
@@ -22,98 +34,153 @@ class DownloadResult:
     data_key: str
     resp_len: int
     skipped: bool = False
+    url: str = ""
+
+    def is_failed(self) -> bool:
+        """
+        :return: True if the file was not skipped and could not be downloaded.
+        """
+        return not self.skipped and self.data_key == ""
+
+
+@dataclass
+class DownloadProgress:
+    """
+    The progress of a set of downloads, reported after each file is completed.
+    """
+
+    completed: int
+    total: int
+    total_bytes: int
+    elapsed_s: float
+    result: DownloadResult
+
+    def percentage(self) -> float:
+        """
+        :return: percentage of completed files
+        """
+        return (float(self.completed) / float(self.total)) * 100.0
+
+    def remaining_s(self) -> float:
+        """
+        :return: estimated time to complete the remaining downloads in seconds
+        """
+        return ((100.0 / self.percentage()) * self.elapsed_s) - self.elapsed_s
+
+    def __str__(self) -> str:
+        return (
+            f"\r[{self.completed:5} / {self.total:5}] [{self.percentage():04.1f}%] [{self.total_bytes:10} bytes] "
+            f"[est time remaining {self.remaining_s():06.1f}s] {self.result.data_key:>55}"
+        )
+
+
+ProgressCallback = Callable[[DownloadProgress], None]
+
+
+def print_progress(progress: DownloadProgress) -> None:
+    """
+    A ProgressCallback that prints the progress of each downloaded file to standard out.
+    :param progress: The progress to print.
+    """
+    if not progress.result.skipped:
+        print(progress)
+
+
+def create_session(
+    max_connections_per_host: int = DEFAULT_MAX_CONNECTIONS_PER_HOST, max_hosts: int = 10
+) -> requests.Session:
+    """
+    Creates a session that can be shared between download threads.
+    :param max_connections_per_host: The maximum number of simultaneous connections to a single host.  Threads wait
+                                     for a free connection once the limit is reached.
+    :param max_hosts: The number of hosts to keep connection pools for.
+    :return: A session with a pooled connection adapter mounted for http and https.
+    """
+    session: requests.Session = requests.Session()
+    adapter: HTTPAdapter = HTTPAdapter(
+        pool_connections=max_hosts, pool_maxsize=max_connections_per_host, pool_block=True
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
 
 
-def download_process(
-    input_queue: Queue, result_queue: Queue, out_dir: str, retries: int
-) -> None:
+def download_url(url: str, session: requests.Session, out_dir: str, retries: int) -> DownloadResult:
     """
-    A function that runs in a separate process for downloading RedVox data.
-    :param input_queue: A shared queue containing the list of items to be downloaded.
-    :param result_queue: A queue used to send results from the process to the caller.
+    Downloads a single file.
+    :param url: The URL of the file.
+    :param session: The HTTP session.
     :param out_dir: The directory downloaded data should be stored to.
     :param retries: Number of times to retry a failed download.
+    :return: The result of the download.
     """
-    session: requests.Session = requests.Session()
     try:
-        # While there is still data in the queue, retrieve it.
-        while True:
-            url: str = input_queue.get_nowait()
-            data_key: str
-            resp_len: int
-            try:
-                data_key, resp_len = download_file(url, session, out_dir, retries)
-                result_queue.put(DownloadResult(data_key, resp_len), True, None)
-            except FileExistsError:
-                print(f"File already exists, skipping...")
-                result_queue.put(DownloadResult("", 0, skipped=True), True, None)
-                continue
-    # Thrown when the queue is empty
-    except queue.Empty:
-        session.close()
+        data_key, resp_len = download_file(url, session, out_dir, retries)
+        return DownloadResult(data_key, resp_len, url=url)
+    except FileExistsError:
+        log.info("File already exists, skipping %s", url)
+        return DownloadResult("", 0, skipped=True, url=url)
 
 
 def download_files(
     urls: List[str],
     out_dir: str,
     retries: int,
-    num_processes: int = cpu_count(),
+    max_workers: int = DEFAULT_MAX_WORKERS,
     out_queue: Optional[Queue] = None,
-) -> None:
+    progress_callback: Optional[ProgressCallback] = None,
+    max_connections_per_host: int = DEFAULT_MAX_CONNECTIONS_PER_HOST,
+    session: Optional[requests.Session] = None,
+    num_processes: Optional[int] = None,
+) -> List[DownloadResult]:
     """
     Downloads files in parallel from the provided URLs.
-    :param out_queue: If provided, send results to this queue instead of printing them
     :param urls: URLs to files to retrieve.
     :param out_dir: The base output directory where files should be stored.
     :param retries: The number of times to retry a failed download.
-    :param num_processes: Number of processes to create for downloading data.
+    :param max_workers: Number of threads downloading data at the same time.
+    :param out_queue: If provided, send progress messages to this queue, followed by "done" once all files are
+                      downloaded.
+    :param progress_callback: If provided, called with the progress after each file is completed.  If neither
+                              progress_callback nor out_queue are provided, the progress is printed to standard out
+                              with print_progress.
+    :param max_connections_per_host: The maximum number of simultaneous connections to a single host.
+    :param session: Optional session to use.  If None, a session is created with create_session and closed when done.
+    :param num_processes: Deprecated, use max_workers.  If provided, used as max_workers.
+    :return: The results of all downloads in the order they completed.
     """
-    manager: Manager = Manager()
-    url_queue: Queue = manager.Queue(len(urls))
-    result_queue: Queue = manager.Queue(len(urls))
-    processes: List[Process] = []
-
-    # Add all URLs to shared queue
-    for url in urls:
-        url_queue.put(url)
-
-    # Create the process pool
-    for _ in range(num_processes):
-        process: Process = Process(
-            target=download_process, args=(url_queue, result_queue, out_dir, retries)
-        )
-        processes.append(process)
-        process.start()
-
-    # Display download status
-    i: int = 0
+    if num_processes is not None:
+        warnings.warn("num_processes is deprecated, use max_workers", DeprecationWarning, stacklevel=2)
+        max_workers = num_processes
+    if progress_callback is None and out_queue is None:
+        progress_callback = print_progress
+    _session: requests.Session = create_session(max_connections_per_host) if session is None else session
+    results: List[DownloadResult] = []
     total_bytes: int = 0
     start_time = time.monotonic_ns()
-    while i < len(urls):
-        res: DownloadResult = result_queue.get(True, None)
-
-        if res.skipped:
-            i += 1
-            continue
-
-        timestamp = time.monotonic_ns()
-        time_range = (timestamp - start_time) / 1_000_000_000.0
-        percentage: float = (float(i + 1) / float(len(urls))) * 100.0
-        remaining: float = ((100.0 / percentage) * time_range) - time_range
-
-        total_bytes += res.resp_len
-
-        out_str: str = f"\r[{(i + 1):5} / {len(urls):5}] [{percentage:04.1f}%] [{total_bytes:10} bytes] " \
-                       f"[est time remaining {remaining:06.1f}s] {res.data_key:>55}"
-        if out_queue is None:
-            print(out_str)
-        else:
-            out_queue.put(out_str, False)
-        i += 1
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(download_url, url, _session, out_dir, retries) for url in urls]
+            for future in as_completed(futures):
+                res: DownloadResult = future.result()
+                results.append(res)
+                total_bytes += res.resp_len
+                progress = DownloadProgress(
+                    len(results),
+                    len(urls),
+                    total_bytes,
+                    (time.monotonic_ns() - start_time) / 1_000_000_000.0,
+                    res,
+                )
+                if progress_callback is not None:
+                    progress_callback(progress)
+                if out_queue is not None and not res.skipped:
+                    out_queue.put(str(progress), False)
+    finally:
+        if session is None:
+            _session.close()
 
     if out_queue is not None:
         out_queue.put("done", False)
 
-    # Wait for all processes in pool to finish
-    for process in processes:
-        process.join()
+    return results
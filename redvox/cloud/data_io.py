@@ -1,16 +1,28 @@
 """
 This module contains functions for downloading data from AWS S3 via signed URLs.
+
+Files are streamed to a partial file next to their final destination and only moved into place once they have been
+completely received and verified.  Interrupted downloads are resumed from the partial file using HTTP range requests.
 """
 
+import hashlib
 import logging
 import os
+import time
 from typing import Tuple, Optional
 
+import lz4.frame
 import requests
 
 # pylint: disable=C0103
 log = logging.getLogger(__name__)
 
+PARTIAL_FILE_EXT: str = ".part"  # Extension of files that are still being downloaded
+DEFAULT_CHUNK_SIZE: int = 64 * 1024  # Number of bytes read from the response and written to disk at a time
+DEFAULT_BACKOFF_S: float = 0.5  # Wait time in seconds before the first retry, doubled on each following retry
+DEFAULT_MAX_BACKOFF_S: float = 30.0  # Maximum wait time in seconds between two retries
+DEFAULT_TIMEOUT_S: float = 60.0  # Connect and read timeout in seconds of a single request
+
 
 def find_between(start: str, end: str, contents: str) -> str:
     """
@@ -25,76 +37,259 @@ def find_between(start: str, end: str, contents: str) -> str:
     return contents[s_idx + len(start) : e_idx]
 
 
+def data_key_from_url(url: str) -> str:
+    """
+    Extracts the data key (the relative path of the file) from a signed S3 URL.
+    :param url: The signed URL.
+    :return: The data key.
+    """
+    if "/rdvxdata/" in url:
+        return find_between("/rdvxdata/", "?X-Amz-Algorithm=", url)
+    return find_between("/rdvxdata.s3.amazonaws.com/", "?AWSAccessKeyId=", url)
+
+
+def backoff_s(attempt: int, base_s: float = DEFAULT_BACKOFF_S, max_s: float = DEFAULT_MAX_BACKOFF_S) -> float:
+    """
+    Bounded exponential backoff.
+    :param attempt: The number of the retry, starting at 0 for the first retry.
+    :param base_s: The wait time of the first retry in seconds.
+    :param max_s: The maximum wait time in seconds.
+    :return: The time to wait in seconds before the given retry.
+    """
+    return min(max_s, base_s * (2.0 ** attempt))
+
+
+def _wait_before_retry(url: str, attempt: int, retries: int, base_s: float, max_s: float) -> None:
+    """
+    Logs and sleeps before the next attempt.
+    :param url: The url being retried.
+    :param attempt: The number of the attempt that just failed, starting at 0.
+    :param retries: The total number of retries.
+    :param base_s: The wait time of the first retry in seconds.
+    :param max_s: The maximum wait time in seconds.
+    """
+    if attempt < retries:
+        wait_s: float = backoff_s(attempt, base_s, max_s)
+        log.info("Retrying %s in %.2fs with %d retries left", url, wait_s, retries - attempt)
+        time.sleep(wait_s)
+
+
 def get_file(
-    url: str, retries: int, session: requests.Session = requests.Session()
+    url: str,
+    retries: int,
+    session: Optional[requests.Session] = None,
+    base_backoff_s: float = DEFAULT_BACKOFF_S,
+    max_backoff_s: float = DEFAULT_MAX_BACKOFF_S,
+    timeout_s: Optional[float] = DEFAULT_TIMEOUT_S,
 ) -> Optional[bytes]:
     """
-    Attempts to download a file with a configurable amount of retries.
+    Attempts to download a file into memory with a configurable amount of retries.
     :param url: The url to download.
     :param retries: Number of retries.
-    :param session: An instance of a session.
-    :return: The bytes of the file.
+    :param session: An optional instance of a session.  If None, a new session is used.
+    :param base_backoff_s: Wait time in seconds before the first retry.  Doubled for each following retry.
+    :param max_backoff_s: Maximum wait time in seconds between retries.
+    :param timeout_s: Connect and read timeout in seconds of each request.  None waits forever.
+    :return: The bytes of the file or None if the file could not be downloaded.
     """
-    # pylint: disable=W0702
-    # noinspection PyBroadException
-    try:
-        resp: requests.Response = session.get(url)
-        if resp.status_code == 200:
-            return resp.content
-        else:
+    _session: requests.Session = requests.Session() if session is None else session
+    for attempt in range(retries + 1):
+        # pylint: disable=W0703
+        # noinspection PyBroadException
+        try:
+            resp: requests.Response = _session.get(url, timeout=timeout_s)
+            if resp.status_code == 200:
+                expected_len: Optional[str] = resp.headers.get("Content-Length")
+                if expected_len is None or int(expected_len) == len(resp.content):
+                    return resp.content
+                log.error(
+                    "Received %d of %s bytes when requesting data for url=%s", len(resp.content), expected_len, url
+                )
+            else:
+                log.error(
+                    "Received error response when requesting data for url=%s: %d %s",
+                    url,
+                    resp.status_code,
+                    resp.text,
+                )
+        except Exception as e:
+            log.error("Encountered an error while getting data for %s: %s", url, str(e))
+        _wait_before_retry(url, attempt, retries, base_backoff_s, max_backoff_s)
+
+    log.error("All retries exhausted, could not get %s", url)
+    return None
+
+
+def _expected_size(resp: requests.Response, offset: int) -> Optional[int]:
+    """
+    :param resp: A response to a (possibly ranged) GET request.
+    :param offset: The first byte requested.
+    :return: The expected total size of the file in bytes or None if the server did not provide it.
+    """
+    if resp.status_code == 206:
+        content_range: Optional[str] = resp.headers.get("Content-Range")
+        if content_range is not None and "/" in content_range:
+            total: str = content_range.rsplit("/", 1)[1]
+            if total.isdigit():
+                return int(total)
+    content_len: Optional[str] = resp.headers.get("Content-Length")
+    if content_len is not None and content_len.isdigit():
+        return int(content_len) + (offset if resp.status_code == 206 else 0)
+    return None
+
+
+def verify_file(
+    path: str,
+    checksum: Optional[str] = None,
+    checksum_algorithm: str = "md5",
+    verify_lz4: bool = False,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> bool:
+    """
+    Checks the integrity of a file on disk.
+    :param path: Path to the file.
+    :param checksum: Optional expected hex digest of the file.
+    :param checksum_algorithm: Name of the hashlib algorithm used to compute the checksum.  Default md5.
+    :param verify_lz4: If True, the file must be a complete and valid lz4 frame.  Default False.
+    :param chunk_size: Number of bytes read at a time.
+    :return: True if the file passes all requested checks, False otherwise.
+    """
+    if checksum is not None:
+        digest = hashlib.new(checksum_algorithm)
+        with open(path, "rb") as f_in:
+            for chunk in iter(lambda: f_in.read(chunk_size), b""):
+                digest.update(chunk)
+        if digest.hexdigest().lower() != checksum.lower():
+            log.error("Checksum mismatch for %s", path)
+            return False
+    if verify_lz4:
+        # pylint: disable=W0703
+        # noinspection PyBroadException
+        try:
+            with lz4.frame.open(path, "rb") as f_in:
+                while f_in.read(chunk_size):
+                    pass
+        except Exception as e:
+            log.error("Invalid lz4 frame in %s: %s", path, str(e))
+            return False
+    return True
+
+
+def _stream_to_partial(
+    url: str,
+    session: requests.Session,
+    part_path: str,
+    chunk_size: int,
+    timeout_s: Optional[float],
+) -> Optional[Tuple[int, Optional[int]]]:
+    """
+    Streams a file into the partial file, resuming from the bytes already in the partial file.
+    :param url: The url to download.
+    :param session: The HTTP session.
+    :param part_path: The path of the partial file.
+    :param chunk_size: Number of bytes written at a time.
+    :param timeout_s: Connect and read timeout in seconds.
+    :return: The size of the partial file and the expected size of the full file, if known, or None if the server
+             responded with an error.
+    """
+    offset: int = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+    headers = {"Range": f"bytes={offset}-"} if offset > 0 else {}
+    with session.get(url, headers=headers, stream=True, timeout=timeout_s) as resp:
+        if resp.status_code == 416:
+            # The partial file is at least as large as the file, so it can't be resumed
+            log.error("Could not resume %s from byte %d, restarting download", url, offset)
+            os.remove(part_path)
+            return None
+        if resp.status_code not in (200, 206):
             log.error(
                 "Received error response when requesting data for url=%s: %d %s",
                 url,
                 resp.status_code,
                 resp.text,
             )
-            if retries > 0:
-                log.info("Retrying with %d retries", retries)
-                return get_file(url, retries - 1, session)
-
-            log.error("All retries exhausted, could not get %s", url)
             return None
-    except Exception as e:
-        log.error("Encountered an error while getting data for %s: %s", url, str(e))
-        if retries > 0:
-            log.info("Retrying with %d retries", retries)
-            return get_file(url, retries - 1, session)
-        log.error("All retries exhausted, could not get %s", url)
-        return None
+        if resp.status_code == 200:
+            # The server ignored the range request and is sending the whole file
+            offset = 0
+        expected: Optional[int] = _expected_size(resp, offset)
+        with open(part_path, "ab" if offset > 0 else "wb") as f_out:
+            for chunk in resp.iter_content(chunk_size):
+                f_out.write(chunk)
+    return os.path.getsize(part_path), expected
 
 
 def download_file(
-    url: str, session: requests.Session, out_dir: str, retries: int
+    url: str,
+    session: requests.Session,
+    out_dir: str,
+    retries: int,
+    checksum: Optional[str] = None,
+    checksum_algorithm: str = "md5",
+    verify_lz4: Optional[bool] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    base_backoff_s: float = DEFAULT_BACKOFF_S,
+    max_backoff_s: float = DEFAULT_MAX_BACKOFF_S,
+    timeout_s: Optional[float] = DEFAULT_TIMEOUT_S,
 ) -> Tuple[str, int]:
     """
     Attempts to download a file from S3.
+
+    The file is streamed to disk as [file].part and resumed with HTTP range requests after an interruption.  Once the
+    content length, checksum and lz4 frame (when requested) are verified, the partial file is atomically renamed to
+    its final name.  An existing final file that fails verification is replaced.
+
     :param url: The URL to retrieve.
     :param session: The HTTP session.
     :param out_dir: The output directory where files will be stored.
     :param retries: The number of times to retry failed file downloads.
-    :return: A tuple containing the data_key and the length of the download response.
+    :param checksum: Optional expected hex digest of the file.  Default None.
+    :param checksum_algorithm: Name of the hashlib algorithm used to compute the checksum.  Default md5.
+    :param verify_lz4: If True, the file must be a valid lz4 frame.  If None, only API M (.rdvxm) files are checked.
+    :param chunk_size: Number of bytes written to disk at a time.
+    :param base_backoff_s: Wait time in seconds before the first retry.  Doubled for each following retry.
+    :param max_backoff_s: Maximum wait time in seconds between retries.
+    :param timeout_s: Connect and read timeout in seconds of each request.  None waits forever.
+    :return: A tuple containing the data_key and the size of the downloaded file.
+             ("", 0) is returned if the file could not be downloaded.
+    :raises FileExistsError: If a verified copy of the file already exists.
     """
-    buf: Optional[bytes] = get_file(url, retries, session)
-
-    if buf:
-        if "/rdvxdata/" in url:
-            data_key = find_between("/rdvxdata/", "?X-Amz-Algorithm=", url)
-        else:
-            data_key = find_between(
-                "/rdvxdata.s3.amazonaws.com/", "?AWSAccessKeyId=", url
-            )
+    data_key: str = data_key_from_url(url)
+    full_path: str = os.path.join(out_dir, data_key)
+    part_path: str = f"{full_path}{PARTIAL_FILE_EXT}"
+    _verify_lz4: bool = data_key.endswith(".rdvxm") if verify_lz4 is None else verify_lz4
 
-        directory = os.path.dirname(data_key)
-        full_dir = f"{out_dir}/{directory}"
-        if not os.path.exists(full_dir):
-            log.debug("Directory %s does not exist, creating it", full_dir)
-            os.makedirs(full_dir)
+    if os.path.exists(full_path):
+        if verify_file(full_path, checksum, checksum_algorithm, _verify_lz4, chunk_size):
+            raise FileExistsError(full_path)
+        log.info("Existing file %s is invalid, downloading it again", full_path)
+        os.remove(full_path)
 
-        full_path = f"{out_dir}/{data_key}"
-        with open(full_path, "wb") as fout:
-            bytes_written = fout.write(buf)
-            log.debug("Wrote %s %d", full_path, bytes_written)
+    full_dir: str = os.path.dirname(full_path)
+    if not os.path.exists(full_dir):
+        log.debug("Directory %s does not exist, creating it", full_dir)
+        os.makedirs(full_dir, exist_ok=True)
 
-        return data_key, len(buf)
+    for attempt in range(retries + 1):
+        # pylint: disable=W0703
+        # noinspection PyBroadException
+        try:
+            streamed: Optional[Tuple[int, Optional[int]]] = _stream_to_partial(
+                url, session, part_path, chunk_size, timeout_s
+            )
+            if streamed is not None:
+                size, expected = streamed
+                if expected is not None and size != expected:
+                    log.error("Received %d of %d bytes for %s", size, expected, url)
+                elif verify_file(part_path, checksum, checksum_algorithm, _verify_lz4, chunk_size):
+                    os.replace(part_path, full_path)
+                    log.debug("Wrote %s %d", full_path, size)
+                    return data_key, size
+                else:
+                    # Corrupt data can't be resumed
+                    os.remove(part_path)
+        except Exception as e:
+            log.error("Encountered an error while getting data for %s: %s", url, str(e))
+        _wait_before_retry(url, attempt, retries, base_backoff_s, max_backoff_s)
 
+    log.error("All retries exhausted, could not get %s", url)
     return "", 0
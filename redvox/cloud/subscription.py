@@ -2,12 +2,15 @@
 A simple WebSocket API for subscribing to live RedVox data.
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field, replace
+import enum
 import logging
+import os
 import threading
 import time
+import zlib
 from typing import Optional, List, Iterator, TypeVar, Generic
-from queue import Empty, Queue
+from queue import Empty, Full, Queue
 
 import lz4.frame  # type: ignore
 from dataclasses_json import dataclass_json
@@ -20,6 +23,10 @@ from redvox.cloud.client import CloudClient
 
 logger: logging.Logger = logging.getLogger(__name__)
 
+DEFAULT_MAX_QUEUE_SIZE: int = 10_000  # Number of messages buffered before the overflow policy applies
+DEFAULT_DECODE_WORKERS: int = 4  # Number of threads decoding messages at the same time
+_WORKER_QUEUE_SIZE: int = 64  # Number of messages buffered for each decode worker
+
 
 @dataclass_json
 @dataclass
@@ -43,6 +50,8 @@ class PubMsg(Generic[T]):
 
     header: Optional[PubHeader]
     msg: T
+    # Monotonic time the message was received at in nanoseconds
+    received_ns: int = field(default_factory=time.monotonic_ns)
 
     def map(self, msg: R) -> "PubMsg[R]":
         """
@@ -50,7 +59,15 @@ class PubMsg(Generic[T]):
         :param msg: The message to replace with.
         :return: A PubMsg with an updated msg body.
         """
-        return PubMsg(self.header, msg)
+        return PubMsg(self.header, msg, self.received_ns)
+
+    def station_key(self) -> str:
+        """
+        :return: The station ID from the file path in the header, or an empty string if there is no header.
+        """
+        if self.header is None:
+            return ""
+        return os.path.basename(self.header.file_path).split("_")[0]
 
     @staticmethod
     def parse(msg: bytes) -> "PubMsg":
@@ -102,23 +119,292 @@ def fmt_uri(
     return f"{base}?auth_token={auth_token}{station_ids_query}&include_header=true{server_id_query}"
 
 
+class OverflowPolicy(enum.Enum):
+    """
+    What to do with a received message when the subscription queue is full.
+    """
+
+    # Wait for space in the queue.  This stops reading from the websocket, pushing back on the server.
+    BLOCK: str = "BLOCK"
+    # Discard the oldest message in the queue to make space for the received message.
+    DROP_OLDEST: str = "DROP_OLDEST"
+    # Discard the received message.
+    DROP_NEWEST: str = "DROP_NEWEST"
+
+
+@dataclass
+class SubscriptionMetrics:
+    """
+    Counters describing the throughput of a subscription.
+    """
+
+    received: int = 0
+    dropped: int = 0
+    decoded: int = 0
+    decode_errors: int = 0
+    delivered: int = 0
+    max_queue_size: int = 0
+    total_latency_s: float = 0.0
+    max_latency_s: float = 0.0
+    start_ns: int = field(default_factory=time.monotonic_ns)
+
+    def elapsed_s(self) -> float:
+        """
+        :return: The time since the subscription started in seconds.
+        """
+        return (time.monotonic_ns() - self.start_ns) / 1_000_000_000.0
+
+    def mean_latency_s(self) -> float:
+        """
+        :return: The mean time between receiving and delivering a message in seconds.
+        """
+        return self.total_latency_s / self.delivered if self.delivered > 0 else 0.0
+
+    def received_per_s(self) -> float:
+        """
+        :return: The number of messages received per second.
+        """
+        return self.received / self.elapsed_s()
+
+    def delivered_per_s(self) -> float:
+        """
+        :return: The number of messages delivered per second.
+        """
+        return self.delivered / self.elapsed_s()
+
+
+class OverflowQueue(Queue):
+    """
+    A bounded queue that applies an OverflowPolicy when it is full and counts received and dropped messages.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = DEFAULT_MAX_QUEUE_SIZE,
+        overflow_policy: OverflowPolicy = OverflowPolicy.BLOCK,
+        metrics: Optional[SubscriptionMetrics] = None,
+    ):
+        """
+        :param maxsize: The maximum number of messages in the queue, must be > 0.
+        :param overflow_policy: What to do with a received message when the queue is full.
+        :param metrics: The metrics to update.  A new instance is used if not provided.
+        """
+        if maxsize <= 0:
+            raise ValueError("maxsize must be > 0")
+        super().__init__(maxsize)
+        self.overflow_policy: OverflowPolicy = overflow_policy
+        self.metrics: SubscriptionMetrics = (
+            SubscriptionMetrics() if metrics is None else metrics
+        )
+
+    def put(self, item, block: bool = True, timeout: Optional[float] = None) -> None:
+        """
+        Adds a message to the queue, applying the overflow policy if the queue is full.
+        :param item: The message to add.
+        :param block: Only used by the BLOCK policy, see Queue.put.
+        :param timeout: Only used by the BLOCK policy, see Queue.put.
+        """
+        if self.overflow_policy == OverflowPolicy.BLOCK:
+            with self.mutex:
+                self.metrics.received += 1
+            super().put(item, block, timeout)
+        else:
+            with self.not_full:
+                self.metrics.received += 1
+                if self._qsize() >= self.maxsize:
+                    self.metrics.dropped += 1
+                    if self.overflow_policy == OverflowPolicy.DROP_NEWEST:
+                        return
+                    self._get()
+                    self.unfinished_tasks -= 1
+                self._put(item)
+                self.unfinished_tasks += 1
+                self.not_empty.notify()
+
+        with self.mutex:
+            self.metrics.max_queue_size = max(
+                self.metrics.max_queue_size, self._qsize()
+            )
+
+
+def decode_pub_msg(pub_msg: PubMsg[bytes]) -> PubMsg[RedvoxPacketM]:
+    """
+    Decompresses and parses the body of a message.
+    :param pub_msg: The message containing lz4 compressed RedvoxPacketM bytes.
+    :return: The message containing the RedvoxPacketM.
+    """
+    decompressed_bytes: bytes = lz4.frame.decompress(pub_msg.msg, False)
+    proto: RedvoxPacketM = RedvoxPacketM()
+    proto.ParseFromString(decompressed_bytes)
+    return pub_msg.map(proto)
+
+
+class SubscriptionPipeline:
+    """
+    Decodes received messages on a pool of worker threads.
+
+    Received messages are buffered in a bounded OverflowQueue.  A dispatcher thread assigns each message to a decode
+    worker by the station ID in its header, so messages from one station are decoded and delivered in the order they
+    were received.  Messages without a header are all decoded by the same worker.  Decoded messages are buffered in
+    a second bounded queue until they are taken by the consumer; when it falls behind, the workers and dispatcher
+    wait, the received queue fills and the overflow policy applies.
+    """
+
+    def __init__(
+        self,
+        max_queue_size: int = DEFAULT_MAX_QUEUE_SIZE,
+        overflow_policy: OverflowPolicy = OverflowPolicy.BLOCK,
+        num_decode_workers: int = DEFAULT_DECODE_WORKERS,
+    ):
+        """
+        :param max_queue_size: The maximum number of received and of decoded messages to buffer.
+        :param overflow_policy: What to do with a received message when the received queue is full.
+        :param num_decode_workers: The number of threads decoding messages.
+        """
+        if num_decode_workers <= 0:
+            raise ValueError("num_decode_workers must be > 0")
+        self._metrics: SubscriptionMetrics = SubscriptionMetrics()
+        self.queue: OverflowQueue = OverflowQueue(
+            max_queue_size, overflow_policy, self._metrics
+        )
+        self.stop_event: threading.Event = threading.Event()
+        self._decoded: Queue = Queue(max_queue_size)
+        self._worker_queues: List[Queue] = [
+            Queue(_WORKER_QUEUE_SIZE) for _ in range(num_decode_workers)
+        ]
+        self._threads: List[threading.Thread] = [
+            threading.Thread(target=self._dispatch, daemon=True)
+        ] + [
+            threading.Thread(target=self._decode, args=(worker_queue,), daemon=True)
+            for worker_queue in self._worker_queues
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def metrics(self) -> SubscriptionMetrics:
+        """
+        :return: A snapshot of the metrics of this pipeline.
+        """
+        with self.queue.mutex:
+            return replace(self._metrics)
+
+    def close(self) -> None:
+        """
+        Stops the subscriptions feeding this pipeline and the pipeline threads.
+        """
+        self.stop_event.set()
+        for thread in self._threads:
+            thread.join()
+
+    def _put(self, queue: Queue, item) -> bool:
+        """
+        Puts an item on a bounded queue, waiting for space until the pipeline is closed.
+        :return: True if the item was added.
+        """
+        while not self.stop_event.is_set():
+            try:
+                queue.put(item, timeout=0.1)
+                return True
+            except Full:
+                continue
+        return False
+
+    def _dispatch(self) -> None:
+        while not self.stop_event.is_set():
+            try:
+                pub_msg: PubMsg[bytes] = self.queue.get(timeout=0.1)
+            except Empty:
+                continue
+            worker: int = zlib.crc32(pub_msg.station_key().encode()) % len(
+                self._worker_queues
+            )
+            self._put(self._worker_queues[worker], pub_msg)
+
+    def _decode(self, worker_queue: Queue) -> None:
+        while not self.stop_event.is_set():
+            try:
+                pub_msg: PubMsg[bytes] = worker_queue.get(timeout=0.1)
+            except Empty:
+                continue
+            try:
+                decoded: PubMsg[RedvoxPacketM] = decode_pub_msg(pub_msg)
+            # pylint: disable=W0703
+            except Exception as ex:
+                logger.warning(f"Error decoding message: {ex}")
+                with self.queue.mutex:
+                    self._metrics.decode_errors += 1
+                continue
+            with self.queue.mutex:
+                self._metrics.decoded += 1
+            self._put(self._decoded, decoded)
+
+    def get(
+        self, block: bool = True, timeout: Optional[float] = None
+    ) -> PubMsg[RedvoxPacketM]:
+        """
+        Takes the next decoded message.
+        :param block: Wait for a message if none is available, see Queue.get.
+        :param timeout: The maximum time to wait for a message, see Queue.get.
+        :return: The next decoded message.  Raises queue.Empty if no message is available.
+        """
+        pub_msg: PubMsg[RedvoxPacketM] = self._decoded.get(block, timeout)
+        latency_s: float = (time.monotonic_ns() - pub_msg.received_ns) / 1_000_000_000.0
+        with self.queue.mutex:
+            self._metrics.delivered += 1
+            self._metrics.total_latency_s += latency_s
+            self._metrics.max_latency_s = max(self._metrics.max_latency_s, latency_s)
+        return pub_msg
+
+    def __iter__(self) -> Iterator[PubMsg[RedvoxPacketM]]:
+        """
+        :return: An iterator over decoded messages that ends when the pipeline is closed.
+        """
+        while not self.stop_event.is_set():
+            try:
+                yield self.get(timeout=0.1)
+            except Empty:
+                continue
+
+
+def _close_on_stop(
+    ws_apps: List[WebSocketApp], stop_event: threading.Event
+) -> None:
+    """
+    Closes the current connection of a subscription once it is stopped.
+    :param ws_apps: A list holding the current connection.
+    :param stop_event: The event that stops the subscription.
+    """
+    stop_event.wait()
+    for ws_app in ws_apps:
+        ws_app.close()
+
+
 def subscribe_bytes_queue(
     base_uri: str,
     queue: Queue[PubMsg[bytes]],
     client: CloudClient,
     station_ids: Optional[List[str]] = None,
     server_id: Optional[str] = None,
+    stop_event: Optional[threading.Event] = None,
 ) -> None:
     """
     Create a subscription on the raw compressed bytes.
     :param base_uri: The base URI to the acquisition subscription service.
-    :param queue: A queue for transferring when received by the subscriber.
+    :param queue: A queue for transferring when received by the subscriber.  Use an OverflowQueue to bound the
+                  number of buffered messages.
     :param client: An instance of the RedVox CloudClient.
     :param station_ids: An optional list of station IDs to subscribe to.
     :param server_id: An optional server ID for working with distributed acquisition servers.
+    :param stop_event: An optional event that closes the subscription when set.  If not provided, the subscription
+                       reconnects forever.
     """
+    ws_apps: List[WebSocketApp] = []
+    if stop_event is not None:
+        threading.Thread(
+            target=_close_on_stop, args=(ws_apps, stop_event), daemon=True
+        ).start()
 
-    while True:
+    while stop_event is None or not stop_event.is_set():
         uri: str = fmt_uri(base_uri, client.auth_token, station_ids, server_id)
         logger.info(f"Connecting to {uri}")
         # noinspection PyTypeChecker
@@ -132,10 +418,44 @@ def subscribe_bytes_queue(
             ),
         )
 
+        ws_apps[:] = [ws_app]
+        if stop_event is not None and stop_event.is_set():
+            break
+
         ws_app.run_forever()
 
         logger.info("Subscription stream ended. Attempting to reconnect...")
-        time.sleep(1)
+        if stop_event is None:
+            time.sleep(1)
+        elif stop_event.wait(1):
+            break
+
+
+def _start_subscriptions(
+    base_uri: str,
+    queue: Queue[PubMsg[bytes]],
+    client: CloudClient,
+    station_ids: Optional[List[str]],
+    server_ids: Optional[List[str]],
+    stop_event: Optional[threading.Event] = None,
+) -> None:
+    """
+    Starts a subscription thread for each server feeding the given queue.
+    :param base_uri: The base URI to the acquisition subscription service.
+    :param queue: A queue for transferring when received by the subscriber.
+    :param client: An instance of the RedVox CloudClient.
+    :param station_ids: An optional list of station IDs to subscribe to.
+    :param server_ids: An optional list of server IDs for working with distributed acquisition servers.
+    :param stop_event: An optional event that closes the subscriptions when set.
+    """
+    server_id: Optional[str]
+    for server_id in [None] if server_ids is None else server_ids:
+        subscription_thread: threading.Thread = threading.Thread(
+            target=subscribe_bytes_queue,
+            args=(base_uri, queue, client, station_ids, server_id, stop_event),
+            daemon=stop_event is not None,
+        )
+        subscription_thread.start()
 
 
 # noinspection PyDefaultArgument
@@ -144,6 +464,8 @@ def subscribe_bytes(
     client: CloudClient,
     station_ids: Optional[List[str]] = None,
     server_ids: Optional[List[str]] = ["0", "1"],
+    max_queue_size: int = DEFAULT_MAX_QUEUE_SIZE,
+    overflow_policy: OverflowPolicy = OverflowPolicy.BLOCK,
 ) -> Iterator[PubMsg[bytes]]:
     """
     Create a subscription on the RedVox packet compressed bytes objects.
@@ -151,23 +473,12 @@ def subscribe_bytes(
     :param client: An instance of the RedVox CloudClient.
     :param station_ids: An optional list of station IDs to subscribe to.
     :param server_ids: An optional list of server IDs for working with distributed acquisition servers.
+    :param max_queue_size: The maximum number of received messages to buffer.
+    :param overflow_policy: What to do with a received message when the buffer is full.
     :return: An iterator over RedVox compressed bytes instances.
     """
-    queue: Queue[PubMsg[bytes]] = Queue()
-
-    if server_ids is None:
-        subscription_thread: threading.Thread = threading.Thread(
-            target=subscribe_bytes_queue, args=(base_uri, queue, client, station_ids)
-        )
-        subscription_thread.start()
-    else:
-        server_id: str
-        for server_id in server_ids:
-            subscription_thread = threading.Thread(
-                target=subscribe_bytes_queue,
-                args=(base_uri, queue, client, station_ids, server_id),
-            )
-            subscription_thread.start()
+    queue: OverflowQueue = OverflowQueue(max_queue_size, overflow_policy)
+    _start_subscriptions(base_uri, queue, client, station_ids, server_ids)
 
     while True:
         try:
@@ -182,6 +493,7 @@ def subscribe_proto(
     client: CloudClient,
     station_ids: Optional[List[str]] = None,
     server_ids: Optional[List[str]] = ["0", "1"],
+    pipeline: Optional[SubscriptionPipeline] = None,
 ) -> Iterator[PubMsg[RedvoxPacketM]]:
     """
     Create a subscription on the RedVox packet protobuf objects (RedvoxPacketM).
@@ -189,14 +501,27 @@ def subscribe_proto(
     :param client: An instance of the RedVox CloudClient.
     :param station_ids: An optional list of station IDs to subscribe to.
     :param server_ids: An optional list of server IDs for working with distributed acquisition servers.
-    :return: An iterator over RedvoxPacketM instances.
+    :param pipeline: An optional pipeline to buffer and decode messages with.  Provide one to configure the queue
+                     size, overflow policy and number of decode workers, or to read its metrics.  Closing the pipeline
+                     closes the subscription.  If not provided, a pipeline with default settings is used.
+    :return: An iterator over RedvoxPacketM instances.  Messages from the same station are in the order received.
     """
-    pub_msg: PubMsg[bytes]
-    for pub_msg in subscribe_bytes(base_uri, client, station_ids, server_ids):
-        decompressed_bytes: bytes = lz4.frame.decompress(pub_msg.msg, False)
-        proto: RedvoxPacketM = RedvoxPacketM()
-        proto.ParseFromString(decompressed_bytes)
-        yield pub_msg.map(proto)
+    _pipeline: SubscriptionPipeline = (
+        SubscriptionPipeline() if pipeline is None else pipeline
+    )
+    _start_subscriptions(
+        base_uri,
+        _pipeline.queue,
+        client,
+        station_ids,
+        server_ids,
+        _pipeline.stop_event,
+    )
+    try:
+        yield from _pipeline
+    finally:
+        if pipeline is None:
+            _pipeline.close()
 
 
 # noinspection PyDefaultArgument
@@ -205,6 +530,7 @@ def subscribe_packet(
     client: CloudClient,
     station_ids: Optional[List[str]] = None,
     server_ids: Optional[List[str]] = ["0", "1"],
+    pipeline: Optional[SubscriptionPipeline] = None,
 ) -> Iterator[PubMsg[WrappedRedvoxPacketM]]:
     """
     Create a subscription on the RedVox wrapped packet objects (WrappedRedvoxPacketM).
@@ -212,8 +538,9 @@ def subscribe_packet(
     :param client: An instance of the RedVox CloudClient.
     :param station_ids: An optional list of station IDs to subscribe to.
     :param server_ids: An optional list of server IDs for working with distributed acquisition servers.
+    :param pipeline: An optional pipeline to buffer and decode messages with, see subscribe_proto.
     :return: An iterator over WrappedRedvoxPacketM instances.
     """
     pub_msg: PubMsg[RedvoxPacketM]
-    for pub_msg in subscribe_proto(base_uri, client, station_ids, server_ids):
+    for pub_msg in subscribe_proto(base_uri, client, station_ids, server_ids, pipeline):
         yield pub_msg.map(WrappedRedvoxPacketM(pub_msg.msg))
@@ -0,0 +1,199 @@
+"""
+Aligns a channel of one type of sensor across many stations to a shared, evenly sampled time grid, producing an
+(n_stations x n_samples) array for beamforming, cross-correlation or machine learning.
+
+The array is preallocated, optionally as a memory-mapped .npy file, and each station's row is filled by linear
+interpolation.  A mask of the same shape marks the samples each station has data for; samples before or after a
+station's data, in gaps of its data or next to NaN values are masked and set to NaN.
+"""
+from dataclasses import dataclass
+from typing import List, Optional, Tuple, TYPE_CHECKING
+
+import numpy as np
+
+from redvox.common.gap_and_pad_utils import DEFAULT_GAP_UPPER_LIMIT, calc_evenly_sampled_timestamps
+from redvox.common.parallel_utils import maybe_parallel_map
+from redvox.common.sensor_data import SensorData, SensorType
+
+if TYPE_CHECKING:
+    from multiprocessing.pool import Pool
+    from redvox.common.station import Station
+
+
+@dataclass
+class AlignedChannel:
+    """
+    A channel of data from many stations on a shared time grid
+
+    Properties:
+        timestamps: np.ndarray, the grid of timestamps in microseconds since epoch UTC
+
+        station_keys: list of str, the [id]_[start_date] of the station of each row
+
+        values: np.ndarray, (n_stations x n_samples) values of the channel.  Samples without data are NaN
+
+        valid: np.ndarray, (n_stations x n_samples) True where the station has data for the sample
+    """
+
+    timestamps: np.ndarray
+    station_keys: List[str]
+    values: np.ndarray
+    valid: np.ndarray
+
+    def get(self, station_key: str) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """
+        :param station_key: the station's [id]_[start_date]
+        :return: the values and valid mask of the station or None if the station isn't in the array
+        """
+        if station_key not in self.station_keys:
+            return None
+        i = self.station_keys.index(station_key)
+        return self.values[i], self.valid[i]
+
+
+def valid_mask_path(out_path: str) -> str:
+    """
+    :param out_path: path of the .npy file of the values
+    :return: path of the .npy file of the valid mask written next to the values
+    """
+    return f"{out_path[:-4] if out_path.endswith('.npy') else out_path}_valid.npy"
+
+
+def align_samples(
+    timestamps: np.ndarray, values: np.ndarray, grid: np.ndarray, max_gap_micros: float
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    linearly interpolate sorted samples to a grid of timestamps.  Grid timestamps outside the samples or between two
+    samples more than max_gap_micros apart are not valid and are NaN.
+
+    :param timestamps: sorted timestamps of the samples in microseconds since epoch UTC
+    :param values: values of the samples
+    :param grid: timestamps to interpolate to in microseconds since epoch UTC
+    :param max_gap_micros: largest distance in microseconds between two samples that are interpolated across
+    :return: the interpolated values and a mask that is True where the values are valid
+    """
+    if timestamps.size < 1:
+        return np.full(grid.size, np.nan), np.zeros(grid.size, dtype=bool)
+    result = np.interp(grid, timestamps, values)
+    valid = (grid >= timestamps[0]) & (grid <= timestamps[-1])
+    # grid timestamps strictly between two samples that are too far apart are not valid
+    gaps = np.flatnonzero(np.diff(timestamps) > max_gap_micros)
+    if gaps.size > 0:
+        bounds = np.zeros(grid.size + 1, dtype=np.int64)
+        np.add.at(bounds, np.searchsorted(grid, timestamps[gaps], side="right"), 1)
+        np.add.at(bounds, np.searchsorted(grid, timestamps[gaps + 1], side="left"), -1)
+        valid &= np.cumsum(bounds[:-1]) <= 0
+    valid &= ~np.isnan(result)
+    result[~valid] = np.nan
+    return result, valid
+
+
+def _data_span(sensor: SensorData) -> Tuple[float, float]:
+    """
+    :param sensor: sensor with data
+    :return: the first and last data timestamps of the sensor
+    """
+    if sensor.is_timing_implicit():
+        return sensor.first_data_timestamp(), sensor.last_data_timestamp()
+    timestamps = sensor.data_timestamps()
+    return timestamps[0], timestamps[-1]
+
+
+def _align_sensor(
+    args: Tuple[int, Optional[SensorData], str, float, int, float, Optional[float], Optional[str]]
+) -> Tuple[int, Optional[np.ndarray], Optional[np.ndarray]]:
+    """
+    align one station's channel to the grid.  If out_path is given, the row is written to the memory-mapped files
+    and not returned.
+
+    :param args: row index, sensor, channel name, grid start, number of grid samples, grid interval in microseconds,
+                    largest gap in seconds or None to use the sensor's sample interval and the path of the values
+    :return: the row index, and the values and valid mask of the row if they weren't written to out_path
+    """
+    index, sensor, channel, start, num_samples, interval_micros, max_gap_s, out_path = args
+    grid = calc_evenly_sampled_timestamps(start, num_samples, interval_micros)
+    timestamps = sensor.data_timestamps() if sensor is not None else np.array([])
+    # sensors without the channel have no data to align
+    samples = np.asarray(sensor.get_data_channel(channel), dtype=float) if timestamps.size > 0 else np.array([])
+    if samples.size != timestamps.size:
+        timestamps, samples = np.array([]), np.array([])
+    if max_gap_s is None:
+        max_gap_s = sensor.sample_interval_s() * (1 + DEFAULT_GAP_UPPER_LIMIT) if timestamps.size > 0 else 0.0
+    values, valid = align_samples(timestamps, samples, grid, max_gap_s * 1e6)
+    if out_path is None:
+        return index, values, valid
+    np.load(out_path, mmap_mode="r+")[index] = values
+    np.load(valid_mask_path(out_path), mmap_mode="r+")[index] = valid
+    return index, None, None
+
+
+def align_channel(
+    stations: List["Station"],
+    sensor_type: SensorType,
+    channel: str,
+    sample_rate_hz: Optional[float] = None,
+    start_timestamp: Optional[float] = None,
+    end_timestamp: Optional[float] = None,
+    max_gap_s: Optional[float] = None,
+    out_path: Optional[str] = None,
+    pool: Optional["Pool"] = None,
+) -> AlignedChannel:
+    """
+    align a channel of one type of sensor across stations to a shared grid of evenly sampled timestamps.
+    Stations are aligned in parallel if parallelism is enabled.
+
+    :param stations: stations to align, one row each
+    :param sensor_type: type of the sensor to align
+    :param channel: name of the channel to align, i.e. "microphone"
+    :param sample_rate_hz: sample rate of the grid; if None, use the highest sample rate of the sensors.  default None
+    :param start_timestamp: first timestamp of the grid in microseconds since epoch UTC; if None, use the first data
+                            timestamp of the sensors.  default None
+    :param end_timestamp: the grid ends before this timestamp, in microseconds since epoch UTC; if None, use the
+                            timestamp after the last data timestamp of the sensors.  default None
+    :param max_gap_s: largest distance in seconds between two samples that are interpolated across; if None, use
+                        1.8 times each sensor's sample interval.  default None
+    :param out_path: path of a .npy file to memory-map the values to; the valid mask is written next to it with a
+                        _valid suffix.  If None, the arrays are kept in memory.  default None
+    :param pool: optional pool of workers to align the stations with, default None
+    :return: the AlignedChannel of the stations
+    """
+    sensors = [s.get_sensor_by_type(sensor_type) for s in stations]
+    with_data = [s for s in sensors if s is not None and s.num_samples() > 0]
+    if sample_rate_hz is None:
+        sample_rate_hz = max([s.sample_rate_hz() for s in with_data], default=np.nan)
+    if start_timestamp is None or end_timestamp is None:
+        # read each sensor's timestamps once for both ends of the data
+        spans = [_data_span(s) for s in with_data]
+        if start_timestamp is None:
+            start_timestamp = min([first for first, _ in spans], default=np.nan)
+        if end_timestamp is None:
+            end_timestamp = max([last for _, last in spans], default=np.nan) + 1
+    interval_micros = 1e6 / sample_rate_hz
+    num_samples = (
+        int(np.ceil((end_timestamp - start_timestamp) / interval_micros)) if end_timestamp > start_timestamp else 0
+    )
+    shape = (len(stations), num_samples)
+    if out_path is None:
+        values = np.empty(shape)
+        valid = np.empty(shape, dtype=bool)
+    else:
+        values = np.lib.format.open_memmap(out_path, mode="w+", dtype=np.float64, shape=shape)
+        valid = np.lib.format.open_memmap(valid_mask_path(out_path), mode="w+", dtype=bool, shape=shape)
+        values.flush()
+        valid.flush()
+    args = [
+        (i, s, channel, start_timestamp, num_samples, interval_micros, max_gap_s, out_path)
+        for i, s in enumerate(sensors)
+    ]
+    for i, row_values, row_valid in maybe_parallel_map(
+        pool, _align_sensor, iter(args), lambda: len(args) > 1, chunk_size=1
+    ):
+        if row_values is not None:
+            values[i] = row_values
+            valid[i] = row_valid
+    return AlignedChannel(
+        calc_evenly_sampled_timestamps(start_timestamp, num_samples, interval_micros),
+        [s.default_station_json_file_name() for s in stations],
+        values,
+        valid,
+    )
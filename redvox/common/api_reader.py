@@ -15,11 +15,12 @@ import redvox.api1000.proto.redvox_api_m_pb2 as api_m
 import redvox.common.date_time_utils as dtu
 from redvox.common import io, api_conversions as ac
 from redvox.common.parallel_utils import maybe_parallel_map
+from redvox.common import tracing
+from redvox.common.memory_planner import MemoryPlan, plan_workload
 from redvox.common.station import Station, STATION_ID_LENGTH
 from redvox.common.reader_session_model import ModelsContainer
 from redvox.common.session_model import SessionModel
 from redvox.common.errors import RedVoxExceptions, RedVoxError
-from redvox.cloud.client import cloud_client
 from redvox.cloud.session_model_api import Session
 from redvox.cloud.errors import CloudApiError
 
@@ -97,6 +98,7 @@ class ApiReader:
         debug: bool, if True, output additional information during function execution.  Default False.
     """
 
+    @tracing.traced()
     def __init__(
         self,
         base_dir: str,
@@ -104,6 +106,7 @@ class ApiReader:
         read_filter: io.ReadFilter = None,
         debug: bool = False,
         pool: Optional[multiprocessing.pool.Pool] = None,
+        memory_budget_bytes: Optional[float] = None,
     ):
         """
         Initialize the ApiReader object
@@ -113,6 +116,9 @@ class ApiReader:
                                 api formats.  If False, base_dir only has the data files.  Default False.
         :param read_filter: ReadFilter for the data files, if None, get everything.  Default None
         :param debug: if True, output program warnings/errors during function execution.  Default False.
+        :param pool: optional multiprocessing pool
+        :param memory_budget_bytes: optional memory available for reading stations.  If None, uses
+                                    PERCENT_FREE_MEM_USE of the available memory.  Default None
         """
         _pool: multiprocessing.pool.Pool = multiprocessing.Pool() if pool is None else pool
 
@@ -133,32 +139,38 @@ class ApiReader:
         self.session_models: ModelsContainer = ModelsContainer()
         self.files_index: List[io.Index] = self._get_all_files(_pool)
         self.index_summary: io.IndexSummary = io.IndexSummary.from_index(self._flatten_files_index())
+        self.memory_plan: Optional[MemoryPlan] = None
         if len(self.files_index) > 0:
-            mem_split_factor = len(self.files_index) if settings.is_parallelism_enabled() else 1
-            self.chunk_limit = psutil.virtual_memory().available * PERCENT_FREE_MEM_USE / mem_split_factor
+            budget = (
+                memory_budget_bytes
+                if memory_budget_bytes
+                else psutil.virtual_memory().available * PERCENT_FREE_MEM_USE
+            )
+            max_workers = (
+                min(len(self.files_index), multiprocessing.cpu_count()) if settings.is_parallelism_enabled() else 1
+            )
+            # sizes the chunks of files and the number of stations read at once to the budget
+            self.memory_plan = plan_workload(self.files_index, budget, max_workers)
+            self.chunk_limit = self.memory_plan.chunk_limit_bytes
             max_file_size = max([fe.decompressed_file_size_bytes for fi in self.files_index for fe in fi.entries])
             total_est_size = max_file_size * sum([len(fi.entries) for fi in self.files_index])
-            if max_file_size > self.chunk_limit:
-                raise MemoryError(
-                    f"System requires {max_file_size} bytes of memory to process a file but only has "
-                    f"{self.chunk_limit} available.  Please free or add more RAM."
-                )
-            elif total_est_size / mem_split_factor > self.chunk_limit:
+            if total_est_size > budget:
                 raise MemoryError(
-                    f"{total_est_size} of data requested, but only {self.chunk_limit} available; "
+                    f"{total_est_size} of data requested, but only {budget} available; "
                     f"please reduce the amount of data you are requesting."
                 )
             if debug:
-                if mem_split_factor == 1:
+                if self.memory_plan.num_workers == 1:
                     print(
                         f"{len(self.files_index)} stations have {int(self.chunk_limit)} "
                         f"bytes for loading files in memory."
                     )
                 else:
                     print(
-                        f"{mem_split_factor} stations each have "
+                        f"{self.memory_plan.num_workers} stations each have "
                         f"{int(self.chunk_limit)} bytes for loading files in memory."
                     )
+                print(f"estimated peak memory use: {int(self.memory_plan.estimated_peak_bytes())} bytes")
         else:
             self.chunk_limit = 0
 
@@ -177,6 +189,7 @@ class ApiReader:
             result.append(iter(i.entries))
         return result
 
+    @tracing.traced()
     def _get_cloud_models(self, ids: List[str]):
         """
         saves the cloud models from the server that match the list of ids given to the ApiReader's session_models.
@@ -185,6 +198,9 @@ class ApiReader:
 
         :param ids: station ids to get models for
         """
+        # the cloud client pulls in every cloud API module, so only load it when cloud models are requested
+        from redvox.cloud.client import cloud_client
+
         try:
             with cloud_client() as client:
                 self.session_models.search_cloud_session(
@@ -238,6 +254,7 @@ class ApiReader:
             self.errors.append(f"Required more data for {model.id} at: {insufficient_str}")
         return self._apply_filter(new_filter)
 
+    @tracing.traced()
     def _get_all_files(self, pool: Optional[multiprocessing.pool.Pool] = None) -> List[io.Index]:
         """
         get all files in the base dir of the ApiReader
@@ -267,7 +284,7 @@ class ApiReader:
                     continue  # if nothing found, just skip the index
                 # attempt to make a session model using local data.  if failure, use what we got initially.
                 try:
-                    stats = SessionModel().create_from_stream(self.read_files_in_index(id_index))
+                    stats = SessionModel.create_from_index(id_index)
                     checked_index = self._reset_index(stats.cloud_session)
                     self.session_models.add_local_session(stats)
                 except (RedVoxError, Exception):
@@ -283,8 +300,10 @@ class ApiReader:
         if len(all_index_ids) > 0:
             self.filter.station_ids = set(all_index_ids)
 
+        tracing.annotate(stations=len(index), files=sum(len(i.entries) for i in index))
         return index
 
+    @tracing.traced()
     def _apply_filter(
         self,
         reader_filter: Optional[io.ReadFilter] = None,
@@ -333,27 +352,17 @@ class ApiReader:
 
     def _split_workload(self, findex: io.Index) -> List[io.Index]:
         """
-        takes an index and splits it into chunks based on a size limit
-        while running_total + next_file_size < limit, adds files to a chunk (Index)
+        takes an index and splits it into chunks whose estimated memory use fits in the chunk limit of the
+        memory plan.  while running_total + next_file_estimate <= limit, adds files to a chunk (Index)
         if limit is exceeded, adds the chunk and puts the next file into a new chunk
 
         :param findex: index of files to split
         :return: list of Index to process
         """
-        packet_list = []
-        chunk_queue = 0
-        chunk_list = []
-        for f in findex.entries:
-            chunk_queue += f.decompressed_file_size_bytes
-            if chunk_queue > self.chunk_limit:
-                packet_list.append(io.Index(chunk_list))
-                chunk_queue = 0
-                chunk_list = []
-            chunk_list.append(f)
-        packet_list.append(io.Index(chunk_list))
-        return packet_list
+        return self.memory_plan.split_index(findex)
 
     @staticmethod
+    @tracing.traced()
     def read_files_in_index(indexf: io.Index) -> List[api_m.RedvoxPacketM]:
         """
         read all the files in the index
@@ -412,6 +421,7 @@ class ApiReader:
         """
         return Station.create_from_packets(self.read_files_in_index(findex))
 
+    @tracing.traced()
     def get_stations(self, pool: Optional[multiprocessing.pool.Pool] = None) -> List[Station]:
         """
         :param pool: optional multiprocessing pool
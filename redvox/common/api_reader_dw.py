@@ -3,7 +3,7 @@ For use with DataWindow specifically.  Do NOT use with non-DataWindow objects
 Read Redvox data from a single directory
 Data files can be either API 900 or API 1000 data formats
 """
-from typing import List, Optional
+from typing import List, Optional, Set
 import multiprocessing.pool
 
 import numpy as np
@@ -13,6 +13,7 @@ from redvox.common import io
 from redvox.common.api_reader import ApiReader
 from redvox.common.parallel_utils import maybe_parallel_map
 from redvox.common.station import Station
+from redvox.common import tracing
 
 
 class ApiReaderDw(ApiReader):
@@ -31,6 +32,8 @@ class ApiReaderDw(ApiReader):
         dw_save_mode: io.FileSystemSaveMode = io.FileSystemSaveMode.TEMP,
         debug: bool = False,
         pool: Optional[multiprocessing.pool.Pool] = None,
+        memory_budget_bytes: Optional[float] = None,
+        exclude_files: Optional[Set[str]] = None,
     ):
         """
         initialize API reader for data window
@@ -46,8 +49,17 @@ class ApiReaderDw(ApiReader):
                             this value doesn't matter.  default "." (current directory)
         :param dw_save_mode: save method for the data window.  Default "FileSystemSaveMode.TEMP"; save to temp_dir
         :param debug: if True, output program warnings/errors during function execution.  Default False.
+        :param pool: optional multiprocessing pool
+        :param memory_budget_bytes: optional memory available for reading stations.  If None, uses
+                                    PERCENT_FREE_MEM_USE of the available memory.  Default None
+        :param exclude_files: optional full paths of files that match the filter but are not read.  The memory plan
+                                still counts them.  Default None
         """
-        super().__init__(base_dir, structured_dir, read_filter, debug, pool)
+        super().__init__(base_dir, structured_dir, read_filter, debug, pool, memory_budget_bytes)
+        if exclude_files:
+            for fi in self.files_index:
+                fi.entries = [e for e in fi.entries if e.full_path not in exclude_files]
+            self.files_index = [fi for fi in self.files_index if len(fi.entries) > 0]
         self.correct_timestamps = correct_timestamps
         self.use_model_correction = use_model_correction
         self.dw_base_dir = dw_base_dir
@@ -55,6 +67,7 @@ class ApiReaderDw(ApiReader):
         self.all_files_size = np.sum([idx.files_size() for idx in self.files_index])
         self._stations = self._read_stations()
 
+    @tracing.traced()
     def _station_by_index(self, findex: io.Index) -> Station:
         """
         builds station using the index of files to read
@@ -66,6 +79,13 @@ class ApiReaderDw(ApiReader):
         """
         split_list = self._split_workload(findex)
         use_temp_dir = True if len(split_list) > 1 else False
+        if tracing.is_enabled():
+            # compare with the memory recorded by the span to check the memory model
+            tracing.annotate(
+                station=findex.entries[0].station_id if findex.entries else "",
+                chunks=len(split_list),
+                estimated_bytes=max(self.memory_plan.estimate_index_bytes(idx) for idx in split_list),
+            )
 
         if len(split_list) > 0:
             if self.debug and use_temp_dir:
@@ -99,7 +119,16 @@ class ApiReaderDw(ApiReader):
         :return: List of all stations in the ApiReader, without building the data from parquet
         """
         if settings.is_parallelism_enabled() and len(self.files_index) > 1:
-            return list(maybe_parallel_map(pool, self._station_by_index, iter(self.files_index), chunk_size=1))
+            # only read as many stations at once as the memory plan allows
+            if pool is not None:
+                return list(maybe_parallel_map(pool, self._station_by_index, iter(self.files_index), chunk_size=1))
+            with multiprocessing.Pool(self.memory_plan.num_workers) as _pool:
+                result = list(
+                    maybe_parallel_map(_pool, self._station_by_index, iter(self.files_index), chunk_size=1)
+                )
+                _pool.close()
+                _pool.join()
+            return result
         return list(map(self._station_by_index, self.files_index))
 
     def get_station_by_id(self, get_id: str) -> Optional[List[Station]]:
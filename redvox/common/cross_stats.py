@@ -1,13 +1,24 @@
 """
 This module contains functions for computing the cross correlation between data sets of equal or unequal length.
+
+The batch functions correlate many equal length signals at once.  Each signal is transformed with a single real FFT,
+zero padded to a fast FFT length, and the spectra are reused for every pair the signal is part of.
 """
 
-from typing import Tuple
+import os
+import tempfile
+from multiprocessing.pool import Pool
+from typing import Iterator, List, Optional, Tuple
 
 import numpy as np
+from scipy import fft as sp_fft
 from scipy import signal
 
 import redvox.common.errors as errors
+import redvox.settings as settings
+from redvox.common.parallel_utils import maybe_parallel_map
+
+DEFAULT_BLOCK_SIZE: int = 8  # Number of signals transformed at the same time by the batch functions
 
 
 def xcorr_all(
@@ -91,3 +102,227 @@ def xcorr_main(
     xcorr_offset_seconds: np.ndarray = xcorr_offset_samples / sample_rate_hz
 
     return xcorr_normalized_max, xcorr_offset_samples, xcorr_offset_seconds
+
+
+def _as_signal_stack(sigs: np.ndarray) -> np.ndarray:
+    """
+    :param sigs: A 2-D array with one signal per row.
+    :return: The signals as floats.  Single precision signals stay single precision.
+    """
+    sigs = np.asarray(sigs)
+    if sigs.ndim != 2 or sigs.shape[1] < 2:
+        raise errors.RedVoxError("Signals must be a 2-D array with one signal of at least 2 samples per row")
+    return sigs if sigs.dtype in (np.float32, np.float64) else sigs.astype(np.float64)
+
+
+def _xcorr_lags(sig_len: int) -> np.ndarray:
+    """
+    :param sig_len: The length of the equal length signals.
+    :return: The lags of the equal length cross correlation, the same as the xcorr_indexes of xcorr_all.
+    """
+    return np.arange(-(sig_len // 2), sig_len - sig_len // 2)
+
+
+def _xcorr_nfft(sig_len: int) -> int:
+    """
+    :param sig_len: The length of the equal length signals.
+    :return: The FFT length needed to compute the linear cross correlation without wrap around.
+    """
+    return sp_fft.next_fast_len(2 * sig_len - 1, real=True)
+
+
+def _xcorr_norms(sigs: np.ndarray) -> np.ndarray:
+    """
+    :param sigs: A 2-D array with one signal per row.
+    :return: The normalization of each signal, the product of two norms is the normalization used by xcorr_all.
+    """
+    return np.sqrt(sigs.shape[1]) * sigs.std(axis=1, dtype=np.float64)
+
+
+def _xcorr_blocks(
+    sigs: np.ndarray, sig_ref: np.ndarray, block_size: int
+) -> Iterator[np.ndarray]:
+    """
+    Computes the normalized equal length cross correlation of each signal against the reference, a block of signals
+    at a time.
+    :param sigs: A 2-D array with one signal per row.
+    :param sig_ref: The reference signal.
+    :param block_size: The number of signals to transform at the same time.
+    :return: An iterator over 2-D arrays containing the normalized cross correlation of each signal in a block.
+    """
+    sigs = _as_signal_stack(sigs)
+    sig_ref = np.asarray(sig_ref, dtype=sigs.dtype)
+    sig_len: int = sigs.shape[1]
+    if sig_ref.shape != (sig_len,):
+        raise errors.RedVoxError("The reference signal must have the same length as the signals")
+    if block_size <= 0:
+        raise errors.RedVoxError("block_size must be > 0")
+
+    nfft: int = _xcorr_nfft(sig_len)
+    lag_indexes: np.ndarray = _xcorr_lags(sig_len) % nfft
+    ref_spectrum: np.ndarray = sp_fft.rfft(sig_ref, nfft)
+    ref_norm: float = _xcorr_norms(sig_ref[np.newaxis, :])[0]
+
+    for start in range(0, sigs.shape[0], block_size):
+        block: np.ndarray = sigs[start : start + block_size]
+        spectra: np.ndarray = sp_fft.rfft(block, nfft, axis=1)
+        spectra = ref_spectrum * np.conj(spectra)
+        xcorr: np.ndarray = sp_fft.irfft(spectra, nfft, axis=1)[:, lag_indexes]
+        xcorr /= (_xcorr_norms(block) * ref_norm)[:, np.newaxis]
+        yield xcorr
+
+
+def xcorr_all_batch(
+    sigs: np.ndarray, sig_ref: np.ndarray, block_size: int = DEFAULT_BLOCK_SIZE
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Cross correlation of many signals against a reference, all with the same length and sample rate.  The results are
+    the same as calling xcorr_all on each signal.
+
+    :param sigs: A 2-D array with one signal per row, for example audio from each station of a DataWindow.
+    :param sig_ref: The reference signal with the same sample rate and length as each signal.
+    :param block_size: The number of signals to transform at the same time.  Default DEFAULT_BLOCK_SIZE
+    :return: A 4-tuple containing xcorr_indexes, xcorr, xcorr_offset_index, and xcorr_offset_samples. xcorr_indexes
+             are relative to sig_ref. xcorr is the normalized cross-correlation with one row per signal.
+             xcorr_offset_index contains the index of max xcorr of each signal. xcorr_offset_samples is the number of
+             offset samples of each signal.
+    """
+    xcorr_indexes: np.ndarray = _xcorr_lags(np.shape(sigs)[-1])
+    xcorr: np.ndarray = np.concatenate(list(_xcorr_blocks(sigs, sig_ref, block_size)))
+    xcorr_offset_index: np.ndarray = xcorr.argmax(axis=1)
+    return xcorr_indexes, xcorr, xcorr_offset_index, xcorr_indexes[xcorr_offset_index]
+
+
+def xcorr_main_batch(
+    sigs: np.ndarray,
+    sig_ref: np.ndarray,
+    sample_rate_hz: float,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Cross correlation of many signals against a reference, all with the same length and sample rate.  Provides the
+    same summarized results as calling xcorr_main on each signal, without keeping the cross correlation of more than
+    block_size signals in memory.
+
+    :param sigs: A 2-D array with one signal per row, for example audio from each station of a DataWindow.
+    :param sig_ref: The reference signal with the same sample rate and length as each signal.
+    :param sample_rate_hz: The sample rate in Hz.
+    :param block_size: The number of signals to transform at the same time.  Default DEFAULT_BLOCK_SIZE
+    :return: A 3-tuple containing xcorr_normalized_max, xcorr_offset_samples, and xcorr_offset_seconds, with one
+             value per signal.
+    """
+    xcorr_indexes: np.ndarray = _xcorr_lags(np.shape(sigs)[-1])
+    xcorr_normalized_max: List[np.ndarray] = []
+    xcorr_offset_samples: List[np.ndarray] = []
+    xcorr: np.ndarray
+    for xcorr in _xcorr_blocks(sigs, sig_ref, block_size):
+        offset_index: np.ndarray = xcorr.argmax(axis=1)
+        xcorr_normalized_max.append(xcorr[np.arange(len(xcorr)), offset_index])
+        xcorr_offset_samples.append(xcorr_indexes[offset_index])
+
+    offset_samples: np.ndarray = np.concatenate(xcorr_offset_samples)
+    return np.concatenate(xcorr_normalized_max), offset_samples, offset_samples / sample_rate_hz
+
+
+def _xcorr_pair_row(
+    spectra: np.ndarray, norms: np.ndarray, sig_len: int, row: int
+) -> Tuple[int, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Cross correlates one signal with itself and every signal after it.
+    :param spectra: The spectra of all signals.
+    :param norms: The normalization of all signals.
+    :param sig_len: The length of the signals.
+    :param row: The index of the signal.
+    :return: The row, followed by the max xcorr and offset samples of the row against each later signal as the
+             reference, then of each later signal against the row as the reference.
+    """
+    nfft: int = _xcorr_nfft(sig_len)
+    xcorr_indexes: np.ndarray = _xcorr_lags(sig_len)
+    lag_indexes: np.ndarray = xcorr_indexes % nfft
+    flipped_lag_indexes: np.ndarray = -xcorr_indexes % nfft
+    num_pairs: int = len(spectra) - row
+    row_max: np.ndarray = np.empty(num_pairs)
+    row_offsets: np.ndarray = np.empty(num_pairs, dtype=xcorr_indexes.dtype)
+    col_max: np.ndarray = np.empty(num_pairs)
+    col_offsets: np.ndarray = np.empty(num_pairs, dtype=xcorr_indexes.dtype)
+    for i in range(num_pairs):
+        col: int = row + i
+        # The circular correlation holds the lags of (row, col) and, negated, the lags of (col, row)
+        xcorr: np.ndarray = sp_fft.irfft(spectra[col] * np.conj(spectra[row]), nfft)
+        xcorr /= norms[row] * norms[col]
+        xcorr_row: np.ndarray = xcorr[lag_indexes]
+        xcorr_col: np.ndarray = xcorr[flipped_lag_indexes]
+        row_offsets[i] = xcorr_indexes[xcorr_row.argmax()]
+        row_max[i] = xcorr_row.max()
+        col_offsets[i] = xcorr_indexes[xcorr_col.argmax()]
+        col_max[i] = xcorr_col.max()
+    return row, row_max, row_offsets, col_max, col_offsets
+
+
+def _xcorr_pair_row_from_file(
+    args: Tuple[str, np.ndarray, int, int]
+) -> Tuple[int, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Cross correlates one signal with every signal after it using spectra memory mapped from a file, so the spectra
+    are not copied to each worker process.
+    :param args: The path to the spectra .npy file, the normalization of all signals, the length of the signals and
+                 the index of the signal.
+    :return: The results of _xcorr_pair_row.
+    """
+    spectra_path, norms, sig_len, row = args
+    return _xcorr_pair_row(np.load(spectra_path, mmap_mode="r"), norms, sig_len, row)
+
+
+def xcorr_pairs(
+    sigs: np.ndarray, sample_rate_hz: float, pool: Optional[Pool] = None
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Cross correlation of every pair of signals with the same length and sample rate.  Entry [i, j] of each result is
+    the same as xcorr_main(sigs[i], sigs[j], sample_rate_hz).
+
+    The spectra of all signals are kept in memory, which takes about 4 (single precision) or 8 (double precision)
+    times the size of the signals.  Each pair is transformed back once and provides the results of both orders.
+
+    :param sigs: A 2-D array with one signal per row, for example audio from each station of a DataWindow.
+    :param sample_rate_hz: The sample rate in Hz.
+    :param pool: An optional pool to correlate signals in parallel with if parallelism is enabled in
+                 redvox.settings.  If parallelism is enabled and a pool is not provided, one is created.
+    :return: A 3-tuple containing xcorr_normalized_max, xcorr_offset_samples, and xcorr_offset_seconds matrices,
+             where the row is the signal and the column is the reference.
+    """
+    sigs = _as_signal_stack(sigs)
+    num_sigs, sig_len = sigs.shape
+    spectra: np.ndarray = sp_fft.rfft(sigs, _xcorr_nfft(sig_len), axis=1)
+    norms: np.ndarray = _xcorr_norms(sigs)
+
+    xcorr_normalized_max: np.ndarray = np.empty((num_sigs, num_sigs))
+    xcorr_offset_samples: np.ndarray = np.empty((num_sigs, num_sigs), dtype=np.int64)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        rows: Iterator[Tuple[int, np.ndarray, np.ndarray, np.ndarray, np.ndarray]]
+        if settings.is_parallelism_enabled() and num_sigs > 2:
+            spectra_path: str = os.path.join(tmp_dir, "spectra.npy")
+            np.save(spectra_path, spectra)
+            del spectra
+            rows = maybe_parallel_map(
+                pool,
+                _xcorr_pair_row_from_file,
+                ((spectra_path, norms, sig_len, row) for row in range(num_sigs)),
+                chunk_size=1,
+            )
+        else:
+            rows = (
+                _xcorr_pair_row(spectra, norms, sig_len, row) for row in range(num_sigs)
+            )
+
+        for row, row_max, row_offsets, col_max, col_offsets in rows:
+            xcorr_normalized_max[row, row:] = row_max
+            xcorr_offset_samples[row, row:] = row_offsets
+            xcorr_normalized_max[row:, row] = col_max
+            xcorr_offset_samples[row:, row] = col_offsets
+
+    return (
+        xcorr_normalized_max,
+        xcorr_offset_samples,
+        xcorr_offset_samples / sample_rate_hz,
+    )
@@ -3,10 +3,11 @@ This module creates specific time-bounded segments of data for users
 combines the base data files into a single composite object based on the user parameters
 """
 from pathlib import Path
-from typing import Optional, Set, List, Dict, Iterable
+from typing import Optional, Set, List, Dict, Iterable, Iterator, Tuple
 from datetime import timedelta
 from dataclasses import dataclass
 from dataclasses_json import dataclass_json
+import copy
 import shutil
 import os
 import inspect
@@ -21,8 +22,10 @@ import redvox
 from redvox.common import run_me, io, data_window_io as dw_io, date_time_utils as dtu, gap_and_pad_utils as gpu
 from redvox.common.data_window_configuration import DataWindowConfigFile
 from redvox.common.parallel_utils import maybe_parallel_map
+from redvox.common import alignment, frames
+from redvox.common import tracing
 from redvox.common.station import Station, STATION_ID_LENGTH
-from redvox.common.sensor_data import SensorType, SensorData
+from redvox.common.sensor_data import SensorType, SensorData, StoragePrecision, TimestampFormat
 from redvox.common.api_reader_dw import ApiReaderDw
 from redvox.common.errors import RedVoxExceptions
 
@@ -30,6 +33,8 @@ DEFAULT_START_BUFFER_TD: timedelta = timedelta(minutes=2.0)  # default padding t
 DEFAULT_END_BUFFER_TD: timedelta = timedelta(minutes=2.0)  # default padding to end time of data
 # minimum default length of time in seconds for data to be off by to be considered suspicious
 DATA_DROP_DURATION_S: float = 0.2
+# largest difference in seconds between the start dates of a station in the DataWindow and the same station read again
+STATION_MATCH_TOLERANCE_S: float = 1.0
 
 
 @dataclass_json
@@ -109,6 +114,26 @@ class DataWindowConfig:
 
         use_model_correction: bool, if True, use the offset model's correction functions, otherwise use the best
         offset.  Default True
+
+        trace: bool, if True, record the time and memory used by each stage of creating the DataWindow.  Get the
+        results from DataWindow.tracer().  Default False
+
+        memory_budget_bytes: optional float, memory available for reading stations.  The number of stations read at
+        once and the number of files each reads at a time are chosen to fit in it.  If None, uses most of the
+        available memory.  Default None
+
+        implicit_timing: bool, if True, store the evenly sampled timestamps of sensors such as audio as the start,
+        interval and length of each run of samples instead of a value per sample.  This only changes how the
+        timestamps are stored; windowing and gap filling use the timestamps created from the runs.  Default False
+
+        storage_precision: enumeration of StoragePrecision.  Determines how the samples of the sensors are stored.
+        Valid values are FLOAT64, FLOAT32 and NATIVE.  Default FLOAT64
+
+        write_profile: enumeration of io.ParquetWriteProfile.  Determines the settings used to write parquet files.
+        Valid values are FAST_SCRATCH, BALANCED and ARCHIVE.  Default BALANCED
+
+        timestamp_format: enumeration of TimestampFormat.  Determines how the timestamps of the sensors are stored.
+        Valid values are FLOAT64_MICROS and INT64_NANOS.  Default FLOAT64_MICROS
     """
 
     def __init__(
@@ -126,6 +151,12 @@ class DataWindowConfig:
         apply_correction: bool = True,
         use_model_correction: bool = True,
         copy_edge_points: gpu.DataPointCreationMode = gpu.DataPointCreationMode.COPY,
+        trace: bool = False,
+        memory_budget_bytes: Optional[float] = None,
+        implicit_timing: bool = False,
+        storage_precision: StoragePrecision = StoragePrecision.FLOAT64,
+        write_profile: io.ParquetWriteProfile = io.ParquetWriteProfile.BALANCED,
+        timestamp_format: TimestampFormat = TimestampFormat.FLOAT64_MICROS,
     ):
         self.input_dir: str = input_dir
         self.structured_layout: bool = structured_layout
@@ -142,6 +173,12 @@ class DataWindowConfig:
         self.apply_correction: bool = apply_correction
         self.use_model_correction = use_model_correction
         self.copy_edge_points = copy_edge_points
+        self.trace: bool = trace
+        self.memory_budget_bytes: Optional[float] = memory_budget_bytes
+        self.implicit_timing: bool = implicit_timing
+        self.storage_precision: StoragePrecision = storage_precision
+        self.write_profile: io.ParquetWriteProfile = write_profile
+        self.timestamp_format: TimestampFormat = timestamp_format
 
     def __repr__(self):
         return (
@@ -157,7 +194,13 @@ class DataWindowConfig:
             f"api_versions: {[a_v.value for a_v in self.api_versions] if self.api_versions else []}, "
             f"apply_correction: {self.apply_correction}, "
             f"use_model_correction: {self.use_model_correction}, "
-            f"copy_edge_points: {self.copy_edge_points.value}"
+            f"copy_edge_points: {self.copy_edge_points.value}, "
+            f"trace: {self.trace}, "
+            f"memory_budget_bytes: {self.memory_budget_bytes}, "
+            f"implicit_timing: {self.implicit_timing}, "
+            f"storage_precision: {self.storage_precision.value}, "
+            f"write_profile: {self.write_profile.value}, "
+            f"timestamp_format: {self.timestamp_format.value}"
         )
 
     def __str__(self):
@@ -175,7 +218,13 @@ class DataWindowConfig:
             f"api_versions: {[a_v.value for a_v in self.api_versions] if self.api_versions else []}, "
             f"apply_correction: {self.apply_correction}, "
             f"use_model_correction: {self.use_model_correction}, "
-            f"copy_edge_points: {self.copy_edge_points.name}"
+            f"copy_edge_points: {self.copy_edge_points.name}, "
+            f"trace: {self.trace}, "
+            f"memory_budget_bytes: {self.memory_budget_bytes}, "
+            f"implicit_timing: {self.implicit_timing}, "
+            f"storage_precision: {self.storage_precision.name}, "
+            f"write_profile: {self.write_profile.name}, "
+            f"timestamp_format: {self.timestamp_format.name}"
         )
 
     def to_dict(self) -> Dict:
@@ -195,6 +244,12 @@ class DataWindowConfig:
             "apply_correction": self.apply_correction,
             "use_model_correction": self.use_model_correction,
             "copy_edge_points": self.copy_edge_points.value,
+            "trace": self.trace,
+            "memory_budget_bytes": self.memory_budget_bytes,
+            "implicit_timing": self.implicit_timing,
+            "storage_precision": self.storage_precision.value,
+            "write_profile": self.write_profile.value,
+            "timestamp_format": self.timestamp_format.value,
         }
 
     @staticmethod
@@ -215,6 +270,12 @@ class DataWindowConfig:
             data_dict["apply_correction"],
             data_dict["use_model_correction"],
             gpu.DataPointCreationMode(data_dict["copy_edge_points"]),
+            data_dict.get("trace", False),
+            data_dict.get("memory_budget_bytes"),
+            data_dict.get("implicit_timing", False),
+            StoragePrecision(data_dict.get("storage_precision", StoragePrecision.FLOAT64.value)),
+            io.ParquetWriteProfile(data_dict.get("write_profile", io.ParquetWriteProfile.BALANCED.value)),
+            TimestampFormat(data_dict.get("timestamp_format", TimestampFormat.FLOAT64_MICROS.value)),
         )
 
 
@@ -284,7 +345,12 @@ class DataWindow:
         self._sdk_version: str = redvox.VERSION
         self._errors = RedVoxExceptions("DataWindow")
         self._stations: List[Station] = []
+        # start and end datetime of every file read for the stations, used to read only new files when the window slides
+        self._read_files: Dict[str, Tuple[dtu.datetime, Optional[dtu.datetime]]] = {}
+        # rows added after the end of the data of each sensor by the window, keyed by the station's [id]_[start_date]
+        self._padded_rows: Dict[str, Dict[SensorType, int]] = {}
         self._config = config
+        self._tracer: Optional[tracing.Tracer] = tracing.Tracer() if config and config.trace else None
         if config:
             if config.start_datetime and config.end_datetime and (config.end_datetime <= config.start_datetime):
                 self._errors.append(
@@ -292,7 +358,8 @@ class DataWindow:
                     f"Your times: {config.end_datetime} <= {config.start_datetime}"
                 )
             else:
-                self.create_data_window()
+                with tracing.activate(self._tracer):
+                    self.create_data_window()
         if self.debug:
             self.print_errors()
 
@@ -575,6 +642,13 @@ class DataWindow:
         """
         return self._config
 
+    def tracer(self) -> Optional[tracing.Tracer]:
+        """
+        :return: the time and memory used by each stage of creating the DataWindow, or None if the config did not
+                    enable tracing
+        """
+        return self._tracer
+
     def sdk_version(self) -> str:
         """
         :return: sdk version used to create the DataWindow
@@ -701,6 +775,344 @@ class DataWindow:
             print(f"Attempted to get station {station_id}, but that station is not in this data window!")
         return None
 
+    def iter_frames(
+        self,
+        duration_s: float,
+        overlap_s: float = 0.0,
+        sensor_types: Optional[List[SensorType]] = None,
+        station_ids: Optional[Iterable[str]] = None,
+    ) -> Iterator[frames.Frame]:
+        """
+        iterate over the sensors of the stations in time-aligned frames of a fixed duration, from the start to the end
+        of the DataWindow.  Sensors saved to disk only read the rows of the current frame, so the memory used depends
+        on the duration of the frames instead of the length of the window.
+
+        :param duration_s: duration of each frame in seconds
+        :param overlap_s: seconds each frame overlaps the frame before it, default 0.0
+        :param sensor_types: types of the sensors to read; if None, read every sensor.  default None
+        :param station_ids: ids of the stations to read; if None, read every station.  default None
+        :return: the Frames in time order
+        """
+        ids = set(station_ids) if station_ids is not None else None
+        stations = [s for s in self._stations if ids is None or s.id() in ids]
+        start = self._config.start_datetime
+        end = self._config.end_datetime
+        return frames.iter_frames(
+            stations,
+            duration_s,
+            overlap_s,
+            sensor_types,
+            dtu.datetime_to_epoch_microseconds_utc(start) if start else None,
+            dtu.datetime_to_epoch_microseconds_utc(end) if end else None,
+        )
+
+    def aligned_channel(
+        self,
+        sensor_type: SensorType = SensorType.AUDIO,
+        channel: str = "microphone",
+        sample_rate_hz: Optional[float] = None,
+        station_ids: Optional[Iterable[str]] = None,
+        out_path: Optional[str] = None,
+        pool: Optional[multiprocessing.pool.Pool] = None,
+    ) -> alignment.AlignedChannel:
+        """
+        align a channel of one type of sensor across the stations to a shared grid of evenly sampled timestamps from
+        the start to the end of the DataWindow, one row per station.  Samples a station has no data for are NaN and
+        are False in the valid mask.
+
+        :param sensor_type: type of the sensor to align, default SensorType.AUDIO
+        :param channel: name of the channel to align, default "microphone"
+        :param sample_rate_hz: sample rate of the grid; if None, use the highest sample rate of the sensors.
+                                default None
+        :param station_ids: ids of the stations to align; if None, align every station.  default None
+        :param out_path: path of a .npy file to memory-map the values to; the valid mask is written next to it with a
+                            _valid suffix.  If None, the arrays are kept in memory.  default None
+        :param pool: optional pool of workers to align the stations with, default None
+        :return: the AlignedChannel of the stations
+        """
+        ids = set(station_ids) if station_ids is not None else None
+        stations = [s for s in self._stations if ids is None or s.id() in ids]
+        start = self._config.start_datetime
+        end = self._config.end_datetime
+        return alignment.align_channel(
+            stations,
+            sensor_type,
+            channel,
+            sample_rate_hz,
+            dtu.datetime_to_epoch_microseconds_utc(start) if start else None,
+            dtu.datetime_to_epoch_microseconds_utc(end) if end else None,
+            out_path=out_path,
+            pool=pool,
+        )
+
+    def slide(
+        self,
+        new_start: dtu.datetime,
+        new_end: dtu.datetime,
+        pool: Optional[multiprocessing.pool.Pool] = None,
+    ):
+        """
+        move the DataWindow to start at new_start and end at new_end.
+
+        When the window moves forward and overlaps the current window, only the files that weren't read for the
+        current window are read, along with the files that end after the current end, whose data after the current
+        end was removed.  A file ends at its start plus the packet duration of its station.  Their data is appended
+        to the stations already in the window and their timesync exchanges are added to the timesync data of the
+        stations.  Data before new_start is removed and only the edges of the sensors are padded again.  Otherwise,
+        the window is created again from all the files.
+
+        The data already in the window keeps its timestamp correction, and packets that arrive late for times already
+        in the window are not added; create a new DataWindow to include them.  The offset model of a station keeps
+        the timesync exchanges of the files that left the window, so when the window moves past files and corrects
+        timestamps, the corrected timestamps can differ slightly from those of a new DataWindow.
+
+        :param new_start: start of the window
+        :param new_end: end of the window, non-inclusive
+        :param pool: optional pool of workers to read the files with, default None
+        """
+        if new_end <= new_start:
+            raise ValueError(f"end datetime ({new_end}) must be after start datetime ({new_start})")
+        old_start = self._config.start_datetime
+        old_end = self._config.end_datetime
+        is_forward = (
+            bool(old_start and old_end) and old_start <= new_start < old_end <= new_end and len(self._read_files) > 0
+        )
+        # the windowing reads the bounds from the config; they are put back if the window can't move
+        self._config.start_datetime = new_start
+        self._config.end_datetime = new_end
+        try:
+            with tracing.activate(self._tracer):
+                if is_forward:
+                    self._slide_forward(old_end, pool)
+                else:
+                    self._stations = []
+                    self.create_data_window(pool)
+        except BaseException:
+            self._config.start_datetime = old_start
+            self._config.end_datetime = old_end
+            raise
+
+    def extend_to(self, new_end: dtu.datetime, pool: Optional[multiprocessing.pool.Pool] = None):
+        """
+        move the end of the DataWindow to new_end, keeping its start.  See slide() for how the data is read.
+
+        :param new_end: end of the window, non-inclusive
+        :param pool: optional pool of workers to read the files with, default None
+        """
+        self.slide(self._config.start_datetime, new_end, pool)
+
+    @tracing.traced()
+    def _slide_forward(self, old_end: dtu.datetime, pool: Optional[multiprocessing.pool.Pool] = None):
+        """
+        read the files of the window that haven't been read, append their data to the stations with the same key
+        and truncate every station to the start and end of the config.
+
+        :param old_end: end of the window before it moved
+        :param pool: optional pool of workers to read the files with, default None
+        """
+        _pool: multiprocessing.pool.Pool = multiprocessing.Pool() if pool is None else pool
+        start_datetime = self._config.start_datetime
+        end_datetime = self._config.end_datetime
+        # files that end by the old end were read completely; other files are read again, since the data after the
+        # old end was removed from the window.  files before the new read filter are forgotten.
+        self._read_files = {
+            path: (file_start, file_end)
+            for path, (file_start, file_end) in self._read_files.items()
+            if file_end is not None
+            and file_start >= start_datetime - self._config.start_buffer_td
+            and file_end <= old_end
+        }
+        a_r = ApiReaderDw(
+            base_dir=self._config.input_dir,
+            structured_dir=self._config.structured_layout,
+            read_filter=self._read_filter(start_datetime, end_datetime),
+            correct_timestamps=False,
+            use_model_correction=self._config.use_model_correction,
+            dw_base_dir=self.save_dir(),
+            dw_save_mode=self._fs_writer.save_mode(),
+            debug=self.debug,
+            pool=_pool,
+            memory_budget_bytes=self._config.memory_budget_bytes,
+            exclude_files=set(self._read_files),
+        )
+        self._read_files.update(self._index_datetimes(a_r))
+        if self._fs_writer.is_use_mem() and a_r.dw_save_mode != self._fs_writer.save_mode():
+            self._fs_writer.set_use_temp(True)
+
+        new_stations = []
+        for st in a_r.get_stations():
+            station = self._matching_station(st)
+            if station is None:
+                new_stations.append(st)
+            else:
+                self._extend_station(station, st)
+        stations = self._stations
+        self._stations = []
+        for station in stations:
+            if self._window_station(station, start_datetime, end_datetime):
+                self._stations.append(station)
+        for st in new_stations:
+            if self._config.apply_correction:
+                st.set_correct_timestamps()
+                st.update_timestamps()
+            self._prepare_station(st)
+            self.create_window_in_sensors(st, start_datetime, end_datetime)
+        self._check_for_audio()
+
+        if pool is None:
+            _pool.close()
+
+    def _matching_station(self, station: Station) -> Optional[Station]:
+        """
+        :param station: station read from files without correcting its timestamps
+        :return: the station of the DataWindow with the same id, uuid and start date as station, or None if there
+                    isn't one
+        """
+        for s in self._stations:
+            if s.id() != station.id() or s.uuid() != station.uuid():
+                continue
+            start_date = s.start_date()
+            if s.is_timestamps_updated():
+                start_date = s.correction_model().get_original_time(start_date, s.use_model_correction())
+            if np.isclose(
+                start_date, station.start_date(), rtol=0, atol=STATION_MATCH_TOLERANCE_S * 1e6, equal_nan=True
+            ):
+                return s
+        return None
+
+    @tracing.traced()
+    def _extend_station(self, station: Station, new_station: Station):
+        """
+        append the data of new_station after the data of station.  Data of new_station at or before the end of the
+        data of station is ignored.  The new timesync exchanges are added to station, and its updated offset model
+        corrects the timestamps of the new data.  Updates station in place.
+
+        :param station: station of the DataWindow
+        :param new_station: the same station read from files without correcting its timestamps
+        """
+        tracing.annotate(station=station.id())
+        # exchanges of files read again are already in the timesync data of the station
+        timesync = new_station.timesync_data()
+        old_exchanges = station.timesync_data().sync_exchanges()
+        if len(old_exchanges[3]) > 0:
+            keep = np.asarray(timesync.sync_exchanges()[3]) > np.max(old_exchanges[3])
+            timesync.set_sync_exchanges([np.asarray(e)[keep] for e in timesync.sync_exchanges()])
+        station.timesync_data().append_timesync(timesync)
+        if self._config.apply_correction:
+            # correct the new data with the model of every exchange of the station
+            new_station.set_timesync_data(copy.copy(station.timesync_data()))
+            new_station.set_correct_timestamps()
+            new_station.update_timestamps()
+        self._prepare_station(new_station)
+
+        audio_end = station.audio_sensor().last_data_timestamp()
+        gaps = [g for g in new_station.gaps() if g[0] >= audio_end]
+        for new_sensor in new_station.data():
+            sensors = [s for s in station.data() if s.type() == new_sensor.type()]
+            if len(sensors) < 1:
+                if self._fs_writer.is_save_disk():
+                    new_sensor.set_save_mode(io.FileSystemSaveMode.DISK)
+                    new_sensor.move_pyarrow_dir(station.save_dir())
+                station.append_sensor(new_sensor)
+                continue
+            gap = self._append_rows(
+                sensors[0],
+                new_sensor,
+                self._padded_rows.get(station.default_station_json_file_name(), {}).get(new_sensor.type(), 0),
+                station.metadata().packet_duration_s,
+            )
+            if gap is not None:
+                gaps.insert(0, gap)
+        station.set_gaps(station.gaps() + gaps)
+
+        last_packet = max([p.packet_start_mach_timestamp for p in station.packet_metadata()], default=-np.inf)
+        station.set_packet_metadata(
+            station.packet_metadata()
+            + [p for p in new_station.packet_metadata() if p.packet_start_mach_timestamp > last_packet]
+        )
+        # remove the empty event added to the end of the window; new events before the end are already in station
+        event_end = station.last_data_timestamp() - 1
+        for stream in station.event_data().streams:
+            stream.events = [e for e in stream.events if e.get_timestamp() != event_end]
+        for stream in new_station.event_data().streams:
+            stream.events = [e for e in stream.events if e.get_timestamp() > event_end]
+            station.event_data().append(stream)
+
+    @staticmethod
+    def _append_rows(
+        sensor: SensorData, new_sensor: SensorData, padded_rows: int, packet_duration_s: float
+    ) -> Optional[Tuple[float, float]]:
+        """
+        append the rows of new_sensor after the last data point of sensor to sensor, after removing the points
+        added to the end of sensor by the window.  New audio samples are found by their unaltered timestamps and
+        continue the timestamps of the audio the way they would if the files were read together: when new_sensor
+        contains the last sample of the audio, the samples after it keep their spacing, otherwise samples missing
+        between the two are filled with NaN.
+
+        :param sensor: sensor of the DataWindow to update in place
+        :param new_sensor: sensor of the same type with the new data
+        :param padded_rows: number of rows added after the end of the data of sensor by the window
+        :param packet_duration_s: duration of the packets of the station in seconds
+        :return: the data points on the edges of the gap between the audio and the new audio, or None if there is no
+                    gap or the sensors aren't audio
+        """
+        table = sensor.pyarrow_table()
+        num_rows = table.num_rows
+        new_table = new_sensor.pyarrow_table()
+        is_audio = sensor.type() == SensorType.AUDIO
+        table = table.slice(0, max(table.num_rows - padded_rows, 0))
+        if table.num_rows < 1:
+            if new_table.num_rows > 0:
+                sensor.write_pyarrow_table(new_table)
+            return None
+        last_timestamp = table["timestamps"][-1].as_py()
+        gap = None
+        if is_audio:
+            # stored timestamps are rounded, so the spacing of the last two rows isn't the sample interval
+            interval = dtu.seconds_to_microseconds(sensor.sample_interval_s())
+            last_unaltered = table["unaltered_timestamps"][-1].as_py()
+            new_unaltered = new_table["unaltered_timestamps"].to_numpy()
+            new_rows = np.flatnonzero(new_unaltered > last_unaltered + interval / 2)
+            if len(new_rows) > 0:
+                first = int(new_rows[0])
+                new_timestamps = new_table["timestamps"].to_numpy()
+                samples_to_first = 1
+                if first > 0 and abs(new_unaltered[first - 1] - last_unaltered) < interval / 2:
+                    # the last sample of the audio is in the new data; align the two
+                    offset = last_timestamp - new_timestamps[first - 1]
+                else:
+                    missing = new_unaltered[first] - last_unaltered - interval
+                    # packets are joined without a gap unless they are further apart than the gap limit
+                    if missing > gpu.DEFAULT_GAP_LOWER_LIMIT * dtu.seconds_to_microseconds(packet_duration_s):
+                        samples_to_first = max(int(np.round((missing + interval) / interval)), 1)
+                    # uncorrected timestamps are already the unaltered timestamps
+                    offset = (
+                        last_timestamp + samples_to_first * interval - new_timestamps[first]
+                        if sensor.is_timestamps_altered()
+                        else 0.0
+                    )
+                new_table = new_table.slice(first)
+                new_table = new_table.set_column(
+                    new_table.schema.get_field_index("timestamps"),
+                    "timestamps",
+                    pa.array(new_timestamps[first:] + offset),
+                )
+                if samples_to_first > 1:
+                    gap = (last_timestamp, new_table["timestamps"][0].as_py())
+                    table = gpu.add_data_points_to_df(
+                        table, table.num_rows - 1, interval, samples_to_first - 1, gpu.DataPointCreationMode.NAN
+                    )
+            else:
+                new_table = new_table.slice(0, 0)
+        else:
+            new_table = new_table.filter(pa.array(new_table["timestamps"].to_numpy() > last_timestamp))
+        if new_table.num_rows > 0:
+            sensor.write_pyarrow_table(pa.concat_tables([table, new_table]))
+        elif table.num_rows != num_rows:
+            sensor.write_pyarrow_table(table)
+        return gap
+
+    @tracing.traced()
     def create_data_window(self, pool: Optional[multiprocessing.pool.Pool] = None):
         """
         updates the DataWindow to contain only the data within the window parameters
@@ -710,23 +1122,7 @@ class DataWindow:
         # the instantiation of the data window.
         _pool: multiprocessing.pool.Pool = multiprocessing.Pool() if pool is None else pool
 
-        r_f = io.ReadFilter()
-        if self._config.start_datetime:
-            r_f.with_start_dt(self._config.start_datetime)
-        if self._config.end_datetime:
-            r_f.with_end_dt(self._config.end_datetime)
-        if self._config.station_ids:
-            r_f.with_station_ids(self._config.station_ids)
-        if self._config.extensions:
-            r_f.with_extensions(self._config.extensions)
-        else:
-            self._config.extensions = r_f.extensions
-        if self._config.api_versions:
-            r_f.with_api_versions(self._config.api_versions)
-        else:
-            self._config.api_versions = r_f.api_versions
-        r_f.with_start_dt_buf(self._config.start_buffer_td)
-        r_f.with_end_dt_buf(self._config.end_buffer_td)
+        r_f = self._read_filter(self._config.start_datetime, self._config.end_datetime)
 
         if self.debug:
             print("Reading files from disk.  This may take a few minutes to complete.")
@@ -742,7 +1138,9 @@ class DataWindow:
             dw_save_mode=self._fs_writer.save_mode(),
             debug=self.debug,
             pool=_pool,
+            memory_budget_bytes=self._config.memory_budget_bytes,
         )
+        self._read_files = self._index_datetimes(a_r)
 
         # self._errors.extend_error(a_r.errors)
 
@@ -758,6 +1156,7 @@ class DataWindow:
         if self.debug:
             print("number of stations loaded: ", len(sts))
         for st in maybe_parallel_map(_pool, lambda s: s, iter(sts), chunk_size=1):
+            self._prepare_station(st)
             self.create_window_in_sensors(st, self._config.start_datetime, self._config.end_datetime)
             if self.debug:
                 print("station processed: ", st.id())
@@ -786,6 +1185,68 @@ class DataWindow:
         if pool is None:
             _pool.close()
 
+    def _read_filter(
+        self, start_datetime: Optional[dtu.datetime], end_datetime: Optional[dtu.datetime]
+    ) -> io.ReadFilter:
+        """
+        :param start_datetime: start of the data to read; if None, read from the start of the data
+        :param end_datetime: end of the data to read; if None, read to the end of the data
+        :return: ReadFilter of the files from start_datetime to end_datetime with the other settings of the config
+        """
+        r_f = io.ReadFilter()
+        if start_datetime:
+            r_f.with_start_dt(start_datetime)
+        if end_datetime:
+            r_f.with_end_dt(end_datetime)
+        if self._config.station_ids:
+            r_f.with_station_ids(self._config.station_ids)
+        if self._config.extensions:
+            r_f.with_extensions(self._config.extensions)
+        else:
+            self._config.extensions = r_f.extensions
+        if self._config.api_versions:
+            r_f.with_api_versions(self._config.api_versions)
+        else:
+            self._config.api_versions = r_f.api_versions
+        r_f.with_start_dt_buf(self._config.start_buffer_td)
+        r_f.with_end_dt_buf(self._config.end_buffer_td)
+        return r_f
+
+    @staticmethod
+    def _index_datetimes(reader: ApiReaderDw) -> Dict[str, Tuple[dtu.datetime, Optional[dtu.datetime]]]:
+        """
+        :param reader: reader of the files of the DataWindow
+        :return: the start and end datetime of every file read by the reader, keyed by the full path of the file.
+                    A file ends at its start plus the packet duration of its station, or None if that isn't known.
+        """
+        durations = {}
+        for station in reader.get_stations():
+            station_id = station.id().lstrip("0")
+            duration = station.metadata().packet_duration_s
+            if not np.isnan(duration):
+                durations[station_id] = max(duration, durations.get(station_id, 0.0))
+        result = {}
+        for index in reader.files_index:
+            for entry in index.entries:
+                duration = durations.get(entry.station_id.lstrip("0"))
+                file_end = None if duration is None else entry.date_time + timedelta(seconds=duration)
+                result[entry.full_path] = (entry.date_time, file_end)
+        return result
+
+    def _prepare_station(self, station: Station):
+        """
+        apply the write profile, timing, storage precision and timestamp format of the config to a station read from
+        files
+
+        :param station: station to update in place
+        """
+        station.set_write_profile(self._config.write_profile)
+        for sensor in station.data():
+            if self._config.implicit_timing:
+                sensor.set_implicit_timing(True)
+            sensor.set_storage_precision(self._config.storage_precision)
+            sensor.set_timestamp_format(self._config.timestamp_format)
+
     def _check_for_audio(self):
         """
         removes any station without audio data from the DataWindow
@@ -814,6 +1275,7 @@ class DataWindow:
                 if ids.zfill(STATION_ID_LENGTH) not in [i.id() for i in self._stations]:
                     self._errors.append(f"Requested {ids} but there is no data to read for that station")
 
+    @tracing.traced()
     def create_window_in_sensors(
         self,
         station: Station,
@@ -831,17 +1293,42 @@ class DataWindow:
         :param start_datetime: datetime of start of window, default None
         :param end_datetime: datetime of end of window, default None
         """
+        tracing.annotate(station=station.id())
+        if self._window_station(station, start_datetime, end_datetime):
+            if self._fs_writer.is_save_disk():
+                station.set_save_mode(io.FileSystemSaveMode.DISK)
+                station.set_save_dir(self.save_dir() if self._fs_writer.is_use_disk() else self._fs_writer.get_temp())
+            self._stations.append(station)
+
+    def _window_station(
+        self,
+        station: Station,
+        start_datetime: Optional[dtu.datetime] = None,
+        end_datetime: Optional[dtu.datetime] = None,
+    ) -> bool:
+        """
+        truncate the sensors, packet metadata and events of the station to the window and pad the edges of the sensors.
+        The other sensors are truncated to the start and end of the audio.  Updates the station in place.
+
+        :param station: station object to truncate sensors of
+        :param start_datetime: datetime of start of window, default None
+        :param end_datetime: datetime of end of window, default None
+        :return: True if the station has audio data in the window
+        """
         start_datetime = dtu.datetime_to_epoch_microseconds_utc(start_datetime) if start_datetime else 0
         end_datetime = dtu.datetime_to_epoch_microseconds_utc(end_datetime if end_datetime else dtu.datetime.max)
-        self.process_sensor(station.audio_sensor(), station.id(), start_datetime, end_datetime)
+        padded_rows = {
+            SensorType.AUDIO: self.process_sensor(station.audio_sensor(), station.id(), start_datetime, end_datetime)
+        }
         if station.has_audio_data():
             for sensor in [s for s in station.data() if s.type() != SensorType.AUDIO]:
-                self.process_sensor(
+                padded_rows[sensor.type()] = self.process_sensor(
                     sensor,
                     station.id(),
                     station.audio_sensor().first_data_timestamp(),
                     station.audio_sensor().last_data_timestamp(),
                 )
+            self._padded_rows[station.default_station_json_file_name()] = padded_rows
             # recalculate metadata
             station.update_first_and_last_data_timestamps()
             station.set_packet_metadata(
@@ -853,26 +1340,28 @@ class DataWindow:
                 ]
             )
             station.event_data().create_event_window(station.first_data_timestamp(), station.last_data_timestamp())
-            if self._fs_writer.is_save_disk():
-                station.set_save_mode(io.FileSystemSaveMode.DISK)
-                station.set_save_dir(self.save_dir() if self._fs_writer.is_use_disk() else self._fs_writer.get_temp())
-            self._stations.append(station)
+            return True
+        return False
 
+    @tracing.traced()
     def process_sensor(
         self, sensor: SensorData, station_id: str, start_date_timestamp: float, end_date_timestamp: float
-    ):
+    ) -> int:
         """
-        process a sensor to fit within the DataWindow.  Updates sensor in place, returns nothing.
+        process a sensor to fit within the DataWindow.  Updates sensor in place.
 
         :param sensor: sensor to process
         :param station_id: station id
         :param start_date_timestamp: start of DataWindow
         :param end_date_timestamp: end of DataWindow
+        :return: the number of rows added after the end of the data of the sensor
         """
+        tracing.annotate(station=station_id, sensor=sensor.type().name, rows=sensor.num_samples())
         if sensor.num_samples() > 0:
             # get only the timestamps between the start and end timestamps
-            before_start = np.where(sensor.data_timestamps() < start_date_timestamp)[0]
-            after_end = np.where(end_date_timestamp <= sensor.data_timestamps())[0]
+            timestamps = sensor.data_timestamps()
+            before_start = np.where(timestamps < start_date_timestamp)[0]
+            after_end = np.where(end_date_timestamp <= timestamps)[0]
             # start_index is inclusive of window start
             if len(before_start) > 0:
                 last_before_start = before_start[-1]
@@ -894,7 +1383,7 @@ class DataWindow:
                     f"Data window for {station_id} {'Audio' if is_audio else sensor.type().name} "
                     f"sensor has truncated all data points"
                 )
-                # adjust data window to match the conditions of the remaining data
+                # adjust data window to match the conditions of the remaining data; the row left isn't data
                 if is_audio:
                     sensor.empty_data_table()
                 elif last_before_start is not None and first_after_end is None:
@@ -914,6 +1403,7 @@ class DataWindow:
                             self._config.copy_edge_points == gpu.DataPointCreationMode.COPY,
                         )
                     )
+                return sensor.num_samples()
             else:
                 _arrow = sensor.pyarrow_table().slice(start_index, end_index - start_index)
                 # if sensor is audio or location, we want nan'd edge points
@@ -950,6 +1440,7 @@ class DataWindow:
                         else 0
                     )
                 # add to end
+                num_rows = _arrow.num_rows
                 _arrow = gpu.add_data_points_to_df(
                     data_table=_arrow,
                     start_index=_arrow.num_rows - 1,
@@ -957,6 +1448,7 @@ class DataWindow:
                     num_samples_to_add=end_samples_to_add,
                     point_creation_mode=new_point_mode,
                 )
+                end_rows = _arrow.num_rows - num_rows
                 # add to begin
                 _arrow = gpu.add_data_points_to_df(
                     data_table=_arrow,
@@ -966,8 +1458,10 @@ class DataWindow:
                     point_creation_mode=new_point_mode,
                 )
                 sensor.sort_by_data_timestamps(_arrow)
+                return end_rows
         else:
             self._errors.append(f"Data window for {station_id} {sensor.type().name} " f"sensor has no data points!")
+        return 0
 
     def errors(self) -> RedVoxExceptions:
         """
@@ -4,13 +4,18 @@ This module provides utility functions for determining statistics of well struct
 
 from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Any, Callable, Iterator, List, Optional, Tuple, TYPE_CHECKING, Union
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, TYPE_CHECKING, Union
+import hashlib
 import math
 import multiprocessing
+import os
 from multiprocessing.pool import Pool
 
 import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
 
+from redvox.api1000.common.packet_metadata import get_num_samples
 from redvox.common.timesync import TimeSync
 from redvox.common.parallel_utils import maybe_parallel_map
 
@@ -26,6 +31,8 @@ if TYPE_CHECKING:
         TimingInformation,
     )
     from redvox.api1000.wrapped_redvox_packet.wrapped_packet import WrappedRedvoxPacketM
+    from redvox.api1000.proto.redvox_api_m_pb2 import RedvoxPacketM
+    from redvox.api900.lib.api900_pb2 import RedvoxPacket
     from redvox.api900.wrapped_redvox_packet import WrappedRedvoxPacket
 
 # noinspection Mypy
@@ -167,6 +174,27 @@ def dur2td(us: float) -> timedelta:
     return timedelta(microseconds=us)
 
 
+def _best_timing(
+    best_latency: Optional[float], best_offset: Optional[float], synch_exchanges: List[float]
+) -> Tuple[Optional[float], float, Optional[float]]:
+    """
+    Computes the best latency, the timestamp of the best latency and the best offset of a packet.
+    The stored best latency and offset are used if they are both set.
+
+    :param best_latency: The best latency stored in the packet.
+    :param best_offset: The best offset stored in the packet.
+    :param synch_exchanges: The packet's synch exchanges as a single list of timestamps.
+    :return: The best latency, the best latency timestamp (NaN without synch exchanges) and the best offset.
+    """
+    if len(synch_exchanges) == 0:
+        return best_latency, np.nan, best_offset
+    tsd = TimeSync(time_sync_exchanges_list=synch_exchanges)
+    if not best_offset or not best_latency:
+        best_offset = tsd.best_offset()
+        best_latency = tsd.best_latency()
+    return best_latency, tsd.get_best_latency_timestamp(), best_offset
+
+
 @dataclass
 class StationStat:
     """
@@ -212,20 +240,13 @@ class StationStat:
         """
         mtz: Optional[float] = packet.mach_time_zero()
 
-        best_offset = packet.best_offset()
-        best_latency = packet.best_latency()
-        if packet.has_time_synchronization_sensor():
-            tsd = TimeSync(
-                time_sync_exchanges_list=list(
-                    packet.time_synchronization_sensor().payload_values()
-                )
-            )
-            if not best_offset or not best_latency:
-                best_offset = tsd.best_offset()
-                best_latency = tsd.best_latency()
-            best_latency_timestamp = tsd.get_best_latency_timestamp()
-        else:
-            best_latency_timestamp = np.nan
+        best_latency, best_latency_timestamp, best_offset = _best_timing(
+            packet.best_latency(),
+            packet.best_offset(),
+            list(packet.time_synchronization_sensor().payload_values())
+            if packet.has_time_synchronization_sensor()
+            else [],
+        )
 
         # noinspection Mypy
         return StationStat(
@@ -276,18 +297,11 @@ class StationStat:
                 )
                 gps_timestamps.append(GpsDateTime(us2dt(ts), gps_ts))
 
-        best_offset = timing_info.get_best_offset()
-        best_latency = timing_info.get_best_latency()
-        if len(timing_info.get_synch_exchange_array()) > 0:
-            tsd = TimeSync(
-                time_sync_exchanges_list=timing_info.get_synch_exchange_array()
-            )
-            if not best_offset or not best_latency:
-                best_offset = tsd.best_offset()
-                best_latency = tsd.best_latency()
-            best_latency_timestamp = tsd.get_best_latency_timestamp()
-        else:
-            best_latency_timestamp = np.nan
+        best_latency, best_latency_timestamp, best_offset = _best_timing(
+            timing_info.get_best_latency(),
+            timing_info.get_best_offset(),
+            timing_info.get_synch_exchange_array(),
+        )
 
         return StationStat(
             station_info.get_id(),
@@ -304,6 +318,225 @@ class StationStat:
         )
 
 
+# Columns of the table of station statistics.  Timestamps are microseconds since epoch UTC, and missing values are null.
+STATION_STATS_SCHEMA: pa.Schema = pa.schema(
+    [
+        ("station_id", pa.string()),
+        ("station_uuid", pa.string()),
+        ("api_version", pa.string()),
+        ("app_start_ts", pa.float64()),
+        ("packet_start_ts", pa.float64()),
+        ("server_recv_ts", pa.float64()),
+        ("latency", pa.float64()),
+        ("best_latency_ts", pa.float64()),
+        ("offset", pa.float64()),
+        ("sample_rate_hz", pa.float64()),
+        ("packet_duration_s", pa.float64()),
+        ("gps_mach_ts", pa.list_(pa.float64())),
+        ("gps_ts", pa.list_(pa.float64())),
+    ]
+)
+
+# schema metadata key of the fingerprint of the index used to create a cached table
+_INDEX_FINGERPRINT_KEY: bytes = b"redvox_index_fingerprint"
+
+# number of index entries read by each parallel task
+DEFAULT_STATS_SHARD_SIZE: int = 1024
+
+
+def _stats_row_api_900(packet: "RedvoxPacket") -> Tuple:
+    """
+    Extracts the StationStat fields of an API 900 packet as a row of STATION_STATS_SCHEMA.
+    API 900 stores the timing fields in metadata strings, so the packet is wrapped to decode them.
+
+    :param packet: API 900 packet to extract fields from.
+    :return: The row of the packet.
+    """
+    from redvox.api900.wrapped_redvox_packet import WrappedRedvoxPacket
+
+    wrapped: WrappedRedvoxPacket = WrappedRedvoxPacket(packet)
+    best_latency, best_latency_timestamp, best_offset = _best_timing(
+        wrapped.best_latency(),
+        wrapped.best_offset(),
+        list(wrapped.time_synchronization_sensor().payload_values())
+        if wrapped.has_time_synchronization_sensor()
+        else [],
+    )
+    has_mic: bool = wrapped.has_microphone_sensor()
+    return (
+        packet.redvox_id,
+        packet.uuid,
+        "900",
+        wrapped.mach_time_zero(),
+        packet.app_file_start_timestamp_machine,
+        packet.server_timestamp_epoch_microseconds_utc,
+        best_latency,
+        best_latency_timestamp,
+        best_offset,
+        wrapped.microphone_sensor().sample_rate_hz() if has_mic else np.nan,
+        wrapped.duration_s() if has_mic else 0.0,
+        None,
+        None,
+    )
+
+
+def _stats_row_api_1000(packet: "RedvoxPacketM") -> Tuple:
+    """
+    Extracts the StationStat fields of an API 1000 packet as a row of STATION_STATS_SCHEMA.
+    The fields are read straight from the protobuf, which can be a full packet or its metadata view.
+
+    :param packet: API 1000 packet to extract fields from.
+    :return: The row of the packet.
+    """
+    timing_info = packet.timing_information
+    synch_exchanges: List[float] = []
+    for exchange in timing_info.synch_exchanges:
+        synch_exchanges.extend([exchange.a1, exchange.a2, exchange.a3, exchange.b1, exchange.b2, exchange.b3])
+    best_latency, best_latency_timestamp, best_offset = _best_timing(
+        timing_info.best_latency, timing_info.best_offset, synch_exchanges
+    )
+
+    sample_rate_hz: Optional[float] = None
+    packet_duration_s: float = 0.0
+    if packet.sensors.HasField("audio"):
+        sample_rate_hz = packet.sensors.audio.sample_rate
+        packet_duration_s = float(get_num_samples(packet.sensors.audio.samples)) / sample_rate_hz
+
+    # A GPS timestamp isn't always present in the location sensor, those are null
+    gps_mach_ts: Optional[List[float]] = None
+    gps_ts: Optional[List[Optional[float]]] = None
+    if packet.sensors.HasField("location"):
+        gps_mach_ts = list(packet.sensors.location.timestamps.timestamps)
+        gps_ts = [None if np.isnan(ts) else ts for ts in packet.sensors.location.timestamps_gps.timestamps]
+        gps_ts = gps_ts[: len(gps_mach_ts)] + [None] * (len(gps_mach_ts) - len(gps_ts))
+
+    return (
+        packet.station_information.id,
+        packet.station_information.uuid,
+        "1000",
+        timing_info.app_start_mach_timestamp,
+        timing_info.packet_start_mach_timestamp,
+        timing_info.server_acquisition_arrival_timestamp,
+        best_latency,
+        best_latency_timestamp,
+        best_offset,
+        sample_rate_hz,
+        packet_duration_s,
+        gps_mach_ts,
+        gps_ts,
+    )
+
+
+def extract_stats_table_serial(index: io.Index) -> pa.Table:
+    """
+    Extracts StationStat information from packets stored in the provided index into a table.
+
+    :param index: Index of packets to extract information from.
+    :return: A table with STATION_STATS_SCHEMA and one row per packet, in the order of the index.
+    """
+    rows: List[Tuple] = []
+    for entry in index.entries:
+        if entry.api_version == io.ApiVersion.API_900:
+            rows.append(_stats_row_api_900(entry.read_raw()))
+        elif entry.api_version == io.ApiVersion.API_1000:
+            rows.append(_stats_row_api_1000(entry.read_raw_metadata()))
+    columns: List[Tuple] = list(zip(*rows)) if rows else [()] * len(STATION_STATS_SCHEMA)
+    return pa.Table.from_arrays(
+        [pa.array(column, type=field.type) for column, field in zip(columns, STATION_STATS_SCHEMA)],
+        schema=STATION_STATS_SCHEMA,
+    )
+
+
+def _index_fingerprint(index: io.Index) -> bytes:
+    """
+    :param index: Index to fingerprint.
+    :return: A digest of the paths, sizes and modification times of the files in the index.
+    """
+    digest = hashlib.sha256()
+    for entry in index.entries:
+        try:
+            mtime_ns: int = os.stat(entry.full_path).st_mtime_ns
+        except OSError:
+            mtime_ns = -1
+        digest.update(f"{entry.full_path}\0{entry.compressed_file_size_bytes}\0{mtime_ns}\0".encode())
+    return digest.hexdigest().encode()
+
+
+def extract_stats_table(
+    index: io.Index,
+    pool: Optional[multiprocessing.pool.Pool] = None,
+    cache_path: Optional[str] = None,
+    shard_size: int = DEFAULT_STATS_SHARD_SIZE,
+) -> pa.Table:
+    """
+    Extracts StationStat information from packets stored in the provided index into a table.
+    Shards of the index are read in parallel when parallelism is enabled.
+
+    If cache_path is given, the table is read from that parquet file when it was made from the same files, otherwise
+    the table is extracted and written to cache_path.  Files are the same when their paths, sizes and modification
+    times match.
+
+    :param index: Index of packets to extract information from.
+    :param pool: optional multiprocessing pool.
+    :param cache_path: optional path of a parquet file to cache the table in.  Default None
+    :param shard_size: the number of index entries read by each parallel task.  Default DEFAULT_STATS_SHARD_SIZE
+    :return: A table with STATION_STATS_SCHEMA and one row per packet, in the order of the index.
+    """
+    if shard_size < 1:
+        raise ValueError(f"shard_size must be at least 1, not {shard_size}")
+    fingerprint: bytes = _index_fingerprint(index)
+    if cache_path is not None and os.path.exists(cache_path):
+        cached: pa.Table = pq.read_table(cache_path)
+        if (cached.schema.metadata or {}).get(_INDEX_FINGERPRINT_KEY) == fingerprint:
+            return cached.replace_schema_metadata(None)
+
+    shards: List[io.Index] = [
+        io.Index(index.entries[i : i + shard_size]) for i in range(0, len(index.entries), shard_size)
+    ]
+    tables: List[pa.Table] = list(
+        maybe_parallel_map(pool, extract_stats_table_serial, iter(shards), lambda: len(shards) > 1, chunk_size=1)
+    )
+    table: pa.Table = pa.concat_tables(tables) if tables else extract_stats_table_serial(index)
+
+    if cache_path is not None:
+        pq.write_table(table.replace_schema_metadata({_INDEX_FINGERPRINT_KEY: fingerprint}), cache_path)
+    return table
+
+
+def stats_from_table(table: pa.Table) -> List[StationStat]:
+    """
+    Converts a table of station statistics into StationStat objects.
+
+    :param table: A table with STATION_STATS_SCHEMA.
+    :return: A list of StationStat objects, one per row.
+    """
+    columns: Dict[str, List[Any]] = table.to_pydict()
+    stats: List[StationStat] = []
+    for i in range(table.num_rows):
+        gps_dts: Optional[List[GpsDateTime]] = None
+        if columns["gps_mach_ts"][i] is not None:
+            gps_dts = [
+                GpsDateTime(us2dt(mach_ts), _map_opt(gps_ts, us2dt))
+                for mach_ts, gps_ts in zip(columns["gps_mach_ts"][i], columns["gps_ts"][i])
+            ]
+        stats.append(
+            StationStat(
+                columns["station_id"][i],
+                columns["station_uuid"][i],
+                _map_opt_numeric(us2dt, columns["app_start_ts"][i]),
+                us2dt(columns["packet_start_ts"][i]),
+                _map_opt_numeric(us2dt, columns["server_recv_ts"][i]),
+                gps_dts,
+                columns["latency"][i],
+                columns["best_latency_ts"][i],
+                columns["offset"][i],
+                columns["sample_rate_hz"][i],
+                timedelta(seconds=columns["packet_duration_s"][i]),
+            )
+        )
+    return stats
+
+
 # noinspection PyTypeChecker,DuplicatedCode
 def extract_stats_serial(index: io.Index) -> List[StationStat]:
     """
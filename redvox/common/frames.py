@@ -0,0 +1,162 @@
+"""
+Iterates over the sensors of stations in time-aligned frames of a fixed duration, so long windows of data can be
+analysed without holding whole sensor tables in memory.
+
+The rows of each sensor are read once, in tables of FRAME_BATCH_ROWS rows, and freed once the frames that contain them
+are passed, so the memory used is proportional to the duration of a frame plus at most one parquet row group per sensor
+rather than the length of the data.
+"""
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Tuple, TYPE_CHECKING
+
+import numpy as np
+import pyarrow as pa
+
+from redvox.common.date_time_utils import seconds_to_microseconds
+from redvox.common.sensor_data import TIMESTAMP_COLUMNS, SensorData, SensorType
+
+if TYPE_CHECKING:
+    from redvox.common.station import Station
+
+
+# rows of a sensor kept in each table read; rows are freed a table at a time once their frames are passed
+FRAME_BATCH_ROWS: int = 1 << 14
+
+
+@dataclass
+class Frame:
+    """
+    The data of a set of stations from a start timestamp up to but not including an end timestamp
+
+    Properties:
+        start_timestamp: float, first timestamp of the frame in microseconds since epoch UTC
+
+        end_timestamp: float, timestamp after the end of the frame in microseconds since epoch UTC
+
+        data: dict of str to dict of SensorType to pyarrow Table, the rows of each sensor in the frame, keyed by
+        the station's [id]_[start_date] and then the type of the sensor.  Sensors without data in the frame have
+        empty tables
+    """
+
+    start_timestamp: float
+    end_timestamp: float
+    data: Dict[str, Dict[SensorType, pa.Table]] = field(default_factory=dict)
+
+    def get(self, station_key: str, sensor_type: SensorType) -> Optional[pa.Table]:
+        """
+        :param station_key: the station's [id]_[start_date]
+        :param sensor_type: type of the sensor
+        :return: the rows of the sensor in the frame or None if the station or sensor isn't in the frame
+        """
+        return self.data.get(station_key, {}).get(sensor_type)
+
+
+def frame_bounds(
+    start_timestamp: float, end_timestamp: float, duration_s: float, overlap_s: float = 0.0
+) -> Iterator[Tuple[float, float]]:
+    """
+    :param start_timestamp: start of the first frame in microseconds since epoch UTC
+    :param end_timestamp: frames start before this timestamp, in microseconds since epoch UTC
+    :param duration_s: duration of each frame in seconds
+    :param overlap_s: seconds each frame overlaps the frame before it, default 0.0
+    :return: start and end timestamps of each frame
+    """
+    if not duration_s > overlap_s >= 0:
+        raise ValueError(f"frame duration ({duration_s}s) must be greater than overlap ({overlap_s}s) and overlap >= 0")
+    duration = seconds_to_microseconds(duration_s)
+    step = seconds_to_microseconds(duration_s - overlap_s)
+    num_frames = int(np.ceil((end_timestamp - start_timestamp) / step)) if end_timestamp > start_timestamp else 0
+    for i in range(num_frames):
+        frame_start = start_timestamp + i * step
+        yield frame_start, frame_start + duration
+
+
+class _SensorFrames:
+    """
+    reads the frames of a sensor in time order.  The rows are read once, FRAME_BATCH_ROWS at a time, and only the rows
+    from the start of the current frame on are kept, so frames don't decode the same rows again.
+    """
+
+    def __init__(self, sensor: SensorData):
+        """
+        :param sensor: sensor to read
+        """
+        self.sensor = sensor
+        self.batches = sensor.iter_tables(FRAME_BATCH_ROWS)
+        self.exhausted = False
+        # sensors without rows may still have the columns of the sensor
+        table = sensor.pyarrow_table() if sensor.num_samples() < 1 else None
+        self.table: pa.Table = (
+            table.slice(0, 0)
+            if table is not None
+            else pa.Table.from_pydict({c: pa.array([], pa.float64()) for c in TIMESTAMP_COLUMNS})
+        )
+
+    def _last_timestamp(self) -> float:
+        """
+        :return: the last timestamp of the rows read but not yet passed, or NaN if there are none
+        """
+        return self.table["timestamps"][-1].as_py() if self.table.num_rows > 0 else np.nan
+
+    def read(self, start_timestamp: float, end_timestamp: float) -> pa.Table:
+        """
+        :param start_timestamp: first timestamp to include, in microseconds since epoch UTC
+        :param end_timestamp: timestamp after the last timestamp to include, in microseconds since epoch UTC
+        :return: the rows of the sensor from start_timestamp up to but not including end_timestamp.  Sensors without
+                    data return an empty table
+        """
+        while not self.exhausted and not self._last_timestamp() >= end_timestamp:
+            batch = next(self.batches, None)
+            if batch is None:
+                self.exhausted = True
+            elif self.table.num_rows > 0:
+                self.table = pa.concat_tables([self.table, batch])
+            else:
+                self.table = batch
+        first, last = np.searchsorted(self.table["timestamps"].to_numpy(), [start_timestamp, end_timestamp])
+        # frames start in time order, so the rows before this frame are not read again
+        self.table = self.table.slice(int(first))
+        return self.table.slice(0, int(last - first))
+
+
+def iter_frames(
+    stations: List["Station"],
+    duration_s: float,
+    overlap_s: float = 0.0,
+    sensor_types: Optional[List[SensorType]] = None,
+    start_timestamp: Optional[float] = None,
+    end_timestamp: Optional[float] = None,
+) -> Iterator[Frame]:
+    """
+    iterate over the sensors of stations in frames of the same start and end timestamps.
+    Only the rows of one frame are read at a time.
+
+    :param stations: stations to read
+    :param duration_s: duration of each frame in seconds
+    :param overlap_s: seconds each frame overlaps the frame before it, default 0.0
+    :param sensor_types: types of the sensors to read; if None, read every sensor.  default None
+    :param start_timestamp: start of the first frame in microseconds since epoch UTC; if None, use the first data
+                            timestamp of the stations.  default None
+    :param end_timestamp: frames start before this timestamp, in microseconds since epoch UTC; if None, use the
+                            timestamp after the last data timestamp of the stations.  default None
+    :return: the Frames in time order
+    """
+    if start_timestamp is None:
+        start_timestamp = np.nanmin([s.first_data_timestamp() for s in stations]) if stations else np.nan
+    if end_timestamp is None:
+        end_timestamp = np.nanmax([s.last_data_timestamp() for s in stations]) + 1 if stations else np.nan
+    sensors = {
+        st.default_station_json_file_name(): [
+            _SensorFrames(s) for s in st.data() if sensor_types is None or s.type() in sensor_types
+        ]
+        for st in stations
+    }
+    for frame_start, frame_end in frame_bounds(start_timestamp, end_timestamp, duration_s, overlap_s):
+        yield Frame(
+            frame_start,
+            frame_end,
+            {
+                key: {s.sensor.type(): s.read(frame_start, frame_end) for s in station_sensors}
+                for key, station_sensors in sensors.items()
+            },
+        )
@@ -13,6 +13,7 @@ import pyarrow as pa
 import pyarrow.compute as pc
 
 from redvox.common import date_time_utils as dtu
+from redvox.common import tracing
 from redvox.common.errors import RedVoxExceptions
 from redvox.api1000.wrapped_redvox_packet.sensors.audio import AudioCodec
 from redvox.api1000.wrapped_redvox_packet.sensors.location import LocationProvider
@@ -86,22 +87,23 @@ class AudioWithGaps:
         """
         :return: converts the audio metadata into a data table
         """
-        result_array = [[], [], []]
+        timestamps = []
+        samples = []
         for m in self.metadata:
-            timestamps = calc_evenly_sampled_timestamps(m[0], m[1].num_rows, self.sample_interval_micros)
-            result_array[0].extend(timestamps)
-            result_array[1].extend(timestamps)
-            result_array[2].extend(m[1]["microphone"].to_numpy())
+            timestamps.append(calc_evenly_sampled_timestamps(m[0], m[1].num_rows, self.sample_interval_micros))
+            samples.append(m[1]["microphone"].to_numpy())
         for gs, ge in self.gaps:
             fractional, whole = modf((ge - gs) / self.sample_interval_micros)
             num_samples = int((whole - 1) if fractional < DEFAULT_GAP_LOWER_LIMIT else whole)
-            timestamps = calc_evenly_sampled_timestamps(
-                gs + self.sample_interval_micros, num_samples, self.sample_interval_micros
+            timestamps.append(
+                calc_evenly_sampled_timestamps(gs + self.sample_interval_micros, num_samples, self.sample_interval_micros)
             )
-            gap_array = [timestamps, np.full(len(timestamps), np.nan)]
-            result_array[0].extend(gap_array[0])
-            result_array[1].extend(gap_array[0])
-            result_array[2].extend(gap_array[1])
+            samples.append(np.full(len(timestamps[-1]), np.nan))
+        # join the packets once instead of growing lists one sample at a time
+        if len(timestamps) > 0:
+            timestamps = np.concatenate(timestamps)
+            samples = np.concatenate(samples)
+        result_array = [timestamps, timestamps, samples]
         ptable = pa.Table.from_pydict(dict(zip(AUDIO_DF_COLUMNS, result_array)))
         return pc.take(ptable, pc.sort_indices(ptable, sort_keys=[("timestamps", "ascending")]))
 
@@ -125,6 +127,259 @@ def calc_evenly_sampled_timestamps(start: float, samples: int, sample_interval_m
     return start + (np.arange(0, samples) * sample_interval_micros)
 
 
+# the most timestamps a new run can take back from the end of the previous run
+_MAX_RUN_BACKTRACK: int = 16
+
+
+def _matching_length(timestamps: np.ndarray, position: int, start: float, index: int, interval: float) -> int:
+    """
+    :param timestamps: timestamps to match
+    :param position: index of the first timestamp to match
+    :param start: start of the evenly sampled run
+    :param index: index in the run of timestamps[position]
+    :param interval: sample interval of the run
+    :return: number of timestamps from position on that are exactly the timestamps of the run
+    """
+    matched = 0
+    block = 1024
+    while position + matched < len(timestamps):
+        end = min(len(timestamps), position + matched + block)
+        expected = start + (np.arange(index + matched, index + end - position) * interval)
+        mismatches = np.flatnonzero(expected != timestamps[position + matched : end])
+        if len(mismatches) > 0:
+            return matched + int(mismatches[0])
+        matched = end - position
+        block *= 2
+    return matched
+
+
+def _fresh_run(timestamps: np.ndarray, position: int, interval: float, max_back: int) -> Tuple[int, int]:
+    """
+    find the run starting at or just before position that reaches the farthest.  The last timestamps of the previous
+    run can be the first of the next one when the next run happens to continue it for a sample or two.
+
+    :param timestamps: timestamps to match
+    :param position: index of the first timestamp not in a run
+    :param interval: sample interval of the run
+    :param max_back: the most timestamps the run can take from the previous run
+    :return: number of timestamps the run starts before position and the length of the run
+    """
+    best_back, best_end = 0, position + _matching_length(timestamps, position, timestamps[position], 0, interval)
+    for back in range(1, min(max_back, _MAX_RUN_BACKTRACK) + 1):
+        start = position - back
+        end = start + _matching_length(timestamps, start, timestamps[start], 0, interval)
+        if end > best_end:
+            best_back, best_end = back, end
+    return best_back, best_end - position + best_back
+
+
+@dataclass
+class TimingSegments:
+    """
+    Evenly sampled timestamps described by runs of samples instead of a value per sample.  Run k has the timestamps
+    calc_evenly_sampled_timestamps(starts[k], first_indices[k] + lengths[k], sample_interval_micros)[first_indices[k]:],
+    so a run keeps the exact values of the timestamps it was made from, even after it is sliced.  Runs are in time
+    order; the time between two runs that is not covered by either is a gap.
+
+    Properties:
+        sample_interval_micros: float, microseconds between samples of a run
+
+        starts: np.ndarray of float, timestamp of sample 0 of each run in microseconds since epoch UTC
+
+        first_indices: np.ndarray of int, index of the first sample of each run
+
+        lengths: np.ndarray of int, number of samples in each run
+    """
+
+    sample_interval_micros: float
+    starts: np.ndarray
+    first_indices: np.ndarray
+    lengths: np.ndarray
+
+    @staticmethod
+    def evenly_sampled(start: float, num_samples: int, sample_interval_micros: float) -> "TimingSegments":
+        """
+        :param start: timestamp of the first sample in microseconds since epoch UTC
+        :param num_samples: number of samples
+        :param sample_interval_micros: microseconds between samples
+        :return: TimingSegments with a single run
+        """
+        return TimingSegments(
+            sample_interval_micros,
+            np.array([start], dtype=np.float64),
+            np.zeros(1, dtype=np.int64),
+            np.array([num_samples], dtype=np.int64),
+        )
+
+    @staticmethod
+    def from_timestamps(
+        timestamps: np.ndarray,
+        sample_interval_micros: float,
+        reference: Optional["TimingSegments"] = None,
+        max_segments: Optional[int] = None,
+    ) -> Optional["TimingSegments"]:
+        """
+        describe timestamps as runs of evenly sampled timestamps.  Runs continue the runs of the reference when
+        possible, so timestamps sliced out of the reference get the same description.
+
+        :param timestamps: timestamps to describe, in microseconds since epoch UTC
+        :param sample_interval_micros: microseconds between samples
+        :param reference: optional TimingSegments the timestamps were taken from, default None
+        :param max_segments: the most runs allowed, default 16 or 1/64th of the number of timestamps, whichever is
+                                larger
+        :return: TimingSegments with exactly the timestamps or None if it would need more than max_segments runs
+        """
+        timestamps = np.asarray(timestamps, dtype=np.float64)
+        if max_segments is None:
+            max_segments = max(16, len(timestamps) // 64)
+        if not sample_interval_micros > 0 or len(timestamps) < 1 or not np.all(np.isfinite(timestamps)):
+            return None
+        starts = []
+        first_indices = []
+        lengths = []
+        position = 0
+        while position < len(timestamps):
+            if len(starts) >= max_segments:
+                return None
+            located = reference.locate(timestamps[position]) if reference is not None else None
+            start, index = located if located is not None else (timestamps[position], 0)
+            length = _matching_length(timestamps, position, start, index, sample_interval_micros)
+            if located is None or length < 1:
+                back, length = _fresh_run(
+                    timestamps, position, sample_interval_micros, lengths[-1] - 1 if len(lengths) > 0 else 0
+                )
+                if back > 0:
+                    lengths[-1] -= back
+                    position -= back
+                start, index = timestamps[position], 0
+            starts.append(start)
+            first_indices.append(index)
+            lengths.append(length)
+            position += length
+        return TimingSegments(
+            sample_interval_micros,
+            np.array(starts, dtype=np.float64),
+            np.array(first_indices, dtype=np.int64),
+            np.array(lengths, dtype=np.int64),
+        )
+
+    def num_samples(self) -> int:
+        """
+        :return: number of timestamps described
+        """
+        return int(np.sum(self.lengths))
+
+    def _run_timestamp(self, run: int, index: int) -> float:
+        """
+        :param run: index of the run
+        :param index: index of the sample in the run
+        :return: the timestamp of the sample
+        """
+        return self.starts[run] + (np.arange(index, index + 1) * self.sample_interval_micros)[0]
+
+    def first_timestamp(self) -> float:
+        """
+        :return: the first timestamp or np.nan if there are none
+        """
+        if self.num_samples() < 1:
+            return np.nan
+        run = int(np.flatnonzero(self.lengths)[0])
+        return self._run_timestamp(run, self.first_indices[run])
+
+    def last_timestamp(self) -> float:
+        """
+        :return: the last timestamp or np.nan if there are none
+        """
+        if self.num_samples() < 1:
+            return np.nan
+        run = int(np.flatnonzero(self.lengths)[-1])
+        return self._run_timestamp(run, self.first_indices[run] + self.lengths[run] - 1)
+
+    def timestamps(self) -> np.ndarray:
+        """
+        :return: all the timestamps in microseconds since epoch UTC
+        """
+        run_offsets = np.cumsum(self.lengths) - self.lengths - self.first_indices
+        indices = np.arange(self.num_samples()) - np.repeat(run_offsets, self.lengths)
+        return np.repeat(self.starts, self.lengths) + (indices * self.sample_interval_micros)
+
+    def slice(self, start: int, end: Optional[int] = None) -> "TimingSegments":
+        """
+        :param start: index of the first timestamp to keep
+        :param end: index after the last timestamp to keep, default None (keep until the end)
+        :return: TimingSegments of the timestamps from start to end, like slicing the timestamps array
+        """
+        start, end, _ = slice(start, end).indices(self.num_samples())
+        run_starts = np.cumsum(self.lengths) - self.lengths
+        keep_start = np.clip(start - run_starts, 0, self.lengths)
+        keep_end = np.clip(end - run_starts, 0, self.lengths)
+        kept = keep_end > keep_start
+        return TimingSegments(
+            self.sample_interval_micros,
+            self.starts[kept],
+            (self.first_indices + keep_start)[kept],
+            (keep_end - keep_start)[kept],
+        )
+
+    def locate(self, timestamp: float) -> Optional[Tuple[float, int]]:
+        """
+        :param timestamp: timestamp to find
+        :return: start and index in the run of the timestamp if it is exactly a timestamp of one of the runs
+                    (or where the run would continue to), otherwise None
+        """
+        if len(self.starts) < 1:
+            return None
+        run_firsts = self.starts + self.first_indices * self.sample_interval_micros
+        run = max(int(np.searchsorted(run_firsts, timestamp, side="right")) - 1, 0)
+        index = int(round((timestamp - self.starts[run]) / self.sample_interval_micros))
+        if index >= 0 and self._run_timestamp(run, index) == timestamp:
+            return self.starts[run], index
+        return None
+
+    def search(self, timestamp: float) -> int:
+        """
+        :param timestamp: timestamp to find
+        :return: number of timestamps before the timestamp, like np.searchsorted(self.timestamps(), timestamp)
+        """
+        run_firsts = self.starts + self.first_indices * self.sample_interval_micros
+        run = int(np.searchsorted(run_firsts, timestamp, side="left")) - 1
+        if run < 0:
+            return 0
+        first = int(self.first_indices[run])
+        last = first + int(self.lengths[run])
+        index = min(max(int(np.ceil((timestamp - self.starts[run]) / self.sample_interval_micros)), first), last)
+        # correct the rounding of the division so the result matches the timestamps exactly
+        while index > first and self._run_timestamp(run, index - 1) >= timestamp:
+            index -= 1
+        while index < last and self._run_timestamp(run, index) < timestamp:
+            index += 1
+        return int(np.sum(self.lengths[:run])) + index - first
+
+    def as_dict(self) -> dict:
+        """
+        :return: TimingSegments as a dictionary
+        """
+        return {
+            "sample_interval_micros": self.sample_interval_micros,
+            "starts": self.starts.tolist(),
+            "first_indices": self.first_indices.tolist(),
+            "lengths": self.lengths.tolist(),
+        }
+
+    @staticmethod
+    def from_dict(data: dict) -> "TimingSegments":
+        """
+        :param data: dictionary made by as_dict()
+        :return: TimingSegments from the dictionary
+        """
+        return TimingSegments(
+            data["sample_interval_micros"],
+            np.array(data["starts"], dtype=np.float64),
+            np.array(data["first_indices"], dtype=np.int64),
+            np.array(data["lengths"], dtype=np.int64),
+        )
+
+
 def check_gap_list(
     gaps: List[Tuple[float, float]], start_timestamp: float = None, end_timestamp: float = None
 ) -> List[Tuple[float, float]]:
@@ -160,6 +415,7 @@ def check_gap_list(
     return return_gaps
 
 
+@tracing.traced()
 def fill_gaps(
     arrow_df: pa.Table, gaps: List[Tuple[float, float]], sample_interval_micros: float, fill_mode: str = "nan"
 ) -> Tuple[pa.Table, List[Tuple[float, float]]]:
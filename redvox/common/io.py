@@ -32,6 +32,7 @@ from redvox.api900.reader import read_rdvxz_file, read_buffer
 from redvox.api900.reader_utils import calculate_uncompressed_size
 from redvox.common import api_conversions as ac
 from redvox.api1000.common.common import check_type
+from redvox.api1000.common.packet_metadata import read_metadata_path
 from redvox.api1000.wrapped_redvox_packet.wrapped_packet import WrappedRedvoxPacketM
 from redvox.api1000.proto.redvox_api_m_pb2 import RedvoxPacketM
 from redvox.common.versioning import check_version, ApiVersion
@@ -43,8 +44,10 @@ from redvox.common.date_time_utils import (
     truncate_dt_ymdh,
 )
 from redvox.common.parallel_utils import maybe_parallel_map
+from redvox.common import tracing
 
 if TYPE_CHECKING:
+    import pyarrow as pa
     from redvox.api900.wrapped_redvox_packet import WrappedRedvoxPacket
     from redvox.api900.lib.api900_pb2 import RedvoxPacket
 
@@ -89,6 +92,102 @@ class FileSystemSaveMode(enum.Enum):
         return FileSystemSaveMode.MEM
 
 
+class ParquetWriteProfile(enum.Enum):
+    """
+    Enumeration of the settings used to write parquet files.  Tables with a timestamps column written with the
+    ARCHIVE profile are sorted by their timestamps first if they aren't in order, so the order of their rows can change.
+    """
+
+    FAST_SCRATCH = 0  # no compression, dictionaries or statistics; for temporary files that are read back once
+    BALANCED = 1  # fast zstd compression with statistics in medium row groups
+    ARCHIVE = 2  # strong zstd compression, rows sorted by timestamps in small row groups for time range pruning
+
+
+# options of pyarrow.parquet.write_table for each profile
+_PARQUET_WRITE_OPTIONS: Dict[ParquetWriteProfile, Dict[str, Any]] = {
+    ParquetWriteProfile.FAST_SCRATCH: {"compression": None, "use_dictionary": False, "write_statistics": False},
+    ParquetWriteProfile.BALANCED: {"compression": "zstd", "compression_level": 1, "row_group_size": 1 << 17},
+    ParquetWriteProfile.ARCHIVE: {"compression": "zstd", "compression_level": 9, "row_group_size": 1 << 16},
+}
+
+
+# integer timestamp columns are delta encoded; consecutive timestamps differ by a few bits
+_DELTA_ENCODED_COLUMNS = ["timestamps", "unaltered_timestamps"]
+
+
+def _parquet_write_options(schema: "pa.Schema", profile: ParquetWriteProfile) -> Dict[str, Any]:
+    """
+    :param schema: schema of the tables to write
+    :param profile: ParquetWriteProfile to use
+    :return: the options of pyarrow.parquet for the profile, with the integer timestamp columns of the schema delta
+                encoded
+    """
+    import pyarrow as pa
+
+    options = dict(_PARQUET_WRITE_OPTIONS[profile])
+    delta = [f.name for f in schema if f.name in _DELTA_ENCODED_COLUMNS and pa.types.is_int64(f.type)]
+    if len(delta) > 0:
+        options["column_encoding"] = {c: "DELTA_BINARY_PACKED" for c in delta}
+        # columns with an encoding can't use a dictionary
+        if options.get("use_dictionary", True):
+            options["use_dictionary"] = [f.name for f in schema if f.name not in delta]
+    return options
+
+
+def write_parquet(
+    table: "pa.Table", path: Union[str, Path], profile: ParquetWriteProfile = ParquetWriteProfile.BALANCED
+):
+    """
+    write a table to a parquet file using the settings of a profile.  The ARCHIVE profile sorts the rows of tables
+    with a timestamps column and records the sort order in the file.  Integer timestamp columns are delta encoded.
+
+    :param table: the table to write
+    :param path: path of the file to write
+    :param profile: ParquetWriteProfile to use, default BALANCED
+    """
+    import pyarrow.parquet as pq
+
+    sorting_columns = None
+    if profile == ParquetWriteProfile.ARCHIVE and "timestamps" in table.schema.names:
+        if np.any(np.diff(table["timestamps"].to_numpy()) < 0):
+            table = table.sort_by("timestamps")
+        sorting_columns = [pq.SortingColumn(table.schema.get_field_index("timestamps"))]
+    pq.write_table(table, path, sorting_columns=sorting_columns, **_parquet_write_options(table.schema, profile))
+
+
+def write_parquet_tables(
+    tables: Iterator["pa.Table"], path: Union[str, Path], profile: ParquetWriteProfile = ParquetWriteProfile.BALANCED
+) -> int:
+    """
+    write tables with the same schema to one parquet file as they are produced, so they are never all in memory at
+    once.  Tables written with the ARCHIVE profile must already be in order of their timestamps.  Nothing is written
+    if there are no tables.
+
+    :param tables: the tables to write, in order
+    :param path: path of the file to write
+    :param profile: ParquetWriteProfile to use, default BALANCED
+    :return: the number of rows written
+    """
+    import pyarrow.parquet as pq
+
+    row_group_size = _PARQUET_WRITE_OPTIONS[profile].get("row_group_size")
+    writer = None
+    num_rows = 0
+    for table in tables:
+        if writer is None:
+            options = _parquet_write_options(table.schema, profile)
+            options.pop("row_group_size", None)
+            sorting_columns = None
+            if profile == ParquetWriteProfile.ARCHIVE and "timestamps" in table.schema.names:
+                sorting_columns = [pq.SortingColumn(table.schema.get_field_index("timestamps"))]
+            writer = pq.ParquetWriter(path, table.schema, sorting_columns=sorting_columns, **options)
+        writer.write_table(table, row_group_size=row_group_size)
+        num_rows += table.num_rows
+    if writer is not None:
+        writer.close()
+    return num_rows
+
+
 class FileSystemWriter:
     """
     This class holds basic information about writing and reading objects from a file system
@@ -101,6 +200,8 @@ class FileSystemWriter:
 
         base_dir: str, the directory to save the file to.  Default "." (current dir)
 
+        write_profile: ParquetWriteProfile, settings used to write parquet files.  Default BALANCED
+
     Protected:
         _save_mode: FileSystemSaveMode, determines how files get saved
 
@@ -113,6 +214,7 @@ class FileSystemWriter:
         file_ext: str = "none",
         base_dir: str = ".",
         save_mode: FileSystemSaveMode = FileSystemSaveMode.MEM,
+        write_profile: ParquetWriteProfile = ParquetWriteProfile.BALANCED,
     ):
         """
         initialize FileSystemWriter
@@ -121,10 +223,12 @@ class FileSystemWriter:
         :param file_ext: extension of file, default "none"
         :param base_dir: directory to save file to, default "." (current dir)
         :param save_mode: determines how to save files to system, default MEM (no save, use RAM)
+        :param write_profile: settings used to write parquet files, default BALANCED
         """
         self.file_name: str = file_name
         self.file_extension: str = file_ext.lower()
         self.base_dir: str = base_dir
+        self.write_profile: ParquetWriteProfile = write_profile
         self._save_mode: FileSystemSaveMode = save_mode
         self._temp_dir = tempfile.TemporaryDirectory()
 
@@ -133,7 +237,8 @@ class FileSystemWriter:
             f"file_name: {self.file_name}, "
             f"extension: {self.file_extension}, "
             f"base_dir: {self.base_dir}, "
-            f"save_mode: {self._save_mode.value if hasattr(self, '_save_mode') else FileSystemSaveMode.TEMP.value}"
+            f"save_mode: {self._save_mode.value if hasattr(self, '_save_mode') else FileSystemSaveMode.TEMP.value}, "
+            f"write_profile: {self.write_profile.value}"
         )
 
     def __str__(self):
@@ -141,7 +246,8 @@ class FileSystemWriter:
             f"file_name: {self.file_name}, "
             f"extension: {self.file_extension}, "
             f"base_dir: {self.base_dir}, "
-            f"save_mode: {self._save_mode.name if hasattr(self, '_save_mode') else FileSystemSaveMode.TEMP.name}"
+            f"save_mode: {self._save_mode.name if hasattr(self, '_save_mode') else FileSystemSaveMode.TEMP.name}, "
+            f"write_profile: {self.write_profile.name}"
         )
 
     def __del__(self):
@@ -303,6 +409,7 @@ class FileSystemWriter:
             "file_extension": self.file_extension,
             "base_dir": self.base_dir,
             "save_mode": self._save_mode.name if hasattr(self, "_save_mode") else FileSystemSaveMode.TEMP.name,
+            "write_profile": self.write_profile.name,
         }
 
     @staticmethod
@@ -316,6 +423,7 @@ class FileSystemWriter:
             data_dict["file_extension"],
             data_dict["base_dir"],
             FileSystemSaveMode[data_dict["save_mode"]],
+            ParquetWriteProfile[data_dict.get("write_profile", ParquetWriteProfile.BALANCED.name)],
         )
 
 
@@ -518,6 +626,17 @@ class IndexEntry:
         else:
             return None
 
+    def read_raw_metadata(self) -> Optional[Union["RedvoxPacket", RedvoxPacketM]]:
+        """
+        Reads, decompresses, and deserializes the RedVox file pointed to by this entry without the sample payloads of
+        API 1000 files.  See redvox.api1000.common.packet_metadata for what is kept.  API 900 files are read in full.
+
+        :return: One of RedvoxPacket, RedvoxPacketM, or None. Note that these are the raw protobuf types.
+        """
+        if self.api_version == ApiVersion.API_1000:
+            return read_metadata_path(self.full_path)
+        return self.read_raw()
+
     def _into_native(self):
         pass
 
@@ -956,6 +1075,20 @@ class Index:
         # noinspection Mypy
         return map(IndexEntry.read_raw, filtered)
 
+    def stream_raw_metadata(
+        self, read_filter: ReadFilter = ReadFilter()
+    ) -> Iterator[Union["RedvoxPacket", RedvoxPacketM]]:
+        """
+        Read, decompress, deserialize, and then stream RedVox data pointed to by this index without the sample payloads
+        of API 1000 files.  See IndexEntry.read_raw_metadata.
+
+        :param read_filter: Additional filtering to specify which data should be streamed.
+        :return: An iterator over RedvoxPacket and RedvoxPacketM instances.
+        """
+        filtered: Iterator[IndexEntry] = filter(read_filter.apply, self.entries)
+        # noinspection Mypy
+        return map(IndexEntry.read_raw_metadata, filtered)
+
     def stream(
         self, read_filter: ReadFilter = ReadFilter()
     ) -> Iterator[Union["WrappedRedvoxPacket", WrappedRedvoxPacketM]]:
@@ -993,12 +1126,17 @@ class Index:
         """
         return float(np.sum([entry.decompressed_file_size_bytes for entry in self.entries]))
 
+    @tracing.traced()
     def read_contents(self) -> List[RedvoxPacketM]:
         """
         read all the files in the index
 
         :return: list of RedvoxPacketM, converted from API 900 if necessary
         """
+        if tracing.is_enabled():
+            tracing.annotate(
+                files=len(self.entries), bytes=sum(entry.compressed_file_size_bytes for entry in self.entries)
+            )
         result: List[RedvoxPacketM] = []
 
         # Iterate over the API 900 packets in a memory efficient way
@@ -1415,6 +1553,7 @@ except ImportError:
     __INDEX_UNSTRUCTURED_FN = index_unstructured_py
 
 
+@tracing.traced()
 def index_unstructured(
     base_dir: str,
     read_filter: ReadFilter = ReadFilter(),
@@ -1469,6 +1608,7 @@ def index_structured_api_1000(
     return __INDEX_STRUCTURED_1000_FN(base_dir, read_filter, sort, pool)
 
 
+@tracing.traced()
 def index_structured(
     base_dir: str,
     read_filter: ReadFilter = ReadFilter(),
@@ -0,0 +1,221 @@
+"""
+Plans how many stations are read at once and how many files each reader loads at a time, so that reading fits in a
+memory budget.
+
+The memory used to read a file is estimated from its decompressed size and from the sensors and sample counts of a few
+files of the same station, read without their sample payloads.  The estimate counts the deserialized packet and the
+Arrow tables made from it, including the copies made while converting, concatenating and gap filling.
+"""
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+import warnings
+
+import numpy as np
+from google.protobuf.message import DecodeError
+
+from redvox.api1000.common.packet_metadata import get_num_samples
+from redvox.api1000.errors import ApiMPacketMetadataError
+from redvox.api1000.proto.redvox_api_m_pb2 import RedvoxPacketM
+from redvox.common import io
+from redvox.common.sensor_reader_utils import LOCATION_COLUMNS, STATION_HEALTH_COLUMNS
+
+# Every sensor table has timestamps and unaltered_timestamps columns, and every column holds 8 byte values
+_NUM_TIMESTAMP_COLUMNS: int = 2
+_VALUE_BYTES: int = 8
+
+
+@dataclass
+class MemoryModel:
+    """
+    Coefficients used to estimate the memory needed to read a file
+
+    Properties:
+        protobuf_factor: float, bytes of memory used by a deserialized packet per decompressed byte.  Default 2.0
+
+        arrow_copies: float, number of copies of a sensor's Arrow table that exist at once while it is converted,
+        concatenated and gap filled, including the memory the allocator keeps.  Default 10.0, the most measured by
+        benchmarks/bench_memory_planner.py
+
+        default_arrow_ratio: float, bytes of Arrow tables per decompressed byte, used when the sensors of a file
+        can't be read.  Default 4.0
+
+        max_sampled_files: int, number of files per station to read without their sample payloads to estimate the
+        Arrow tables of the station.  Default 3
+    """
+
+    protobuf_factor: float = 2.0
+    arrow_copies: float = 10.0
+    default_arrow_ratio: float = 4.0
+    max_sampled_files: int = 3
+
+
+def _num_timestamps(timing_payload) -> int:
+    """
+    :param timing_payload: TimingPayload to count, with or without its timestamps
+    :return: number of timestamps in the payload
+    """
+    return len(timing_payload.timestamps) or int(timing_payload.timestamp_statistics.count)
+
+
+def estimate_arrow_bytes(packet: RedvoxPacketM) -> int:
+    """
+    :param packet: packet to estimate, with or without its sample payloads
+    :return: bytes of the Arrow tables made from the packet's sensors
+    """
+    num_values = 0
+    for descriptor, sensor in packet.sensors.ListFields():
+        name = descriptor.name
+        if name == "audio":
+            num_values += get_num_samples(sensor.samples) * (_NUM_TIMESTAMP_COLUMNS + 1)
+        elif name == "compressed_audio":
+            # compressed audio is kept as bytes, which the protobuf factor accounts for
+            continue
+        elif name in ("location", "best_location"):
+            num_values += _num_timestamps(sensor.timestamps) * len(LOCATION_COLUMNS)
+        elif hasattr(sensor, "x_samples"):
+            num_values += _num_timestamps(sensor.timestamps) * (_NUM_TIMESTAMP_COLUMNS + 3)
+        elif hasattr(sensor, "timestamps"):
+            num_values += _num_timestamps(sensor.timestamps) * (_NUM_TIMESTAMP_COLUMNS + 1)
+    if packet.station_information.HasField("station_metrics"):
+        num_values += _num_timestamps(packet.station_information.station_metrics.timestamps) * len(
+            STATION_HEALTH_COLUMNS
+        )
+    return num_values * _VALUE_BYTES
+
+
+def arrow_ratio(index: io.Index, model: MemoryModel = MemoryModel()) -> float:
+    """
+    :param index: files of a single station
+    :param model: coefficients of the estimate, default MemoryModel()
+    :return: bytes of Arrow tables per decompressed byte, from up to model.max_sampled_files evenly spaced API 1000
+                files of the index, or model.default_arrow_ratio if none of the sampled files can be read
+    """
+    entries = [e for e in index.entries if e.api_version == io.ApiVersion.API_1000 and e.decompressed_file_size_bytes]
+    if len(entries) < 1:
+        return model.default_arrow_ratio
+    sampled = np.unique(np.linspace(0, len(entries) - 1, min(len(entries), model.max_sampled_files)).astype(int))
+    arrow_bytes = 0
+    decompressed_bytes = 0
+    for i in sampled:
+        # missing or corrupt files are left to the reader to report
+        try:
+            packet = entries[i].read_raw_metadata()
+        except (OSError, RuntimeError, ApiMPacketMetadataError, DecodeError):
+            # lz4 raises RuntimeError for corrupt frames
+            continue
+        if packet is None:
+            continue
+        arrow_bytes += estimate_arrow_bytes(packet)
+        decompressed_bytes += entries[i].decompressed_file_size_bytes
+    if decompressed_bytes < 1:
+        return model.default_arrow_ratio
+    return arrow_bytes / decompressed_bytes
+
+
+@dataclass
+class MemoryPlan:
+    """
+    How to read a set of stations within a memory budget
+
+    Properties:
+        budget_bytes: float, memory available to all readers combined
+
+        num_workers: int, number of stations to read at the same time
+
+        chunk_limit_bytes: float, estimated memory each reader may use at once; the files of a station are read in
+        chunks that fit in this limit
+
+        model: MemoryModel, coefficients of the estimates
+
+        arrow_ratios: dict of str to float, bytes of Arrow tables per decompressed byte of each station id
+
+        station_estimates_bytes: list of float, estimated memory needed to read all files of each station at once
+    """
+
+    budget_bytes: float
+    num_workers: int
+    chunk_limit_bytes: float
+    model: MemoryModel = field(default_factory=MemoryModel)
+    arrow_ratios: Dict[str, float] = field(default_factory=dict)
+    station_estimates_bytes: List[float] = field(default_factory=list)
+
+    def estimate_entry_bytes(self, entry: io.IndexEntry) -> float:
+        """
+        :param entry: file to estimate
+        :return: estimated memory needed to read the file and convert it into Arrow tables
+        """
+        ratio = self.arrow_ratios.get(entry.station_id, self.model.default_arrow_ratio)
+        return entry.decompressed_file_size_bytes * (self.model.protobuf_factor + ratio * self.model.arrow_copies)
+
+    def estimate_index_bytes(self, index: io.Index) -> float:
+        """
+        :param index: files to estimate
+        :return: estimated memory needed to read all the files at once
+        """
+        return float(sum(self.estimate_entry_bytes(e) for e in index.entries))
+
+    def estimated_peak_bytes(self) -> float:
+        """
+        :return: estimated memory used when num_workers of the largest stations are read at the same time
+        """
+        largest = sorted(self.station_estimates_bytes, reverse=True)[: self.num_workers]
+        return float(sum(min(s, self.chunk_limit_bytes) for s in largest))
+
+    def split_index(self, index: io.Index) -> List[io.Index]:
+        """
+        split the files of a station into consecutive chunks whose estimated memory fits in chunk_limit_bytes.
+        A file larger than the limit gets a chunk of its own.
+
+        :param index: files to split
+        :return: list of Index to read one after the other
+        """
+        chunks: List[io.Index] = []
+        chunk: List[io.IndexEntry] = []
+        chunk_bytes = 0.0
+        for entry in index.entries:
+            entry_bytes = self.estimate_entry_bytes(entry)
+            if chunk and chunk_bytes + entry_bytes > self.chunk_limit_bytes:
+                chunks.append(io.Index(chunk))
+                chunk = []
+                chunk_bytes = 0.0
+            chunk.append(entry)
+            chunk_bytes += entry_bytes
+        chunks.append(io.Index(chunk))
+        return chunks
+
+
+def plan_workload(
+    indexes: List[io.Index],
+    budget_bytes: float,
+    max_workers: int,
+    model: Optional[MemoryModel] = None,
+) -> MemoryPlan:
+    """
+    Uses as many workers as the budget allows while every worker can hold at least the largest file it will read.
+    Every worker gets an equal share of the budget.  If the largest file doesn't fit in the budget, a single worker
+    reads one file at a time and a warning is issued.
+
+    :param indexes: files of each station to read
+    :param budget_bytes: memory available to all readers combined
+    :param max_workers: largest number of stations to read at the same time
+    :param model: coefficients of the estimates, default MemoryModel()
+    :return: the MemoryPlan
+    """
+    plan = MemoryPlan(budget_bytes, 1, budget_bytes, model if model else MemoryModel())
+    for index in indexes:
+        if len(index.entries) > 0:
+            plan.arrow_ratios[index.entries[0].station_id] = arrow_ratio(index, plan.model)
+    plan.station_estimates_bytes = [plan.estimate_index_bytes(index) for index in indexes]
+    max_file_bytes = max([plan.estimate_entry_bytes(e) for index in indexes for e in index.entries], default=0.0)
+    if max_file_bytes > budget_bytes:
+        warnings.warn(
+            f"System requires an estimated {int(max_file_bytes)} bytes of memory to process a file but only has "
+            f"{int(budget_bytes)} available; reading one file at a time."
+        )
+        return plan
+    num_workers = max(1, min(max_workers, len(indexes)))
+    if max_file_bytes > 0:
+        num_workers = max(1, min(num_workers, int(budget_bytes // max_file_bytes)))
+    plan.num_workers = num_workers
+    plan.chunk_limit_bytes = budget_bytes / num_workers
+    return plan
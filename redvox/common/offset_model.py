@@ -9,13 +9,14 @@ from datetime import timedelta, datetime
 from typing import Tuple, Optional, List, TYPE_CHECKING
 
 import numpy as np
-import pandas as pd
 from dataclasses import dataclass
-from scipy.optimize import curve_fit
 
+# pandas and scipy are slow to import and only needed to fit a model, so the functions that use them import them
 if TYPE_CHECKING:
+    import pandas as pd
     from redvox.common.file_statistics import StationStat
 import redvox.common.date_time_utils as dt_utils
+from redvox.common import tracing
 
 
 MIN_VALID_LATENCY_MICROS = 100  # minimum value of latency before it's unreliable
@@ -136,6 +137,7 @@ class OffsetModel:
         min_timesync_dur_min: int, the minimum number of minutes of data for the model to be reliable.  default 5
     """
 
+    @tracing.traced()
     def __init__(
         self,
         latencies: np.ndarray,
@@ -187,6 +189,8 @@ class OffsetModel:
         else:
             use_model = False
         if use_model:
+            import pandas as pd
+
             # Organize the data into a data frame
             full_df = pd.DataFrame(data=times, columns=["times"])
             full_df["latencies"] = latencies
@@ -418,6 +422,8 @@ def offset_weighted_linear_regression(
     # Compute the weights for the linear regression by the latencies
     latencies_ms = latencies / 1e3
 
+    from scipy.optimize import curve_fit
+
     # Set up the weighted linear regression
     parameters = curve_fit(linear_function, xdata=times, ydata=offsets, sigma=latencies_ms)
 
@@ -436,6 +442,8 @@ def simple_offset_weighted_linear_regression(offsets: np.ndarray, times: np.ndar
     :param times: array of device times used to get the offsets
     :return: slope of the model line, offset intercept at UTC 0
     """
+    from scipy.optimize import curve_fit
+
     # set up linear regression
     parameters = curve_fit(linear_function, xdata=times, ydata=offsets)
     intercept = get_offset_at_new_time(
@@ -467,7 +475,7 @@ def get_offset_at_new_time(new_time: float, slope: float, intercept: float, mode
 
 
 # Function to get the subset data frame to do the weighted linear regression
-def get_binned_df(full_df: pd.DataFrame, bin_times: np.ndarray, n_samples: float) -> pd.DataFrame:
+def get_binned_df(full_df: "pd.DataFrame", bin_times: np.ndarray, n_samples: float) -> "pd.DataFrame":
     """
     Returns a subset of the full_df with n_samples per binned times.
     nan latencies values will be ignored.
@@ -477,6 +485,8 @@ def get_binned_df(full_df: pd.DataFrame, bin_times: np.ndarray, n_samples: float
     :param n_samples: number of samples to take per bin
     :return: binned_df
     """
+    import pandas as pd
+
     # Initialize the data frame
     binned_df = pd.DataFrame()
 
@@ -19,8 +19,10 @@ from redvox.api1000.proto.redvox_api_m_pb2 import RedvoxPacketM
 from redvox.common import sensor_reader_utils as srupa
 from redvox.common import date_time_utils as dtu
 from redvox.common import gap_and_pad_utils as gpu
+from redvox.common import tracing
 from redvox.common.sensor_data import SensorType
 from redvox.common.errors import RedVoxExceptions
+from redvox.common.io import ParquetWriteProfile, write_parquet
 
 
 packet_schema = pa.schema(
@@ -79,6 +81,9 @@ class PyarrowSummary:
         sstd: float, std dev of sample rate in seconds
 
         _data: optional data as a Pyarrow Table
+
+        write_profile: settings used to write the data.  Default FAST_SCRATCH, since summaries are temporary files
+        that are read once to create the sensors
     """
 
     name: str
@@ -90,6 +95,7 @@ class PyarrowSummary:
     smint_s: float = np.nan
     sstd_s: float = np.nan
     _data: Optional[pa.Table] = None
+    write_profile: ParquetWriteProfile = ParquetWriteProfile.FAST_SCRATCH
 
     def file_name(self) -> str:
         """
@@ -121,7 +127,7 @@ class PyarrowSummary:
             os.makedirs(self.fdir, exist_ok=True)
             if clean_dir:
                 self.clean_fdir()
-            pq.write_table(self._data, self.file_name())
+            write_parquet(self._data, self.file_name(), self.write_profile)
             self._data = None
             return self.file_name()
         return ""
@@ -232,7 +238,7 @@ class AggregateSummary:
                 if first_summary.check_data():
                     first_summary._data = tbl
                 else:
-                    pq.write_table(tbl, first_summary.file_name())
+                    write_parquet(tbl, first_summary.file_name(), first_summary.write_profile)
                 # sort data by timestamps
                 tbl = pc.take(tbl, pc.sort_indices(tbl, sort_keys=[("timestamps", "ascending")]))
                 timestamps = tbl["timestamps"].to_numpy()
@@ -287,7 +293,7 @@ class AggregateSummary:
             if first_summary.check_data():
                 first_summary._data = tbl
             else:
-                pq.write_table(tbl, first_summary.file_name())
+                write_parquet(tbl, first_summary.file_name(), first_summary.write_profile)
                 os.remove(smrys.file_name())
         mnint = dtu.microseconds_to_seconds(float(np.mean(np.diff(tbl["timestamps"].to_numpy()))))
         stdint = dtu.microseconds_to_seconds(float(np.std(np.diff(tbl["timestamps"].to_numpy()))))
@@ -352,6 +358,7 @@ class AggregateSummary:
         return result
 
 
+@tracing.traced()
 def stream_to_pyarrow(packets: List[RedvoxPacketM], out_dir: Optional[str] = None) -> AggregateSummary:
     """
     stream the packets to parquet files for later processing.
@@ -360,6 +367,7 @@ def stream_to_pyarrow(packets: List[RedvoxPacketM], out_dir: Optional[str] = Non
     :param out_dir: optional directory to write the pyarrow files to; if None, don't write files.  default None
     :return: AggregateSummary of the sensors' metadata, data, and location of the data if written to disk
     """
+    tracing.annotate(packets=len(packets))
     summary = AggregateSummary()
     for k in map(packet_to_pyarrow, packets, repeat(out_dir)):
         for t in k.summaries:
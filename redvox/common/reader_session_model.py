@@ -7,7 +7,6 @@ from typing import List, Optional
 
 from redvox.common.session_model import SessionModel, LocalSessionModels
 from redvox.common.errors import RedVoxExceptions
-from redvox.cloud.client import cloud_client
 from redvox.cloud.session_model_api import SessionModelsResp, Session, DynamicSession
 from redvox.cloud.errors import CloudApiError
 
@@ -144,6 +143,8 @@ class ModelsContainer:
                     where START and END values times as microseconds since epoch UTC.
         :return: DynamicSession matching the key or None
         """
+        from redvox.cloud.client import cloud_client
+
         key_parts = key.split(":")
         dynamic_session: Optional[DynamicSession] = None
         try:
@@ -204,6 +205,8 @@ class ModelsContainer:
         :param end_ts: An optional end timestamp in microseconds since epoch UTC.
         :param include_public: Additionally include public sessions that may not be the same as the owner.
         """
+        from redvox.cloud.client import cloud_client
+
         try:
             resp: Optional[SessionModelsResp]
             with cloud_client() as client:
@@ -0,0 +1,204 @@
+"""
+Resamples the data of a sensor to a new sample rate as a new SensorData of the same type.  The data is resampled
+one chunk of rows at a time, so the data of sensors saved to disk is never read all at once, and the result can be
+written to disk chunk by chunk.
+
+Evenly sampled sensors, such as audio, are resampled with a polyphase FIR filter that removes frequencies above the
+Nyquist frequency of the new sample rate before decimating.  Other sensors are linearly interpolated to the new
+timestamps; new timestamps in gaps of their data are NaN.
+"""
+from fractions import Fraction
+import os
+from typing import Iterator, Optional, Tuple
+
+import numpy as np
+import pyarrow as pa
+
+from redvox.common.alignment import align_samples
+from redvox.common.gap_and_pad_utils import DEFAULT_GAP_UPPER_LIMIT, calc_evenly_sampled_timestamps
+from redvox.common.io import write_parquet_tables
+from redvox.common.sensor_data import SensorData, NON_INTERPOLATED_COLUMNS, NON_NUMERIC_COLUMNS
+
+# largest up or down factor of the polyphase filter; other ratios of sample rates are interpolated
+MAX_POLYPHASE_FACTOR: int = 1000
+# default seconds of data resampled at a time
+DEFAULT_CHUNK_S: float = 60.0
+
+
+def polyphase_factors(sample_rate_hz: float, new_sample_rate_hz: float) -> Optional[Tuple[int, int]]:
+    """
+    :param sample_rate_hz: sample rate of the data
+    :param new_sample_rate_hz: sample rate to resample to
+    :return: the up and down factors to resample with a polyphase filter or None if the ratio of the sample rates
+                needs a factor larger than MAX_POLYPHASE_FACTOR
+    """
+    ratio = Fraction(new_sample_rate_hz / sample_rate_hz).limit_denominator(MAX_POLYPHASE_FACTOR)
+    if ratio.numerator < 1 or ratio.numerator > MAX_POLYPHASE_FACTOR:
+        return None
+    if not np.isclose(sample_rate_hz * ratio.numerator / ratio.denominator, new_sample_rate_hz, rtol=1e-9):
+        return None
+    return ratio.numerator, ratio.denominator
+
+
+def _is_evenly_sampled(sensor: SensorData, num_samples: int, first: float, last: float) -> bool:
+    """
+    :return: True if the sensor has a fixed sample rate and no rows are missing from its data
+    """
+    if not sensor.is_sample_rate_fixed() or not sensor.sample_rate_hz() > 0 or num_samples < 2:
+        return False
+    interval = 1e6 / sensor.sample_rate_hz()
+    return abs(last - first - (num_samples - 1) * interval) < interval / 2
+
+
+def _nearest_previous(timestamps: np.ndarray, values: pa.ChunkedArray, grid: np.ndarray) -> pa.Array:
+    """
+    :return: the value of the sample at or before each timestamp of the grid, or of the first sample if there is none
+    """
+    if timestamps.size < 1:
+        return pa.nulls(grid.size, values.type)
+    index = np.clip(np.searchsorted(timestamps, grid, side="right") - 1, 0, timestamps.size - 1)
+    return values.take(pa.array(index))
+
+
+def _polyphase_chunks(
+    sensor: SensorData, num_samples: int, first: float, last: float, up: int, down: int, chunk_s: float
+) -> Iterator[pa.Table]:
+    """
+    resample an evenly sampled sensor with scipy.signal.resample_poly.  Each chunk is read with enough rows on either
+    side to cover the filter, so the result is the same as resampling all the data at once.
+
+    :return: the resampled chunks in order
+    """
+    from scipy import signal
+
+    interval = (last - first) / (num_samples - 1)
+    # rows read on either side of a chunk to cover half the filter, a multiple of down so the phase doesn't change
+    pad = int(np.ceil(10 * max(up, down) / (up * down) + 1)) * down
+    step = max(int(chunk_s * sensor.sample_rate_hz()) // down, 1) * down
+    for start in range(0, num_samples, step):
+        end = min(start + step, num_samples)
+        read_start = max(start - pad, 0)
+        table = sensor.rows(read_start, min(end + pad, num_samples))
+        skip = (start - read_start) * up // down
+        out_index = start * up // down + np.arange(int(np.ceil(end * up / down)) - start * up // down)
+        grid = first + out_index * (interval * down / up)
+        timestamps = table["timestamps"].to_numpy()
+        columns = {"timestamps": grid}
+        for name in table.schema.names:
+            if name == "timestamps" or name in NON_INTERPOLATED_COLUMNS:
+                continue
+            if name in NON_NUMERIC_COLUMNS:
+                columns[name] = _nearest_previous(timestamps, table[name], grid)
+            elif name == "unaltered_timestamps":
+                columns[name] = np.interp(grid, timestamps, table[name].to_numpy())
+            else:
+                resampled = signal.resample_poly(table[name].to_numpy().astype(float), up, down)
+                columns[name] = resampled[skip : skip + grid.size]
+        yield pa.Table.from_pydict(columns)
+
+
+def _interpolated_chunks(
+    sensor: SensorData, first: float, last: float, new_sample_rate_hz: float, chunk_s: float, max_gap_s: Optional[float]
+) -> Iterator[pa.Table]:
+    """
+    linearly interpolate a sensor to evenly sampled timestamps.  New timestamps between two samples more than
+    max_gap_s apart are NaN.
+
+    :return: the resampled chunks in order
+    """
+    if max_gap_s is None:
+        max_gap_s = np.inf if sensor.is_sample_interval_invalid() else sensor.sample_interval_s()
+        max_gap_s *= 1 + DEFAULT_GAP_UPPER_LIMIT
+    max_gap = max_gap_s * 1e6
+    interval = 1e6 / new_sample_rate_hz
+    num_new_samples = int((last - first) // interval) + 1
+    step = max(int(chunk_s * new_sample_rate_hz), 1)
+    # without a largest gap every chunk can interpolate from any sample, so the data is read once and each chunk
+    # takes its samples and the one on either side
+    whole = None if np.isfinite(max_gap) else sensor.pyarrow_table()
+    whole_timestamps = whole["timestamps"].to_numpy() if whole is not None else None
+    for start in range(0, num_new_samples, step):
+        grid = calc_evenly_sampled_timestamps(first + start * interval, min(step, num_new_samples - start), interval)
+        if whole is None:
+            # read the samples around the chunk that can be interpolated from
+            lookaround = min(max_gap, last - first) + 1
+            table = sensor.time_range_table(grid[0] - lookaround, grid[-1] + lookaround)
+        else:
+            read_start = max(int(np.searchsorted(whole_timestamps, grid[0])) - 1, 0)
+            read_end = min(int(np.searchsorted(whole_timestamps, grid[-1], side="right")) + 1, whole.num_rows)
+            table = whole.slice(read_start, read_end - read_start)
+        timestamps = table["timestamps"].to_numpy()
+        columns = {"timestamps": grid}
+        for name in table.schema.names:
+            if name == "timestamps" or name in NON_INTERPOLATED_COLUMNS:
+                continue
+            if name in NON_NUMERIC_COLUMNS:
+                columns[name] = _nearest_previous(timestamps, table[name], grid)
+            else:
+                columns[name] = align_samples(timestamps, table[name].to_numpy().astype(float), grid, max_gap)[0]
+        yield pa.Table.from_pydict(columns)
+
+
+def resample(
+    sensor: SensorData,
+    new_sample_rate_hz: float,
+    base_dir: Optional[str] = None,
+    chunk_s: float = DEFAULT_CHUNK_S,
+    max_gap_s: Optional[float] = None,
+) -> SensorData:
+    """
+    resample the data of a sensor to a new sample rate.  Evenly sampled sensors are resampled with a polyphase FIR
+    filter when the ratio of the sample rates needs up and down factors of at most MAX_POLYPHASE_FACTOR.  NaN values
+    in their data make the new samples the filter computes from them NaN.  Other sensors and other ratios are
+    linearly interpolated, which does not filter frequencies above the new Nyquist frequency.
+    Enumerated channels take the value of the sample at or before each new timestamp.  Image and compressed audio
+    channels are not resampled.
+
+    :param sensor: the sensor to resample
+    :param new_sample_rate_hz: the sample rate of the new sensor
+    :param base_dir: directory to save the data of the new sensor to, one chunk at a time.  Must not be the directory
+                        of the sensor.  If None, the data of the new sensor is kept in memory.  default None
+    :param chunk_s: seconds of data to resample at a time, default DEFAULT_CHUNK_S
+    :param max_gap_s: largest distance in seconds between two samples that are interpolated across; if None, use
+                        1.8 times the sample interval of the sensor.  Not used by the polyphase filter.  default None
+    :return: a new sensor of the same type with the resampled data
+    """
+    if not new_sample_rate_hz > 0:
+        raise ValueError(f"new sample rate ({new_sample_rate_hz}hz) must be greater than 0")
+    if (
+        base_dir is not None
+        and sensor.is_save_to_disk()
+        and os.path.abspath(base_dir) == os.path.abspath(sensor.save_dir())
+    ):
+        raise ValueError(f"can't save the resampled sensor to the directory of the sensor: {base_dir}")
+    result = SensorData(
+        sensor.name,
+        None,
+        sensor.type(),
+        new_sample_rate_hz,
+        1 / new_sample_rate_hz,
+        0.0,
+        True,
+        sensor.is_timestamps_altered(),
+        save_data=base_dir is not None,
+        base_dir=base_dir if base_dir is not None else ".",
+        gaps=list(sensor.gaps()),
+    )
+    result.set_write_profile(sensor.fs_writer().write_profile)
+    num_samples = sensor.num_samples()
+    if num_samples < 1:
+        return result
+    first = sensor.rows(0, 1)["timestamps"][0].as_py()
+    last = sensor.rows(num_samples - 1, num_samples)["timestamps"][0].as_py()
+    factors = polyphase_factors(sensor.sample_rate_hz(), new_sample_rate_hz)
+    if factors is not None and _is_evenly_sampled(sensor, num_samples, first, last):
+        chunks = _polyphase_chunks(sensor, num_samples, first, last, factors[0], factors[1], chunk_s)
+    else:
+        chunks = _interpolated_chunks(sensor, first, last, new_sample_rate_hz, chunk_s, max_gap_s)
+    if base_dir is None:
+        result.write_pyarrow_table(pa.concat_tables(list(chunks)))
+    else:
+        result.set_file_name(f"{sensor.type().name}_{int(first)}")
+        result.fs_writer().create_dir()
+        write_parquet_tables(chunks, result.full_path(), result.fs_writer().write_profile)
+    return result
@@ -3,23 +3,30 @@ Defines generic sensor data and data for API-independent analysis
 all timestamps are integers in microseconds unless otherwise stated
 """
 import enum
-from typing import List, Dict, Optional, Tuple
+from typing import Iterator, List, Dict, Optional, Tuple, TYPE_CHECKING
 from pathlib import Path
 import os
+from collections import deque
 
 import numpy as np
-import pandas as pd
 import pyarrow as pa
 import pyarrow.compute as pc
-import pyarrow.dataset as ds
 import pyarrow.parquet as pq
 
 import redvox.common.sensor_io as io
 import redvox.common.date_time_utils as dtu
-from redvox.common.io import FileSystemSaveMode, FileSystemWriter as Fsw, get_json_file, json_file_to_dict
+from redvox.common.io import (
+    FileSystemSaveMode,
+    FileSystemWriter as Fsw,
+    ParquetWriteProfile,
+    get_json_file,
+    json_file_to_dict,
+    write_parquet,
+)
 from redvox.common import offset_model as om
+from redvox.common import tracing
 from redvox.common.errors import RedVoxExceptions
-from redvox.common.gap_and_pad_utils import calc_evenly_sampled_timestamps, AudioWithGaps
+from redvox.common.gap_and_pad_utils import calc_evenly_sampled_timestamps, AudioWithGaps, TimingSegments
 from redvox.api1000.wrapped_redvox_packet.station_information import (
     NetworkType,
     PowerState,
@@ -31,6 +38,11 @@ from redvox.api1000.wrapped_redvox_packet.sensors.location import LocationProvid
 from redvox.api1000.wrapped_redvox_packet.sensors.image import ImageCodec
 from redvox.api1000.wrapped_redvox_packet.sensors.audio import AudioCodec
 
+# pandas and pyarrow.dataset are slow to import and only used by a few methods, which import them when called
+if TYPE_CHECKING:
+    import pandas as pd
+    import pyarrow.dataset as ds
+
 # function used to translate values of enumerated columns
 COLUMN_TO_ENUM_FN = {
     "location_provider": lambda l: LocationProvider(l).name,
@@ -42,6 +54,114 @@ COLUMN_TO_ENUM_FN = {
     "wifi_wake_lock": lambda l: WifiWakeLock(l).name,
     "screen_state": lambda l: ScreenState(l).name,
 }
+# enumeration of the values of enumerated columns
+COLUMN_TO_ENUM = {
+    "location_provider": LocationProvider,
+    "image_codec": ImageCodec,
+    "audio_codec": AudioCodec,
+    "network_type": NetworkType,
+    "power_state": PowerState,
+    "cell_service": CellServiceState,
+    "wifi_wake_lock": WifiWakeLock,
+    "screen_state": ScreenState,
+}
+
+
+def _enum_name_table(enum_type: enum.EnumMeta) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    :param enum_type: enumeration with non-negative integer values
+    :return: the names of the enumeration indexed by value and a mask of the values that are in the enumeration
+    """
+    value_to_name = {e.value: e.name for e in enum_type}
+    names = np.array([value_to_name.get(v, "") for v in range(max(value_to_name) + 1)])
+    return names, names != ""
+
+
+# names and valid values of enumerated columns indexed by value, used to decode whole columns at once
+_COLUMN_TO_ENUM_TABLE = {col: _enum_name_table(enum_type) for col, enum_type in COLUMN_TO_ENUM.items()}
+
+
+def decode_enum_column(channel_name: str, values: np.ndarray) -> np.ndarray:
+    """
+    translate the integer values of an enumerated column into the names of the enumeration.
+    raises a ValueError if any value is not in the enumeration
+
+    :param channel_name: name of the enumerated column
+    :param values: integer values of the column
+    :return: names of the values as a numpy array of strings
+    """
+    names, valid = _COLUMN_TO_ENUM_TABLE[channel_name]
+    codes = np.asarray(values)
+    if codes.size < 1:
+        return np.array([], dtype=names.dtype)
+    if codes.dtype.kind not in "iu":
+        if not np.all(np.isfinite(codes)) or not np.all(np.mod(codes, 1) == 0):
+            raise ValueError(f"{channel_name} has values that are not in {COLUMN_TO_ENUM[channel_name].__name__}")
+        codes = codes.astype(np.int64)
+    if codes.min() < 0 or codes.max() >= len(names) or not np.all(valid[codes]):
+        raise ValueError(f"{channel_name} has values that are not in {COLUMN_TO_ENUM[channel_name].__name__}")
+    return names[codes]
+
+
+def _table_to_samples(table: pa.Table, columns: List[str], upcast: bool = False) -> np.ndarray:
+    """
+    copies the columns of a table into a (columns x rows) numpy array without going through pandas.  every chunk of
+    a column is read without copying where arrow allows it, then copied once into its row of the result.
+
+    :param table: table to read
+    :param columns: names of the numeric columns to read
+    :param upcast: if True, the result is at least float64, with nans for nulls.  Default False
+    :return: the columns as rows of a numpy array with the common type of the columns
+    """
+    # like pandas, integer columns with nulls become floats with nans
+    dtype = np.result_type(
+        np.float64 if len(columns) < 1 or upcast else np.bool_,
+        *[np.float64 if table[c].null_count > 0 else table.schema.field(c).type.to_pandas_dtype() for c in columns],
+    )
+    result = np.empty((len(columns), table.num_rows), dtype=dtype)
+    for row, column in enumerate(columns):
+        start = 0
+        for chunk in table[column].chunks:
+            result[row, start : start + len(chunk)] = chunk.to_numpy(zero_copy_only=False)
+            start += len(chunk)
+    return result
+
+
+# columns that can be stored as TimingSegments instead of values
+TIMESTAMP_COLUMNS = ["timestamps", "unaltered_timestamps"]
+
+
+def _iter_row_group_tables(parquet: pq.ParquetFile, num_rows: int) -> Iterator[pa.Table]:
+    """
+    :param parquet: the file to read
+    :param num_rows: the most rows of each table
+    :return: the rows of the file in order, num_rows at a time.  Each row group is read once and copied into tables
+                that don't share its memory, so rows are freed as soon as the tables that hold them are
+    """
+    for group in range(parquet.num_row_groups):
+        table = parquet.read_row_group(group)
+        tables = deque(
+            pa.Table.from_arrays(
+                [pa.concat_arrays(c.chunks) for c in table.slice(i, num_rows).columns], schema=table.schema
+            )
+            for i in range(0, table.num_rows, num_rows)
+        )
+        del table
+        while tables:
+            yield tables.popleft()
+
+
+def _add_timing_columns(table: pa.Table, timing: Tuple[TimingSegments, TimingSegments]) -> pa.Table:
+    """
+    :param table: table without timestamp columns
+    :param timing: TimingSegments of the timestamps and unaltered timestamps of the table
+    :return: the table with the timestamps and unaltered timestamps as its first two columns
+    """
+    for column, segments in reversed(list(zip(TIMESTAMP_COLUMNS, timing))):
+        table = table.add_column(0, column, pa.array(segments.timestamps()))
+    return table
+
+
 # columns that cannot be interpolated
 NON_INTERPOLATED_COLUMNS = ["compressed_audio", "image"]
 # columns that are not numeric but can be interpolated
@@ -126,6 +246,139 @@ class SensorType(enum.Enum):
             return SensorType.UNKNOWN_SENSOR
 
 
+class StoragePrecision(enum.Enum):
+    """
+    Enumeration of the ways to store the sample columns of a sensor
+    """
+
+    FLOAT64 = 0  # 8 byte floats, nan for missing values
+    FLOAT32 = 1  # 4 byte floats, null for missing values
+    NATIVE = 2  # 2 or 4 byte integers if all values are integers that fit, otherwise 4 byte floats; null for missing
+
+
+class TimestampFormat(enum.Enum):
+    """
+    Enumeration of the ways to store the timestamp columns of a sensor
+    """
+
+    FLOAT64_MICROS = 0  # 8 byte floats of microseconds since epoch, nan for missing values
+    INT64_NANOS = 1  # 8 byte integers of nanoseconds since epoch, delta encoded on disk; null for missing values
+
+
+# sensors whose values need double precision, such as coordinates, are always stored as FLOAT64
+FULL_PRECISION_SENSORS = [SensorType.LOCATION, SensorType.BEST_LOCATION, SensorType.STATION_HEALTH]
+# types of the compact columns, which are read as float64
+_COMPACT_TYPES = [pa.float32(), pa.int16(), pa.int32()]
+
+
+def _compact_column(column: pa.ChunkedArray, precision: StoragePrecision) -> pa.Array:
+    """
+    :param column: float64 column to compact
+    :param precision: FLOAT32 or NATIVE
+    :return: the column in the smallest type allowed by the precision, with nans as nulls
+    """
+    values = column.to_numpy()
+    missing = np.isnan(values)
+    valid = values[~missing]
+    dtype = np.float32
+    if precision == StoragePrecision.NATIVE and np.all(np.mod(valid, 1) == 0):
+        for int_type in (np.int16, np.int32):
+            if valid.size < 1 or (valid.min() >= np.iinfo(int_type).min and valid.max() <= np.iinfo(int_type).max):
+                dtype = int_type
+                break
+    return pa.array(np.where(missing, 0, values).astype(dtype), mask=missing if missing.any() else None)
+
+
+def _compact_table(table: pa.Table, precision: StoragePrecision) -> pa.Table:
+    """
+    :param table: table to compact
+    :param precision: FLOAT32 or NATIVE
+    :return: the table with its float64 sample columns compacted; timestamps and enumerated columns are unchanged
+    """
+    for i, field in enumerate(table.schema):
+        if pa.types.is_float64(field.type) and field.name not in TIMESTAMP_COLUMNS + NON_NUMERIC_COLUMNS:
+            table = table.set_column(i, field.name, _compact_column(table[field.name], precision))
+    return table
+
+
+def _float_micros_to_nanos(values: np.ndarray) -> np.ndarray:
+    """
+    :param values: float64 microseconds since epoch without nans
+    :return: the values as int64 nanoseconds since epoch.  The whole microseconds are converted separately from the
+                fraction, so float64 microseconds since epoch convert exactly
+    """
+    whole = np.floor(values)
+    return whole.astype(np.int64) * 1000 + np.round((values - whole) * 1000).astype(np.int64)
+
+
+def _nanos_to_float_micros(values: np.ndarray) -> np.ndarray:
+    """
+    :param values: int64 nanoseconds since epoch
+    :return: the values as float64 microseconds since epoch, rounded once to the nearest float
+    """
+    return (values // 1000).astype(np.float64) + (values % 1000) / 1000.0
+
+
+def _integer_timestamps(table: pa.Table, nanos: bool = False) -> pa.Table:
+    """
+    :param table: table to convert
+    :param nanos: if True, the int64 timestamp columns of the table are nanoseconds, otherwise microseconds.
+                    default False
+    :return: the table with its timestamp columns as int64 nanoseconds, with nans as nulls
+    """
+    for i, field in enumerate(table.schema):
+        if field.name in TIMESTAMP_COLUMNS and pa.types.is_int64(field.type) and not nanos:
+            table = table.set_column(i, field.name, pc.multiply(table[field.name], 1000))
+        elif field.name in TIMESTAMP_COLUMNS and pa.types.is_floating(field.type):
+            values = table[field.name].to_numpy()
+            missing = np.isnan(values)
+            nanos = _float_micros_to_nanos(np.where(missing, 0, values))
+            table = table.set_column(i, field.name, pa.array(nanos, mask=missing if missing.any() else None))
+    return table
+
+
+def _expand_column(column: pa.ChunkedArray) -> pa.ChunkedArray:
+    """
+    :param column: column to expand
+    :return: compact columns as float64 with nans for nulls, other columns unchanged
+    """
+    if column.type in _COMPACT_TYPES:
+        return pc.fill_null(column.cast(pa.float64()), np.nan)
+    return column
+
+
+def _float_timestamps(values: pa.ChunkedArray, nanos: bool = False) -> np.ndarray:
+    """
+    :param values: a stored timestamp column
+    :param nanos: if True, int64 values are nanoseconds, otherwise microseconds.  default False
+    :return: the values of the column as float64 microseconds with nan for missing values
+    """
+    if pa.types.is_int64(values.type) and not nanos:
+        return pc.fill_null(values.cast(pa.float64()), np.nan).to_numpy()
+    if pa.types.is_int64(values.type):
+        result = _nanos_to_float_micros(pc.fill_null(values, 0).to_numpy())
+        if values.null_count > 0:
+            result[values.is_null().to_numpy()] = np.nan
+        return result
+    return values.to_numpy()
+
+
+def _expand_table(table: pa.Table, nanos: bool = False) -> pa.Table:
+    """
+    :param table: table to expand
+    :param nanos: if True, the int64 timestamp columns of the table are nanoseconds, otherwise microseconds.
+                    default False
+    :return: the table with its compact columns as float64 and its integer timestamp columns as float64
+                microseconds, with nans for nulls
+    """
+    for i, field in enumerate(table.schema):
+        if field.type in _COMPACT_TYPES:
+            table = table.set_column(i, field.name, _expand_column(table[field.name]))
+        elif field.name in TIMESTAMP_COLUMNS and pa.types.is_int64(field.type):
+            table = table.set_column(i, field.name, pa.array(_float_timestamps(table[field.name], nanos)))
+    return table
+
+
 class SensorData:
     """
     Generic Redvox Sensor class for API-independent analysis
@@ -157,6 +410,10 @@ class SensorData:
         _fs_writer: FileSystemWriter, handles file system i/o parameters
 
         _data: pyarrow Table, used to store the data when it's not written to the disk.  default None
+
+        _precision: StoragePrecision, how the sample columns are stored, default FLOAT64
+
+        _timestamp_format: TimestampFormat, how the timestamp columns are stored, default FLOAT64_MICROS
     """
 
     def __init__(
@@ -222,6 +479,14 @@ class SensorData:
             save_mode = FileSystemSaveMode.MEM
         self._fs_writer = Fsw("", "parquet", base_dir, save_mode)
         self._gaps: List[Tuple] = gaps if gaps else []
+        # read-only samples() and the channels in it, cleared whenever the data changes
+        self._samples: Optional[np.ndarray] = None
+        self._samples_channels: Dict[str, Tuple[int, np.dtype]] = {}
+        # if True, evenly sampled timestamps are stored as TimingSegments in _timing instead of in the table
+        self._implicit_timing: bool = False
+        self._timing: Optional[Tuple[TimingSegments, TimingSegments]] = None
+        self._precision: StoragePrecision = StoragePrecision.FLOAT64
+        self._timestamp_format: TimestampFormat = TimestampFormat.FLOAT64_MICROS
         set_data_as_sensor_data = True
         if sensor_data is not None:
             if "timestamps" not in sensor_data.schema.names:
@@ -239,6 +504,13 @@ class SensorData:
         if show_errors:
             self.print_errors()
 
+    def __getstate__(self):
+        # the cached samples can be rebuilt from the data
+        state = self.__dict__.copy()
+        state["_samples"] = None
+        state["_samples_channels"] = {}
+        return state
+
     def __repr__(self):
         return (
             f"name: {self.name}, "
@@ -280,6 +552,9 @@ class SensorData:
         use_offset_model_for_correction: bool = False,
         save_data: bool = False,
         use_temp_dir: bool = False,
+        timing: Optional[Tuple[TimingSegments, TimingSegments]] = None,
+        storage_precision: StoragePrecision = StoragePrecision.FLOAT64,
+        timestamp_format: TimestampFormat = TimestampFormat.FLOAT64_MICROS,
     ) -> "SensorData":
         """
         init but with a path to directory containing parquet file(s) instead of a table of data
@@ -299,11 +574,20 @@ class SensorData:
                                                 use the best known offset.  default False
         :param save_data: if True, save the data of the sensor to disk, otherwise use a temporary dir.  default False
         :param use_temp_dir: if True, save the data using a temporary directory.  default False
+        :param timing: optional TimingSegments of the timestamps and unaltered timestamps if the parquet files don't
+                        contain them.  default None
+        :param storage_precision: how the sample columns of the parquet files are stored.  default FLOAT64
+        :param timestamp_format: how the timestamp columns of the parquet files are stored.  default FLOAT64_MICROS
         :return: SensorData object
         """
+        import pyarrow.dataset as ds
+
+        table = ds.dataset(data_path, format="parquet", exclude_invalid_files=True).to_table()
+        if timing is not None:
+            table = _add_timing_columns(table, timing)
         result = SensorData(
             sensor_name,
-            ds.dataset(data_path, format="parquet", exclude_invalid_files=True).to_table(),
+            table,
             sensor_type,
             sample_rate_hz,
             sample_interval_s,
@@ -316,6 +600,13 @@ class SensorData:
             data_path,
             use_temp_dir=use_temp_dir,
         )
+        if timing is not None:
+            # keep the runs of the saved timing
+            result._implicit_timing = True
+            result._data, result._timing = result._split_timing(result._stored_table(), timing)
+        # the parquet files are already stored with the precision and timestamp format
+        result._precision = storage_precision
+        result._timestamp_format = timestamp_format
         return result
 
     @staticmethod
@@ -407,6 +698,12 @@ class SensorData:
         """
         self._fs_writer.set_save_mode(new_save_mode)
 
+    def set_write_profile(self, profile: ParquetWriteProfile):
+        """
+        :param profile: settings used to write the parquet files of the sensor
+        """
+        self._fs_writer.write_profile = profile
+
     def is_save_to_disk(self) -> bool:
         """
         :return: True if sensor will be saved to disk
@@ -447,6 +744,7 @@ class SensorData:
         :param new_dir: the directory to change to; default "." (use current directory)
         """
         self._fs_writer.base_dir = new_dir
+        self._clear_samples()
 
     def save_dir(self) -> str:
         """
@@ -472,29 +770,285 @@ class SensorData:
         """
         self._fs_writer.set_use_temp(use_temp_dir)
 
-    def pyarrow_ds(self, base_dir: Optional[str] = None) -> ds.Dataset:
+    def pyarrow_ds(self, base_dir: Optional[str] = None) -> "ds.Dataset":
         """
         :param base_dir: optional directory to use when loading the dataset.  if None, use self.save_dir()
         :return: the dataset stored in base_dir
         """
+        import pyarrow.dataset as ds
+
         if base_dir is None:
             base_dir = self.save_dir()
         return ds.dataset(base_dir, format="parquet", exclude_invalid_files=True)
 
-    def pyarrow_table(self) -> pa.Table:
+    def _stored_table(self) -> pa.Table:
         """
-        :return: the table defined by the _data property or the dataset stored in self.save_dir()
+        :return: the table as stored, without the timestamp columns if the timing is implicit
         """
         if self._data or self._fs_writer.is_use_mem():
             return self._data
+        if not os.path.exists(self.save_dir()):
+            # nothing has been written yet
+            return self._data
         return self.pyarrow_ds().to_table()
 
-    def data_df(self) -> pd.DataFrame:
+    def _stored_column(self, column: str) -> Optional[pa.ChunkedArray]:
+        """
+        :param column: name of a stored column
+        :return: the column as stored, read without the other columns if the data is on disk, or None if the column
+                    isn't stored
+        """
+        if self._data or self._fs_writer.is_use_mem():
+            return self._data[column] if self._data is not None and column in self._data.schema.names else None
+        if not os.path.exists(self.save_dir()):
+            return None
+        dataset = self.pyarrow_ds()
+        if column not in dataset.schema.names:
+            return None
+        return dataset.to_table(columns=[column])[column]
+
+    def _is_expanded(self) -> bool:
+        """
+        :return: True if the stored table has to be expanded to float64 columns when it is read
+        """
+        return (
+            self._precision != StoragePrecision.FLOAT64 or self._timestamp_format != TimestampFormat.FLOAT64_MICROS
+        )
+
+    def _is_nanos(self) -> bool:
+        """
+        :return: True if the stored int64 timestamp columns are nanoseconds
+        """
+        return self._timestamp_format == TimestampFormat.INT64_NANOS
+
+    def pyarrow_table(self) -> pa.Table:
+        """
+        :return: the table defined by the _data property or the dataset stored in self.save_dir()
+        """
+        table = self._stored_table()
+        if self._is_expanded() and table:
+            table = _expand_table(table, self._is_nanos())
+        if self._timing is None:
+            return table
+        return _add_timing_columns(table, self._timing)
+
+    def _stored_rows(self, first: int, last: int) -> pa.Table:
+        """
+        :param first: index of the first row to get
+        :param last: index after the last row to get
+        :return: the rows of the stored table; only the row groups that contain the rows are read from disk
+        """
+        if self._data or self._fs_writer.is_use_mem():
+            return self._data.slice(first, last - first)
+        parquet = pq.ParquetFile(self.full_path())
+        sizes = np.array([parquet.metadata.row_group(i).num_rows for i in range(parquet.num_row_groups)])
+        group_starts = np.cumsum(sizes) - sizes
+        groups = np.flatnonzero((group_starts < last) & (group_starts + sizes > first)).tolist()
+        if len(groups) < 1:
+            return parquet.schema_arrow.empty_table()
+        return parquet.read_row_groups(groups).slice(int(first - group_starts[groups[0]]), last - first)
+
+    def rows(self, first: int, last: int) -> pa.Table:
+        """
+        gets the rows at indices from first up to but not including last.  When the data is on disk, only the row
+        groups that contain the rows are read.
+
+        :param first: index of the first row to get
+        :param last: index after the last row to get
+        :return: the rows as a table with the same columns as pyarrow_table()
+        """
+        num_samples = self.num_samples()
+        if num_samples < 1:
+            return self.pyarrow_table()
+        first = min(max(first, 0), num_samples)
+        last = min(max(first, last), num_samples)
+        table = self._stored_rows(first, last)
+        if self._is_expanded():
+            table = _expand_table(table, self._is_nanos())
+        if self._timing is None:
+            return table
+        return _add_timing_columns(table, (self._timing[0].slice(first, last), self._timing[1].slice(first, last)))
+
+    def iter_tables(self, num_rows: int) -> Iterator[pa.Table]:
+        """
+        iterates over the rows in order, num_rows at a time.  When the data is on disk, it is read one row group at
+        a time, so every row is read once and the memory used is at most about one row group.
+
+        :param num_rows: the most rows of each table
+        :return: the tables of rows with the same columns as pyarrow_table()
+        """
+        if self.num_samples() < 1:
+            return
+        if self._data or self._fs_writer.is_use_mem():
+            stored = (self._data.slice(i, num_rows) for i in range(0, self._data.num_rows, num_rows))
+        else:
+            stored = _iter_row_group_tables(pq.ParquetFile(self.full_path()), num_rows)
+        first = 0
+        for table in stored:
+            last = first + table.num_rows
+            if self._is_expanded():
+                table = _expand_table(table, self._is_nanos())
+            if self._timing is not None:
+                table = _add_timing_columns(
+                    table, (self._timing[0].slice(first, last), self._timing[1].slice(first, last))
+                )
+            first = last
+            yield table
+
+    def time_range_table(self, start_timestamp: float, end_timestamp: float) -> pa.Table:
+        """
+        gets the rows with timestamps from start_timestamp up to but not including end_timestamp.  When the data is
+        on disk, only the row groups that can contain the rows are read.
+
+        :param start_timestamp: first timestamp to include, in microseconds since epoch UTC
+        :param end_timestamp: timestamp after the last timestamp to include, in microseconds since epoch UTC
+        :return: the rows as a table with the same columns as pyarrow_table()
+        """
+        import pyarrow.dataset as ds
+
+        timing = None
+        if self._timing is not None:
+            first = self._timing[0].search(start_timestamp)
+            last = max(first, self._timing[0].search(end_timestamp))
+            table = self._stored_rows(first, last)
+            timing = (self._timing[0].slice(first, last), self._timing[1].slice(first, last))
+        elif self._data or self._fs_writer.is_use_mem():
+            if not self._data:
+                return self._data
+            bounds = np.array([start_timestamp, end_timestamp])
+            if self._is_nanos():
+                # integer timestamps are compared as integers
+                bounds = _float_micros_to_nanos(bounds)
+            first, last = np.searchsorted(self._data["timestamps"].to_numpy(), bounds)
+            table = self._data.slice(int(first), int(last - first))
+        else:
+            if self._is_nanos():
+                start_timestamp, end_timestamp = (
+                    int(t) for t in _float_micros_to_nanos(np.array([start_timestamp, end_timestamp]))
+                )
+            # row groups are skipped using the statistics of the timestamps
+            table = self.pyarrow_ds().to_table(
+                filter=(ds.field("timestamps") >= start_timestamp) & (ds.field("timestamps") < end_timestamp)
+            )
+        if self._is_expanded():
+            table = _expand_table(table, self._is_nanos())
+        if timing is None:
+            return table
+        return _add_timing_columns(table, timing)
+
+    def set_implicit_timing(self, implicit_timing: bool):
+        """
+        if True, store evenly sampled timestamps and unaltered timestamps as TimingSegments instead of columns of the
+        data, which are created when pyarrow_table() or data_timestamps() are called.  Only sensors with a fixed sample
+        rate and exactly evenly sampled timestamps, such as audio, are stored this way; the timestamps of other
+        sensors stay in the data.
+
+        :param implicit_timing: if True, store timestamps as TimingSegments when possible
+        """
+        if implicit_timing != self._implicit_timing:
+            table = self.pyarrow_table()
+            self._implicit_timing = implicit_timing
+            if table:
+                self.write_pyarrow_table(table, False)
+
+    def is_timing_implicit(self) -> bool:
+        """
+        :return: True if the timestamps are stored as TimingSegments
+        """
+        return self._timing is not None
+
+    def timing_segments(self) -> Optional[TimingSegments]:
+        """
+        :return: the TimingSegments of the timestamps or None if the timestamps are stored in the data
+        """
+        return None if self._timing is None else self._timing[0]
+
+    def set_storage_precision(self, precision: StoragePrecision):
+        """
+        sets how the sample columns are stored.  FLOAT32 and NATIVE use less memory and disk space than FLOAT64 and
+        store missing values as nulls instead of nan.  pyarrow_table(), samples() and get_data_channel() always return
+        float64 values with nan for missing values.  Sensors in FULL_PRECISION_SENSORS are always stored as FLOAT64.
+
+        :param precision: the StoragePrecision to use
+        """
+        if self._type in FULL_PRECISION_SENSORS:
+            precision = StoragePrecision.FLOAT64
+        if precision != self._precision:
+            table = self.pyarrow_table()
+            self._precision = precision
+            if table:
+                self.write_pyarrow_table(table, False)
+
+    def storage_precision(self) -> StoragePrecision:
+        """
+        :return: how the sample columns are stored
+        """
+        return self._precision
+
+    def set_timestamp_format(self, timestamp_format: TimestampFormat):
+        """
+        sets how the timestamp columns are stored.  INT64_NANOS stores the timestamps as integer nanoseconds, which
+        hold every float64 microsecond timestamp exactly and take a fraction of the disk space of FLOAT64_MICROS.
+        Timestamps stored as INT64_NANOS are corrected in integer nanoseconds by update_data_timestamps().
+        pyarrow_table() and data_timestamps() always return float64 microseconds with nan for missing values.
+        Timestamps stored as TimingSegments by implicit timing are not affected.
+
+        :param timestamp_format: the TimestampFormat to use
+        """
+        if timestamp_format != self._timestamp_format:
+            table = self.pyarrow_table()
+            self._timestamp_format = timestamp_format
+            if table:
+                self.write_pyarrow_table(table, False)
+
+    def timestamp_format(self) -> TimestampFormat:
+        """
+        :return: how the timestamp columns are stored
+        """
+        return self._timestamp_format
+
+    def _split_timing(
+        self, table: pa.Table, reference: Optional[Tuple[TimingSegments, TimingSegments]] = None, nanos: bool = False
+    ) -> Tuple[pa.Table, Optional[Tuple[TimingSegments, TimingSegments]]]:
+        """
+        :param table: table to split
+        :param reference: optional TimingSegments the timestamps of the table were taken from, default None
+        :param nanos: if True, the int64 timestamp columns of the table are nanoseconds.  default False
+        :return: the table without timestamp columns and their TimingSegments, or the table and None if the
+                    timestamps can't be stored as TimingSegments
+        """
+        if (
+            not self._is_sample_rate_fixed
+            or table.num_rows < 2
+            or table.num_columns <= len(TIMESTAMP_COLUMNS)
+            or table.schema.names[: len(TIMESTAMP_COLUMNS)] != TIMESTAMP_COLUMNS
+        ):
+            return table, None
+        timing = []
+        for i, column in enumerate(TIMESTAMP_COLUMNS):
+            values = _float_timestamps(table[column], nanos)
+            segments = None
+            intervals = [dtu.seconds_to_microseconds(self._sample_interval_s)]
+            if reference is not None:
+                intervals.insert(0, reference[i].sample_interval_micros)
+            for interval in intervals:
+                segments = TimingSegments.from_timestamps(
+                    values, interval, None if reference is None else reference[i]
+                )
+                if segments is not None:
+                    break
+            if segments is None:
+                return table, None
+            timing.append(segments)
+        return table.remove_column(0).remove_column(0), (timing[0], timing[1])
+
+    def data_df(self) -> "pd.DataFrame":
         """
         :return: the pandas dataframe defined by the dataset stored in self.save_dir()
         """
         return self.pyarrow_table().to_pandas()
 
+    @tracing.traced()
     def write_pyarrow_table(self, table: pa.Table, update_file_name: Optional[bool] = True):
         """
         saves the pyarrow table to disk or to memory.
@@ -507,13 +1061,36 @@ class SensorData:
         :param table: the table to write
         :param update_file_name: if True, updates the file name to match the new data.  Default True
         """
+        self._write_table(table, update_file_name)
+
+    def _write_table(self, table: pa.Table, update_file_name: bool = True, nanos: bool = False):
+        """
+        saves the table to disk or to memory; see write_pyarrow_table()
+
+        :param table: the table to write
+        :param update_file_name: if True, updates the file name to match the new data.  Default True
+        :param nanos: if True, the int64 timestamp columns of the table are nanoseconds, otherwise microseconds.
+                        default False
+        """
+        tracing.annotate(sensor=self.type().name, rows=table.num_rows)
+        self._clear_samples()
         if table.num_rows < 1 or "timestamps" not in table.schema.names:
             self._errors.append("Attempted to write invalid table.")
-        elif self._fs_writer.is_save_disk():
+            return
+        if update_file_name and self._fs_writer.is_save_disk():
+            first_timestamp = _float_timestamps(table["timestamps"].slice(0, 1), nanos)[0]
+            self.set_file_name(f"{self.type().name}_{int(first_timestamp)}")
+        if self._implicit_timing:
+            table, self._timing = self._split_timing(table, self._timing, nanos)
+        else:
+            self._timing = None
+        if self._precision != StoragePrecision.FLOAT64:
+            table = _compact_table(table, self._precision)
+        if self._timestamp_format == TimestampFormat.INT64_NANOS:
+            table = _integer_timestamps(table, nanos)
+        if self._fs_writer.is_save_disk():
             self._fs_writer.create_dir()
-            if update_file_name:
-                self.set_file_name(f"{self.type().name}_{int(table['timestamps'][0].as_py())}")
-            pq.write_table(table, self.full_path())
+            write_parquet(table, self.full_path(), self._fs_writer.write_profile)
             self._data = None
         else:
             self._data = table
@@ -523,8 +1100,10 @@ class SensorData:
         CAUTION: REMOVES ALL DATA AND COLUMNS FROM THE TABLE
         """
         tbl = pa.Table.from_pydict({"timestamps": []})
+        self._clear_samples()
+        self._timing = None
         if self._fs_writer.is_save_disk():
-            pq.write_table(tbl, self.full_path())
+            write_parquet(tbl, self.full_path(), self._fs_writer.write_profile)
             self._data = None
         else:
             self._data = tbl
@@ -616,8 +1195,12 @@ class SensorData:
             order = "ascending"
         else:
             order = "descending"
-        data = pc.take(ptable, pc.sort_indices(ptable, sort_keys=[("timestamps", order)]))
-        self.write_pyarrow_table(data)
+        # tables read from disk are usually in order already, so don't copy them
+        timestamps = _float_timestamps(ptable["timestamps"])
+        steps = np.diff(timestamps) if ascending else -np.diff(timestamps)
+        if np.isnan(timestamps).any() or (steps < 0).any():
+            ptable = pc.take(ptable, pc.sort_indices(ptable, sort_keys=[("timestamps", order)]))
+        self.write_pyarrow_table(ptable)
 
     def organize_and_update_stats(self, ptable: pa.Table) -> "SensorData":
         """
@@ -690,47 +1273,105 @@ class SensorData:
         """
         :return: the timestamps as a numpy array or [np.nan] if none exist
         """
-        if "timestamps" in self.pyarrow_table().schema.names:
-            return self.pyarrow_table()["timestamps"].to_numpy()
-        else:
-            return np.array([np.nan])
+        if self._timing is not None:
+            return self._timing[0].timestamps()
+        values = self._timestamp_values("timestamps")
+        return np.array([np.nan]) if values is None else values
 
     def unaltered_data_timestamps(self) -> np.array:
         """
         :return: the unaltered timestamps as a numpy array
         """
-        if "unaltered_timestamps" in self.pyarrow_table().schema.names:
-            return self.pyarrow_table()["unaltered_timestamps"].to_numpy()
-        else:
-            return np.array([np.nan])
+        if self._timing is not None:
+            return self._timing[1].timestamps()
+        values = self._timestamp_values("unaltered_timestamps")
+        return np.array([np.nan]) if values is None else values
+
+    def _timestamp_values(self, column: str) -> Optional[np.ndarray]:
+        """
+        :param column: name of a stored timestamp column
+        :return: the values of the column as float64 with nan for missing values, or None if the column isn't stored
+        """
+        values = self._stored_column(column)
+        return None if values is None else _float_timestamps(values, self._is_nanos())
 
     def first_data_timestamp(self) -> float:
         """
         :return: timestamp of the first data point or np.nan if no timestamps
         """
+        if self._timing is not None:
+            return self._timing[0].first_timestamp()
         return self.data_timestamps()[0]
 
     def last_data_timestamp(self) -> float:
         """
         :return: timestamp of the last data point or np.nan if no timestamps
         """
+        if self._timing is not None:
+            return self._timing[0].last_timestamp()
         return self.data_timestamps()[-1]
 
     def num_samples(self) -> int:
         """
         :return: the number of rows (samples) in the dataframe
         """
-        if self.pyarrow_table():
-            return self.pyarrow_table().num_rows
+        if self._timing is not None:
+            return self._timing[0].num_samples()
+        if not self._data and self._fs_writer.is_save_disk() and os.path.exists(self.full_path()):
+            # the number of rows is in the metadata of the file, so the data doesn't have to be read
+            return pq.ParquetFile(self.full_path()).metadata.num_rows
+        if self._stored_table():
+            return self._stored_table().num_rows
         return 0
 
     def samples(self) -> np.ndarray:
         """
-        gets the non-timestamp samples of dataframe
+        gets the non-timestamp samples of the data.  The result is read-only; copy it before changing it.  When the
+        data is kept in memory, the result is cached until the data changes.  Data on disk is read again on every
+        call, so the sensor doesn't hold a copy of it.
+
+        :return: the data values as a read-only (channels x samples) numpy ndarray
+        """
+        if self._samples is None:
+            # implicit timestamps are not needed for the samples
+            _arrow = self._stored_table()
+            if not _arrow:
+                return np.empty((0, 0))
+            columns = _arrow.schema.names[0 if self._timing is not None else 2 :]
+            samples_channels: Dict[str, Tuple[int, np.dtype]] = {}
+            if all(
+                pa.types.is_integer(t) or pa.types.is_floating(t) or pa.types.is_boolean(t)
+                for t in [_arrow.schema.field(c).type for c in columns]
+            ):
+                # compact columns are read as float64
+                upcast = self._precision != StoragePrecision.FLOAT64
+                samples = _table_to_samples(_arrow, columns, upcast)
+                samples_channels = {
+                    c: (
+                        i,
+                        samples.dtype
+                        if _arrow[c].null_count > 0 or (upcast and _arrow.schema.field(c).type in _COMPACT_TYPES)
+                        else _arrow.schema.field(c).type.to_pandas_dtype(),
+                    )
+                    for i, c in enumerate(columns)
+                    if c not in NON_NUMERIC_COLUMNS
+                }
+            else:
+                # binary and text columns are converted by pandas
+                samples = _arrow.select(columns).to_pandas().T.to_numpy()
+            samples.setflags(write=False)
+            if not self._fs_writer.is_use_mem():
+                return samples
+            self._samples = samples
+            self._samples_channels = samples_channels
+        return self._samples
 
-        :return: the data values of the dataframe as a numpy ndarray
+    def _clear_samples(self):
+        """
+        removes the cached samples; call whenever the data changes
         """
-        return self.data_df().iloc[:, 2:].T.to_numpy()
+        self._samples = None
+        self._samples_channels = {}
 
     def data_channels(self) -> List[str]:
         """
@@ -747,16 +1388,27 @@ class SensorData:
         :param channel_name: the name of the channel to get data for
         :return: the data values of the channel as a numpy array or list of strings for enumerated channels
         """
-        if not self.pyarrow_table():
-            self._errors.append(f"WARNING: There are no channels to access in this Sensor!")
-            return []
-        _arrow = self.pyarrow_table()
-        if channel_name not in _arrow.schema.names:
-            self._errors.append(f"WARNING: {channel_name} does not exist; try one of {_arrow.schema.names}")
+        if channel_name in self._samples_channels:
+            # copy the channel from the cached samples instead of reading the data again
+            row, dtype = self._samples_channels[channel_name]
+            return self._samples[row].astype(dtype)
+        if self._timing is not None and channel_name in TIMESTAMP_COLUMNS:
+            return self.data_timestamps() if channel_name == "timestamps" else self.unaltered_data_timestamps()
+        # read only the requested column of the stored table
+        column = self._stored_column(channel_name)
+        if column is None or len(column) < 1:
+            if not self._stored_table():
+                self._errors.append(f"WARNING: There are no channels to access in this Sensor!")
+            else:
+                self._errors.append(f"WARNING: {channel_name} does not exist; try one of {self.data_channels()}")
             return []
         if channel_name in NON_NUMERIC_COLUMNS:
-            return np.array([COLUMN_TO_ENUM_FN[channel_name](c.as_py()) for c in _arrow[channel_name]])
-        return _arrow[channel_name].to_numpy()
+            return decode_enum_column(channel_name, column.to_numpy())
+        if channel_name in TIMESTAMP_COLUMNS:
+            return _float_timestamps(column, self._is_nanos())
+        if self._precision != StoragePrecision.FLOAT64:
+            return _expand_column(column).to_numpy()
+        return column.to_numpy()
 
     def _get_non_numeric_data_channel(self, channel_name: str) -> List[str]:
         """
@@ -770,7 +1422,7 @@ class SensorData:
         else:
             _arrow = self.pyarrow_table()
             if channel_name in NON_NUMERIC_COLUMNS:
-                return [COLUMN_TO_ENUM_FN[channel_name](c.as_py()) for c in _arrow[channel_name]]
+                return decode_enum_column(channel_name, _arrow[channel_name].to_numpy()).tolist()
         self._errors.append(f"WARNING: {channel_name} does not exist")
         return []
 
@@ -819,7 +1471,19 @@ class SensorData:
             if self._use_offset_model
             else dtu.seconds_to_microseconds(self._sample_interval_s)
         )
-        if self._type == SensorType.AUDIO:
+        if self._type == SensorType.AUDIO and self._timing is not None:
+            # the corrected timestamps are a single run; only the description of the timestamps changes
+            self._timing = (
+                TimingSegments.evenly_sampled(
+                    offset_model.update_time(self._timing[1].first_timestamp(), self._use_offset_model),
+                    self.num_samples(),
+                    slope,
+                ),
+                self._timing[1],
+            )
+        elif self._timestamp_format == TimestampFormat.INT64_NANOS:
+            self._write_table(self._corrected_integer_table(offset_model, slope), nanos=True)
+        elif self._type == SensorType.AUDIO:
             # use the model to update the first timestamp or add the best offset (model's intercept value)
             timestamps = pa.array(
                 calc_evenly_sampled_timestamps(
@@ -828,12 +1492,18 @@ class SensorData:
                     slope,
                 )
             )
+            self.write_pyarrow_table(self.pyarrow_table().set_column(0, "timestamps", timestamps))
         else:
             timestamps = pa.array(
                 offset_model.update_timestamps(self.unaltered_data_timestamps(), self._use_offset_model)
             )
-        self.write_pyarrow_table(self.pyarrow_table().set_column(0, "timestamps", timestamps))
-        time_diffs = np.floor(np.diff(self.data_timestamps()))
+            self.write_pyarrow_table(self.pyarrow_table().set_column(0, "timestamps", timestamps))
+        stored = self._stored_column("timestamps") if self._timing is None else None
+        if stored is not None and self._is_nanos():
+            # integer timestamps are differenced in nanoseconds
+            time_diffs = np.floor(np.diff(stored.to_numpy(zero_copy_only=False)) / 1000)
+        else:
+            time_diffs = np.floor(np.diff(self.data_timestamps()))
         if len(time_diffs) > 1:
             self._sample_interval_s = dtu.microseconds_to_seconds(slope)
             if self._sample_interval_s > 0:
@@ -841,11 +1511,57 @@ class SensorData:
                 self._sample_interval_std_s = dtu.microseconds_to_seconds(float(np.std(time_diffs)))
         self._timestamps_altered = True
 
+    def _corrected_integer_table(self, offset_model: om.OffsetModel, slope: float) -> pa.Table:
+        """
+        :param offset_model: model used to update the timestamps
+        :param slope: corrected sample interval in microseconds
+        :return: the stored table with its timestamps corrected in integer nanoseconds, so the fractions of a
+                    microsecond of the unaltered timestamps and the offsets are kept
+        """
+        table = self._stored_table()
+        unaltered = table["unaltered_timestamps"]
+        nanos = pc.fill_null(unaltered, 0).to_numpy()
+        if self._type == SensorType.AUDIO:
+            # use the model to update the first timestamp or add the best offset (model's intercept value)
+            first = _nanos_to_float_micros(nanos[:1])[0]
+            offset = offset_model.get_offset_at_time(first) if self._use_offset_model else offset_model.intercept
+            corrected = (
+                nanos[0]
+                + int(np.round(offset * 1000))
+                + np.round(np.arange(table.num_rows) * slope * 1000).astype(np.int64)
+            )
+            return table.set_column(table.schema.get_field_index("timestamps"), "timestamps", pa.array(corrected))
+        if self._use_offset_model and offset_model.slope != 0.0:
+            offsets = om.get_offset_at_new_time(
+                _nanos_to_float_micros(nanos), offset_model.slope, offset_model.intercept, offset_model.start_time
+            )
+        else:
+            offsets = np.full(nanos.size, offset_model.intercept)
+        corrected = nanos + np.round(offsets * 1000).astype(np.int64)
+        missing = unaltered.is_null().to_numpy()
+        return table.set_column(
+            table.schema.get_field_index("timestamps"),
+            "timestamps",
+            pa.array(corrected, mask=missing if missing.any() else None),
+        )
+
     def set_original_timestamps(self):
         """
         converts all timestamps in the sensor to the original values from the data
         """
-        self.write_pyarrow_table(self.pyarrow_table().set_column(0, "timestamps", self.unaltered_data_timestamps()))
+        if self._timing is not None:
+            self._timing = (self._timing[1], self._timing[1])
+            self._timestamps_altered = False
+            return
+        if self._timestamp_format == TimestampFormat.INT64_NANOS:
+            # copy the integers so the unaltered timestamps aren't rounded to floats
+            table = self._stored_table()
+            table = table.set_column(
+                table.schema.get_field_index("timestamps"), "timestamps", table["unaltered_timestamps"]
+            )
+        else:
+            table = self.pyarrow_table().set_column(0, "timestamps", self.unaltered_data_timestamps())
+        self._write_table(table, nanos=self._is_nanos())
         self._timestamps_altered = False
 
     def interpolate(
@@ -887,6 +1603,30 @@ class SensorData:
         i_p["timestamps"] = [interpolate_timestamp]
         return pa.Table.from_pydict(i_p)
 
+    def resample(
+        self,
+        new_sample_rate_hz: float,
+        base_dir: Optional[str] = None,
+        chunk_s: float = 60.0,
+        max_gap_s: Optional[float] = None,
+    ) -> "SensorData":
+        """
+        resample the data to a new sample rate, one chunk at a time.  Evenly sampled sensors are decimated with a
+        polyphase anti-aliasing filter; other sensors are linearly interpolated and new timestamps in gaps are NaN.
+        See redvox.common.resampling.resample for details.
+
+        :param new_sample_rate_hz: the sample rate of the new sensor
+        :param base_dir: directory to save the data of the new sensor to.  If None, keep the data in memory.
+                            default None
+        :param chunk_s: seconds of data to resample at a time, default 60.0
+        :param max_gap_s: largest distance in seconds between two samples that are interpolated across; if None, use
+                            1.8 times the sample interval.  default None
+        :return: a new sensor of the same type with the resampled data
+        """
+        from redvox.common import resampling
+
+        return resampling.resample(self, new_sample_rate_hz, base_dir, chunk_s, max_gap_s)
+
     def as_dict(self) -> dict:
         """
         :return: sensor as dict
@@ -904,6 +1644,9 @@ class SensorData:
             "gaps": self._gaps,
             "base_dir": os.path.basename(self._fs_writer.save_dir()),
             "errors": self._errors.as_dict(),
+            "timing": None if self._timing is None else [t.as_dict() for t in self._timing],
+            "storage_precision": self._precision.name,
+            "timestamp_format": self._timestamp_format.name,
         }
 
     def to_json(self) -> str:
@@ -941,6 +1684,9 @@ class SensorData:
                 return result
         json_data = json_file_to_dict(os.path.join(file_dir, file_name))
         if "name" in json_data.keys():
+            timing = json_data.get("timing")
+            if timing is not None:
+                timing = (TimingSegments.from_dict(timing[0]), TimingSegments.from_dict(timing[1]))
             result = SensorData.from_dir(
                 json_data["name"],
                 file_dir,
@@ -952,6 +1698,9 @@ class SensorData:
                 json_data["timestamps_altered"],
                 False,
                 json_data["use_offset_model"],
+                timing=timing,
+                storage_precision=StoragePrecision[json_data.get("storage_precision", "FLOAT64")],
+                timestamp_format=TimestampFormat[json_data.get("timestamp_format", "FLOAT64_MICROS")],
             )
             result.set_errors(RedVoxExceptions.from_dict(json_data["errors"]))
             result.set_save_to_disk(True)
@@ -1,4 +1,5 @@
 import os.path
+import multiprocessing.pool
 from pathlib import Path
 from typing import Dict, List, Optional
 
@@ -12,6 +13,7 @@ import redvox.common.date_time_utils as dtu
 from redvox.common.errors import RedVoxError, RedVoxExceptions
 from redvox.common import io
 from redvox.common.offset_model import OffsetModel
+from redvox.common.parallel_utils import maybe_parallel_map
 import redvox.common.session_io as s_io
 import redvox.common.session_model_utils as smu
 
@@ -35,6 +37,40 @@ def _get_session_key_from_packet(packet: api_m.RedvoxPacketM) -> str:
     )
 
 
+def _partition_index_by_station(index: io.Index) -> List[io.Index]:
+    """
+    Splits an index into one index per station id.  Entries keep their relative order.
+
+    :param index: index to split
+    :return: list of indexes, one per station id in the order the station ids first appear in the index
+    """
+    partitions: Dict[str, io.Index] = {}
+    for entry in index.entries:
+        if entry.station_id not in partitions:
+            partitions[entry.station_id] = io.Index()
+        partitions[entry.station_id].entries.append(entry)
+    return list(partitions.values())
+
+
+def _create_models_from_index(index: io.Index) -> List["SessionModel"]:
+    """
+    Reads the metadata of every file in the index once and builds a SessionModel for each session key found in the
+    data.
+
+    :param index: index of the files to read; usually all the files of one station
+    :return: list of SessionModel, one per session key in the order the keys first appear in the data
+    """
+    models = LocalSessionModels()
+    for entry in index.entries:
+        packet = entry.read_raw_metadata()
+        if packet is None:
+            continue
+        if entry.api_version == io.ApiVersion.API_900:
+            packet = ac.convert_api_900_to_1000_raw(packet)
+        models.add_packet(packet)
+    return models.sessions
+
+
 class SessionModel:
     """
     SDK version of Session from the cloud API
@@ -203,6 +239,16 @@ class SessionModel:
             return model
         raise RedVoxError("Unable to find data files for a model.")
 
+    @staticmethod
+    def create_from_index(index: io.Index) -> "SessionModel":
+        """
+        Reads the metadata of the files without their sample payloads.  Raises an error if no packets are found
+
+        :param index: index of the files of a single station to read
+        :return: SessionModel using the data packets of the files
+        """
+        return SessionModel.create_from_stream(SessionModel._read_files_in_index(index))
+
     @staticmethod
     def create_from_dir(
         in_dir: str,
@@ -230,7 +276,7 @@ class SessionModel:
         else:
             index = io.index_unstructured(in_dir, reader_filter)
         if len(index.entries) > 0:
-            return SessionModel().create_from_stream(SessionModel()._read_files_in_index(index))
+            return SessionModel.create_from_index(index)
         err_m = f"{station_id}"
         if start_datetime:
             err_m += f" with start_datetime {start_datetime}"
@@ -267,16 +313,71 @@ class SessionModel:
             index = io.index_unstructured(in_dir, reader_filter)
         all_index_ids = index.summarize().station_ids()
         for station_id in all_index_ids:
-            result.append(
-                SessionModel().create_from_stream(
-                    SessionModel()._read_files_in_index(index.get_index_for_station_id(station_id))
-                )
-            )
+            result.append(SessionModel.create_from_index(index.get_index_for_station_id(station_id)))
+        return result
+
+    @staticmethod
+    def create_all_from_index(
+        index: io.Index, pool: Optional[multiprocessing.pool.Pool] = None
+    ) -> Dict[str, "SessionModel"]:
+        """
+        Creates a SessionModel for every session in the index.  The index is split by station id and each station's
+        files are read and modeled independently, in parallel if parallelism is enabled in redvox.settings.
+
+        Unlike create_from_stream, packets with a different session key than the first packet of a station start a
+        new SessionModel instead of being rejected.
+
+        :param index: index of the files to read
+        :param pool: optional pool for multiprocessing.  If None and parallelism is enabled, one is created.
+        :return: dictionary of session key to SessionModel
+        """
+        partitions = _partition_index_by_station(index)
+        result: Dict[str, SessionModel] = {}
+        for models in maybe_parallel_map(
+            pool, _create_models_from_index, iter(partitions), lambda: len(partitions) > 1, chunk_size=1
+        ):
+            for model in models:
+                result[model.cloud_session.session_key()] = model
         return result
 
+    @staticmethod
+    def create_all_from_dir(
+        in_dir: str,
+        structured_dir: bool = True,
+        station_ids: Optional[List[str]] = None,
+        start_datetime: Optional[dtu.datetime] = None,
+        end_datetime: Optional[dtu.datetime] = None,
+        pool: Optional[multiprocessing.pool.Pool] = None,
+    ) -> Dict[str, "SessionModel"]:
+        """
+        Indexes the directory once, then creates a SessionModel for every session in the data.
+        See create_all_from_index for details.
+
+        :param in_dir: input directory
+        :param structured_dir: if True, input directory is organized as per api1000/api900 specifications.  Default True
+        :param station_ids: optional list of station IDs to get files for.  Default None
+        :param start_datetime: optional start datetime to get data from.  Default None
+        :param end_datetime: optional end datetime to get data until.  Default None
+        :param pool: optional pool for multiprocessing.  Default None
+        :return: dictionary of session key to SessionModel
+        """
+        reader_filter = (
+            io.ReadFilter()
+            .with_start_dt(start_datetime)
+            .with_end_dt(end_datetime)
+            .with_station_ids(set(station_ids) if station_ids else None)
+        )
+        if structured_dir:
+            index = io.index_structured(in_dir, reader_filter, pool)
+        else:
+            index = io.index_unstructured(in_dir, reader_filter, pool=pool)
+        return SessionModel.create_all_from_index(index, pool)
+
     @staticmethod
     def _read_files_in_index(indexf: io.Index) -> List[api_m.RedvoxPacketM]:
         """
+        Sample payloads of API 1000 packets are not read; see redvox.api1000.common.packet_metadata.
+
         :return: list of RedvoxPacketM, converted from API 900 if necessary
         """
         result: List[api_m.RedvoxPacketM] = []
@@ -285,9 +386,9 @@ class SessionModel:
         for packet_900 in indexf.stream_raw(io.ReadFilter.empty().with_api_versions({io.ApiVersion.API_900})):
             # noinspection Mypy
             result.append(ac.convert_api_900_to_1000_raw(packet_900))
-        # Grab the API 1000 packets
+        # Grab the metadata of the API 1000 packets
         # noinspection PyTypeChecker
-        for packet in indexf.stream_raw(io.ReadFilter.empty().with_api_versions({io.ApiVersion.API_1000})):
+        for packet in indexf.stream_raw_metadata(io.ReadFilter.empty().with_api_versions({io.ApiVersion.API_1000})):
             # noinspection Mypy
             result.append(packet)
         return result
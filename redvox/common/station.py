@@ -3,16 +3,22 @@ Defines generic station objects for API-independent analysis
 all timestamps are integers in microseconds unless otherwise stated
 Utilizes RedvoxPacketM (API M data packets) as the format of the data due to their versatility
 """
-from typing import List, Optional, Tuple, Union
+from typing import Iterator, List, Optional, Tuple, Union
 import os
 from pathlib import Path
 
 import numpy as np
-import pyarrow.dataset as ds
 import pyarrow as pa
 
 from redvox.common import station_io as io
-from redvox.common.io import FileSystemWriter as Fsw, FileSystemSaveMode, Index, get_json_file, json_file_to_dict
+from redvox.common.io import (
+    FileSystemWriter as Fsw,
+    FileSystemSaveMode,
+    Index,
+    ParquetWriteProfile,
+    get_json_file,
+    json_file_to_dict,
+)
 from redvox.common import sensor_data as sd
 from redvox.common import station_utils as st_utils
 from redvox.common.offset_model import OffsetModel, GPS_LATENCY_MICROS
@@ -23,6 +29,8 @@ from redvox.common import packet_to_pyarrow as ptp
 from redvox.common import gap_and_pad_utils as gpu
 from redvox.common.date_time_utils import datetime_from_epoch_microseconds_utc, seconds_to_microseconds as s_to_us
 from redvox.common.event_stream import EventStreams
+from redvox.common import frames
+from redvox.common import tracing
 
 
 STATION_ID_LENGTH: int = 10  # the length of a station ID string
@@ -299,6 +307,23 @@ class Station:
         for s in self._data:
             s.set_save_mode(new_save_mode)
 
+    def set_write_profile(self, profile: ParquetWriteProfile):
+        """
+        sets the settings used to write the parquet files of the Station's sensors and timesync data
+
+        :param profile: ParquetWriteProfile to use
+        """
+        self._fs_writer.write_profile = profile
+        self._timesync_data.write_profile = profile
+        for s in self._data:
+            s.set_write_profile(profile)
+
+    def write_profile(self) -> ParquetWriteProfile:
+        """
+        :return: the settings used to write the parquet files of the Station
+        """
+        return self._fs_writer.write_profile
+
     def set_save_data(self, save_on: bool = False):
         """
         set the option to save the station
@@ -398,6 +423,7 @@ class Station:
         station.load_from_indexes(indexes)
         return station
 
+    @tracing.traced()
     def load_from_indexes(self, indexes: List[Index]):
         """
         fill station using data from a list of Indexes
@@ -405,6 +431,7 @@ class Station:
         :param indexes: List of indexes of the files to read
         """
         self._load_metadata_from_packet(indexes[0].read_first_packet())
+        tracing.annotate(station=self.id(), files=sum(len(idx.entries) for idx in indexes))
         self._timesync_data.arrow_dir = os.path.join(self.save_dir(), "timesync")
         self._timesync_data.arrow_file = f"timesync_{self.start_date_as_str()}"
         all_summaries = ptp.AggregateSummary()
@@ -481,6 +508,7 @@ class Station:
         station._load_metadata_from_packet(packet)
         return station
 
+    @tracing.traced()
     def load_data_from_packets(self, packets: List[api_m.RedvoxPacketM]):
         """
         fill station with data from packets
@@ -656,6 +684,29 @@ class Station:
         """
         return [s.type() for s in self._data]
 
+    def iter_frames(
+        self,
+        duration_s: float,
+        overlap_s: float = 0.0,
+        sensor_types: Optional[List[sd.SensorType]] = None,
+        start_timestamp: Optional[float] = None,
+        end_timestamp: Optional[float] = None,
+    ) -> Iterator[frames.Frame]:
+        """
+        iterate over the sensors of the station in frames of a fixed duration.  Sensors saved to disk only read the
+        rows of the current frame.
+
+        :param duration_s: duration of each frame in seconds
+        :param overlap_s: seconds each frame overlaps the frame before it, default 0.0
+        :param sensor_types: types of the sensors to read; if None, read every sensor.  default None
+        :param start_timestamp: start of the first frame in microseconds since epoch UTC; if None, use the first data
+                                timestamp of the station.  default None
+        :param end_timestamp: frames start before this timestamp, in microseconds since epoch UTC; if None, use the
+                                timestamp after the last data timestamp of the station.  default None
+        :return: the Frames in time order
+        """
+        return frames.iter_frames([self], duration_s, overlap_s, sensor_types, start_timestamp, end_timestamp)
+
     def get_sensor_by_type(self, sensor_type: sd.SensorType) -> Optional[sd.SensorData]:
         """
         :param sensor_type: type of sensor to get
@@ -1438,6 +1489,7 @@ class Station:
             )
         return data_table
 
+    @tracing.traced()
     def _set_pyarrow_sensors(self, sensor_summaries: ptp.AggregateSummary):
         """
         create sensors using pyarrow functions to convert summaries to tables and metadata
@@ -1464,6 +1516,8 @@ class Station:
             self.update_first_and_last_data_timestamps()
             for snr, sdata in sensor_summaries.get_non_audio().items():
                 if self._fs_writer.is_save_disk():
+                    import pyarrow.dataset as ds
+
                     data_table = ds.dataset(sdata[0].fdir, format="parquet", exclude_invalid_files=True).to_table()
                 else:
                     data_table = sdata[0].data()
@@ -1502,6 +1556,8 @@ class Station:
                 )
                 self._data.append(new_sensor.class_from_type())
             self._set_gps_offset()
+            if tracing.is_enabled():
+                tracing.annotate(sensors=len(self._data), rows=sum(s.num_samples() for s in self._data))
         else:
             self._errors.append("Audio Sensor expected, but does not exist.")
 
@@ -1715,6 +1771,14 @@ class Station:
             False if np.isnan(self._timesync_data.mean_latency()) or self._timesync_data.best_offset() == 0.0 else True
         )
 
+    def correction_model(self) -> OffsetModel:
+        """
+        :return: the OffsetModel used to correct timestamps; the timesync model if it can be used, otherwise the gps
+                    offset model
+        """
+        return self._timesync_data.offset_model() if self.use_timesync_for_correction() else self.gps_offset_model()
+
+    @tracing.traced()
     def update_timestamps(self) -> "Station":
         """
         updates the timestamps in the station using the offset model
@@ -1722,9 +1786,7 @@ class Station:
         :return: updated Station
         """
         if not self._is_timestamps_updated and self._correct_timestamps:
-            offset_model = (
-                self._timesync_data.offset_model() if self.use_timesync_for_correction() else self._gps_offset_model
-            )
+            offset_model = self.correction_model()
             self._start_date = offset_model.update_time(self._start_date, self._use_model_correction)
             for sensor in self._data:
                 sensor.update_data_timestamps(offset_model)
@@ -1755,9 +1817,7 @@ class Station:
         :return: updated Station
         """
         if self._is_timestamps_updated:
-            offset_model = (
-                self._timesync_data.offset_model() if self.use_timesync_for_correction() else self._gps_offset_model
-            )
+            offset_model = self.correction_model()
             self._start_date = offset_model.get_original_time(self._start_date, self._use_model_correction)
             for sensor in self._data:
                 sensor.set_original_timestamps()
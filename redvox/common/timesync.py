@@ -13,16 +13,16 @@ import os
 # noinspection Mypy
 import numpy as np
 import pyarrow as pa
-import pyarrow.dataset as ds
 
 import redvox.common.timesync_io as io
-from redvox.common.io import json_file_to_dict
+from redvox.common.io import json_file_to_dict, ParquetWriteProfile
 import redvox.api900.lib.api900_pb2 as api900_pb2
 from redvox.api1000.proto.redvox_api_m_pb2 import RedvoxPacketM
 from redvox.api900.lib.api900_pb2 import RedvoxPacket
 import redvox.api900.reader_utils as util_900
 from redvox.common.offset_model import OffsetModel
 from redvox.common import tri_message_stats as tms
+from redvox.common import tracing
 
 
 class TimeSync:
@@ -67,6 +67,8 @@ class TimeSync:
         _arrow_dir: str, directory to save arrow file in, default "." (current dir)
 
         _arrow_file: str, base name of file to save data as, default "timesync"
+
+        write_profile: ParquetWriteProfile, settings used to write the arrow file, default BALANCED
     """
 
     def __init__(
@@ -121,6 +123,7 @@ class TimeSync:
         self._data_end: float = data_end
         self.arrow_dir: str = arrow_dir
         self.arrow_file: str = arrow_file_name
+        self.write_profile: ParquetWriteProfile = ParquetWriteProfile.BALANCED
 
         if time_sync_exchanges_list is None or len(time_sync_exchanges_list) < 1:
             self._time_sync_exchanges_list = [[], [], [], [], [], []]
@@ -176,6 +179,7 @@ class TimeSync:
             "data_end": self._data_end,
             "arrow_dir": self.arrow_dir,
             "arrow_file_name": self.arrow_file,
+            "write_profile": self.write_profile.name,
         }
 
     def to_json(self):
@@ -203,6 +207,8 @@ class TimeSync:
         :param file_path: full path of file to load data from.
         :return: TimeSyncArrow object
         """
+        import pyarrow.dataset as ds
+
         json_data = json_file_to_dict(file_path)
         data = ds.dataset(
             os.path.join(json_data["arrow_dir"], json_data["arrow_file_name"] + ".parquet"),
@@ -226,6 +232,9 @@ class TimeSync:
             json_data["arrow_dir"],
             json_data["arrow_file_name"],
         )
+        result.write_profile = ParquetWriteProfile[
+            json_data.get("write_profile", ParquetWriteProfile.BALANCED.name)
+        ]
         result.set_sync_exchanges(
             [
                 data["a1"].to_numpy(),
@@ -399,6 +408,7 @@ class TimeSync:
             self._data_end = np.max([self._data_end, new_data._data_end])
         self._stats_from_exchanges()
 
+    @tracing.traced()
     def from_raw_packets(self, packets: List[Union[RedvoxPacketM, RedvoxPacket]]) -> "TimeSync":
         """
         converts packets into TimeSyncData objects, then performs analysis
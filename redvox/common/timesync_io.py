@@ -8,7 +8,7 @@ from typing import (
     TYPE_CHECKING,
 )
 
-import pyarrow.parquet as pq
+from redvox.common.io import write_parquet
 
 
 if TYPE_CHECKING:
@@ -35,7 +35,9 @@ def to_json_file(timesync: "TimeSync", file_name: Optional[str] = None) -> Path:
     """
     _file_name: str = file_name if file_name is not None else timesync.arrow_file
     file_path: Path = Path(timesync.arrow_dir).joinpath(f"{_file_name}.json")
-    pq.write_table(timesync.data_as_pyarrow(), Path(timesync.arrow_dir).joinpath(f"{_file_name}.parquet"))
+    write_parquet(
+        timesync.data_as_pyarrow(), Path(timesync.arrow_dir).joinpath(f"{_file_name}.parquet"), timesync.write_profile
+    )
     with open(file_path, "w") as f_p:
         f_p.write(to_json(timesync))
         return file_path.resolve(False)
@@ -0,0 +1,333 @@
+"""
+Opt-in tracing of the time and memory used by the stages of reading RedVox data.
+
+Functions decorated with traced() record a Span every time they run while a Tracer is active.  Spans nest, so the
+spans of a DataWindow show how long it spent indexing, reading, converting, correcting and windowing each station.
+When no Tracer is active the decorators only check a global and call the function.
+
+Spans are recorded by the process that activated the Tracer.  Work done by a multiprocessing pool is recorded as the
+single span of the function that waited for the pool; disable parallelism in redvox.settings for a detailed trace.
+
+    tracer = Tracer()
+    with tracer.activate():
+        station = Station.create_from_indexes(indexes)
+    tracer.print_summary()
+    tracer.chrome_trace_to_file("station_trace.json")
+"""
+import contextlib
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+_ACTIVE: Optional["Tracer"] = None
+# psutil.Process of the current process, replaced after a fork
+_PROCESS: Optional[Any] = None
+
+
+def _rss_bytes() -> int:
+    """
+    :return: the current resident memory of the process in bytes
+    """
+    global _PROCESS
+    if _PROCESS is None or _PROCESS.pid != os.getpid():
+        import psutil
+
+        _PROCESS = psutil.Process()
+    return _PROCESS.memory_info().rss
+
+
+def max_rss_bytes() -> Optional[int]:
+    """
+    :return: the largest resident memory of the process so far in bytes, or None if the platform doesn't report it
+    """
+    try:
+        import resource
+    except ImportError:
+        import psutil
+
+        return getattr(psutil.Process().memory_info(), "peak_wset", None)
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS reports bytes, everything else reports kilobytes
+    return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+class Span:
+    """
+    The time and memory used by one call of a traced function
+
+    Properties:
+        name: str, name of the span
+
+        start_ns: int, start of the span in nanoseconds since the Tracer was created
+
+        end_ns: int, end of the span in nanoseconds since the Tracer was created, 0 while the span is open
+
+        rss_start_bytes: int, resident memory of the process when the span started
+
+        rss_end_bytes: int, resident memory of the process when the span ended
+
+        max_rss_bytes: optional int, largest resident memory of the process so far when the span ended
+
+        attributes: dict, values such as row counts and bytes added to the span by annotate()
+
+        children: list of Span, spans started and ended while this span was open
+    """
+
+    def __init__(self, name: str, start_ns: int, rss_start_bytes: int):
+        self.name: str = name
+        self.start_ns: int = start_ns
+        self.end_ns: int = 0
+        self.rss_start_bytes: int = rss_start_bytes
+        self.rss_end_bytes: int = rss_start_bytes
+        self.max_rss_bytes: Optional[int] = None
+        self.attributes: Dict[str, Any] = {}
+        self.children: List["Span"] = []
+
+    def __repr__(self):
+        return f"Span(name: {self.name}, duration_s: {self.duration_s()}, attributes: {self.attributes})"
+
+    def duration_s(self) -> float:
+        """
+        :return: duration of the span in seconds
+        """
+        return (self.end_ns - self.start_ns) / 1e9
+
+    def as_dict(self) -> dict:
+        """
+        :return: Span and its children as a dictionary
+        """
+        return {
+            "name": self.name,
+            "start_ns": self.start_ns,
+            "end_ns": self.end_ns,
+            "duration_s": self.duration_s(),
+            "rss_start_bytes": self.rss_start_bytes,
+            "rss_end_bytes": self.rss_end_bytes,
+            "max_rss_bytes": self.max_rss_bytes,
+            "attributes": self.attributes,
+            "children": [c.as_dict() for c in self.children],
+        }
+
+    def walk(self) -> Iterator["Span"]:
+        """
+        :return: iterator over this span and all of its descendants, depth first
+        """
+        yield self
+        for child in self.children:
+            yield from child.walk()
+
+
+class Tracer:
+    """
+    Records the spans of traced functions while it is active.
+
+    Properties:
+        spans: list of Span, the top level spans recorded by the Tracer
+    """
+
+    def __init__(self):
+        self.spans: List[Span] = []
+        self._stack: List[Span] = []
+        self._origin_ns: int = time.perf_counter_ns()
+        self._thread_id: Optional[int] = None
+        self._pid: int = os.getpid()
+
+    @contextlib.contextmanager
+    def activate(self) -> Iterator["Tracer"]:
+        """
+        record spans in this Tracer until the context exits.  The previously active Tracer is restored afterwards.
+
+        :return: the Tracer
+        """
+        global _ACTIVE
+        previous = _ACTIVE
+        _ACTIVE = self
+        self._thread_id = threading.get_ident()
+        self._pid = os.getpid()
+        try:
+            yield self
+        finally:
+            _ACTIVE = previous
+
+    def _is_recording(self) -> bool:
+        """
+        :return: True if called by the thread and process that activated the Tracer
+        """
+        return threading.get_ident() == self._thread_id and os.getpid() == self._pid
+
+    @contextlib.contextmanager
+    def span(self, name: str, **attributes) -> Iterator[Optional[Span]]:
+        """
+        record a span until the context exits.  Spans opened by other threads or processes are not recorded.
+
+        :param name: name of the span
+        :param attributes: values to attach to the span
+        :return: the open Span, or None if the span is not recorded
+        """
+        if not self._is_recording():
+            yield None
+            return
+        new_span = Span(name, time.perf_counter_ns() - self._origin_ns, _rss_bytes())
+        new_span.attributes.update(attributes)
+        (self._stack[-1].children if self._stack else self.spans).append(new_span)
+        self._stack.append(new_span)
+        try:
+            yield new_span
+        finally:
+            self._stack.pop()
+            new_span.end_ns = time.perf_counter_ns() - self._origin_ns
+            new_span.rss_end_bytes = _rss_bytes()
+            new_span.max_rss_bytes = max_rss_bytes()
+
+    def current_span(self) -> Optional[Span]:
+        """
+        :return: the innermost open span, or None if no spans are open
+        """
+        if self._stack and self._is_recording():
+            return self._stack[-1]
+        return None
+
+    def walk(self) -> Iterator[Span]:
+        """
+        :return: iterator over every recorded span, depth first
+        """
+        for s in self.spans:
+            yield from s.walk()
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """
+        :return: the number of calls and total seconds of each span name, ordered by total seconds, largest first
+        """
+        result: Dict[str, Dict[str, float]] = {}
+        for s in self.walk():
+            totals = result.setdefault(s.name, {"calls": 0, "total_s": 0.0})
+            totals["calls"] += 1
+            totals["total_s"] += s.duration_s()
+        return dict(sorted(result.items(), key=lambda item: item[1]["total_s"], reverse=True))
+
+    def print_summary(self):
+        """
+        print the number of calls and total seconds of each span name
+        """
+        for name, totals in self.summary().items():
+            print(f"{totals['total_s']:10.3f} s {int(totals['calls']):6d} calls  {name}")
+
+    def as_dict(self) -> dict:
+        """
+        :return: Tracer as a dictionary
+        """
+        return {"spans": [s.as_dict() for s in self.spans]}
+
+    def to_json_file(self, file_path: str) -> str:
+        """
+        save the recorded spans as a json file
+
+        :param file_path: path of the file to write
+        :return: path of the written file
+        """
+        with open(file_path, "w") as f_p:
+            json.dump(self.as_dict(), f_p)
+        return file_path
+
+    def chrome_trace(self) -> dict:
+        """
+        :return: the recorded spans in the Chrome trace event format, viewable in chrome://tracing or Perfetto
+        """
+        pid = os.getpid()
+        events = []
+        for s in self.walk():
+            args = dict(s.attributes)
+            args["rss_start_bytes"] = s.rss_start_bytes
+            args["rss_end_bytes"] = s.rss_end_bytes
+            args["max_rss_bytes"] = s.max_rss_bytes
+            events.append(
+                {
+                    "name": s.name,
+                    "ph": "X",
+                    "ts": s.start_ns / 1e3,
+                    "dur": (s.end_ns - s.start_ns) / 1e3,
+                    "pid": pid,
+                    "tid": self._thread_id or 0,
+                    "args": args,
+                }
+            )
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def chrome_trace_to_file(self, file_path: str) -> str:
+        """
+        save the recorded spans as a Chrome trace event file
+
+        :param file_path: path of the file to write
+        :return: path of the written file
+        """
+        with open(file_path, "w") as f_p:
+            json.dump(self.chrome_trace(), f_p)
+        return file_path
+
+
+def get_active_tracer() -> Optional[Tracer]:
+    """
+    :return: the active Tracer, or None if tracing is disabled
+    """
+    return _ACTIVE
+
+
+def is_enabled() -> bool:
+    """
+    :return: True if a Tracer is active
+    """
+    return _ACTIVE is not None
+
+
+@contextlib.contextmanager
+def activate(tracer: Optional[Tracer]) -> Iterator[Optional[Tracer]]:
+    """
+    activate a Tracer until the context exits.  Does nothing if tracer is None.
+
+    :param tracer: the Tracer to activate
+    :return: the Tracer
+    """
+    if tracer is None:
+        yield None
+    else:
+        with tracer.activate():
+            yield tracer
+
+
+def annotate(**attributes):
+    """
+    attach values such as row counts or bytes to the innermost open span.  Does nothing if tracing is disabled.
+
+    :param attributes: values to attach
+    """
+    if _ACTIVE is not None:
+        current = _ACTIVE.current_span()
+        if current is not None:
+            current.attributes.update(attributes)
+
+
+def traced(name: Optional[str] = None) -> Callable:
+    """
+    decorator that records a span for every call of the function while a Tracer is active
+
+    :param name: name of the spans, default the qualified name of the function
+    :return: the decorator
+    """
+
+    def decorator(fn: Callable) -> Callable:
+        span_name = name if name is not None else fn.__qualname__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if _ACTIVE is None:
+                return fn(*args, **kwargs)
+            with _ACTIVE.span(span_name):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,118 @@
+from unittest import TestCase
+
+import numpy as np
+
+import redvox.tests as tests
+import redvox.api1000.common.packet_metadata as pm
+from redvox.api1000.errors import ApiMPacketMetadataError
+from redvox.api1000.proto.redvox_api_m_pb2 import RedvoxPacketM
+from redvox.common import io
+from redvox.common.session_model import SessionModel
+import redvox.common.session_model_utils as smu
+
+
+class TestPacketMetadata(TestCase):
+    def setUp(self) -> None:
+        self.packet: RedvoxPacketM = RedvoxPacketM(api=1000.0, sub_api=1.0)
+        self.packet.station_information.id = "1000000001"
+        self.packet.station_information.uuid = "1234"
+        self.packet.station_information.station_metrics.battery.values.extend([90.0, 89.0])
+        self.packet.timing_information.packet_start_mach_timestamp = 1000.0
+        self.packet.timing_information.synch_exchanges.add(a1=1.0, a2=2.0, a3=3.0, b1=1.5, b2=2.5, b3=3.5)
+        audio = self.packet.sensors.audio
+        audio.sensor_description = "mic"
+        audio.sample_rate = 800.0
+        audio.first_sample_timestamp = 1000.0
+        audio.samples.values.extend(range(4096))
+        audio.samples.value_statistics.mean = 2047.5
+        pressure = self.packet.sensors.pressure
+        pressure.sensor_description = "barometer"
+        pressure.timestamps.timestamps.extend([1000.0, 2000.0, 3000.0])
+        pressure.timestamps.mean_sample_rate = 30.0
+        pressure.timestamps.timestamp_statistics.count = 3
+        pressure.samples.values.extend([101.0, 101.1, 101.2])
+        accelerometer = self.packet.sensors.accelerometer
+        accelerometer.timestamps.timestamps.extend([1500.0, 2500.0])
+        for samples in [accelerometer.x_samples, accelerometer.y_samples, accelerometer.z_samples]:
+            samples.values.extend([0.1, 0.2])
+        self.packet.sensors.location.timestamps.timestamps.extend([1000.0, 2000.0])
+        self.packet.sensors.location.latitude_samples.values.extend([21.0, 21.5])
+        self.packet.sensors.compressed_audio.audio_bytes = b"\x00" * 1024
+        self.packet.sensors.image.samples.extend([b"\x01" * 64, b"\x02" * 64])
+        self.packet.sensors.image.timestamps.timestamps.extend([1200.0, 2200.0])
+        self.metadata: RedvoxPacketM = pm.read_metadata_buffer(self.packet.SerializeToString())
+
+    def test_keeps_metadata(self):
+        self.assertEqual(self.metadata.api, 1000.0)
+        self.assertEqual(self.metadata.station_information, self.packet.station_information)
+        self.assertEqual(self.metadata.timing_information, self.packet.timing_information)
+        self.assertEqual(self.metadata.sensors.location, self.packet.sensors.location)
+        self.assertEqual(self.metadata.sensors.audio.sensor_description, "mic")
+        self.assertEqual(self.metadata.sensors.audio.sample_rate, 800.0)
+        self.assertEqual(self.metadata.sensors.audio.first_sample_timestamp, 1000.0)
+        self.assertEqual(self.metadata.sensors.audio.samples.value_statistics.mean, 2047.5)
+        self.assertEqual(self.metadata.sensors.pressure.timestamps.mean_sample_rate, 30.0)
+
+    def test_drops_payloads(self):
+        self.assertEqual(len(self.metadata.sensors.audio.samples.values), 0)
+        self.assertEqual(len(self.metadata.sensors.pressure.samples.values), 0)
+        self.assertEqual(len(self.metadata.sensors.pressure.timestamps.timestamps), 0)
+        self.assertEqual(len(self.metadata.sensors.accelerometer.x_samples.values), 0)
+        self.assertEqual(len(self.metadata.sensors.compressed_audio.audio_bytes), 0)
+        self.assertEqual(len(self.metadata.sensors.image.samples), 0)
+        self.assertLess(self.metadata.ByteSize(), self.packet.ByteSize() / 10)
+
+    def test_sample_counts(self):
+        self.assertEqual(pm.get_num_samples(self.metadata.sensors.audio.samples), 4096)
+        self.assertEqual(pm.get_num_samples(self.packet.sensors.audio.samples), 4096)
+        self.assertEqual(pm.get_num_samples(self.metadata.sensors.pressure.samples), 3)
+        self.assertEqual(pm.get_num_samples(self.metadata.sensors.accelerometer.z_samples), 2)
+        self.assertEqual(self.metadata.sensors.image.timestamps.timestamp_statistics.count, 2)
+
+    def test_first_last_timestamps(self):
+        stats = self.metadata.sensors.pressure.timestamps.timestamp_statistics
+        self.assertEqual(stats.count, 3)
+        self.assertEqual(stats.min, 1000.0)
+        self.assertEqual(stats.max, 3000.0)
+        stats = self.metadata.sensors.accelerometer.timestamps.timestamp_statistics
+        self.assertEqual(stats.min, 1500.0)
+        self.assertEqual(stats.max, 2500.0)
+
+    def test_empty_packet(self):
+        self.assertEqual(pm.read_metadata_buffer(b""), RedvoxPacketM())
+
+    def test_truncated_packet(self):
+        with self.assertRaises(ApiMPacketMetadataError):
+            pm.skim_packet_bytes(self.packet.SerializeToString()[:-10])
+
+
+class TestPacketMetadataFiles(TestCase):
+    def setUp(self) -> None:
+        self.index: io.Index = io.index_unstructured(
+            tests.TEST_DATA_DIR, io.ReadFilter(api_versions={io.ApiVersion.API_1000})
+        )
+
+    def test_read_raw_metadata(self):
+        self.assertGreater(len(self.index.entries), 0)
+        for entry in self.index.entries:
+            full: RedvoxPacketM = entry.read_raw()
+            metadata: RedvoxPacketM = entry.read_raw_metadata()
+            # the packets contain NaN values, which never compare equal; compare the serialized messages instead
+            self.assertEqual(metadata.SerializeToString(), pm.read_metadata_path(entry.full_path).SerializeToString())
+            self.assertEqual(
+                metadata.station_information.SerializeToString(), full.station_information.SerializeToString()
+            )
+            self.assertEqual(
+                metadata.timing_information.SerializeToString(), full.timing_information.SerializeToString()
+            )
+            np.testing.assert_equal(smu.get_all_sensors_in_packet(metadata), smu.get_all_sensors_in_packet(full))
+            self.assertEqual(
+                pm.get_num_samples(metadata.sensors.audio.samples), len(full.sensors.audio.samples.values)
+            )
+
+    def test_session_model(self):
+        index = self.index.get_index_for_station_id("0000000001")
+        full = SessionModel.create_from_stream(index.read_raw())
+        metadata = SessionModel.create_from_stream(list(index.stream_raw_metadata()))
+        # assert_equal treats NaN values as equal
+        np.testing.assert_equal(metadata.as_dict(), full.as_dict())
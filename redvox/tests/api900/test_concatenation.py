@@ -503,3 +503,56 @@ class TestConcatenation(unittest.TestCase):
     def test_concat_non_monotonic(self):
         with self.assertRaises(exceptions.ConcatenationException):
             concat.concat_wrapped_redvox_packets([self.example_packet, self.example_packet])
+
+    def continuous_packets(self, num_packets: int):
+        packets = []
+        for i in range(num_packets):
+            packet = self.example_packet.clone()
+            packet.set_app_file_start_timestamp_machine(i * 10_000_000) \
+                .microphone_sensor().set_payload_values(list(range(10))) \
+                .set_sample_rate_hz(1.0) \
+                .set_first_sample_timestamp_epoch_microseconds_utc(i * 10_000_000)
+            packets.append(packet)
+        return packets
+
+    def test_identify_gaps_continuous(self):
+        self.assertEqual([], concat._identify_gaps(self.continuous_packets(5), 5))
+
+    def test_identify_gaps_sensor_dropout(self):
+        packets = self.continuous_packets(5)
+        packets[2].set_barometer_sensor(None)
+        self.assertEqual([2, 3], concat._identify_gaps(packets, 5))
+
+    def test_identify_gaps_mach_time_zero(self):
+        packets = self.continuous_packets(5)
+        for packet in packets[3:]:
+            packet.set_mach_time_zero(1)
+        self.assertEqual([3], concat._identify_gaps(packets, 5))
+
+    def test_identify_gaps_time_expected_len(self):
+        packets = self.continuous_packets(5)
+        # The packet after the first gap is 20 seconds long, so a 25 second step is no longer a gap
+        packets[2].microphone_sensor().set_first_sample_timestamp_epoch_microseconds_utc(40_000_000) \
+            .set_payload_values(list(range(20)))
+        packets[3].microphone_sensor().set_first_sample_timestamp_epoch_microseconds_utc(65_000_000)
+        packets[4].microphone_sensor().set_first_sample_timestamp_epoch_microseconds_utc(100_000_000)
+        self.assertEqual([2, 4], concat._identify_gaps(packets, 5))
+
+    def test_concat_segments(self):
+        packets = self.continuous_packets(6)
+        for packet in packets[3:]:
+            packet.set_mach_time_zero(1)
+        concatted = concat.concat_wrapped_redvox_packets(packets)
+        self.assertEqual(2, len(concatted))
+        self.assertEqual(30, len(concatted[0].microphone_sensor().payload_values()))
+        self.assertTrue(np.array_equal([1, 2, 3] * 3, concatted[1].gyroscope_sensor().payload_values_x()))
+        self.assertTrue(np.array_equal([13, 14, 15] * 3, concatted[1].location_sensor().payload_values_accuracy()))
+        self.assertEqual(concatted[1], reader.WrappedRedvoxPacket(concatted[1].redvox_packet()))
+
+    def test_concat_interleaved_channel_types_differ(self):
+        sensors = [self.example_packet.location_sensor(), self.cloned_packet.location_sensor()]
+        sensors[1]._unevenly_sampled_channel.set_channel_types([3, 2, 5, 4, 10])
+        self.assertFalse(concat._concat_interleaved(sensors, concat._constants.PayloadType.FLOAT64_PAYLOAD))
+        self.assertTrue(concat._concat_interleaved(sensors[:1] * 2, concat._constants.PayloadType.FLOAT64_PAYLOAD))
+        self.assertTrue(np.array_equal([4, 5, 6, 4, 5, 6], self.example_packet.location_sensor()
+                                       .payload_values_longitude()))
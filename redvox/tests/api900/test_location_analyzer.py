@@ -41,6 +41,14 @@ class DataHolderClassTests(unittest.TestCase):
         self.new_dh.add(101.1)
         self.assertEqual(self.new_dh.get_len_data(), 4)
 
+    def test_dh_add_values(self):
+        self.new_dh.add(101.1)
+        self.new_dh.add(0.0)
+        self.assertEqual(self.new_dh.get_len_data(), 5)
+        self.assertEqual(self.new_dh.get_data(), [12, -6, la.EPSILON, 101.1, la.EPSILON])
+        self.assertIsInstance(self.new_dh.get_data_array(), np.ndarray)
+        self.assertEqual(self.new_dh.get_data_array()[3], 101.1)
+
     def test_dh_set_data(self):
         self.new_dh.set_data([-300, 2.5, 0.0])
         self.assertEqual(self.new_dh.get_len_data(), 3)
@@ -357,9 +365,46 @@ class LocationAnalyzerTests(LoadRedvoxTestFiles):
         result = la.validate_point_in_polygon(point_test3, polygon)
         self.assertFalse(result)
 
+    def test_validate_points_in_polygon(self):
+        polygon = [{"lat": 0, "lon": 0}, {"lat": 0, "lon": 10}, {"lat": 10, "lon": 10}, {"lat": 5, "lon": 5},
+                   {"lat": 10, "lon": 0}, {"lat": 0, "lon": 0}]
+        lats = np.linspace(-1, 11, 25)
+        lons = np.linspace(11, -1, 25)
+        lats, lons = np.meshgrid(lats, lons)
+        result = la.validate_points_in_polygon(lats.ravel(), lons.ravel(), polygon)
+        expected = [la.validate_point_in_polygon({"lat": lat, "lon": lon}, polygon)
+                    for lat, lon in zip(lats.ravel(), lons.ravel())]
+        self.assertEqual(result.tolist(), expected)
+        self.assertTrue(0 < np.count_nonzero(result) < result.size)
+
+    def test_validate_blacklist_points(self):
+        lats = np.array([self.valid_gps_point["latitude"], SURVEY_LAT])
+        lons = np.array([self.valid_gps_point["longitude"], SURVEY_LON])
+        alts = np.array([self.valid_gps_point["altitude"], SURVEY_ALT])
+        bar_height = la.compute_barometric_height(self.bar_mean)
+        result = la.validate_blacklist_points(lats, lons, alts, bar_height, self.survey, self.inclusion_ranges)
+        self.assertEqual(result.tolist(), [True, False])
+        result = la.validate_near_points(lats, lons, alts, bar_height, self.survey, self.inclusion_ranges)
+        self.assertEqual(result.tolist(), [False, True])
+
     def test_validate(self):
         valid_data = la.validate(self.gps_data, self.inclusion_ranges, validation_points=BLACKLIST)
         self.assertEqual(valid_data.get_size(), (3, 3))
+        valid_data = la.validate(self.gps_data, self.inclusion_ranges, validation_points=[self.survey])
+        self.assertEqual(valid_data.get_size(), (0, 3))
+
+    def test_validate_all_stations(self):
+        points = [self.survey, blacklist_point1]
+        for validation_type in ["blacklist", "solution"]:
+            results = la.validate_all_stations(self.new_la.all_gps_data, self.inclusion_ranges, validation_type,
+                                               points)
+            self.assertEqual(len(results), 2)
+            for gps_data, result in zip(self.new_la.all_gps_data, results):
+                expected = la.validate(gps_data, self.inclusion_ranges, validation_type, points)
+                self.assertEqual(result.id, gps_data.id)
+                pd.testing.assert_frame_equal(result.gps_df, expected.gps_df)
+        self.assertEqual(la.validate_all_stations([], self.inclusion_ranges, validation_points=points), [])
+        self.assertEqual(la.validate_all_stations(self.new_la.all_gps_data), self.new_la.all_gps_data)
 
     def test_compute_solution_all(self):
         result = la.compute_distance_all(self.survey, self.new_la.all_gps_data)
@@ -1,7 +1,9 @@
+import multiprocessing
 import os
 import unittest
 
 import redvox.api900.reader as reader
+import redvox.settings as settings
 import redvox.tests as test_utils
 
 
@@ -97,3 +99,56 @@ class TestReader(unittest.TestCase):
         self.assertEqual(3, len(grouped["0000000001:123456789"]))
         self.assertEqual(2, len(grouped["foo:bar"]))
 
+
+
+def _buffers(grouped):
+    return {key: [packet.compressed_buffer() for packet in packets] for key, packets in grouped.items()}
+
+
+class TestParallelReader(unittest.TestCase):
+    def setUp(self):
+        self.parallelism_enabled = settings.is_parallelism_enabled()
+
+    def tearDown(self):
+        settings.set_parallelism_enabled(self.parallelism_enabled)
+
+    def test_iter_rdvxz_file_range(self):
+        devices = list(reader.iter_rdvxz_file_range(test_utils.LA_TEST_DATA_DIR))
+        # Devices are yielded in the order of the ids in their file names
+        self.assertEqual(["testios1:2", "testandroid1:2"], [key for key, _ in devices])
+        self.assertEqual(_buffers(dict(devices)), _buffers(reader.read_rdvxz_file_range(test_utils.LA_TEST_DATA_DIR)))
+
+    def test_read_directory_ordered(self):
+        grouped = reader.read_directory(test_utils.TEST_DATA_DIR, max_in_flight_packets=1)
+        timestamps = [packet.app_file_start_timestamp_machine() for packet in grouped["1637680001"]]
+        self.assertEqual(3, len(timestamps))
+        self.assertEqual(sorted(timestamps), timestamps)
+
+    def test_parallel_matches_serial(self):
+        serial_range = _buffers(reader.read_rdvxz_file_range(test_utils.LA_TEST_DATA_DIR,
+                                                             concat_continuous_segments=False))
+        serial_directory = _buffers(reader.read_directory(test_utils.TEST_DATA_DIR))
+        settings.set_parallelism_enabled(True)
+        with multiprocessing.Pool(2) as pool:
+            for max_in_flight_packets in [1, 2, reader.DEFAULT_MAX_IN_FLIGHT_PACKETS]:
+                self.assertEqual(serial_range,
+                                 _buffers(reader.read_rdvxz_file_range(test_utils.LA_TEST_DATA_DIR,
+                                                                       concat_continuous_segments=False,
+                                                                       pool=pool,
+                                                                       max_in_flight_packets=max_in_flight_packets)))
+                self.assertEqual(serial_directory,
+                                 _buffers(reader.read_directory(test_utils.TEST_DATA_DIR,
+                                                                pool,
+                                                                max_in_flight_packets)))
+
+    def test_read_paths_bounded(self):
+        paths = sorted(os.path.join(test_utils.TEST_DATA_DIR, file) for file in os.listdir(test_utils.TEST_DATA_DIR)
+                       if file.endswith(".rdvxz"))
+        with multiprocessing.Pool(2) as pool:
+            packets = reader._read_paths(paths, pool, 2)
+            self.assertEqual(reader.read_rdvxz_file(paths[0]), next(packets))
+            self.assertEqual(list(map(reader.read_rdvxz_file, paths[1:])), list(packets))
+
+    def test_invalid_max_in_flight_packets(self):
+        with self.assertRaises(ValueError):
+            list(reader.iter_rdvxz_file_range(test_utils.LA_TEST_DATA_DIR, max_in_flight_packets=0))
@@ -1,4 +1,5 @@
 import os
+import pickle
 import unittest
 
 from redvox.api900 import reader
@@ -600,3 +601,14 @@ class TestWrappedRedvoxPacket(unittest.TestCase):
 
 
 
+
+    def test_pickle(self):
+        packet = reader.read_rdvxz_file(test_data("1637680001_1532459197088.rdvxz"))
+        unpickled = pickle.loads(pickle.dumps(packet))
+        self.assertEqual(packet, unpickled)
+        self.assertEqual(packet.redvox_packet(), unpickled.redvox_packet())
+        self.assertTrue(numpy.array_equal(packet.microphone_sensor().payload_values(),
+                                          unpickled.microphone_sensor().payload_values()))
+        unpickled.set_redvox_id("foo")
+        self.assertEqual("foo", unpickled.redvox_packet().redvox_id)
+        self.assertEqual(self.empty_packet, pickle.loads(pickle.dumps(self.empty_packet)))
@@ -1,3 +1,4 @@
+import argparse
 import glob
 import os
 import shutil
@@ -5,6 +6,7 @@ import subprocess
 import unittest
 
 import redvox.api900.reader as reader
+import redvox.cli.cli as cli
 from redvox.tests import test_data, TEST_DATA_DIR
 
 if os.name != "nt":
@@ -111,3 +113,17 @@ if os.name != "nt":
             process = subprocess.Popen("python3 -m redvox.cli.cli json-to-rdvxz *.whatever", stderr=subprocess.STDOUT, stdout=subprocess.PIPE, shell=True)
             output = process.communicate()[0].decode()
             self.assertTrue("Invalid path *.whatever" in output)
+
+
+class TestCloudConfigArgs(unittest.TestCase):
+    def test_passed_args(self):
+        args = argparse.Namespace(
+            email="user@redvox.io", password="pass", protocol="http", host="localhost", port=8000, secret_token="s"
+        )
+        config = cli.cloud_config_args(args)
+        self.assertEqual(config.username, "user@redvox.io")
+        self.assertEqual(config.password, "pass")
+        self.assertEqual(config.protocol, "http")
+        self.assertEqual(config.host, "localhost")
+        self.assertEqual(config.port, 8000)
+        self.assertEqual(config.secret_token, "s")
@@ -0,0 +1,157 @@
+"""
+A local stand-in for the RedVox cloud and S3 HTTP servers used by the cloud tests.
+
+Faults can be injected per path and are consumed one per request:
+    "error": respond with a 503
+    "truncate": send the full Content-Length, but only half of the body, then close the connection
+    "slow": wait slow_s seconds before responding
+    "no_range": ignore the Range header and send the full file
+"""
+
+import threading
+import time
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "_Server"
+
+    # pylint: disable=C0103
+    def do_GET(self):
+        self.server.stand_in.handle(self, "GET")
+
+    # pylint: disable=C0103
+    def do_POST(self):
+        self.server.stand_in.handle(self, "POST")
+
+    def log_message(self, *args):
+        pass
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    # Many concurrent clients connect at once, a full backlog delays connections by the SYN retransmit timeout
+    request_queue_size = 128
+    stand_in: "HttpStandIn"
+
+
+class HttpStandIn:
+    """
+    A threaded HTTP server serving in memory files and JSON routes on localhost.
+    """
+
+    def __init__(self, latency_s: float = 0.0, slow_s: float = 1.0):
+        """
+        :param latency_s: latency added to every response in seconds.  Default 0.0
+        :param slow_s: latency added to responses with the "slow" fault in seconds.  Default 1.0
+        """
+        self.files: Dict[str, bytes] = {}
+        self.routes: Dict[str, Callable[[bytes], Tuple[int, bytes]]] = {}
+        self.faults: Dict[str, List[str]] = defaultdict(list)
+        self.requests: List[Tuple[str, str, Dict[str, str]]] = []
+        self.latency_s: float = latency_s
+        self.slow_s: float = slow_s
+        self.in_flight: int = 0
+        self.max_in_flight: int = 0
+        self._lock = threading.Lock()
+        self._server: Optional[_Server] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def __enter__(self) -> "HttpStandIn":
+        self._server = _Server(("127.0.0.1", 0), _Handler)
+        self._server.stand_in = self
+        self._thread = threading.Thread(target=self._server.serve_forever, args=(0.05,), daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *args):
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+    def url(self, path: str = "") -> str:
+        """
+        :param path: path on the server, starting with /
+        :return: the full url of the path on this server
+        """
+        return f"http://127.0.0.1:{self._server.server_address[1]}{path}"
+
+    def requests_for(self, path: str) -> List[Dict[str, str]]:
+        """
+        :param path: the path to get requests for
+        :return: the headers of all requests made to the path
+        """
+        return [headers for _, req_path, headers in self.requests if req_path == path]
+
+    def _next_fault(self, path: str) -> str:
+        with self._lock:
+            faults = self.faults.get(path)
+            return faults.pop(0) if faults else "ok"
+
+    def handle(self, handler: BaseHTTPRequestHandler, method: str):
+        path = handler.path
+        body = b""
+        if method == "POST":
+            body = handler.rfile.read(int(handler.headers.get("Content-Length", 0)))
+        with self._lock:
+            self.requests.append((method, path, dict(handler.headers)))
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            fault = self._next_fault(path)
+            time.sleep(self.latency_s + (self.slow_s if fault == "slow" else 0.0))
+        finally:
+            # The request stops counting before the response is written, since a client may start its next request
+            # as soon as it has read the response
+            with self._lock:
+                self.in_flight -= 1
+        try:
+            if fault == "error":
+                self._respond(handler, 503, b"unavailable")
+            elif path.split("?")[0] in self.routes:
+                status, content = self.routes[path.split("?")[0]](body)
+                self._respond(handler, status, content, "application/json")
+            elif path in self.files:
+                self._send_file(handler, self.files[path], fault)
+            else:
+                self._respond(handler, 404, b"not found")
+        except (BrokenPipeError, ConnectionResetError):
+            # The client gave up on the request, i.e. after a timeout
+            pass
+
+    @staticmethod
+    def _respond(handler: BaseHTTPRequestHandler, status: int, content: bytes, content_type: str = "text/plain"):
+        handler.send_response(status)
+        handler.send_header("Content-Type", content_type)
+        handler.send_header("Content-Length", str(len(content)))
+        handler.end_headers()
+        handler.wfile.write(content)
+
+    @staticmethod
+    def _send_file(handler: BaseHTTPRequestHandler, content: bytes, fault: str):
+        start = 0
+        range_header = handler.headers.get("Range")
+        if range_header is not None and fault != "no_range":
+            start = int(range_header.split("=")[1].split("-")[0])
+            if start >= len(content):
+                handler.send_response(416)
+                handler.send_header("Content-Range", f"bytes */{len(content)}")
+                handler.send_header("Content-Length", "0")
+                handler.end_headers()
+                return
+            handler.send_response(206)
+            handler.send_header("Content-Range", f"bytes {start}-{len(content) - 1}/{len(content)}")
+        else:
+            handler.send_response(200)
+        body = content[start:]
+        handler.send_header("Content-Type", "application/octet-stream")
+        handler.send_header("Content-Length", str(len(body)))
+        handler.end_headers()
+        if fault == "truncate":
+            handler.wfile.write(body[: len(body) // 2])
+            handler.wfile.flush()
+            handler.close_connection = True
+        else:
+            handler.wfile.write(body)
@@ -0,0 +1,138 @@
+import json
+import time
+import unittest
+from typing import Dict, List, Tuple
+
+import redvox.cloud.errors as cloud_errors
+from redvox.cloud.client import CloudClient
+from redvox.cloud.config import RedVoxConfig
+from redvox.cloud.routes import RoutesV1
+from redvox.tests.cloud.http_stand_in import HttpStandIn
+
+DAY: int = 86400
+
+
+def _timing_route(body: bytes) -> Tuple[int, bytes]:
+    req: Dict = json.loads(body)
+    item: Dict = {
+        "station_id": req["station_ids"][0],
+        "start_ts_os": req["start_ts_s"],
+        "start_ts_mach": req["end_ts_s"],
+        "server_ts": 0.0,
+        "mach_time_zero": 0.0,
+        "best_latency": 0.0,
+        "best_offset": 0.0,
+    }
+    return 200, json.dumps([item]).encode()
+
+
+def _status_route(body: bytes) -> Tuple[int, bytes]:
+    req: Dict = json.loads(body)
+    availability: Dict = {
+        "station_id": req["station_ids"][0],
+        "station_uuid": "uuid",
+        "start": req["start_ts_s"],
+        "end": req["end_ts_s"],
+        "total_packets": 1,
+        "expected_packets": 1,
+    }
+    return 200, json.dumps({"station_statuses": [], "data_availabilities": [availability]}).encode()
+
+
+def _metadata_route(body: bytes) -> Tuple[int, bytes]:
+    req: Dict = json.loads(body)
+    metadata: Dict = {"station_id": req["station_ids"][0], "mach_ts": req["start_ts_s"]}
+    return 200, json.dumps({"metadata": [metadata]}).encode()
+
+
+class ChunkedRequestTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.server = HttpStandIn(latency_s=0.05).__enter__()
+        self.server.routes[RoutesV1.TIMING_METADATA_REQ] = _timing_route
+        self.server.routes[RoutesV1.STATION_STATUS_TIMELINE] = _status_route
+        self.server.routes[RoutesV1.METADATA_REQ] = _metadata_route
+        self.clients: List[CloudClient] = []
+
+    def tearDown(self) -> None:
+        for client in self.clients:
+            client.close()
+        self.server.__exit__()
+
+    def client(self, max_concurrent_requests: int = 4, chunk_retries: int = 2) -> CloudClient:
+        config: RedVoxConfig = RedVoxConfig.from_auth_token(
+            "token", "http", "127.0.0.1", int(self.server.url().rsplit(":", 1)[1])
+        )
+        client: CloudClient = CloudClient(
+            config,
+            max_concurrent_requests=max_concurrent_requests,
+            chunk_retries=chunk_retries,
+            retry_backoff_s=0.01,
+        )
+        self.clients.append(client)
+        return client
+
+    def test_timing_metadata_in_chunk_order(self):
+        resp = self.client().request_timing_metadata(0, 20 * DAY, ["1"])
+        self.assertEqual([i * DAY for i in range(20)], [item.start_ts_os for item in resp.items])
+        self.assertEqual([(i + 1) * DAY for i in range(20)], [item.start_ts_mach for item in resp.items])
+
+    def test_in_flight_requests_capped(self):
+        self.client(max_concurrent_requests=3).request_timing_metadata(0, 20 * DAY, ["1"])
+        self.assertEqual(3, self.server.max_in_flight)
+
+    def test_serial_requests(self):
+        self.client(max_concurrent_requests=1).request_timing_metadata(0, 5 * DAY, ["1"])
+        self.assertEqual(1, self.server.max_in_flight)
+
+    def test_concurrent_faster_than_serial(self):
+        start = time.monotonic()
+        self.client(max_concurrent_requests=1).request_metadata(0, 10 * DAY, ["1"], ["station_id"])
+        serial_s = time.monotonic() - start
+        start = time.monotonic()
+        resp = self.client(max_concurrent_requests=10).request_metadata(0, 10 * DAY, ["1"], ["station_id"])
+        concurrent_s = time.monotonic() - start
+        self.assertEqual([i * DAY for i in range(10)], [m.mach_ts for m in resp.metadata])
+        self.assertLess(concurrent_s * 2, serial_s)
+
+    def test_station_statuses_chunked(self):
+        resp = self.client().request_station_statuses(0, 3 * DAY, ["1"], chunk_by_seconds=DAY)
+        self.assertEqual([(0, DAY), (DAY, 2 * DAY), (2 * DAY, 3 * DAY)],
+                         [(a.start, a.end) for a in resp.data_availabilities])
+
+    def test_station_statuses_single_request(self):
+        resp = self.client().request_station_statuses(0, 3 * DAY, ["1"])
+        self.assertEqual([(0, 3 * DAY)], [(a.start, a.end) for a in resp.data_availabilities])
+
+    def test_station_stats_single_request(self):
+        self.server.routes[RoutesV1.STATION_STATS] = lambda body: (200, json.dumps({"station_stats": []}).encode())
+        self.assertEqual([], self.client().request_station_stats(0, 3 * DAY, ["1"]).station_stats)
+        self.assertEqual(1, len(self.server.requests_for(RoutesV1.STATION_STATS)))
+        self.client().request_station_stats(0, 3 * DAY, ["1"], chunk_by_seconds=DAY)
+        self.assertEqual(4, len(self.server.requests_for(RoutesV1.STATION_STATS)))
+
+    def test_chunk_retried(self):
+        self.server.faults[RoutesV1.STATION_STATUS_TIMELINE] = ["slow", "slow"]
+        self.server.slow_s = 0.5
+        client = self.client(max_concurrent_requests=1)
+        client.timeout = 0.1
+        resp = client.request_station_statuses(0, 3 * DAY, ["1"], chunk_by_seconds=DAY)
+        self.assertEqual(3, len(resp.data_availabilities))
+        self.assertEqual(5, len(self.server.requests_for(RoutesV1.STATION_STATUS_TIMELINE)))
+
+    def test_error_response_not_retried(self):
+        self.server.faults[RoutesV1.STATION_STATUS_TIMELINE] = ["error"]
+        client = self.client(max_concurrent_requests=1)
+        self.assertIsNone(client.request_station_statuses(0, 3 * DAY, ["1"], chunk_by_seconds=DAY))
+        self.assertEqual(1, len(self.server.requests_for(RoutesV1.STATION_STATUS_TIMELINE)))
+
+    def test_connection_error_raised(self):
+        self.server.faults[RoutesV1.TIMING_METADATA_REQ] = ["slow"] * 8
+        self.server.slow_s = 0.5
+        client = self.client(chunk_retries=1)
+        client.timeout = 0.1
+        with self.assertRaises(cloud_errors.ApiConnectionError):
+            client.request_timing_metadata(0, 4 * DAY, ["1"])
+
+    def test_invalid_concurrency(self):
+        with self.assertRaises(cloud_errors.CloudApiError):
+            self.client(max_concurrent_requests=0)
@@ -0,0 +1,84 @@
+import contextlib
+import io
+import os
+import queue
+import tempfile
+import unittest
+from typing import List
+
+import lz4.frame
+
+import redvox.cloud.data_client as data_client
+import redvox.cloud.data_io as data_io
+from redvox.tests.cloud.http_stand_in import HttpStandIn
+
+
+def _path(i: int) -> str:
+    return f"/rdvxdata/2021/01/01/00/{1000000000 + i}_1609459200000000.rdvxm?X-Amz-Algorithm=AWS4-HMAC-SHA256"
+
+
+class DataClientTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.server = HttpStandIn(latency_s=0.02).__enter__()
+        for i in range(20):
+            self.server.files[_path(i)] = lz4.frame.compress(bytes([i]) * 1000)
+        self.urls: List[str] = [self.server.url(_path(i)) for i in range(20)]
+        self.out_dir = tempfile.TemporaryDirectory()
+        data_io.log.disabled = True
+
+    def tearDown(self) -> None:
+        data_io.log.disabled = False
+        self.server.__exit__()
+        self.out_dir.cleanup()
+
+    def test_download_files(self):
+        progress: List[data_client.DownloadProgress] = []
+        results = data_client.download_files(self.urls, self.out_dir.name, 0, 4, progress_callback=progress.append)
+        self.assertEqual(20, len(results))
+        self.assertEqual(list(range(1, 21)), [p.completed for p in progress])
+        self.assertEqual(sum(r.resp_len for r in results), progress[-1].total_bytes)
+        for i in range(20):
+            with open(os.path.join(self.out_dir.name, data_io.data_key_from_url(self.urls[i])), "rb") as f_in:
+                self.assertEqual(bytes([i]) * 1000, lz4.frame.decompress(f_in.read()))
+
+    def test_download_files_skips_existing(self):
+        data_client.download_files(self.urls[:5], self.out_dir.name, 0, 4)
+        results = data_client.download_files(self.urls, self.out_dir.name, 0, 4)
+        self.assertEqual(5, len([r for r in results if r.skipped]))
+        self.assertEqual(15, len([r for r in results if not r.skipped and not r.is_failed()]))
+
+    def test_download_files_failed(self):
+        self.server.faults[_path(3)] = ["error"]
+        results = data_client.download_files(self.urls, self.out_dir.name, 0, 4)
+        failed = [r for r in results if r.is_failed()]
+        self.assertEqual(1, len(failed))
+        self.assertEqual(self.urls[3], failed[0].url)
+
+    def test_download_files_max_connections_per_host(self):
+        data_client.download_files(self.urls, self.out_dir.name, 0, 8, max_connections_per_host=2)
+        self.assertLessEqual(self.server.max_in_flight, 2)
+
+    def test_download_files_concurrent(self):
+        data_client.download_files(self.urls, self.out_dir.name, 0, 8)
+        self.assertGreater(self.server.max_in_flight, 1)
+
+    def test_download_files_out_queue(self):
+        out_queue = queue.Queue()
+        data_client.download_files(self.urls, self.out_dir.name, 0, 4, out_queue=out_queue)
+        messages = [out_queue.get_nowait() for _ in range(out_queue.qsize())]
+        self.assertEqual(21, len(messages))
+        self.assertEqual("done", messages[-1])
+
+    def test_download_files_prints_progress(self):
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            data_client.download_files(self.urls, self.out_dir.name, 0, 4)
+        self.assertEqual(20, out.getvalue().count(" / "))
+
+    def test_download_files_num_processes(self):
+        with self.assertWarns(DeprecationWarning):
+            results = data_client.download_files(
+                self.urls, self.out_dir.name, 0, num_processes=2, progress_callback=lambda p: None
+            )
+        self.assertEqual(20, len(results))
+        self.assertLessEqual(self.server.max_in_flight, 2)
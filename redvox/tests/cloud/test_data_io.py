@@ -0,0 +1,133 @@
+import hashlib
+import os
+import tempfile
+import unittest
+
+import lz4.frame
+import numpy as np
+import requests
+
+import redvox.cloud.data_io as data_io
+from redvox.tests.cloud.http_stand_in import HttpStandIn
+
+
+DATA_KEY = "2021/01/01/00/0000000001_1609459200000000.rdvxm"
+PATH = f"/rdvxdata/{DATA_KEY}?X-Amz-Algorithm=AWS4-HMAC-SHA256"
+
+
+class DataIoTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.content: bytes = lz4.frame.compress(np.random.default_rng(0).bytes(200_000))
+        self.server = HttpStandIn(slow_s=0.5).__enter__()
+        self.server.files[PATH] = self.content
+        self.url = self.server.url(PATH)
+        self.out_dir = tempfile.TemporaryDirectory()
+        self.full_path = os.path.join(self.out_dir.name, DATA_KEY)
+        self.session = requests.Session()
+        # Errors are expected and logged by most tests
+        data_io.log.disabled = True
+
+    def tearDown(self) -> None:
+        data_io.log.disabled = False
+        self.session.close()
+        self.server.__exit__()
+        self.out_dir.cleanup()
+
+    def download(self, retries: int = 3, **kwargs):
+        return data_io.download_file(
+            self.url, self.session, self.out_dir.name, retries, base_backoff_s=0.01, chunk_size=1024, **kwargs
+        )
+
+    def assert_downloaded(self, result):
+        self.assertEqual((DATA_KEY, len(self.content)), result)
+        with open(self.full_path, "rb") as f_in:
+            self.assertEqual(self.content, f_in.read())
+        self.assertFalse(os.path.exists(self.full_path + data_io.PARTIAL_FILE_EXT))
+
+    def test_data_key_from_url(self):
+        self.assertEqual(DATA_KEY, data_io.data_key_from_url(self.url))
+        self.assertEqual(
+            "foo/bar.rdvxm",
+            data_io.data_key_from_url("https://rdvxdata.s3.amazonaws.com/foo/bar.rdvxm?AWSAccessKeyId=123"),
+        )
+
+    def test_backoff_bounded(self):
+        self.assertEqual([0.5, 1.0, 2.0, 4.0, 5.0], [data_io.backoff_s(i, 0.5, 5.0) for i in range(5)])
+
+    def test_download(self):
+        self.assert_downloaded(self.download())
+        self.assertEqual(1, len(self.server.requests_for(PATH)))
+
+    def test_download_server_errors(self):
+        self.server.faults[PATH] = ["error", "error"]
+        self.assert_downloaded(self.download())
+        self.assertEqual(3, len(self.server.requests_for(PATH)))
+
+    def test_download_retries_exhausted(self):
+        self.server.faults[PATH] = ["error", "error", "error"]
+        self.assertEqual(("", 0), self.download(retries=2))
+        self.assertFalse(os.path.exists(self.full_path))
+
+    def test_download_truncated_resumes(self):
+        self.server.faults[PATH] = ["truncate"]
+        self.assert_downloaded(self.download())
+        requests_made = self.server.requests_for(PATH)
+        self.assertEqual(2, len(requests_made))
+        self.assertNotIn("Range", requests_made[0])
+        self.assertTrue(requests_made[1]["Range"].startswith("bytes="))
+        self.assertNotEqual("bytes=0-", requests_made[1]["Range"])
+
+    def test_download_resume_ignored_by_server(self):
+        self.server.faults[PATH] = ["truncate", "no_range"]
+        self.assert_downloaded(self.download())
+
+    def test_download_resume_partial_file(self):
+        os.makedirs(os.path.dirname(self.full_path))
+        with open(self.full_path + data_io.PARTIAL_FILE_EXT, "wb") as f_out:
+            f_out.write(self.content[:1000])
+        self.assert_downloaded(self.download())
+        self.assertEqual("bytes=1000-", self.server.requests_for(PATH)[0]["Range"])
+
+    def test_download_oversized_partial_file(self):
+        os.makedirs(os.path.dirname(self.full_path))
+        with open(self.full_path + data_io.PARTIAL_FILE_EXT, "wb") as f_out:
+            f_out.write(self.content + b"extra")
+        self.assert_downloaded(self.download())
+
+    def test_download_slow(self):
+        self.server.faults[PATH] = ["slow"]
+        self.assert_downloaded(self.download(timeout_s=0.1))
+        self.assertEqual(2, len(self.server.requests_for(PATH)))
+
+    def test_download_checksum(self):
+        self.assert_downloaded(self.download(checksum=hashlib.md5(self.content).hexdigest()))
+
+    def test_download_bad_checksum(self):
+        self.assertEqual(("", 0), self.download(retries=1, checksum="0" * 32))
+        self.assertFalse(os.path.exists(self.full_path))
+        self.assertFalse(os.path.exists(self.full_path + data_io.PARTIAL_FILE_EXT))
+
+    def test_download_invalid_lz4(self):
+        self.server.files[PATH] = b"not lz4"
+        self.assertEqual(("", 0), self.download(retries=1))
+        self.assertFalse(os.path.exists(self.full_path))
+
+    def test_existing_valid_file(self):
+        self.download()
+        with self.assertRaises(FileExistsError):
+            self.download()
+
+    def test_existing_corrupt_file_replaced(self):
+        os.makedirs(os.path.dirname(self.full_path))
+        with open(self.full_path, "wb") as f_out:
+            f_out.write(self.content[:1000])
+        self.assert_downloaded(self.download())
+
+    def test_get_file(self):
+        self.server.faults[PATH] = ["error", "truncate"]
+        self.assertEqual(self.content, data_io.get_file(self.url, 2, self.session, base_backoff_s=0.01))
+        self.assertEqual(3, len(self.server.requests_for(PATH)))
+
+    def test_get_file_retries_exhausted(self):
+        self.server.faults[PATH] = ["error", "error"]
+        self.assertIsNone(data_io.get_file(self.url, 1, self.session, base_backoff_s=0.01))
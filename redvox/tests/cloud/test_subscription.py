@@ -0,0 +1,177 @@
+import glob
+import json
+import os
+import threading
+import time
+import unittest
+from collections import defaultdict
+from queue import Empty
+from typing import Dict, List
+
+import lz4.frame
+
+import redvox.cloud.subscription as subscription
+from redvox.api1000.proto.redvox_api_m_pb2 import RedvoxPacketM
+from redvox.cloud.client import CloudClient
+from redvox.cloud.config import RedVoxConfig
+from redvox.tests import TEST_DATA_DIR
+from redvox.tests.cloud.websocket_stand_in import WebSocketStandIn
+
+NUM_MESSAGES: int = 400
+NUM_STATIONS: int = 8
+
+
+def _pub_msg_bytes(file_path: str, body: bytes) -> bytes:
+    header: bytes = json.dumps({"file_path": file_path}).encode()
+    return b"\xc0\xff\xee" + len(header).to_bytes(2, "little") + header + body
+
+
+def _recorded_packets() -> List[bytes]:
+    paths: List[str] = sorted(glob.glob(os.path.join(TEST_DATA_DIR, "**", "*.rdvxm"), recursive=True))
+    packets: List[bytes] = []
+    for path in paths:
+        with open(path, "rb") as f_in:
+            packets.append(f_in.read())
+    return packets
+
+
+def _station_id(packet: bytes) -> str:
+    proto: RedvoxPacketM = RedvoxPacketM()
+    proto.ParseFromString(lz4.frame.decompress(packet))
+    return proto.station_information.id
+
+
+class OverflowQueueTests(unittest.TestCase):
+    def test_block(self):
+        queue = subscription.OverflowQueue(2)
+        queue.put(1)
+        queue.put(2)
+        with self.assertRaises(subscription.Full):
+            queue.put(3, timeout=0.01)
+        self.assertEqual(0, queue.metrics.dropped)
+
+    def test_drop_oldest(self):
+        queue = subscription.OverflowQueue(2, subscription.OverflowPolicy.DROP_OLDEST)
+        for i in range(5):
+            queue.put(i)
+        self.assertEqual([3, 4], [queue.get_nowait() for _ in range(2)])
+        self.assertEqual(5, queue.metrics.received)
+        self.assertEqual(3, queue.metrics.dropped)
+        self.assertEqual(2, queue.metrics.max_queue_size)
+
+    def test_drop_newest(self):
+        queue = subscription.OverflowQueue(2, subscription.OverflowPolicy.DROP_NEWEST)
+        for i in range(5):
+            queue.put(i)
+        self.assertEqual([0, 1], [queue.get_nowait() for _ in range(2)])
+        self.assertEqual(3, queue.metrics.dropped)
+
+    def test_station_key(self):
+        header = subscription.PubHeader("2021/01/01/00/1000000001_1609459200000000.rdvxm")
+        self.assertEqual("1000000001", subscription.PubMsg(header, b"").station_key())
+        self.assertEqual("", subscription.PubMsg(None, b"").station_key())
+
+
+class SubscriptionPipelineTests(unittest.TestCase):
+    def setUp(self) -> None:
+        recorded: List[bytes] = _recorded_packets()
+        self.station_ids: List[str] = [_station_id(packet) for packet in recorded]
+        self.messages: List[bytes] = []
+        self.expected_station_ids: List[str] = []
+        for i in range(NUM_MESSAGES):
+            station: int = i % NUM_STATIONS
+            self.messages.append(
+                _pub_msg_bytes(f"2021/01/01/00/{station}_{i:016d}.rdvxm", recorded[i % len(recorded)])
+            )
+            self.expected_station_ids.append(self.station_ids[i % len(recorded)])
+        self.server = WebSocketStandIn(self.messages).__enter__()
+        self.client = CloudClient(RedVoxConfig.from_auth_token("token", "http", "127.0.0.1", 1))
+        subscription.logger.disabled = True
+
+    def tearDown(self) -> None:
+        subscription.logger.disabled = False
+        self.client.close()
+        self.server.__exit__()
+
+    def subscribe(self, pipeline: subscription.SubscriptionPipeline):
+        threading.Thread(
+            target=subscription.subscribe_bytes_queue,
+            args=(self.server.url(), pipeline.queue, self.client, None, None, pipeline.stop_event),
+            daemon=True,
+        ).start()
+
+    def drain(self, pipeline: subscription.SubscriptionPipeline) -> List[subscription.PubMsg]:
+        self.assertTrue(self.server.replayed.wait(10))
+        while pipeline.metrics().received < NUM_MESSAGES:
+            time.sleep(0.01)
+        pub_msgs: List[subscription.PubMsg] = []
+        try:
+            while True:
+                pub_msgs.append(pipeline.get(timeout=0.5))
+        except Empty:
+            pipeline.close()
+        return pub_msgs
+
+    def assert_station_order(self, pub_msgs: List[subscription.PubMsg]):
+        by_station: Dict[str, List[int]] = defaultdict(list)
+        for pub_msg in pub_msgs:
+            index: int = int(pub_msg.header.file_path.split("_")[1].split(".")[0])
+            self.assertEqual(self.expected_station_ids[index], pub_msg.msg.station_information.id)
+            by_station[pub_msg.station_key()].append(index)
+        for indices in by_station.values():
+            self.assertEqual(sorted(indices), indices)
+
+    def test_subscribe_proto_block(self):
+        pipeline = subscription.SubscriptionPipeline(16, subscription.OverflowPolicy.BLOCK, 4)
+        # Ends the subscription if messages are lost
+        timer = threading.Timer(10, pipeline.close)
+        timer.start()
+        pub_msgs: List[subscription.PubMsg] = []
+        for pub_msg in subscription.subscribe_proto(self.server.url(), self.client, None, None, pipeline):
+            pub_msgs.append(pub_msg)
+            if len(pub_msgs) == NUM_MESSAGES:
+                break
+        timer.cancel()
+        pipeline.close()
+
+        self.assertEqual(NUM_MESSAGES, len(pub_msgs))
+        self.assert_station_order(pub_msgs)
+        self.assertTrue(self.server.paths[0].startswith("/?auth_token=token"))
+        metrics = pipeline.metrics()
+        self.assertEqual(NUM_MESSAGES, metrics.received)
+        self.assertEqual(NUM_MESSAGES, metrics.decoded)
+        self.assertEqual(NUM_MESSAGES, metrics.delivered)
+        self.assertEqual(0, metrics.dropped)
+        self.assertLessEqual(metrics.max_queue_size, 16)
+        self.assertGreater(metrics.mean_latency_s(), 0.0)
+        self.assertGreaterEqual(metrics.max_latency_s, metrics.mean_latency_s())
+        self.assertGreater(metrics.delivered_per_s(), 0.0)
+
+    def test_drop_newest(self):
+        pipeline = subscription.SubscriptionPipeline(8, subscription.OverflowPolicy.DROP_NEWEST, 2)
+        self.subscribe(pipeline)
+        pub_msgs = self.drain(pipeline)
+        metrics = pipeline.metrics()
+        self.assertGreater(metrics.dropped, 0)
+        self.assertEqual(NUM_MESSAGES, len(pub_msgs) + metrics.dropped)
+        self.assertIn("2021/01/01/00/0_0000000000000000.rdvxm", [m.header.file_path for m in pub_msgs])
+        self.assert_station_order(pub_msgs)
+
+    def test_drop_oldest(self):
+        pipeline = subscription.SubscriptionPipeline(8, subscription.OverflowPolicy.DROP_OLDEST, 2)
+        self.subscribe(pipeline)
+        pub_msgs = self.drain(pipeline)
+        metrics = pipeline.metrics()
+        self.assertGreater(metrics.dropped, 0)
+        self.assertEqual(NUM_MESSAGES, len(pub_msgs) + metrics.dropped)
+        last_path: str = f"2021/01/01/00/{(NUM_MESSAGES - 1) % NUM_STATIONS}_{NUM_MESSAGES - 1:016d}.rdvxm"
+        self.assertIn(last_path, [m.header.file_path for m in pub_msgs])
+        self.assert_station_order(pub_msgs)
+
+    def test_decode_errors_counted(self):
+        self.server.messages = [_pub_msg_bytes("0_0.rdvxm", b"not lz4")] + self.messages[: NUM_MESSAGES - 1]
+        pipeline = subscription.SubscriptionPipeline(NUM_MESSAGES)
+        self.subscribe(pipeline)
+        pub_msgs = self.drain(pipeline)
+        self.assertEqual(NUM_MESSAGES - 1, len(pub_msgs))
+        self.assertEqual(1, pipeline.metrics().decode_errors)
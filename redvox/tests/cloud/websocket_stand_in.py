@@ -0,0 +1,116 @@
+"""
+A local stand-in for the RedVox acquisition subscription websocket server used by the cloud tests.
+
+Every connection is sent all messages as binary frames as fast as possible, then held open until the client sends a
+close frame or the stand-in is stopped.
+"""
+
+import base64
+import hashlib
+import socket
+import struct
+import threading
+from typing import List, Optional
+
+_WS_GUID: bytes = b"258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+
+def _frame(payload: bytes, opcode: int = 0x2) -> bytes:
+    """
+    :param payload: the payload of the frame
+    :param opcode: the frame opcode.  Default 0x2 (binary)
+    :return: an unmasked, final websocket frame containing the payload
+    """
+    header: bytes = bytes([0x80 | opcode])
+    if len(payload) < 126:
+        header += bytes([len(payload)])
+    elif len(payload) < 2**16:
+        header += bytes([126]) + struct.pack(">H", len(payload))
+    else:
+        header += bytes([127]) + struct.pack(">Q", len(payload))
+    return header + payload
+
+
+class WebSocketStandIn:
+    """
+    A websocket server on localhost that replays a list of messages to every connection.
+    """
+
+    def __init__(self, messages: List[bytes]):
+        """
+        :param messages: the messages to send to each connection
+        """
+        self.messages: List[bytes] = messages
+        self.paths: List[str] = []
+        self.replayed: threading.Event = threading.Event()
+        self._stop: threading.Event = threading.Event()
+        self._sock: Optional[socket.socket] = None
+        self._threads: List[threading.Thread] = []
+
+    def __enter__(self) -> "WebSocketStandIn":
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._sock.bind(("127.0.0.1", 0))
+        self._sock.listen()
+        self._sock.settimeout(0.05)
+        thread = threading.Thread(target=self._accept, daemon=True)
+        thread.start()
+        self._threads.append(thread)
+        return self
+
+    def __exit__(self, *args):
+        self._stop.set()
+        for thread in self._threads:
+            thread.join()
+        self._sock.close()
+
+    def url(self, path: str = "/") -> str:
+        """
+        :param path: path on the server, starting with /
+        :return: the websocket url of the path on this server
+        """
+        return f"ws://127.0.0.1:{self._sock.getsockname()[1]}{path}"
+
+    def _accept(self):
+        while not self._stop.is_set():
+            try:
+                conn, _ = self._sock.accept()
+            except socket.timeout:
+                continue
+            thread = threading.Thread(target=self._serve, args=(conn,), daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def _serve(self, conn: socket.socket):
+        try:
+            request: bytes = b""
+            while b"\r\n\r\n" not in request:
+                request += conn.recv(4096)
+            lines: List[str] = request.decode("utf-8").split("\r\n")
+            self.paths.append(lines[0].split(" ")[1])
+            key: bytes = [
+                line.split(":", 1)[1].strip() for line in lines if line.lower().startswith("sec-websocket-key:")
+            ][0].encode()
+            accept: str = base64.b64encode(hashlib.sha1(key + _WS_GUID).digest()).decode()
+            conn.sendall(
+                (
+                    "HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                    f"Sec-WebSocket-Accept: {accept}\r\n\r\n"
+                ).encode()
+            )
+            for message in self.messages:
+                conn.sendall(_frame(message))
+            self.replayed.set()
+            # The subscription client only ever sends a close frame, so wait for any data or the stand-in to stop
+            conn.settimeout(0.05)
+            while not self._stop.is_set():
+                try:
+                    conn.recv(4096)
+                    break
+                except socket.timeout:
+                    continue
+            conn.sendall(_frame(b"", 0x8))
+        except OSError:
+            # The client went away
+            pass
+        finally:
+            conn.close()
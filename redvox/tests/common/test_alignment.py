@@ -0,0 +1,84 @@
+"""
+tests for alignment
+"""
+import contextlib
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+import redvox.tests as tests
+from redvox.common import alignment
+from redvox.common import api_reader
+from redvox.common.gap_and_pad_utils import calc_evenly_sampled_timestamps
+from redvox.common.io import ReadFilter
+from redvox.common.sensor_data import SensorType
+
+
+class AlignSamplesTest(unittest.TestCase):
+    def test_align_samples(self):
+        timestamps = np.array([0.0, 10.0, 20.0, 50.0, 60.0, 70.0])
+        values = np.array([0.0, 1.0, 2.0, 5.0, np.nan, 7.0])
+        grid = np.arange(-10.0, 90.0, 5.0)
+        result, valid = alignment.align_samples(timestamps, values, grid, 15.0)
+        self.assertEqual(result.size, grid.size)
+        np.testing.assert_array_equal(grid[valid], [0.0, 5.0, 10.0, 15.0, 20.0, 50.0, 70.0])
+        np.testing.assert_array_almost_equal(result[valid], [0.0, 0.5, 1.0, 1.5, 2.0, 5.0, 7.0])
+        self.assertTrue(np.all(np.isnan(result[~valid])))
+
+    def test_align_samples_empty(self):
+        result, valid = alignment.align_samples(np.array([]), np.array([]), np.arange(5.0), 1.0)
+        self.assertTrue(np.all(np.isnan(result)))
+        self.assertFalse(np.any(valid))
+
+
+class AlignChannelTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        with contextlib.redirect_stdout(None):
+            reader = api_reader.ApiReader(
+                tests.TEST_DATA_DIR,
+                False,
+                ReadFilter(extensions={".rdvxm"}, station_ids={"0000000001"}),
+            )
+            cls.station = reader.get_station_by_id("0000000001")[0]
+        cls.key = cls.station.default_station_json_file_name()
+        cls.audio = cls.station.audio_sensor()
+
+    def test_align_channel(self):
+        result = alignment.align_channel([self.station], SensorType.AUDIO, "microphone")
+        self.assertEqual(result.station_keys, [self.key])
+        self.assertEqual(result.values.shape, (1, result.timestamps.size))
+        self.assertEqual(result.valid.shape, result.values.shape)
+        self.assertEqual(result.timestamps[0], self.audio.first_data_timestamp())
+        # epoch microseconds are stored with a resolution of 0.25, so the spacing isn't exactly the sample interval
+        np.testing.assert_array_equal(
+            result.timestamps,
+            calc_evenly_sampled_timestamps(
+                self.audio.first_data_timestamp(), result.timestamps.size, 1e6 / self.audio.sample_rate_hz()
+            ),
+        )
+        values, valid = result.get(self.key)
+        self.assertTrue(np.any(valid))
+        audio = self.audio.get_microphone_data()
+        self.assertEqual(values[0], audio[0])
+        self.assertTrue(np.all((values[valid] >= np.nanmin(audio)) & (values[valid] <= np.nanmax(audio))))
+        self.assertIsNone(result.get("not_a_station"))
+
+    def test_align_channel_no_sensor(self):
+        result = alignment.align_channel([self.station], SensorType.LIGHT, "light", 10.0, 0.0, 1e6)
+        self.assertEqual(result.values.shape, (1, 10))
+        self.assertFalse(np.any(result.valid))
+
+    def test_align_channel_out_path(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            out_path = os.path.join(tmp_dir, "audio.npy")
+            in_memory = alignment.align_channel([self.station, self.station], SensorType.AUDIO, "microphone", 80.0)
+            result = alignment.align_channel(
+                [self.station, self.station], SensorType.AUDIO, "microphone", 80.0, out_path=out_path
+            )
+            self.assertIsInstance(result.values, np.memmap)
+            np.testing.assert_array_equal(np.load(out_path), in_memory.values)
+            np.testing.assert_array_equal(np.load(alignment.valid_mask_path(out_path)), in_memory.valid)
+            del result
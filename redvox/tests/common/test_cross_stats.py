@@ -2,8 +2,11 @@
  cross correlation test module
 """
 
+import multiprocessing
 import unittest
 import redvox.common.cross_stats as cs
+import redvox.settings as settings
+from redvox.common.errors import RedVoxError
 import numpy as np
 
 SIGNAL_LENGTH = 100   # number of elements in signal
@@ -51,3 +54,66 @@ class CrossCorrelationTests(unittest.TestCase):
         self.assertAlmostEqual(xcorr_normalized_max, 0.9855, 4)
         self.assertEqual(xcorr_offset_samples, -10)
         self.assertEqual(xcorr_offset_seconds, -0.125)
+
+
+class BatchCrossCorrelationTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.parallelism_enabled = settings.is_parallelism_enabled()
+        rng = np.random.default_rng(0)
+        base = rng.normal(size=SIGNAL_LENGTH + 50)
+        # Shifted, noisy copies of the same signal with even and odd lengths
+        self.sigs = np.stack([base[i * 7:i * 7 + SIGNAL_LENGTH] + 0.1 * rng.normal(size=SIGNAL_LENGTH)
+                              for i in range(5)])
+        self.odd_sigs = self.sigs[:, :-1]
+
+    def tearDown(self) -> None:
+        settings.set_parallelism_enabled(self.parallelism_enabled)
+
+    def test_xcorr_all_batch(self):
+        for sigs in (self.sigs, self.odd_sigs):
+            xcorr_indexes, xcorr, xcorr_offset_index, xcorr_offset_samples = cs.xcorr_all_batch(sigs, sigs[2], 2)
+            self.assertEqual(xcorr.shape, sigs.shape)
+            for i, sig in enumerate(sigs):
+                expected = cs.xcorr_all(sig, sigs[2])
+                self.assertTrue(np.array_equal(expected[0], xcorr_indexes))
+                self.assertTrue(np.allclose(expected[1], xcorr[i]))
+                self.assertEqual(expected[2], xcorr_offset_index[i])
+                self.assertEqual(expected[3], xcorr_offset_samples[i])
+
+    def test_xcorr_main_batch(self):
+        xcorr_normalized_max, xcorr_offset_samples, xcorr_offset_seconds = \
+            cs.xcorr_main_batch(self.sigs, self.sigs[0], SAMPLE_RATE, 3)
+        self.assertEqual([0, 7, 14, 21, 28], list(xcorr_offset_samples))
+        for i, sig in enumerate(self.sigs):
+            expected = cs.xcorr_main(sig, self.sigs[0], SAMPLE_RATE)
+            self.assertAlmostEqual(expected[0], xcorr_normalized_max[i])
+            self.assertEqual(expected[2], xcorr_offset_seconds[i])
+
+    def test_xcorr_main_batch_single_precision(self):
+        sigs = self.sigs.astype(np.float32)
+        xcorr_normalized_max, xcorr_offset_samples, _ = cs.xcorr_main_batch(sigs, sigs[0], SAMPLE_RATE)
+        expected = cs.xcorr_main_batch(self.sigs, self.sigs[0], SAMPLE_RATE)
+        self.assertTrue(np.allclose(expected[0], xcorr_normalized_max, atol=1e-5))
+        self.assertTrue(np.array_equal(expected[1], xcorr_offset_samples))
+
+    def test_xcorr_pairs(self):
+        for sigs in (self.sigs, self.odd_sigs):
+            xcorr_normalized_max, xcorr_offset_samples, xcorr_offset_seconds = cs.xcorr_pairs(sigs, SAMPLE_RATE)
+            for i in range(len(sigs)):
+                for j in range(len(sigs)):
+                    expected = cs.xcorr_main(sigs[i], sigs[j], SAMPLE_RATE)
+                    self.assertAlmostEqual(expected[0], xcorr_normalized_max[i, j])
+                    self.assertEqual(expected[1], xcorr_offset_samples[i, j])
+                    self.assertEqual(expected[2], xcorr_offset_seconds[i, j])
+
+    def test_xcorr_pairs_parallel(self):
+        settings.set_parallelism_enabled(True)
+        with multiprocessing.Pool(2) as pool:
+            parallel = cs.xcorr_pairs(self.sigs, SAMPLE_RATE, pool)
+        serial = cs.xcorr_pairs(self.sigs, SAMPLE_RATE)
+        for parallel_result, serial_result in zip(parallel, serial):
+            self.assertTrue(np.array_equal(parallel_result, serial_result))
+
+    def test_mismatched_reference(self):
+        with self.assertRaises(RedVoxError):
+            cs.xcorr_main_batch(self.sigs, self.odd_sigs[0], SAMPLE_RATE)
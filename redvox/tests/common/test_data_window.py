@@ -2,10 +2,16 @@
 tests for data window objects
 """
 import unittest
+from datetime import timedelta
+from unittest import mock
+
+import numpy as np
+import pyarrow as pa
 
 import redvox.tests as tests
 import redvox.common.date_time_utils as dt
 from redvox.common import data_window as dw
+from redvox.common.sensor_data import SensorData, SensorType
 
 
 class EventOriginTest(unittest.TestCase):
@@ -110,6 +116,90 @@ class DataWindowTest(unittest.TestCase):
         self.assertEqual("1637650010", first_station.id())
 
 
+class DataWindowSlideTest(unittest.TestCase):
+    @staticmethod
+    def _window(start_s: float, end_s: float, buffer_s: float = 5.1, apply_correction: bool = False) -> dw.DataWindow:
+        # by default the buffers are longer than the 5 second packets of the station
+        return dw.DataWindow(
+            config=dw.DataWindowConfig(
+                input_dir=tests.TEST_DATA_DIR,
+                structured_layout=False,
+                station_ids={"0000000001"},
+                start_datetime=dt.datetime_from_epoch_seconds_utc(start_s),
+                end_datetime=dt.datetime_from_epoch_seconds_utc(end_s),
+                start_buffer_td=timedelta(seconds=buffer_s),
+                end_buffer_td=timedelta(seconds=buffer_s),
+                apply_correction=apply_correction,
+            )
+        )
+
+    def assert_same_station(self, window: dw.DataWindow, expected: dw.DataWindow):
+        self.assertEqual(window.station_ids(), expected.station_ids())
+        station = window.get_station("0000000001")[0]
+        expected_station = expected.get_station("0000000001")[0]
+        for sensor in expected_station.data():
+            result = [s for s in station.data() if s.type() == sensor.type()][0]
+            self.assertEqual(result.num_samples(), sensor.num_samples())
+            np.testing.assert_array_almost_equal(result.data_timestamps(), sensor.data_timestamps(), decimal=0)
+        np.testing.assert_array_equal(
+            station.audio_sensor().get_microphone_data(), expected_station.audio_sensor().get_microphone_data()
+        )
+
+    def test_slide(self):
+        window = self._window(1597189458, 1597189463.5)
+        window.slide(dt.datetime_from_epoch_seconds_utc(1597189460), dt.datetime_from_epoch_seconds_utc(1597189468))
+        self.assertEqual(window.config().start_datetime, dt.datetime_from_epoch_seconds_utc(1597189460))
+        self.assertEqual(len(window._read_files), 2)
+        self.assert_same_station(window, self._window(1597189460, 1597189468))
+
+    def test_extend_to(self):
+        window = self._window(1597189458, 1597189463.5)
+        window.extend_to(dt.datetime_from_epoch_seconds_utc(1597189468))
+        self.assert_same_station(window, self._window(1597189458, 1597189468))
+
+    def test_slide_short_buffer(self):
+        # the packet ending after the old end is read again
+        window = self._window(1597189456, 1597189461, buffer_s=0.5)
+        window.slide(dt.datetime_from_epoch_seconds_utc(1597189459), dt.datetime_from_epoch_seconds_utc(1597189466))
+        self.assert_same_station(window, self._window(1597189459, 1597189466, buffer_s=0.5))
+
+    def test_extend_to_corrected(self):
+        window = self._window(1597189458, 1597189463.5, buffer_s=2.0, apply_correction=True)
+        window.extend_to(dt.datetime_from_epoch_seconds_utc(1597189468))
+        self.assert_same_station(window, self._window(1597189458, 1597189468, buffer_s=2.0, apply_correction=True))
+
+    def test_slide_back(self):
+        window = self._window(1597189460, 1597189468)
+        window.slide(dt.datetime_from_epoch_seconds_utc(1597189455), dt.datetime_from_epoch_seconds_utc(1597189460))
+        self.assert_same_station(window, self._window(1597189455, 1597189460))
+
+    def test_slide_invalid(self):
+        window = self._window(1597189458, 1597189463.5)
+        with self.assertRaises(ValueError):
+            window.slide(dt.datetime_from_epoch_seconds_utc(1597189465), dt.datetime_from_epoch_seconds_utc(1597189460))
+
+    def test_slide_failed(self):
+        window = self._window(1597189458, 1597189463.5)
+        with mock.patch.object(window, "_slide_forward", side_effect=OSError("unreadable")):
+            with self.assertRaises(OSError):
+                window.slide(
+                    dt.datetime_from_epoch_seconds_utc(1597189460), dt.datetime_from_epoch_seconds_utc(1597189468)
+                )
+        self.assertEqual(window.config().start_datetime, dt.datetime_from_epoch_seconds_utc(1597189458))
+        self.assertEqual(window.config().end_datetime, dt.datetime_from_epoch_seconds_utc(1597189463.5))
+
+    def test_append_rows_keeps_nan_samples(self):
+        # only the padded rows are removed, not NaN samples of the data
+        timestamps = np.array([0.0, 1000.0, 2000.0])
+        table = pa.Table.from_pydict(
+            {"timestamps": timestamps, "unaltered_timestamps": timestamps, "microphone": [1.0, np.nan, np.nan]}
+        )
+        sensor = SensorData("audio", table, SensorType.AUDIO, 1000.0, 0.001, 0.0, True)
+        new_sensor = SensorData("audio", table.slice(0, 0), SensorType.AUDIO, 1000.0, 0.001, 0.0, True)
+        self.assertIsNone(dw.DataWindow._append_rows(sensor, new_sensor, 1, 5.0))
+        np.testing.assert_array_equal(sensor.get_data_channel("microphone"), [1.0, np.nan])
+
+
 # doesn't work with test module, but works on its own.
 # class DataWindowConfigFileTest(unittest.TestCase):
 #     def test_load(self):
@@ -2,9 +2,23 @@
 Redvox file helper test module
 """
 
+import dataclasses
+import math
+import multiprocessing
+import os
+import shutil
+import tempfile
 import unittest
+from typing import List
 
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+import redvox.settings as settings
 from redvox.common import file_statistics
+from redvox.common.io import Index, index_unstructured
+from redvox.tests import TEST_DATA_DIR
 
 
 class RdvxFileHelperTests(unittest.TestCase):
@@ -26,3 +40,84 @@ class RdvxFileHelperTests(unittest.TestCase):
         self.assertEqual(40.96, file_statistics.get_duration_seconds_from_sample_rate(800))
         self.assertEqual(32.768, file_statistics.get_duration_seconds_from_sample_rate(8000))
         self.assertRaises(ValueError, file_statistics.get_duration_seconds_from_sample_rate, 100)
+
+
+class StationStatsTableTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.index = index_unstructured(TEST_DATA_DIR)
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.parallelism_enabled = settings.is_parallelism_enabled()
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+        settings.set_parallelism_enabled(self.parallelism_enabled)
+
+    def assert_stats_equal(self, stats: List[file_statistics.StationStat]):
+        expected = file_statistics.extract_stats_serial(self.index)
+        self.assertEqual(len(expected), len(stats))
+        key = lambda stat: (stat.station_id, stat.packet_start_dt)
+        for stat, expected_stat in zip(sorted(stats, key=key), sorted(expected, key=key)):
+            for field in dataclasses.fields(stat):
+                value = getattr(stat, field.name)
+                expected_value = getattr(expected_stat, field.name)
+                if isinstance(expected_value, float) and math.isnan(expected_value):
+                    self.assertTrue(math.isnan(value))
+                else:
+                    self.assertEqual(expected_value, value)
+
+    def assert_tables_equal(self, expected: pa.Table, table: pa.Table):
+        self.assertEqual(expected.schema, table.schema)
+        for name in ["gps_mach_ts", "gps_ts"]:
+            self.assertEqual(expected[name].to_pylist(), table[name].to_pylist())
+        for name in expected.drop(["gps_mach_ts", "gps_ts"]).column_names:
+            np.testing.assert_array_equal(expected[name].to_numpy(), table[name].to_numpy())
+
+    def test_extract_stats_table(self):
+        table = file_statistics.extract_stats_table(self.index)
+        self.assertEqual(file_statistics.STATION_STATS_SCHEMA, table.schema)
+        self.assertEqual(len(self.index.entries), table.num_rows)
+        self.assertEqual({"900", "1000"}, set(table["api_version"].to_pylist()))
+        self.assert_stats_equal(file_statistics.stats_from_table(table))
+
+    def test_extract_stats_table_shards(self):
+        table = file_statistics.extract_stats_table(self.index)
+        settings.set_parallelism_enabled(True)
+        with multiprocessing.Pool(2) as pool:
+            sharded = file_statistics.extract_stats_table(self.index, pool, shard_size=2)
+        self.assert_tables_equal(table, sharded)
+        with self.assertRaises(ValueError):
+            file_statistics.extract_stats_table(self.index, shard_size=0)
+
+    def test_extract_stats_table_empty(self):
+        table = file_statistics.extract_stats_table(Index())
+        self.assertEqual(0, table.num_rows)
+        self.assertEqual(file_statistics.STATION_STATS_SCHEMA, table.schema)
+
+    def test_extract_stats_table_cache(self):
+        cache_path = os.path.join(self.temp_dir.name, "stats.parquet")
+        table = file_statistics.extract_stats_table(self.index, cache_path=cache_path)
+        self.assertTrue(os.path.exists(cache_path))
+        # a matching cache is read instead of the files
+        cached = pq.read_table(cache_path)
+        pq.write_table(cached.slice(0, 1).replace_schema_metadata(cached.schema.metadata), cache_path)
+        self.assertEqual(1, file_statistics.extract_stats_table(self.index, cache_path=cache_path).num_rows)
+        # a different index replaces the cache
+        smaller = Index(self.index.entries[:2])
+        self.assertEqual(2, file_statistics.extract_stats_table(smaller, cache_path=cache_path).num_rows)
+        self.assertEqual(2, pq.read_table(cache_path).num_rows)
+        self.assert_tables_equal(table, file_statistics.extract_stats_table(self.index, cache_path=cache_path))
+
+    def test_extract_stats_table_cache_modified(self):
+        cache_path = os.path.join(self.temp_dir.name, "stats.parquet")
+        data_dir = os.path.join(self.temp_dir.name, "data")
+        os.makedirs(data_dir)
+        entry = self.index.entries[0]
+        path = os.path.join(data_dir, os.path.basename(entry.full_path))
+        shutil.copyfile(entry.full_path, path)
+        index = index_unstructured(data_dir)
+        file_statistics.extract_stats_table(index, cache_path=cache_path)
+        cached = pq.read_table(cache_path)
+        pq.write_table(cached.slice(0, 0).replace_schema_metadata(cached.schema.metadata), cache_path)
+        # a file rewritten with the same size replaces the cache
+        os.utime(path, ns=(os.stat(path).st_atime_ns, os.stat(path).st_mtime_ns + 10**9))
+        self.assertEqual(1, file_statistics.extract_stats_table(index, cache_path=cache_path).num_rows)
@@ -0,0 +1,76 @@
+"""
+tests for frames
+"""
+import contextlib
+import unittest
+from unittest import mock
+
+import numpy as np
+import pyarrow as pa
+
+import redvox.tests as tests
+from redvox.common import api_reader
+from redvox.common import frames
+from redvox.common.io import ReadFilter
+from redvox.common.sensor_data import SensorData, SensorType
+
+
+class FramesTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        with contextlib.redirect_stdout(None):
+            reader = api_reader.ApiReader(
+                tests.TEST_DATA_DIR,
+                False,
+                ReadFilter(extensions={".rdvxm"}, station_ids={"0000000001"}),
+            )
+            cls.station = reader.get_station_by_id("0000000001")[0]
+        cls.key = cls.station.default_station_json_file_name()
+
+    def test_frame_bounds(self):
+        self.assertEqual(list(frames.frame_bounds(0.0, 2.5e6, 1.0)), [(0.0, 1e6), (1e6, 2e6), (2e6, 3e6)])
+        self.assertEqual(len(list(frames.frame_bounds(0.0, 2.5e6, 1.0, 0.5))), 5)
+        self.assertEqual(list(frames.frame_bounds(np.nan, np.nan, 1.0)), [])
+        with self.assertRaises(ValueError):
+            list(frames.frame_bounds(0.0, 2.5e6, 1.0, 1.0))
+
+    def test_iter_frames(self):
+        audio = self.station.audio_sensor().pyarrow_table()
+        result = list(self.station.iter_frames(1.0, sensor_types=[SensorType.AUDIO]))
+        self.assertGreater(len(result), 1)
+        self.assertEqual(list(result[0].data[self.key].keys()), [SensorType.AUDIO])
+        self.assertTrue(pa.concat_tables([f.get(self.key, SensorType.AUDIO) for f in result]).equals(audio))
+        for frame in result:
+            timestamps = frame.get(self.key, SensorType.AUDIO)["timestamps"].to_numpy()
+            self.assertTrue(np.all((timestamps >= frame.start_timestamp) & (timestamps < frame.end_timestamp)))
+        self.assertIsNone(result[0].get(self.key, SensorType.ACCELEROMETER))
+
+    def test_iter_frames_overlap(self):
+        result = list(self.station.iter_frames(2.0, 1.0, [SensorType.AUDIO]))
+        self.assertEqual(result[1].start_timestamp - result[0].start_timestamp, 1e6)
+        self.assertEqual(result[0].end_timestamp - result[0].start_timestamp, 2e6)
+        audio = self.station.audio_sensor()
+        for frame in result:
+            self.assertTrue(
+                frame.get(self.key, SensorType.AUDIO).equals(
+                    audio.time_range_table(frame.start_timestamp, frame.end_timestamp)
+                )
+            )
+
+    def test_iter_frames_small_batches(self):
+        audio = self.station.audio_sensor()
+        with mock.patch.object(frames, "FRAME_BATCH_ROWS", 1000):
+            result = list(self.station.iter_frames(0.5, sensor_types=[SensorType.AUDIO]))
+        for frame in result:
+            self.assertTrue(
+                frame.get(self.key, SensorType.AUDIO).equals(
+                    audio.time_range_table(frame.start_timestamp, frame.end_timestamp)
+                )
+            )
+
+    def test_sensor_without_data(self):
+        sensor_frames = frames._SensorFrames(SensorData("empty", sensor_type=SensorType.PRESSURE))
+        for start in [0.0, 1e6]:
+            table = sensor_frames.read(start, start + 1e6)
+            self.assertEqual(table.num_rows, 0)
+            self.assertIn("timestamps", table.column_names)
@@ -105,3 +105,52 @@ class AudioGapFillTest(unittest.TestCase):
                    ]
         result = gpu.fill_audio_gaps(my_data, self.sample_interval)
         self.assertEqual(len(result.errors.get()), 1)
+
+
+class TimingSegmentsTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.timestamps = np.concatenate([gpu.calc_evenly_sampled_timestamps(1.6e15 + 0.1, 100, 1e6 / 48000.),
+                                          gpu.calc_evenly_sampled_timestamps(1.6e15 + 5e6, 50, 1e6 / 48000.)])
+
+    def test_from_timestamps(self):
+        segments = gpu.TimingSegments.from_timestamps(self.timestamps, 1e6 / 48000.)
+        self.assertEqual(len(segments.starts), 2)
+        self.assertEqual(segments.num_samples(), 150)
+        self.assertTrue(np.array_equal(segments.timestamps(), self.timestamps))
+        self.assertEqual(segments.first_timestamp(), self.timestamps[0])
+        self.assertEqual(segments.last_timestamp(), self.timestamps[-1])
+
+    def test_from_packet_timestamps(self):
+        # each packet's timestamps are computed from its own start; some packets continue the previous one for a sample
+        interval = 1e6 / 48000.
+        timestamps = np.concatenate([gpu.calc_evenly_sampled_timestamps(1.6e15 + i * 4096 * interval, 4096, interval)
+                                     for i in range(20)])
+        segments = gpu.TimingSegments.from_timestamps(timestamps, interval)
+        self.assertLessEqual(len(segments.starts), 20)
+        self.assertTrue(np.array_equal(segments.timestamps(), timestamps))
+
+    def test_uneven_timestamps(self):
+        self.assertIsNone(gpu.TimingSegments.from_timestamps(np.cumsum(np.arange(1., 200.)), 10.))
+        self.assertIsNone(gpu.TimingSegments.from_timestamps(np.array([1., np.nan]), 10.))
+
+    def test_slice(self):
+        segments = gpu.TimingSegments.from_timestamps(self.timestamps, 1e6 / 48000.)
+        sliced = segments.slice(37, 120)
+        self.assertTrue(np.array_equal(sliced.timestamps(), self.timestamps[37:120]))
+        self.assertEqual(len(segments.slice(10, 10).starts), 0)
+        resliced = gpu.TimingSegments.from_timestamps(self.timestamps[37:120], 1e6 / 48000., segments)
+        self.assertEqual(len(resliced.starts), 2)
+        self.assertTrue(np.array_equal(resliced.first_indices, [37, 0]))
+
+    def test_search(self):
+        segments = gpu.TimingSegments.from_timestamps(self.timestamps, 1e6 / 48000.)
+        sliced = segments.slice(37, 120)
+        for timestamp in [0., self.timestamps[0], self.timestamps[50] + 1., self.timestamps[99] + 100.,
+                          self.timestamps[100], self.timestamps[120], self.timestamps[-1] + 1e6]:
+            self.assertEqual(segments.search(timestamp), np.searchsorted(self.timestamps, timestamp))
+            self.assertEqual(sliced.search(timestamp), np.searchsorted(self.timestamps[37:120], timestamp))
+
+    def test_dict(self):
+        segments = gpu.TimingSegments.from_timestamps(self.timestamps, 1e6 / 48000.)
+        self.assertTrue(np.array_equal(gpu.TimingSegments.from_dict(segments.as_dict()).timestamps(),
+                                       self.timestamps))
@@ -6,6 +6,10 @@ import tempfile
 from typing import Optional, Union
 from unittest import TestCase
 
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+
 from redvox.api1000.proto.redvox_api_m_pb2 import RedvoxPacketM
 from redvox.api1000.wrapped_redvox_packet.wrapped_packet import WrappedRedvoxPacketM
 from redvox.api900.lib.api900_pb2 import RedvoxPacket
@@ -1072,3 +1076,50 @@ class FileSystemWriterTests(TestCase):
         self.assertEqual("mem.test", self.mem_fsw.full_name())
         self.assertEqual("temp.test", self.temp_fsw.full_name())
         self.assertEqual("disk.test", self.disk_fsw.full_name())
+
+    def test_write_profile(self):
+        self.assertEqual(self.disk_fsw.write_profile, io.ParquetWriteProfile.BALANCED)
+        self.disk_fsw.write_profile = io.ParquetWriteProfile.ARCHIVE
+        self.assertEqual(
+            io.FileSystemWriter.from_dict(self.disk_fsw.as_dict()).write_profile, io.ParquetWriteProfile.ARCHIVE
+        )
+
+    def test_write_parquet(self):
+        table = pa.Table.from_pydict({"timestamps": np.arange(100000.0)[::-1], "values": np.arange(100000.0)})
+        path = os.path.join(self.temp_dir.name, "archive.parquet")
+        io.write_parquet(table, path, io.ParquetWriteProfile.ARCHIVE)
+        metadata = pq.ParquetFile(path).metadata
+        self.assertEqual(metadata.num_row_groups, 2)
+        self.assertEqual(metadata.row_group(0).column(0).compression, "ZSTD")
+        self.assertEqual(metadata.row_group(0).column(0).statistics.max, 65535.0)
+        self.assertTrue(np.array_equal(pq.read_table(path)["timestamps"].to_numpy(), np.arange(100000.0)))
+        path = os.path.join(self.temp_dir.name, "scratch.parquet")
+        io.write_parquet(table, path, io.ParquetWriteProfile.FAST_SCRATCH)
+        metadata = pq.ParquetFile(path).metadata
+        self.assertEqual(metadata.row_group(0).column(0).compression, "UNCOMPRESSED")
+        self.assertFalse(metadata.row_group(0).column(0).is_stats_set)
+        self.assertTrue(pq.read_table(path).equals(table))
+
+    def test_write_parquet_integer_timestamps(self):
+        table = pa.Table.from_pydict(
+            {"timestamps": np.arange(100000, dtype=np.int64) * 21, "values": np.zeros(100000)}
+        )
+        path = os.path.join(self.temp_dir.name, "integer.parquet")
+        io.write_parquet(table, path)
+        metadata = pq.ParquetFile(path).metadata
+        self.assertIn("DELTA_BINARY_PACKED", metadata.row_group(0).column(0).encodings)
+        self.assertIn("RLE_DICTIONARY", metadata.row_group(0).column(1).encodings)
+        self.assertTrue(pq.read_table(path).equals(table))
+        path = os.path.join(self.temp_dir.name, "integer_tables.parquet")
+        io.write_parquet_tables(iter([table, table]), path, io.ParquetWriteProfile.FAST_SCRATCH)
+        self.assertIn("DELTA_BINARY_PACKED", pq.ParquetFile(path).metadata.row_group(0).column(0).encodings)
+
+    def test_write_parquet_tables(self):
+        tables = [pa.Table.from_pydict({"timestamps": np.arange(i, i + 10.0)}) for i in range(0, 30, 10)]
+        path = os.path.join(self.temp_dir.name, "tables.parquet")
+        self.assertEqual(io.write_parquet_tables(iter(tables), path, io.ParquetWriteProfile.ARCHIVE), 30)
+        self.assertTrue(pq.read_table(path).equals(pa.concat_tables(tables)))
+        self.assertEqual(pq.ParquetFile(path).metadata.row_group(0).sorting_columns[0].column_index, 0)
+        path = os.path.join(self.temp_dir.name, "no_tables.parquet")
+        self.assertEqual(io.write_parquet_tables(iter([]), path), 0)
+        self.assertFalse(os.path.exists(path))
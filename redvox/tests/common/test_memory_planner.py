@@ -0,0 +1,71 @@
+"""
+tests for memory planner
+"""
+from datetime import datetime
+import unittest
+
+import redvox.tests as tests
+from redvox.common import io
+from redvox.common import memory_planner as mp
+from redvox.common.api_reader import ApiReader
+
+
+def _entry(station_id: str, num_bytes: int) -> io.IndexEntry:
+    return io.IndexEntry("", station_id, datetime(2021, 1, 1), ".rdvxm", io.ApiVersion.API_1000, num_bytes, num_bytes)
+
+
+class MemoryPlannerTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.index = io.index_unstructured(tests.TEST_DATA_DIR, io.ReadFilter().with_station_ids({"0000000001"}))
+        # a file needs as many bytes as its decompressed size
+        cls.model = mp.MemoryModel(protobuf_factor=0.5, arrow_copies=0.5, default_arrow_ratio=1.0)
+
+    def test_estimate_arrow_bytes(self):
+        entry = [e for e in self.index.entries if e.api_version == io.ApiVersion.API_1000][0]
+        metadata_estimate = mp.estimate_arrow_bytes(entry.read_raw_metadata())
+        self.assertGreater(metadata_estimate, 0)
+        self.assertEqual(metadata_estimate, mp.estimate_arrow_bytes(entry.read_raw()))
+
+    def test_arrow_ratio(self):
+        self.assertGreater(mp.arrow_ratio(self.index), 0)
+        self.assertEqual(mp.arrow_ratio(io.Index([]), self.model), 1.0)
+        # files that can't be read use the default ratio
+        self.assertEqual(mp.arrow_ratio(io.Index([_entry("1", 30)]), self.model), 1.0)
+
+    def test_split_index(self):
+        plan = mp.MemoryPlan(100, 1, 100, self.model)
+        chunks = plan.split_index(io.Index([_entry("1", 30) for _ in range(7)]))
+        self.assertEqual([len(c.entries) for c in chunks], [3, 3, 1])
+
+    def test_split_index_large_file(self):
+        plan = mp.MemoryPlan(100, 1, 50, self.model)
+        chunks = plan.split_index(io.Index([_entry("1", 80), _entry("1", 20), _entry("1", 20)]))
+        self.assertEqual([len(c.entries) for c in chunks], [1, 2])
+
+    def test_plan_workload(self):
+        indexes = [io.Index([_entry(str(s), 20) for _ in range(5)]) for s in range(4)]
+        plan = mp.plan_workload(indexes, 100, 8, self.model)
+        self.assertEqual(plan.num_workers, 4)
+        self.assertEqual(plan.chunk_limit_bytes, 25)
+        self.assertEqual(plan.estimated_peak_bytes(), 100)
+        plan = mp.plan_workload(indexes, 50, 8, self.model)
+        self.assertEqual(plan.num_workers, 2)
+        self.assertEqual(len(plan.split_index(indexes[0])), 5)
+
+    def test_plan_workload_too_large(self):
+        indexes = [io.Index([_entry(str(s), 200), _entry(str(s), 20)]) for s in range(2)]
+        with self.assertWarns(UserWarning):
+            plan = mp.plan_workload(indexes, 100, 8, self.model)
+        self.assertEqual(plan.num_workers, 1)
+        self.assertEqual([len(c.entries) for c in plan.split_index(indexes[0])], [1, 1])
+
+    def test_api_reader_budget(self):
+        reader = ApiReader(tests.TEST_DATA_DIR, False, io.ReadFilter().with_station_ids({"0000000001"}))
+        self.assertEqual(reader.memory_plan.num_workers, 1)
+        findex = reader.files_index[0]
+        budget = max(reader.memory_plan.estimate_entry_bytes(e) for e in findex.entries)
+        reader = ApiReader(
+            tests.TEST_DATA_DIR, False, io.ReadFilter().with_station_ids({"0000000001"}), memory_budget_bytes=budget
+        )
+        self.assertEqual(len(reader._split_workload(findex)), len(findex.entries))
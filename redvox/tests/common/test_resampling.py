@@ -0,0 +1,101 @@
+"""
+tests for resampling
+"""
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import pyarrow as pa
+from scipy import signal
+
+from redvox.common import resampling
+from redvox.common.sensor_data import SensorData, SensorType
+
+
+def _sensor(timestamps: np.ndarray, values: np.ndarray, sample_rate_hz: float, fixed: bool, **kwargs) -> SensorData:
+    return SensorData(
+        "test",
+        pa.Table.from_pydict({"timestamps": timestamps, "unaltered_timestamps": timestamps, "pressure": values}),
+        SensorType.PRESSURE,
+        sample_rate_hz,
+        1 / sample_rate_hz,
+        0.0,
+        fixed,
+        **kwargs,
+    )
+
+
+class ResamplingTest(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.timestamps = 1.6e15 + np.arange(8000) * 1250.0
+        self.values = rng.standard_normal(8000)
+        self.even_sensor = _sensor(self.timestamps, self.values, 800.0, True)
+
+    def test_polyphase_factors(self):
+        self.assertEqual(resampling.polyphase_factors(48000.0, 800.0), (1, 60))
+        self.assertEqual(resampling.polyphase_factors(800.0, 48000.0), (60, 1))
+        self.assertEqual(resampling.polyphase_factors(48000.0, 44100.0), (147, 160))
+        self.assertIsNone(resampling.polyphase_factors(1.0, np.pi))
+
+    def test_resample_polyphase(self):
+        result = self.even_sensor.resample(80.0, chunk_s=1.0)
+        self.assertEqual(result.type(), SensorType.PRESSURE)
+        self.assertEqual(result.sample_rate_hz(), 80.0)
+        self.assertEqual(result.num_samples(), 800)
+        np.testing.assert_array_almost_equal(np.diff(result.data_timestamps()), 12500.0)
+        self.assertEqual(result.first_data_timestamp(), self.timestamps[0])
+        # resampling in chunks is the same as resampling all the data at once
+        np.testing.assert_array_almost_equal(
+            result.get_data_channel("pressure"), signal.resample_poly(self.values, 1, 10)
+        )
+        np.testing.assert_array_almost_equal(result.unaltered_data_timestamps(), result.data_timestamps())
+
+    def test_resample_polyphase_nan(self):
+        values = self.values.copy()
+        values[4000] = np.nan
+        result = _sensor(self.timestamps, values, 800.0, True).resample(80.0, chunk_s=1.0).get_data_channel("pressure")
+        self.assertTrue(np.isnan(result[400]))
+        self.assertFalse(np.any(np.isnan(result[:300])))
+
+    def test_resample_to_disk(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            sensor = _sensor(self.timestamps, self.values, 800.0, True, save_data=True, base_dir=tmp_dir)
+            result = sensor.resample(80.0, os.path.join(tmp_dir, "resampled"), chunk_s=1.0)
+            self.assertTrue(result.is_save_to_disk())
+            self.assertTrue(os.path.exists(result.full_path()))
+            np.testing.assert_array_almost_equal(
+                result.get_data_channel("pressure"), self.even_sensor.resample(80.0).get_data_channel("pressure")
+            )
+            with self.assertRaises(ValueError):
+                sensor.resample(80.0, tmp_dir)
+
+    def test_resample_interpolated(self):
+        # remove a second of samples to make a gap
+        keep = np.ones(8000, dtype=bool)
+        keep[2000:2800] = False
+        sensor = _sensor(self.timestamps[keep], self.values[keep], 800.0, False)
+        result = sensor.resample(100.0, chunk_s=1.0)
+        self.assertEqual(result.num_samples(), 1000)
+        values = result.get_data_channel("pressure")
+        self.assertTrue(np.all(np.isnan(values[251:350])))
+        self.assertFalse(np.any(np.isnan(values[:250])))
+        self.assertEqual(values[0], self.values[0])
+        self.assertEqual(values[1], self.values[8])
+
+    def test_resample_interpolated_without_gap_limit(self):
+        keep = np.ones(8000, dtype=bool)
+        keep[2000:2800] = False
+        sensor = _sensor(self.timestamps[keep], self.values[keep], 800.0, False)
+        result = sensor.resample(100.0, chunk_s=1.0, max_gap_s=np.inf)
+        self.assertTrue(
+            np.allclose(
+                result.get_data_channel("pressure"),
+                np.interp(result.data_timestamps(), self.timestamps[keep], self.values[keep]),
+            )
+        )
+
+    def test_resample_invalid(self):
+        with self.assertRaises(ValueError):
+            self.even_sensor.resample(0.0)
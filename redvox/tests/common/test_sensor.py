@@ -1,12 +1,19 @@
 """
 tests for sensor data and sensor metadata objects
 """
+import os
+import tempfile
 import unittest
 
 import numpy as np
+import pyarrow as pa
 
 from redvox.common import date_time_utils as dtu
-from redvox.common.sensor_data import SensorData, SensorType
+from redvox.common import gap_and_pad_utils as gpu
+from redvox.common.offset_model import OffsetModel
+from redvox.common.sensor_data import (
+    SensorData, SensorType, StoragePrecision, TimestampFormat, decode_enum_column
+)
 
 
 class SensorDataTest(unittest.TestCase):
@@ -134,6 +141,30 @@ class SensorDataTest(unittest.TestCase):
         self.assertEqual(len(self.even_sensor.samples()), 2)
         self.assertEqual(len(self.even_sensor.samples()[0]), 9)
 
+    def test_samples_cache(self):
+        samples = self.even_sensor.samples()
+        self.assertIs(self.even_sensor.samples(), samples)
+        self.assertFalse(samples.flags.writeable)
+        self.assertTrue(np.array_equal(samples, self.even_sensor.data_df().iloc[:, 2:].T.to_numpy()))
+        test_data = self.even_sensor.get_data_channel("test_data")
+        self.assertTrue(np.array_equal(test_data, samples[1]))
+        self.assertTrue(test_data.flags.writeable)
+        self.even_sensor.append_data([[0.], [0.], [1.], [2.]])
+        self.assertIsNot(self.even_sensor.samples(), samples)
+        self.assertEqual(self.even_sensor.samples().shape, (2, 10))
+        self.assertEqual(len(self.even_sensor.get_data_channel("test_data")), 10)
+
+    def test_samples_not_cached_on_disk(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            sensor = SensorData("test", sensor_type=SensorType.PRESSURE, save_data=True, base_dir=temp_dir)
+            sensor.write_pyarrow_table(
+                pa.Table.from_pydict({"timestamps": [1., 2.], "unaltered_timestamps": [1., 2.], "barometer": [1., 2.]})
+            )
+            samples = sensor.samples()
+            self.assertTrue(np.array_equal(samples, [[1., 2.]]))
+            self.assertIsNot(sensor.samples(), samples)
+            self.assertTrue(np.array_equal(sensor.get_data_channel("barometer"), [1., 2.]))
+
     def test_num_samples(self):
         self.assertEqual(self.even_sensor.num_samples(), 9)
 
@@ -219,3 +250,167 @@ class SensorDataTest(unittest.TestCase):
         self.assertEqual(audio_sensor.errors().get_num_errors(), 1)
         self.assertEqual(audio_sensor.first_data_timestamp(), 10)
         self.assertEqual(audio_sensor.last_data_timestamp(), 40)
+
+    def test_enumerated_channel(self):
+        location_sensor = SensorData.from_dict(
+            "test_location",
+            dict(zip(["timestamps", "unaltered_timestamps", "location_provider"],
+                     [[10, 20, 30, 40], [10, 20, 30, 40], [3, 4, 3, 0]])),
+            SensorType.LOCATION,
+            0.1,
+            10.,
+            0,
+            True,
+        )
+        providers = location_sensor.get_data_channel("location_provider")
+        self.assertIsInstance(providers, np.ndarray)
+        self.assertListEqual(providers.tolist(), ["GPS", "NETWORK", "GPS", "UNKNOWN"])
+        self.assertListEqual(location_sensor._get_non_numeric_data_channel("location_provider"),
+                             ["GPS", "NETWORK", "GPS", "UNKNOWN"])
+
+    def test_decode_enum_column(self):
+        self.assertListEqual(decode_enum_column("network_type", np.array([2., 1.])).tolist(), ["WIFI", "NO_NETWORK"])
+        self.assertEqual(len(decode_enum_column("power_state", np.array([], dtype=int))), 0)
+        with self.assertRaises(ValueError):
+            decode_enum_column("screen_state", np.array([1, 9]))
+        with self.assertRaises(ValueError):
+            decode_enum_column("screen_state", np.array([1., np.nan]))
+
+    def test_implicit_timing(self):
+        timestamps = gpu.calc_evenly_sampled_timestamps(1.6e15, 1000, 1e6 / 800.)
+        audio_sensor = SensorData(
+            "test_audio",
+            pa.Table.from_pydict({"timestamps": timestamps, "unaltered_timestamps": timestamps,
+                                  "microphone": np.arange(1000.)}),
+            SensorType.AUDIO,
+            800.,
+            1 / 800.,
+            0.,
+            True,
+        )
+        table = audio_sensor.pyarrow_table()
+        audio_sensor.set_implicit_timing(True)
+        self.assertTrue(audio_sensor.is_timing_implicit())
+        self.assertEqual(audio_sensor._stored_table().schema.names, ["microphone"])
+        self.assertTrue(audio_sensor.pyarrow_table().equals(table))
+        self.assertEqual(audio_sensor.num_samples(), 1000)
+        self.assertEqual(audio_sensor.last_data_timestamp(), timestamps[-1])
+        self.assertEqual(audio_sensor.samples().shape, (1, 1000))
+        audio_sensor.write_pyarrow_table(audio_sensor.pyarrow_table().slice(100, 500))
+        self.assertEqual(len(audio_sensor.timing_segments().starts), 1)
+        self.assertTrue(np.array_equal(audio_sensor.data_timestamps(), timestamps[100:600]))
+        audio_sensor.set_implicit_timing(False)
+        self.assertFalse(audio_sensor.is_timing_implicit())
+        self.assertTrue(np.array_equal(audio_sensor.data_timestamps(), timestamps[100:600]))
+
+    def test_time_range_table(self):
+        table = self.even_sensor.time_range_table(60., 140.)
+        self.assertTrue(np.array_equal(table["timestamps"].to_numpy(), [60., 80., 100., 120.]))
+        self.assertEqual(self.even_sensor.time_range_table(200., 300.).num_rows, 0)
+        self.even_sensor.set_implicit_timing(True)
+        self.even_sensor.set_storage_precision(StoragePrecision.NATIVE)
+        table = self.even_sensor.time_range_table(60., 140.)
+        self.assertTrue(table.equals(self.even_sensor.pyarrow_table().slice(2, 4)))
+
+    def test_rows(self):
+        table = self.even_sensor.pyarrow_table()
+        self.assertTrue(self.even_sensor.rows(2, 6).equals(table.slice(2, 4)))
+        self.assertEqual(self.even_sensor.rows(8, 20).num_rows, 1)
+        self.even_sensor.set_implicit_timing(True)
+        self.even_sensor.set_storage_precision(StoragePrecision.NATIVE)
+        self.assertTrue(self.even_sensor.rows(2, 6).equals(table.slice(2, 4)))
+
+    def test_iter_tables(self):
+        table = self.even_sensor.pyarrow_table()
+        self.assertEqual([t.num_rows for t in self.even_sensor.iter_tables(4)], [4, 4, 1])
+        self.assertTrue(pa.concat_tables(self.even_sensor.iter_tables(4)).equals(table))
+        self.even_sensor.set_implicit_timing(True)
+        self.even_sensor.set_storage_precision(StoragePrecision.NATIVE)
+        self.assertTrue(pa.concat_tables(self.even_sensor.iter_tables(4)).equals(table))
+        self.assertEqual(list(SensorData("empty").iter_tables(4)), [])
+
+    def test_storage_precision(self):
+        table = self.even_sensor.pyarrow_table()
+        self.even_sensor.set_storage_precision(StoragePrecision.NATIVE)
+        self.assertEqual(self.even_sensor.storage_precision(), StoragePrecision.NATIVE)
+        self.assertEqual(self.even_sensor._stored_table().schema.field("microphone").type, pa.int16())
+        self.assertEqual(self.even_sensor._stored_table().schema.field("timestamps").type, pa.float64())
+        self.assertTrue(self.even_sensor.pyarrow_table().equals(table))
+        self.assertEqual(self.even_sensor.get_data_channel("test_data").dtype, np.float64)
+        self.assertEqual(self.even_sensor.samples().dtype, np.float64)
+        self.even_sensor.write_pyarrow_table(
+            table.set_column(2, "microphone", pa.array([np.nan, 0.5] + [0.] * 7))
+        )
+        self.assertEqual(self.even_sensor._stored_table().schema.field("microphone").type, pa.float32())
+        self.assertEqual(self.even_sensor._stored_table()["microphone"].null_count, 1)
+        microphone = self.even_sensor.get_data_channel("microphone")
+        self.assertTrue(np.isnan(microphone[0]))
+        self.assertEqual(microphone[1], 0.5)
+        self.even_sensor.set_storage_precision(StoragePrecision.FLOAT64)
+        self.assertEqual(self.even_sensor._stored_table().schema.field("microphone").type, pa.float64())
+        self.assertTrue(np.isnan(self.even_sensor.get_data_channel("microphone")[0]))
+        self.assertEqual(self.even_sensor.as_dict()["storage_precision"], "FLOAT64")
+
+    def test_timestamp_format(self):
+        timestamps = np.array([1.6e15 + 0.3, 1.6e15 + 20.7, np.nan])
+        sensor = SensorData(
+            "test",
+            pa.Table.from_pydict({"timestamps": timestamps, "unaltered_timestamps": timestamps,
+                                  "barometer": [1., 2., 3.]}),
+            SensorType.PRESSURE,
+        )
+        sensor.set_timestamp_format(TimestampFormat.INT64_NANOS)
+        self.assertEqual(sensor.timestamp_format(), TimestampFormat.INT64_NANOS)
+        self.assertEqual(sensor._stored_table().schema.field("timestamps").type, pa.int64())
+        self.assertEqual(sensor._stored_table()["unaltered_timestamps"].null_count, 1)
+        self.assertEqual(sensor.pyarrow_table().schema.field("timestamps").type, pa.float64())
+        self.assertTrue(np.array_equal(sensor.data_timestamps(), timestamps, equal_nan=True))
+        self.assertTrue(np.array_equal(sensor.get_data_channel("unaltered_timestamps")[:2], timestamps[:2]))
+        self.assertEqual(sensor.time_range_table(timestamps[0] + 0.25, timestamps[1]).num_rows, 0)
+        self.assertEqual(sensor.time_range_table(timestamps[0], timestamps[1]).num_rows, 1)
+        self.assertEqual(sensor.rows(1, 2)["timestamps"][0].as_py(), timestamps[1])
+        self.assertEqual(sensor.as_dict()["timestamp_format"], "INT64_NANOS")
+        sensor.set_timestamp_format(TimestampFormat.FLOAT64_MICROS)
+        self.assertEqual(sensor._stored_table().schema.field("timestamps").type, pa.float64())
+        self.assertEqual(sensor.first_data_timestamp(), timestamps[0])
+
+    def test_timestamp_format_correction(self):
+        timestamps = 1.6e15 + np.arange(1000) * 1250.25
+        model = OffsetModel.empty_model()
+        model.start_time = 1.6e15
+        model.slope = 1e-6
+        model.intercept = 123.4565
+        for sensor_type, fixed in ((SensorType.AUDIO, True), (SensorType.ACCELEROMETER, False)):
+            sensors = {}
+            for timestamp_format in TimestampFormat:
+                sensor = SensorData(
+                    "test",
+                    pa.Table.from_pydict({"timestamps": timestamps, "unaltered_timestamps": timestamps,
+                                          "values": np.zeros(1000)}),
+                    sensor_type, 800., 1 / 800., 0., fixed, use_offset_model_for_correction=True,
+                )
+                sensor.set_timestamp_format(timestamp_format)
+                sensor.update_data_timestamps(model)
+                sensors[timestamp_format] = sensor
+            integer = sensors[TimestampFormat.INT64_NANOS]
+            self.assertLess(
+                np.max(np.abs(integer.data_timestamps() - sensors[TimestampFormat.FLOAT64_MICROS].data_timestamps())),
+                0.5,
+            )
+            self.assertEqual(integer.sample_interval_s(), sensors[TimestampFormat.FLOAT64_MICROS].sample_interval_s())
+            integer.set_original_timestamps()
+            self.assertTrue(np.array_equal(integer.data_timestamps(), timestamps))
+
+    def test_timestamp_format_before_write(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            sensor = SensorData(
+                "test", sensor_type=SensorType.PRESSURE, save_data=True, base_dir=os.path.join(temp_dir, "new")
+            )
+            sensor.set_timestamp_format(TimestampFormat.INT64_NANOS)
+            sensor.set_storage_precision(StoragePrecision.FLOAT32)
+            sensor.write_pyarrow_table(
+                pa.Table.from_pydict({"timestamps": [1.6e15 + 0.3], "unaltered_timestamps": [1.6e15 + 0.3],
+                                      "barometer": [1.]})
+            )
+            self.assertEqual(sensor._stored_table().schema.field("timestamps").type, pa.int64())
+            self.assertEqual(sensor.data_timestamps()[0], 1.6e15 + 0.25)
@@ -2,10 +2,12 @@ import unittest
 import tempfile
 import os.path
 
+import redvox.settings as settings
 import redvox.tests as tests
 from redvox.common.io import ReadFilter
 from redvox.common.api_reader import ApiReader
 import redvox.common.session_model as sm
+import redvox.common.session_io as s_io
 
 
 class SessionModelTest(unittest.TestCase):
@@ -14,6 +16,12 @@ class SessionModelTest(unittest.TestCase):
         cls.input_dir = tests.TEST_DATA_DIR
         cls.station_filter = ReadFilter(station_ids={"0000000001"})
 
+    def setUp(self) -> None:
+        self.parallelism_enabled = settings.is_parallelism_enabled()
+
+    def tearDown(self) -> None:
+        settings.set_parallelism_enabled(self.parallelism_enabled)
+
     def test_station_model(self):
         files = ApiReader(self.input_dir, read_filter=self.station_filter).read_files_by_id("0000000001")
 
@@ -28,6 +36,12 @@ class SessionModelTest(unittest.TestCase):
         self.assertEqual(len(model.get_daily_dynamic_sessions()), 1)
         self.assertEqual(len(model.get_hourly_dynamic_sessions()), 1)
 
+    def test_create_from_index(self):
+        index = ApiReader(self.input_dir, read_filter=self.station_filter).files_index[0]
+        model = sm.SessionModel.create_from_index(index)
+        self.assertEqual(model.cloud_session.n_pkts, 3)
+        self.assertEqual(model.get_sensor_names(), ["audio", "location", "health"])
+
     def test_write_station_model(self):
         tmpdir = tempfile.TemporaryDirectory()
         files = ApiReader(self.input_dir, read_filter=self.station_filter).read_files_by_id("0000000001")
@@ -46,6 +60,28 @@ class SessionModelTest(unittest.TestCase):
 
         tmpdir.cleanup()
 
+    def test_create_all_from_dir(self):
+        models = sm.SessionModel.create_all_from_dir(self.input_dir, structured_dir=False)
+        self.assertEqual(3, len(models))
+        model = models["0000000001:0000000001:1597189452943691"]
+        self.assertEqual(model.cloud_session.n_pkts, 3)
+        self.assertEqual(model.get_sensor_names(), ["audio", "location", "health"])
+        self.assertEqual(model.audio_sample_rate_nominal_hz(), 48000)
+
+    def test_create_all_from_dir_station_ids(self):
+        models = sm.SessionModel.create_all_from_dir(
+            self.input_dir, structured_dir=False, station_ids=["0000000001"]
+        )
+        self.assertEqual(["0000000001:0000000001:1597189452943691"], list(models.keys()))
+
+    def test_create_all_from_dir_parallel(self):
+        serial = sm.SessionModel.create_all_from_dir(self.input_dir, structured_dir=False)
+        settings.set_parallelism_enabled(True)
+        parallel = sm.SessionModel.create_all_from_dir(self.input_dir, structured_dir=False)
+        self.assertEqual(list(serial.keys()), list(parallel.keys()))
+        for key, model in serial.items():
+            self.assertEqual(s_io.session_model_to_json(model), s_io.session_model_to_json(parallel[key]))
+
 
 class LocalSessionModelsTest(unittest.TestCase):
     @classmethod
@@ -1,12 +1,14 @@
 """
 tests for timesync
 """
+import copy
 import unittest
 import contextlib
+import tempfile
 import redvox.tests as tests
 from redvox.common import timesync as ts
 from redvox.common import api_reader
-from redvox.common.io import ReadFilter
+from redvox.common.io import ParquetWriteProfile, ReadFilter
 
 
 class TimesyncTest(unittest.TestCase):
@@ -20,6 +22,15 @@ class TimesyncTest(unittest.TestCase):
     def test_num_tri_messages(self):
         self.assertEqual(self.timesync.num_tri_messages(), 14)
 
+    def test_json_file_write_profile(self):
+        timesync = copy.copy(self.timesync)
+        timesync.write_profile = ParquetWriteProfile.ARCHIVE
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            timesync.arrow_dir = tmp_dir
+            result = ts.TimeSync.from_json_file(str(timesync.to_json_file()))
+        self.assertEqual(result.write_profile, ParquetWriteProfile.ARCHIVE)
+        self.assertEqual(result.num_tri_messages(), 14)
+
     def test_latencies(self):
         self.assertEqual(len(self.timesync.latencies()[0]), 14)
         self.assertEqual(self.timesync.latencies()[0][0], 74559.5)
@@ -0,0 +1,99 @@
+"""
+tests for tracing
+"""
+import os
+import json
+import tempfile
+import unittest
+
+import redvox.tests as tests
+import redvox.settings as settings
+from redvox.common import tracing
+from redvox.common import data_window as dw
+
+
+@tracing.traced()
+def _outer(n: int) -> int:
+    tracing.annotate(rows=n)
+    return _inner(n) + _inner(n)
+
+
+@tracing.traced("inner")
+def _inner(n: int) -> int:
+    return n * 2
+
+
+class TracerTest(unittest.TestCase):
+    def test_disabled(self):
+        self.assertFalse(tracing.is_enabled())
+        self.assertEqual(_outer(2), 8)
+        tracing.annotate(rows=1)
+        self.assertIsNone(tracing.get_active_tracer())
+
+    def test_nested_spans(self):
+        tracer = tracing.Tracer()
+        with tracer.activate():
+            self.assertTrue(tracing.is_enabled())
+            self.assertEqual(_outer(3), 12)
+        self.assertFalse(tracing.is_enabled())
+        self.assertEqual(len(tracer.spans), 1)
+        outer = tracer.spans[0]
+        self.assertEqual(outer.name, "_outer")
+        self.assertEqual(outer.attributes["rows"], 3)
+        self.assertEqual([c.name for c in outer.children], ["inner", "inner"])
+        self.assertGreaterEqual(outer.duration_s(), sum(c.duration_s() for c in outer.children))
+        self.assertGreater(outer.rss_end_bytes, 0)
+        summary = tracer.summary()
+        self.assertEqual(summary["inner"]["calls"], 2)
+        self.assertEqual(summary["_outer"]["calls"], 1)
+
+    def test_activate_none(self):
+        with tracing.activate(None):
+            self.assertFalse(tracing.is_enabled())
+
+    def test_export(self):
+        tracer = tracing.Tracer()
+        with tracer.activate():
+            _outer(1)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            with open(tracer.to_json_file(os.path.join(tmp_dir, "trace.json"))) as f_p:
+                as_json = json.load(f_p)
+            with open(tracer.chrome_trace_to_file(os.path.join(tmp_dir, "chrome.json"))) as f_p:
+                chrome = json.load(f_p)
+        self.assertEqual(as_json["spans"][0]["name"], "_outer")
+        self.assertEqual(len(as_json["spans"][0]["children"]), 2)
+        self.assertEqual([e["name"] for e in chrome["traceEvents"]], ["_outer", "inner", "inner"])
+        self.assertTrue(all(e["ph"] == "X" for e in chrome["traceEvents"]))
+        self.assertEqual(chrome["traceEvents"][0]["args"]["rows"], 1)
+
+
+class DataWindowTracingTest(unittest.TestCase):
+    def test_trace_data_window(self):
+        parallel = settings.is_parallelism_enabled()
+        settings.set_parallelism_enabled(False)
+        try:
+            datawindow = dw.DataWindow(
+                config=dw.DataWindowConfig(
+                    input_dir=tests.TEST_DATA_DIR, structured_layout=False, station_ids={"0000000001"}, trace=True
+                )
+            )
+        finally:
+            settings.set_parallelism_enabled(parallel)
+        tracer = datawindow.tracer()
+        self.assertIsNotNone(tracer)
+        self.assertEqual(tracer.spans[0].name, "DataWindow.create_data_window")
+        names = set(tracer.summary().keys())
+        for name in [
+            "ApiReader.__init__",
+            "Index.read_contents",
+            "Station._set_pyarrow_sensors",
+            "DataWindow.create_window_in_sensors",
+            "DataWindow.process_sensor",
+        ]:
+            self.assertIn(name, names)
+        windowed = [s for s in tracer.walk() if s.name == "DataWindow.create_window_in_sensors"]
+        self.assertEqual(windowed[0].attributes["station"], "0000000001")
+
+    def test_no_trace(self):
+        datawindow = dw.DataWindow(config=dw.DataWindowConfig(input_dir=tests.TEST_DATA_DIR, structured_layout=False))
+        self.assertIsNone(datawindow.tracer())
@@ -0,0 +1,89 @@
+"""
+Guards the start up cost of the SDK's entry points by running each one in a fresh interpreter with -X importtime.
+The time budgets depend on the machine, so they are only checked when REDVOX_CHECK_IMPORT_TIME is set to true.
+"""
+import os
+import subprocess
+import sys
+import unittest
+from typing import Dict, List
+
+import redvox.tests as tests
+
+# set to true to check the import time of each entry point against its budget
+CHECK_IMPORT_TIME_ENV: str = "REDVOX_CHECK_IMPORT_TIME"
+
+
+def _import_times(*args: str) -> Dict[str, int]:
+    """
+    :param args: arguments to the python interpreter, after -X importtime
+    :return: cumulative import time in microseconds of every module imported, keyed by module name
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    )
+    times: Dict[str, int] = {}
+    # lines look like: "import time:       123 |       4567 |   redvox.common.io"
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts: List[str] = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        times[parts[2].strip()] = int(parts[1].strip())
+    return times
+
+
+class TestImportTime(unittest.TestCase):
+    # budgets are generous, they catch a heavy dependency creeping back into an entry point rather than noise
+    def assert_entry_point(self, args: List[str], root: str, budget_s: float, forbidden: List[str]):
+        times = _import_times(*args)
+        self.assertIn(root, times)
+        for module in forbidden:
+            self.assertNotIn(module, times, f"{module} is imported by {root}")
+        if os.environ.get(CHECK_IMPORT_TIME_ENV, "").lower() == "true":
+            self.assertLess(times[root] / 1e6, budget_s)
+
+    def test_import_redvox(self):
+        self.assert_entry_point(
+            ["-c", "import redvox"], "redvox", 0.5, ["numpy", "pandas", "pyarrow", "scipy", "requests"]
+        )
+
+    def test_import_cli(self):
+        self.assert_entry_point(
+            ["-c", "import redvox.cli.cli"],
+            "redvox.cli.cli",
+            0.5,
+            ["numpy", "pandas", "pyarrow", "scipy", "requests", "dataclasses_json", "redvox.api900.reader"],
+        )
+
+    def test_cli_validate_m(self):
+        path: str = os.path.join(tests.TEST_DATA_DIR, "0000000001_1597189452945991.rdvxm")
+        if not os.path.isfile(path):
+            self.skipTest(f"missing test file {path}")
+        self.assert_entry_point(
+            ["-m", "redvox.cli.cli", "validate-m", path],
+            "redvox.cli.conversions",
+            1.5,
+            ["pandas", "pyarrow", "scipy", "requests", "dataclasses_json", "redvox.cloud.client"],
+        )
+
+    def test_import_wrapped_packet(self):
+        self.assert_entry_point(
+            ["-c", "import redvox.api1000.wrapped_redvox_packet.wrapped_packet"],
+            "redvox.api1000.wrapped_redvox_packet.wrapped_packet",
+            1.5,
+            ["pandas", "pyarrow", "scipy", "requests", "redvox.api900.reader"],
+        )
+
+    def test_import_data_window(self):
+        self.assert_entry_point(
+            ["-c", "import redvox.common.data_window"],
+            "redvox.common.data_window",
+            3.0,
+            ["pandas", "scipy", "pyarrow.dataset", "redvox.cloud.client"],
+        )